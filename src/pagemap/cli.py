@@ -1,12 +1,14 @@
 # Copyright (C) 2025-2026 Retio AI
 # SPDX-License-Identifier: AGPL-3.0-only
 
-"""Page Map CLI: validate, build, serve, benchmark, collect, convert commands.
+"""Page Map CLI: validate, build, serve, perf, benchmark, collect, convert commands.
 
 Usage:
     python -m pagemap.cli validate [--url URL] [--all]
     python -m pagemap.cli build [--url URL] [--snapshots] [--output DIR]
+    python -m pagemap.cli build --bulk DIR [--workers N] [--shard-size N] [--no-resume] [--output DIR]
     python -m pagemap.cli serve
+    python -m pagemap.cli perf [--iterations N] [--workers N] [--pages NAMES] [-o result.json] [--baseline PATH]
     python -m pagemap.cli benchmark [--static] [--live] [--sim-live] [--sim-static] [--task ID] [--model MODEL] [--force] [--conditions CONDS]
     python -m pagemap.cli collect [--site SITE] [--type TYPE] [--count N] [--all] [--simulator]
     python -m pagemap.cli convert [--tool TOOL] [--snapshot-dir DIR] [--force] [--pilot]
@@ -456,7 +458,18 @@ def cmd_build(args: argparse.Namespace) -> None:
 
     snapshot_dir = Path(args.snapshot_dir) if getattr(args, "snapshot_dir", None) else None
 
-    if args.url:
+    if getattr(args, "bulk", None):
+        if fmt or is_file_mode:
+            print("Error: --bulk writes NDJSON shards; use --output DIR (not --format or a file).", file=sys.stderr)
+            sys.exit(1)
+        _build_bulk(
+            Path(args.bulk),
+            output_path or Path("pagemap-bulk"),
+            workers=args.workers,
+            shard_size=args.shard_size,
+            resume=not args.no_resume,
+        )
+    elif args.url:
         try:
             asyncio.run(
                 _build_live(
@@ -722,6 +735,41 @@ def _build_offline(output_dir: Path) -> None:
     print(f"\nOutput: {output_dir}")
 
 
+def _build_bulk(input_dir: Path, output_dir: Path, *, workers: int | None, shard_size: int, resume: bool) -> None:
+    """Bulk offline build: worker pool → NDJSON shards + resumable manifest."""
+    import os
+
+    from .core.bulk_build import run_bulk_build
+
+    if not input_dir.is_dir():
+        print(f"Error: --bulk directory not found: {input_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    workers = workers or os.cpu_count() or 1
+    progress = {"n": 0}
+
+    def _on_result(entry: dict) -> None:
+        progress["n"] += 1
+        if entry["status"] != "ok":
+            print(f"  ERROR {entry['key']}: {entry['error']}", file=sys.stderr)
+        elif progress["n"] % 100 == 0:
+            print(f"  {progress['n']} pages built...", file=sys.stderr)
+
+    report = run_bulk_build(
+        input_dir,
+        output_dir,
+        workers=workers,
+        shard_size=shard_size,
+        resume=resume,
+        on_result=_on_result,
+    )
+
+    print(f"Pages:      {report.total} total, {report.built} built, {report.skipped} skipped, {report.failed} failed")
+    print(f"Throughput: {report.pages_per_s:.2f} pages/s ({report.workers} workers, {report.elapsed_s:.1f}s)")
+    print(f"Per page:   p50 {report.p50_ms:.0f}ms, p99 {report.p99_ms:.0f}ms")
+    print(f"\nOutput: {output_dir}")
+
+
 def cmd_serve(args: argparse.Namespace) -> None:
     """Start MCP server, forwarding any extra args to the server."""
     from .server import main
@@ -1223,6 +1271,39 @@ class _ServeHelpAction(argparse.Action):
         parser.exit()
 
 
+def cmd_perf(args: argparse.Namespace) -> None:
+    """Offline build-pipeline performance benchmark (no browser/LLM)."""
+    import os
+
+    from .core.perf_bench import compare_to_baseline, format_report, run_perf
+
+    names = [n.strip() for n in args.pages.split(",") if n.strip()] if args.pages else None
+    workers = args.workers or os.cpu_count() or 1
+    print(f"Running perf benchmark ({args.iterations} iterations, up to {workers} workers)...", file=sys.stderr)
+    result = run_perf(iterations=args.iterations, max_workers=workers, rounds=args.rounds, names=names)
+    print(format_report(result))
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"Result written to {args.output}", file=sys.stderr)
+
+    if not args.baseline:
+        return
+    baseline_path = Path(args.baseline)
+    if args.update_baseline or not baseline_path.exists():
+        baseline_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"Baseline written to {baseline_path}", file=sys.stderr)
+        return
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    regressions = compare_to_baseline(result, baseline, tolerance=args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) vs {baseline_path}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions vs {baseline_path} (tolerance {args.tolerance:.0%})")
+
+
 def cmd_openapi(args: argparse.Namespace) -> None:
     """Generate OpenAPI 3.1 specification."""
     from .openapi import generate_openapi_spec, spec_to_json, spec_to_yaml
@@ -1260,6 +1341,7 @@ examples:
   %(prog)s --url https://example.com -o result.json Save to single file
   %(prog)s --url https://example.com -o out/        Save to directory
   %(prog)s --snapshots                              Build from all snapshots
+  %(prog)s --bulk corpus/ -o out/ --workers 8       Parallel, resumable offline build
 """
     p_build = subparsers.add_parser(
         "build",
@@ -1283,6 +1365,19 @@ examples:
         choices=["json", "text", "markdown"],
         help="Output format to stdout (mutually exclusive with --output)",
     )
+    p_build.add_argument(
+        "--bulk",
+        type=str,
+        metavar="DIR",
+        help="Offline bulk build of snapshot dirs / *.html under DIR into NDJSON shards",
+    )
+    p_build.add_argument("--workers", type=int, metavar="N", help="Bulk build worker processes (default: CPU count)")
+    p_build.add_argument(
+        "--shard-size", type=int, default=1000, metavar="N", help="Bulk build records per NDJSON shard"
+    )
+    p_build.add_argument(
+        "--no-resume", action="store_true", help="Bulk build: ignore the checkpoint manifest and start over"
+    )
 
     p_serve = subparsers.add_parser(
         "serve",
@@ -1331,7 +1426,34 @@ examples:
         help="Output file path (default: stdout)",
     )
 
-    commands = {"build": cmd_build, "serve": cmd_serve, "openapi": cmd_openapi}
+    # Offline pipeline performance benchmark
+    _perf_epilog = """\
+examples:
+  %(prog)s                                     Full corpus, 1..CPU workers
+  %(prog)s --pages product,huge_spa -i 10      Selected pages, 10 iterations
+  %(prog)s -o perf.json --baseline base.json   Save result, fail on regression
+  %(prog)s --baseline base.json --update-baseline
+"""
+    p_perf = subparsers.add_parser(
+        "perf",
+        help="Benchmark offline page-map build latency and throughput",
+        epilog=_perf_epilog,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    p_perf.add_argument("-i", "--iterations", type=int, default=5, metavar="N", help="Timed builds per page")
+    p_perf.add_argument("--workers", type=int, metavar="N", help="Max worker processes (default: CPU count)")
+    p_perf.add_argument("--rounds", type=int, default=2, metavar="N", help="Corpus passes per throughput run")
+    p_perf.add_argument("--pages", type=str, metavar="NAMES", help="Comma-separated corpus page names")
+    p_perf.add_argument("-o", "--output", type=str, metavar="PATH", help="Write JSON result to PATH")
+    p_perf.add_argument(
+        "--baseline", type=str, metavar="PATH", help="Compare against baseline JSON (created if missing)"
+    )
+    p_perf.add_argument("--update-baseline", action="store_true", help="Overwrite --baseline with this result")
+    p_perf.add_argument(
+        "--tolerance", type=float, default=0.2, metavar="F", help="Allowed slowdown before flagging (default: 0.2)"
+    )
+
+    commands = {"build": cmd_build, "serve": cmd_serve, "openapi": cmd_openapi, "perf": cmd_perf}
 
     # ── Credits management (S8) ─────────────────────────────────
     if _has_management_db():
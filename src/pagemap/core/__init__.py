@@ -34,6 +34,7 @@ class Interactable:
     options: list[str] = field(default_factory=list)  # for selects/comboboxes
     selector: str = ""  # CSS selector for precise DOM targeting (internal)
     name_source: str = ""  # "aria-label", "contents", "title", "placeholder", "alt", "labelledby"
+    backend_node_id: int | None = None  # CDP backendDOMNodeId at build time (internal, direct dispatch)
 
     def __str__(self) -> str:
         parts = [f"[{self.ref}]", f"{self.role}:", self.name, f"({self.affordance})"]
@@ -63,11 +64,18 @@ class PageMap:
     barrier: BarrierResult | None = None  # v0.8.0: Layer 0 barrier detection
     diagnostics: DiagnosticResult | None = None  # v0.8.0 S9: self-healing diagnostics
     browser_security: BrowserSecurityReport | None = None  # v0.9.0: browser-side security scan
+    # Rendered prompts / scan verdicts (core/render_cache.py); not copied by dataclasses.replace
+    _render_memo: dict = field(default_factory=dict, init=False, repr=False, compare=False)
 
     @property
     def total_interactables(self) -> int:
         return len(self.interactables)
 
+    @property
+    def node_handles(self) -> dict[int, int]:
+        """ref → backendDOMNodeId for this build (weak: ids never pin DOM nodes)."""
+        return {i.ref: i.backend_node_id for i in self.interactables if i.backend_node_id is not None}
+
     @property
     def tier_counts(self) -> dict[int, int]:
         counts: dict[int, int] = {}
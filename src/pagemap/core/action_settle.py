@@ -0,0 +1,215 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Adaptive post-action settling: wait until the page is quiet, not a fixed sleep.
+
+Leaf module with no internal pagemap dependencies.
+The page is considered settled when, at the same time:
+  - no fetch/XHR request started by the action is still in flight,
+  - no main-frame navigation started by the action is still in flight,
+  - the DOM has seen no mutations for ``quiet_ms``.
+
+Only requests that *start* while the settler is attached are tracked, so
+long-polls and analytics beacons opened before the action never hold it
+up.  Every wait is bounded by ``max_ms``.
+
+Usage::
+
+    with ActionSettler(page) as settler:
+        await locator.click()
+        result = await settler.settle()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Request
+
+logger = logging.getLogger("pagemap.action_settle")
+
+SETTLE_QUIET_MS = 150  # DOM mutation quiet window
+SETTLE_MAX_MS = 2000  # hard cap per action
+
+_TRACKED_RESOURCE_TYPES = frozenset({"fetch", "xhr"})
+_MAX_EVAL_FAILURES = 2  # context destroyed / page gone → give up early
+
+# Resolves once the DOM has been mutation-free for quietMs, or at maxMs, with
+# {waited_ms, mutations, reason: "quiet"|"timeout"}. Shared with BrowserSession.wait_for_dom_settle.
+DOM_SETTLE_JS = """([quietMs, maxMs]) => new Promise(resolve => {
+  let mutations = 0;
+  let quietTimer = null;
+  let maxTimer = null;
+  const start = performance.now();
+
+  const finish = (reason) => {
+    observer.disconnect();
+    if (quietTimer) clearTimeout(quietTimer);
+    if (maxTimer) clearTimeout(maxTimer);
+    resolve({
+      waited_ms: Math.round(performance.now() - start),
+      mutations: mutations,
+      reason: reason
+    });
+  };
+
+  const resetQuiet = () => {
+    if (quietTimer) clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => finish('quiet'), quietMs);
+  };
+
+  const observer = new MutationObserver((records) => {
+    mutations += records.length;
+    resetQuiet();
+  });
+
+  observer.observe(document.documentElement, {
+    childList: true,
+    subtree: true,
+    characterData: true
+  });
+
+  resetQuiet();
+  maxTimer = setTimeout(() => finish('timeout'), maxMs);
+})"""
+
+
+@dataclass(frozen=True, slots=True)
+class SettleResult:
+    """Outcome of one post-action settle."""
+
+    waited_ms: int
+    reason: str  # "quiet" | "timeout" | "error"
+    mutations: int = 0
+    requests: int = 0  # fetch/XHR/navigation requests started by the action
+
+
+class ActionSettler:
+    """Track action-triggered network activity, then wait for quiescence.
+
+    Attach (``with`` / :meth:`attach`) *before* performing the action so
+    requests it fires are seen; :meth:`settle` detaches when done.
+    """
+
+    __slots__ = ("_page", "_pending", "_idle", "_seen", "_attached")
+
+    def __init__(self, page: Page) -> None:
+        self._page = page
+        self._pending: set[Request] = set()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._seen = 0
+        self._attached = False
+
+    def __enter__(self) -> ActionSettler:
+        self.attach()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.detach()
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def attach(self) -> None:
+        if self._attached:
+            return
+        try:
+            self._page.on("request", self._on_request)
+            self._page.on("requestfinished", self._on_request_done)
+            self._page.on("requestfailed", self._on_request_done)
+            self._attached = True
+        except Exception:
+            logger.debug("Settle listeners not attached", exc_info=True)
+
+    def detach(self) -> None:
+        if not self._attached:
+            return
+        self._attached = False
+        for event, handler in (
+            ("request", self._on_request),
+            ("requestfinished", self._on_request_done),
+            ("requestfailed", self._on_request_done),
+        ):
+            with suppress(Exception):
+                self._page.remove_listener(event, handler)
+        self._pending.clear()
+        self._idle.set()
+
+    def _on_request(self, request: Request) -> None:
+        try:
+            tracked = request.resource_type in _TRACKED_RESOURCE_TYPES or (
+                request.is_navigation_request() and request.frame == self._page.main_frame
+            )
+        except Exception:
+            return
+        if not tracked:
+            return
+        self._pending.add(request)
+        self._seen += 1
+        self._idle.clear()
+
+    def _on_request_done(self, request: Request) -> None:
+        self._pending.discard(request)
+        if not self._pending:
+            self._idle.set()
+
+    async def settle(self, *, quiet_ms: int = SETTLE_QUIET_MS, max_ms: int = SETTLE_MAX_MS) -> SettleResult:
+        """Return once network and DOM are quiet, or after *max_ms*. Never raises."""
+        start = time.monotonic()
+        deadline = start + max_ms / 1000
+        mutations = 0
+        failures = 0
+        reason = "timeout"
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                if self._pending:
+                    with suppress(TimeoutError):
+                        await asyncio.wait_for(self._idle.wait(), timeout=remaining)
+                    continue
+                try:
+                    dom = await self._page.evaluate(DOM_SETTLE_JS, [quiet_ms, max(1, int(remaining * 1000))])
+                except Exception:
+                    # Usually "execution context destroyed": a navigation is committing.
+                    failures += 1
+                    if failures >= _MAX_EVAL_FAILURES:
+                        reason = "error"
+                        break
+                    with suppress(Exception):
+                        await asyncio.wait_for(
+                            self._page.wait_for_load_state("domcontentloaded"),
+                            timeout=max(0.0, deadline - time.monotonic()),
+                        )
+                    continue
+                mutations += int(dom.get("mutations", 0))
+                if dom.get("reason") != "quiet":
+                    break
+                if not self._pending:
+                    reason = "quiet"
+                    break
+        finally:
+            self.detach()
+        result = SettleResult(
+            waited_ms=round((time.monotonic() - start) * 1000),
+            reason=reason,
+            mutations=mutations,
+            requests=self._seen,
+        )
+        logger.debug(
+            "Action settle: %dms reason=%s mutations=%d requests=%d",
+            result.waited_ms,
+            result.reason,
+            result.mutations,
+            result.requests,
+        )
+        return result
@@ -0,0 +1,28 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Atomic file writes for the on-disk indexes (boilerplate index, navigation profiles)."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write *text* to *path* via a temp file in the same directory and ``os.replace``.
+
+    Readers see either the old file or the new one, never a partial write.
+    The temp file is removed if anything fails; the error propagates.
+    """
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except BaseException:
+        with suppress(OSError):
+            os.unlink(tmp)
+        raise
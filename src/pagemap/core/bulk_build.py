@@ -0,0 +1,296 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Parallel, resumable bulk offline build for snapshot corpora.
+
+Flow:
+  input dir
+    → discover snapshot pages (site/page/raw.html) + loose *.html files
+    → skip keys already recorded ``ok`` in the checkpoint manifest
+    → multi-process worker pool (build_page_map_offline per page)
+    → streaming NDJSON shards (one PageMap dict per line)
+    → manifest.jsonl checkpoint (one line per finished page)
+    → BulkBuildReport (pages/s, p50/p99 per page, failures)
+
+The manifest line for a page is written only after its record has been
+flushed to a shard, so an interrupted run never loses a page it marked
+done.  Resumed runs always open a fresh shard — a torn trailing line in
+an older shard cannot corrupt new output.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import multiprocessing
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.jsonl"
+REPORT_NAME = "report.json"
+SHARD_PREFIX = "pagemaps-"
+DEFAULT_SHARD_SIZE = 1000
+
+_HTML_SUFFIXES = (".html", ".htm")
+_IMAP_CHUNKSIZE = 4
+_MAX_FAILURES_REPORTED = 100
+
+
+@dataclass(frozen=True, slots=True)
+class BulkInput:
+    """One page to build. ``key`` is the stable checkpoint identity."""
+
+    key: str
+    html_path: str
+    site_id: str
+    page_id: str
+    url: str
+
+
+@dataclass(slots=True)
+class BulkBuildReport:
+    """Final throughput report for a bulk build run."""
+
+    total: int = 0
+    built: int = 0
+    skipped: int = 0
+    failed: int = 0
+    workers: int = 1
+    elapsed_s: float = 0.0
+    pages_per_s: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    shards: list[str] = field(default_factory=list)
+    failures: list[dict[str, str]] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def discover_inputs(input_dir: Path) -> list[BulkInput]:
+    """Collect pages under *input_dir* in a stable (sorted) order.
+
+    Snapshot pages are directories containing ``raw.html`` (with an
+    optional ``snapshot.json`` for url/site_id/page_id).  Any other
+    ``*.html`` / ``*.htm`` file is built as a loose offline page.
+    """
+    inputs: list[BulkInput] = []
+    for path in sorted(input_dir.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in _HTML_SUFFIXES:
+            continue
+        rel = path.relative_to(input_dir)
+        if path.name == "raw.html":
+            page_dir = path.parent
+            meta: dict[str, Any] = {}
+            meta_path = page_dir / "snapshot.json"
+            if meta_path.exists():
+                try:
+                    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                except (OSError, ValueError) as e:
+                    logger.warning("Unreadable snapshot.json in %s: %s", page_dir, e)
+            key = rel.parent.as_posix() if rel.parent != Path(".") else rel.as_posix()
+            inputs.append(
+                BulkInput(
+                    key=key,
+                    html_path=str(path),
+                    site_id=meta.get("site_id", page_dir.parent.name if page_dir != input_dir else "unknown"),
+                    page_id=meta.get("page_id", page_dir.name),
+                    url=meta.get("url", f"file://{page_dir}"),
+                )
+            )
+        else:
+            inputs.append(
+                BulkInput(
+                    key=rel.as_posix(),
+                    html_path=str(path),
+                    site_id=rel.parent.as_posix() if rel.parent != Path(".") else "offline",
+                    page_id=path.stem,
+                    url=f"file://{path}",
+                )
+            )
+    return inputs
+
+
+def load_manifest(output_dir: Path) -> dict[str, dict[str, Any]]:
+    """Return ``{key: last manifest entry}``; torn/invalid lines are ignored."""
+    path = output_dir / MANIFEST_NAME
+    entries: dict[str, dict[str, Any]] = {}
+    if not path.exists():
+        return entries
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict) and "key" in entry:
+                entries[entry["key"]] = entry
+    return entries
+
+
+def build_one(item: BulkInput) -> dict[str, Any]:
+    """Build a single page offline. Never raises — errors are returned in the record.
+
+    Top-level (picklable) so it can run inside a worker process.
+    """
+    from .page_map_builder import build_page_map_offline
+    from .serializer import to_dict
+
+    start = time.perf_counter()
+    try:
+        raw_html = Path(item.html_path).read_text(encoding="utf-8", errors="replace")
+        page_map = build_page_map_offline(
+            raw_html=raw_html,
+            url=item.url,
+            site_id=item.site_id,
+            page_id=item.page_id,
+        )
+        return {
+            "key": item.key,
+            "ok": True,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+            "page_map": to_dict(page_map),
+        }
+    except Exception as e:  # one bad page must not stop the corpus
+        return {
+            "key": item.key,
+            "ok": False,
+            "elapsed_ms": (time.perf_counter() - start) * 1000,
+            "error": f"{type(e).__name__}: {e}",
+        }
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already-sorted list (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, math.ceil(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class _ShardWriter:
+    """Append NDJSON records, rotating to a new shard every ``shard_size`` lines."""
+
+    def __init__(self, output_dir: Path, shard_size: int) -> None:
+        self._output_dir = output_dir
+        self._shard_size = max(1, shard_size)
+        existing = [p.stem[len(SHARD_PREFIX) :] for p in output_dir.glob(f"{SHARD_PREFIX}*.ndjson")]
+        self._next_index = max((int(n) + 1 for n in existing if n.isdigit()), default=0)
+        self._file: IO[str] | None = None
+        self._count = 0
+        self.shard_names: list[str] = []
+        self.current_name = ""
+
+    def write(self, record: dict[str, Any]) -> str:
+        if self._file is None or self._count >= self._shard_size:
+            self._rotate()
+        assert self._file is not None
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._count += 1
+        return self.current_name
+
+    def _rotate(self) -> None:
+        self.close()
+        self.current_name = f"{SHARD_PREFIX}{self._next_index:05d}.ndjson"
+        self._next_index += 1
+        self._file = (self._output_dir / self.current_name).open("w", encoding="utf-8")
+        self._count = 0
+        self.shard_names.append(self.current_name)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _iter_results(items: list[BulkInput], workers: int) -> Iterator[dict[str, Any]]:
+    """Yield build records as they complete (inline when ``workers == 1``)."""
+    workers = min(workers, len(items))
+    if workers <= 1:
+        for item in items:
+            yield build_one(item)
+        return
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(processes=workers) as pool:
+        yield from pool.imap_unordered(build_one, items, chunksize=_IMAP_CHUNKSIZE)
+
+
+def run_bulk_build(
+    input_dir: Path,
+    output_dir: Path,
+    *,
+    workers: int = 1,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    resume: bool = True,
+    inputs: Iterable[BulkInput] | None = None,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> BulkBuildReport:
+    """Build every page under *input_dir* into NDJSON shards under *output_dir*.
+
+    Args:
+        workers: worker processes (1 = build inline in this process).
+        shard_size: records per NDJSON shard before rotating.
+        resume: skip pages the manifest already records as ``ok``.
+            Pass False to start over (existing manifest/shards are removed).
+        inputs: explicit page list (default: :func:`discover_inputs`).
+        on_result: progress callback invoked with each finished record
+            (``page_map`` stripped).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if not resume:
+        (output_dir / MANIFEST_NAME).unlink(missing_ok=True)
+        for old in output_dir.glob(f"{SHARD_PREFIX}*.ndjson"):
+            old.unlink()
+
+    all_items = list(inputs) if inputs is not None else discover_inputs(input_dir)
+    done = {k for k, e in load_manifest(output_dir).items() if e.get("status") == "ok"} if resume else set()
+    pending = [item for item in all_items if item.key not in done]
+
+    report = BulkBuildReport(total=len(all_items), skipped=len(all_items) - len(pending), workers=max(1, workers))
+    logger.info("Bulk build: %d pages (%d already done, %d workers)", report.total, report.skipped, report.workers)
+
+    durations: list[float] = []
+    writer = _ShardWriter(output_dir, shard_size)
+    start = time.perf_counter()
+    try:
+        with (output_dir / MANIFEST_NAME).open("a", encoding="utf-8") as manifest:
+            for record in _iter_results(pending, report.workers):
+                elapsed_ms = round(record["elapsed_ms"], 1)
+                durations.append(elapsed_ms)
+                if record["ok"]:
+                    shard = writer.write({"key": record["key"], "page_map": record["page_map"]})
+                    entry = {"key": record["key"], "status": "ok", "shard": shard, "elapsed_ms": elapsed_ms}
+                    report.built += 1
+                else:
+                    entry = {
+                        "key": record["key"],
+                        "status": "error",
+                        "error": record["error"],
+                        "elapsed_ms": elapsed_ms,
+                    }
+                    report.failed += 1
+                    if len(report.failures) < _MAX_FAILURES_REPORTED:
+                        report.failures.append({"key": record["key"], "error": record["error"]})
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                manifest.flush()
+                if on_result is not None:
+                    on_result(entry)
+    finally:
+        writer.close()
+        report.elapsed_s = round(time.perf_counter() - start, 3)
+        processed = report.built + report.failed
+        report.pages_per_s = round(processed / report.elapsed_s, 2) if report.elapsed_s > 0 else 0.0
+        durations.sort()
+        report.p50_ms = _percentile(durations, 50)
+        report.p99_ms = _percentile(durations, 99)
+        report.shards = writer.shard_names
+        (output_dir / REPORT_NAME).write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+
+    return report
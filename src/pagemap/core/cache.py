@@ -119,6 +119,8 @@ class CacheStats:
     hits: int = 0
     misses: int = 0
     content_refreshes: int = 0
+    scroll_deltas: int = 0
+    shared_hits: int = 0  # served from the shared L2 tier (server/shared_cache.py)
     fingerprint_mismatches: int = 0
     ttl_expirations: int = 0
     hard_invalidations: int = 0
@@ -292,6 +294,12 @@ class PageMapCache:
     def record_content_refresh(self) -> None:
         self._stats.content_refreshes += 1
 
+    def record_scroll_delta(self) -> None:
+        self._stats.scroll_deltas += 1
+
+    def record_shared_hit(self) -> None:
+        self._stats.shared_hits += 1
+
     def record_fingerprint_mismatch(self) -> None:
         self._stats.fingerprint_mismatches += 1
 
@@ -3,8 +3,8 @@
 
 """S9: Provider-specific anti-bot/captcha detection.
 
-Pre-compiled regex patterns for 6 providers: Turnstile, reCAPTCHA, hCaptcha,
-Cloudflare, Akamai, Generic.
+Pre-compiled rules (the ``antibot`` family of :mod:`pagemap.core.pattern_set`)
+for 6 providers: Turnstile, reCAPTCHA, hCaptcha, Cloudflare, Akamai, Generic.
 
 Target: <2ms per invocation.
 """
@@ -14,43 +14,32 @@ from __future__ import annotations
 import re
 from datetime import UTC, datetime
 
+from ..pattern_set import PatternSet
 from . import AntibotDetection, AntibotProvider, AntibotSessionState
 
-# ── Provider patterns (module-level pre-compiled) ─────────────────
+# ── Provider rules (lowercased HTML; see pattern_set.py) ─────────
 
-_PROVIDERS: tuple[tuple[AntibotProvider, re.Pattern[str], float], ...] = (
+_PROVIDER_RULES = PatternSet(
+    "antibot",
     (
-        AntibotProvider.TURNSTILE,
-        re.compile(r"cf-turnstile|challenges\.cloudflare\.com/turnstile", re.IGNORECASE),
-        0.95,
-    ),
-    (
-        AntibotProvider.RECAPTCHA,
-        re.compile(r"g-recaptcha|google\.com/recaptcha|grecaptcha", re.IGNORECASE),
-        0.95,
-    ),
-    (
-        AntibotProvider.HCAPTCHA,
-        re.compile(r"h-captcha|hcaptcha\.com|data-hcaptcha", re.IGNORECASE),
-        0.95,
-    ),
-    (
-        AntibotProvider.CLOUDFLARE,
-        re.compile(r"cf-browser-verification|just\s+a\s+moment|__cf_chl", re.IGNORECASE),
-        0.90,
-    ),
-    (
-        AntibotProvider.AKAMAI,
-        re.compile(r"akamai.*bot.*manager|_abck|sensor_data", re.IGNORECASE),
-        0.85,
-    ),
-    (
-        AntibotProvider.GENERIC,
-        re.compile(r"captcha|challenge-platform", re.IGNORECASE),
-        0.70,
+        ("turnstile", r"cf-turnstile|challenges\.cloudflare\.com/turnstile"),
+        ("recaptcha", r"g-recaptcha|google\.com/recaptcha|grecaptcha"),
+        ("hcaptcha", r"h-captcha|hcaptcha\.com|data-hcaptcha"),
+        ("cloudflare", r"cf-browser-verification|just\s+a\s+moment|__cf_chl"),
+        ("akamai", r"akamai.*bot.*manager|_abck|sensor_data"),
+        ("generic", r"captcha|challenge-platform"),
     ),
 )
 
+_PROVIDERS: dict[str, tuple[AntibotProvider, float]] = {
+    "turnstile": (AntibotProvider.TURNSTILE, 0.95),
+    "recaptcha": (AntibotProvider.RECAPTCHA, 0.95),
+    "hcaptcha": (AntibotProvider.HCAPTCHA, 0.95),
+    "cloudflare": (AntibotProvider.CLOUDFLARE, 0.90),
+    "akamai": (AntibotProvider.AKAMAI, 0.85),
+    "generic": (AntibotProvider.GENERIC, 0.70),
+}
+
 # Visibility heuristic: very short body text
 _SHORT_BODY_RE = re.compile(r"<body[^>]*>(.*?)</body>", re.DOTALL | re.IGNORECASE)
 
@@ -64,26 +53,26 @@ def detect_antibot(*, raw_html: str, html_lower: str) -> AntibotDetection | None
 
 
 def _detect_impl(raw_html: str, html_lower: str) -> AntibotDetection | None:
-    for provider, pattern, base_confidence in _PROVIDERS:
-        match = pattern.search(html_lower)
-        if match:
-            signals = [f"pattern_match={match.group()!r}"]
-            confidence = base_confidence
-
-            # Visibility heuristic: check if challenge is fullscreen
-            challenge_visible = _check_challenge_visible(html_lower, signals)
-
-            stealth_tips = _stealth_recommendations(provider, 0)
-
-            return AntibotDetection(
-                provider=provider,
-                confidence=confidence,
-                signals=tuple(signals),
-                challenge_visible=challenge_visible,
-                stealth_tips=stealth_tips,
-            )
-
-    return None
+    hit = _PROVIDER_RULES.first(html_lower)
+    if hit is None:
+        return None
+
+    rule_id, match = hit
+    provider, confidence = _PROVIDERS[rule_id]
+    signals = [f"pattern_match={match.group()!r}"]
+
+    # Visibility heuristic: check if challenge is fullscreen
+    challenge_visible = _check_challenge_visible(html_lower, signals)
+
+    stealth_tips = _stealth_recommendations(provider, 0)
+
+    return AntibotDetection(
+        provider=provider,
+        confidence=confidence,
+        signals=tuple(signals),
+        challenge_visible=challenge_visible,
+        stealth_tips=stealth_tips,
+    )
 
 
 def _check_challenge_visible(html_lower: str, signals: list[str]) -> bool:
@@ -4,13 +4,18 @@
 """S9: Pre-compiled i18n regex patterns for page failure state detection.
 
 6-locale coverage: ko/en/ja/fr/de/zh.
-All patterns compiled at module level for O(1) re-use.
+All patterns compiled at module level for O(1) re-use.  The ``*_RE``
+patterns are case-insensitive; :data:`PAGE_STATE_RULES` holds the same term
+lists as the ``page_state`` family of :mod:`pagemap.core.pattern_set` for
+``html_lower``.
 """
 
 from __future__ import annotations
 
 import re
 
+from ..pattern_set import PatternSet
+
 # ── Out of stock ──────────────────────────────────────────────────
 
 _OUT_OF_STOCK_TERMS: tuple[str, ...] = (
@@ -269,3 +274,21 @@ _LOGIN_REQUIRED_TERMS: tuple[str, ...] = (
 )
 
 LOGIN_REQUIRED_RE = re.compile("|".join(re.escape(t) for t in _LOGIN_REQUIRED_TERMS), re.IGNORECASE)
+
+# ── Page-state rule family (lowercased HTML) ─────────────────────
+
+PAGE_STATE_RULES = PatternSet(
+    "page_state",
+    (
+        (rule_id, "|".join(re.escape(t) for t in terms))
+        for rule_id, terms in (
+            ("bot_blocked", _BOT_BLOCKED_TERMS),
+            ("error_page", _ERROR_PAGE_TERMS),
+            ("login_required", _LOGIN_REQUIRED_TERMS),
+            ("age_verification", _AGE_VERIFICATION_TERMS),
+            ("region_restricted", _REGION_RESTRICTED_TERMS),
+            ("out_of_stock", _OUT_OF_STOCK_TERMS),
+            ("empty_results", _EMPTY_RESULTS_TERMS),
+        )
+    ),
+)
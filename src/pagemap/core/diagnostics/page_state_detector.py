@@ -16,15 +16,7 @@ import contextlib
 from typing import TYPE_CHECKING, Any
 
 from . import PageFailureState, PageStateDiagnosis
-from .i18n_patterns import (
-    AGE_VERIFICATION_RE,
-    BOT_BLOCKED_RE,
-    EMPTY_RESULTS_RE,
-    ERROR_PAGE_RE,
-    LOGIN_REQUIRED_RE,
-    OUT_OF_STOCK_RE,
-    REGION_RESTRICTED_RE,
-)
+from .i18n_patterns import PAGE_STATE_RULES
 
 if TYPE_CHECKING:
     from .. import Interactable
@@ -97,7 +89,7 @@ def _detect_page_state_impl(
         )
 
     # Check for bot-blocked text patterns
-    bot_match = BOT_BLOCKED_RE.search(html_lower)
+    bot_match = PAGE_STATE_RULES.search("bot_blocked", html_lower)
     if bot_match:
         signals = [f"text_match={bot_match.group()!r}"]
         # Higher confidence if very few interactables (captcha page)
@@ -118,7 +110,7 @@ def _detect_page_state_impl(
         confidence = 0.95
         detail = f"HTTP {http_status} error"
         # Check for error text to boost confidence
-        err_match = ERROR_PAGE_RE.search(html_lower)
+        err_match = PAGE_STATE_RULES.search("error_page", html_lower)
         if err_match:
             signals.append(f"text_match={err_match.group()!r}")
             confidence = 0.98
@@ -130,7 +122,7 @@ def _detect_page_state_impl(
         )
 
     # Text-only error page detection (no HTTP status)
-    err_match = ERROR_PAGE_RE.search(html_lower)
+    err_match = PAGE_STATE_RULES.search("error_page", html_lower)
     if err_match and len(interactables) < 10:
         signals = [f"text_match={err_match.group()!r}", f"low_interactables={len(interactables)}"]
         return PageStateDiagnosis(
@@ -152,7 +144,7 @@ def _detect_page_state_impl(
             )
 
     # Text-based login detection
-    login_match = LOGIN_REQUIRED_RE.search(html_lower)
+    login_match = PAGE_STATE_RULES.search("login_required", html_lower)
     if login_match and len(interactables) < 15:
         signals = [f"text_match={login_match.group()!r}"]
         return PageStateDiagnosis(
@@ -172,7 +164,7 @@ def _detect_page_state_impl(
                 detail="Age verification barrier detected",
             )
 
-    age_match = AGE_VERIFICATION_RE.search(html_lower)
+    age_match = PAGE_STATE_RULES.search("age_verification", html_lower)
     if age_match:
         signals = [f"text_match={age_match.group()!r}"]
         return PageStateDiagnosis(
@@ -192,7 +184,7 @@ def _detect_page_state_impl(
                 detail="Region restriction barrier detected",
             )
 
-    region_match = REGION_RESTRICTED_RE.search(html_lower)
+    region_match = PAGE_STATE_RULES.search("region_restricted", html_lower)
     if region_match:
         signals = [f"text_match={region_match.group()!r}"]
         return PageStateDiagnosis(
@@ -205,7 +197,7 @@ def _detect_page_state_impl(
     # ── 6. OUT_OF_STOCK ────────────────────────────────────────────
     # Only on product detail pages
     if page_type == "product_detail":
-        stock_match = OUT_OF_STOCK_RE.search(html_lower)
+        stock_match = PAGE_STATE_RULES.search("out_of_stock", html_lower)
         if stock_match:
             signals = [f"text_match={stock_match.group()!r}", f"page_type={page_type}"]
             return PageStateDiagnosis(
@@ -218,7 +210,7 @@ def _detect_page_state_impl(
     # ── 7. EMPTY_RESULTS ───────────────────────────────────────────
     # Only on search/listing pages
     if page_type in ("search_results", "listing"):
-        empty_match = EMPTY_RESULTS_RE.search(html_lower)
+        empty_match = PAGE_STATE_RULES.search("empty_results", html_lower)
         if empty_match:
             signals = [f"text_match={empty_match.group()!r}", f"page_type={page_type}"]
             return PageStateDiagnosis(
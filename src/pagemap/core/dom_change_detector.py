@@ -70,6 +70,7 @@ class DomFingerprint:
     content_hash: int | None = None  # hash of visible text first 2KB
     spa_signals: dict | None = None  # S9: SPA framework detection signals
     landmark_vector: DomLandmarkVector | None = None
+    document_id: float | None = None  # performance.timeOrigin — distinct per document instance
 
 
 @dataclass
@@ -211,6 +212,7 @@ _DOM_FINGERPRINT_JS = """(() => {
     title: document.title || '',
     contentHash: contentHash,
     spaSignals: spaSignals,
+    documentId: performance.timeOrigin,
     landmarkData: {
       totalLandmarks, interactiveLandmarks,
       mainChars, totalChars,
@@ -276,6 +278,7 @@ async def capture_dom_fingerprint(page: Page) -> DomFingerprint | None:
         content_hash=raw.get("contentHash"),
         spa_signals=raw.get("spaSignals"),
         landmark_vector=compute_landmark_vector(raw),
+        document_id=raw.get("documentId"),
     )
 
 
@@ -13,7 +13,6 @@ Reuses patterns from pruned_context_builder and page_map_builder.
 
 from __future__ import annotations
 
-import json
 import logging
 import re
 from contextlib import suppress
@@ -23,6 +22,7 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from .. import Interactable
 
+from ..embedded_data import embedded_data
 from ..i18n import FILTER_TERMS, LOAD_MORE_PAGINATION_TERMS, NEXT_PAGE_TERMS, PREV_PAGE_TERMS
 from ..preprocessing.normalize import infer_currency, normalize_numeric
 from ..sanitizer import sanitize_text
@@ -32,11 +32,6 @@ logger = logging.getLogger(__name__)
 
 # ── Module-level pre-compiled patterns ─────────────────────────────
 
-_JSONLD_RE = re.compile(
-    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-    re.DOTALL | re.IGNORECASE,
-)
-
 _CARD_PRICE_RE = re.compile(
     r"(?:₩\s*[\d,]+|\d[\d,]+\s*원|\d[\d,]+\s*円|¥\s*[\d,]+"
     r"|\d{2,3}(?:,\d{3})+(?:\s*원)?"
@@ -60,12 +55,7 @@ def extract_cards_from_jsonld(
     cards: list[ProductCard] = []
     currency = infer_currency(page_url)
 
-    for m in _JSONLD_RE.finditer(raw_html):
-        try:
-            data = json.loads(m.group(1))
-        except (json.JSONDecodeError, TypeError):
-            continue
-
+    for data in embedded_data(raw_html).json_ld_data():
         items = _extract_jsonld_items(data)
         for i, item in enumerate(items):
             name = item.get("name", "")
@@ -3,14 +3,15 @@
 
 """Cookie consent banner detection — 7 named CMP providers + generic fallback.
 
-All regex patterns are pre-compiled at module level.
+Detection rules form the ``cookie`` family of :mod:`pagemap.core.pattern_set`.
 """
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
 
+from ..pattern_set import PatternSet
+
 
 @dataclass(frozen=True, slots=True)
 class CookieConsentPattern:
@@ -25,27 +26,40 @@ class CookieConsentPattern:
     js_dismiss_call: str = ""  # CMP JS API call (e.g. "Cookiebot.dialog && ...")
 
 
-# ── Module-level pre-compiled regex patterns ───────────────────────
-
-# Named CMP detection patterns
-_COOKIEBOT_RE = re.compile(r"cybotcookiebotdialog|cookiebot", re.IGNORECASE)
-_ONETRUST_RE = re.compile(r"onetrust-banner-sdk|optanon|onetrust", re.IGNORECASE)
-_TRUSTARC_RE = re.compile(r"truste-consent|trustarc|truste_overlay", re.IGNORECASE)
-_DIDOMI_RE = re.compile(r"didomi-popup|didomi-notice|didomi", re.IGNORECASE)
-_QUANTCAST_RE = re.compile(r"qc-cmp-ui|quantcast-choice|qc-cmp2", re.IGNORECASE)
-_USERCENTRICS_RE = re.compile(r"usercentrics|uc-banner|uc-consent", re.IGNORECASE)
-
-# Generic cookie banner patterns — anchored to class/id/aria-label attributes
-# to avoid false positives from JS/CSS references.
-_GENERIC_COOKIE_RE = re.compile(
-    r'(?:class|id|aria-label)=["\'][^"\']*(?:'
-    r"cookie[-_]?(?:banner|consent|notice|popup|modal|wall|bar|overlay)"
-    r"|gdpr[-_]?(?:banner|consent|notice|popup|modal)"
-    r"|consent[-_]?(?:banner|modal|popup|notice)"
-    r')[^"\']*["\']',
-    re.IGNORECASE,
+# ── Detection rules (lowercased HTML; see pattern_set.py) ──────────
+
+_COOKIE_RULES = PatternSet(
+    "cookie",
+    (
+        # Named CMPs, in priority order
+        ("cookiebot", r"cybotcookiebotdialog|cookiebot"),
+        ("onetrust", r"onetrust-banner-sdk|optanon|onetrust"),
+        ("trustarc", r"truste-consent|trustarc|truste_overlay"),
+        ("didomi", r"didomi-popup|didomi-notice|didomi"),
+        ("quantcast", r"qc-cmp-ui|quantcast-choice|qc-cmp2"),
+        ("usercentrics", r"usercentrics|uc-banner|uc-consent"),
+        # Generic cookie banner patterns — anchored to class/id/aria-label
+        # attributes to avoid false positives from JS/CSS references.
+        (
+            "generic",
+            r'(?:class|id|aria-label)=["\'][^"\']*(?:'
+            r"cookie[-_]?(?:banner|consent|notice|popup|modal|wall|bar|overlay)"
+            r"|gdpr[-_]?(?:banner|consent|notice|popup|modal)"
+            r"|consent[-_]?(?:banner|modal|popup|notice)"
+            r')[^"\']*["\']',
+        ),
+    ),
 )
 
+_NAMED_CMP_CONFIDENCE: dict[str, float] = {
+    "cookiebot": 0.95,
+    "onetrust": 0.95,
+    "trustarc": 0.90,
+    "didomi": 0.90,
+    "quantcast": 0.90,
+    "usercentrics": 0.90,
+}
+
 # ── i18n reject/necessary-only button text patterns ───────────────
 
 _REJECT_TERMS: tuple[str, ...] = (
@@ -233,34 +247,24 @@ _ACCEPT_TERMS_ALL: tuple[str, ...] = (
 
 def _detect_named_cmp(html_lower: str) -> CookieConsentPattern | None:
     """Check for known CMP providers (highest confidence)."""
-    checks: list[tuple[re.Pattern[str], str, float]] = [
-        (_COOKIEBOT_RE, "cookiebot", 0.95),
-        (_ONETRUST_RE, "onetrust", 0.95),
-        (_TRUSTARC_RE, "trustarc", 0.90),
-        (_DIDOMI_RE, "didomi", 0.90),
-        (_QUANTCAST_RE, "quantcast", 0.90),
-        (_USERCENTRICS_RE, "usercentrics", 0.90),
-    ]
-
-    for pattern, provider, confidence in checks:
-        match = pattern.search(html_lower)
-        if match:
-            return CookieConsentPattern(
-                provider=provider,
-                confidence=confidence,
-                signals=(f"cmp:{provider}:{match.group()}",),
-                accept_terms=_ACCEPT_TERMS_ALL,
-                reject_terms=_REJECT_TERMS,
-                dismiss_terms=_DISMISS_TERMS,
-                js_dismiss_call=_CMP_JS_REJECT.get(provider, ""),
-            )
-
-    return None
+    hit = _COOKIE_RULES.first(html_lower, _NAMED_CMP_CONFIDENCE)
+    if hit is None:
+        return None
+    provider, match = hit
+    return CookieConsentPattern(
+        provider=provider,
+        confidence=_NAMED_CMP_CONFIDENCE[provider],
+        signals=(f"cmp:{provider}:{match.group()}",),
+        accept_terms=_ACCEPT_TERMS_ALL,
+        reject_terms=_REJECT_TERMS,
+        dismiss_terms=_DISMISS_TERMS,
+        js_dismiss_call=_CMP_JS_REJECT.get(provider, ""),
+    )
 
 
 def _detect_generic_cookie(html_lower: str) -> CookieConsentPattern | None:
     """Check for generic cookie banners (lower confidence)."""
-    match = _GENERIC_COOKIE_RE.search(html_lower)
+    match = _COOKIE_RULES.search("generic", html_lower)
     if match:
         return CookieConsentPattern(
             provider="generic",
@@ -9,16 +9,16 @@ Never raises — returns empty ListingResult on failure.
 
 from __future__ import annotations
 
-import json
 import logging
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from .. import Interactable
 
+from ..embedded_data import embedded_data
 from ..sanitizer import sanitize_text
 from . import ListingResult
-from ._card_extractor import _JSONLD_RE, extract_cards, find_filter_refs, find_pagination_refs
+from ._card_extractor import extract_cards, find_filter_refs, find_pagination_refs
 
 logger = logging.getLogger(__name__)
 
@@ -26,12 +26,7 @@ logger = logging.getLogger(__name__)
 def _extract_breadcrumbs(raw_html: str) -> tuple[str, ...]:
     """Extract breadcrumbs from JSON-LD BreadcrumbList."""
     try:
-        for m in _JSONLD_RE.finditer(raw_html):
-            try:
-                data = json.loads(m.group(1))
-            except (json.JSONDecodeError, TypeError):
-                continue
-
+        for data in embedded_data(raw_html).json_ld_data():
             items = _find_breadcrumb_items(data)
             if items:
                 crumbs: list[str] = []
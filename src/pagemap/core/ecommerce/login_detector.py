@@ -7,6 +7,8 @@ Extracts login form fields (field_type, label, required) without
 exposing password field name/id/class attributes.
 
 Also handles age gate detection (extended) and 2FA/OTP detection.
+Detection rules form the ``login`` family of :mod:`pagemap.core.pattern_set`
+and run over ``html_lower``.
 """
 
 from __future__ import annotations
@@ -18,35 +20,70 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from .. import Interactable
 
+from ..pattern_set import PatternSet
 from ..sanitizer import sanitize_text
 
-# ── Module-level pre-compiled patterns ─────────────────────────────
-
-_LOGIN_FORM_RE = re.compile(
-    r"<form[^>]*(?:login|signin|sign-in|log-in|auth)[^>]*>",
-    re.IGNORECASE,
-)
-
-_LOGIN_MODAL_RE = re.compile(
-    r'(?:class|id)=["\'][^"\']*(?:login[-_]?(?:modal|dialog|overlay|popup|wall|gate)'
-    r"|sign[-_]?in[-_]?(?:modal|dialog|overlay|popup|wall|gate)"
-    r"|auth[-_]?(?:modal|dialog|overlay|popup|wall|gate))[^\"']*[\"']",
-    re.IGNORECASE,
+# ── Detection rules (lowercased HTML; see pattern_set.py) ──────────
+
+_OAUTH_PROVIDERS: tuple[tuple[str, str], ...] = (
+    ("google", r"google[-_]?(?:sign[-_]?in|login|oauth|auth)|accounts\.google\.com"),
+    ("facebook", r"facebook[-_]?(?:sign[-_]?in|login|oauth|auth)|facebook\.com/v\d+"),
+    ("apple", r"apple[-_]?(?:sign[-_]?in|login|auth)|appleid\.apple\.com"),
+    ("kakao", r"kakao[-_]?(?:sign[-_]?in|login|oauth|auth)|kauth\.kakao\.com"),
+    ("naver", r"naver[-_]?(?:sign[-_]?in|login|oauth|auth)|nid\.naver\.com"),
+    ("github", r"github[-_]?(?:sign[-_]?in|login|oauth|auth)|github\.com/login/oauth"),
+    ("twitter", r"twitter[-_]?(?:sign[-_]?in|login|oauth|auth)|api\.twitter\.com"),
+    ("line", r"line[-_]?(?:sign[-_]?in|login|oauth|auth)|access\.line\.me"),
+    ("wechat", r"wechat[-_]?(?:sign[-_]?in|login|oauth|auth)|open\.weixin\.qq\.com"),
 )
-
-_PASSWORD_FIELD_RE = re.compile(
-    r'<input[^>]*type=["\']password["\'][^>]*/?>',
-    re.IGNORECASE,
-)
-
-_EMAIL_FIELD_RE = re.compile(
-    r'<input[^>]*type=["\'](?:email|text)["\'][^>]*(?:email|이메일|メール|e-mail)[^>]*/?>',
-    re.IGNORECASE,
-)
-
-_USERNAME_FIELD_RE = re.compile(
-    r'<input[^>]*(?:name|id|placeholder)=["\'][^"\']*(?:username|user[-_]?name|아이디|ユーザー名|用户名)[^"\']*["\'][^>]*/?>',
-    re.IGNORECASE,
+_OAUTH_RULE_IDS = tuple(f"oauth_{name}" for name, _ in _OAUTH_PROVIDERS)
+
+_LOGIN_RULES = PatternSet(
+    "login",
+    (
+        ("login_form", r"<form[^>]*(?:login|signin|sign-in|log-in|auth)[^>]*>"),
+        (
+            "login_modal",
+            r'(?:class|id)=["\'][^"\']*(?:login[-_]?(?:modal|dialog|overlay|popup|wall|gate)'
+            r"|sign[-_]?in[-_]?(?:modal|dialog|overlay|popup|wall|gate)"
+            r"|auth[-_]?(?:modal|dialog|overlay|popup|wall|gate))[^\"']*[\"']",
+        ),
+        ("password_field", r'<input[^>]*type=["\']password["\'][^>]*/?>'),
+        ("email_field", r'<input[^>]*type=["\'](?:email|text)["\'][^>]*(?:email|이메일|メール|e-mail)[^>]*/?>'),
+        (
+            "username_field",
+            r'<input[^>]*(?:name|id|placeholder)=["\'][^"\']*(?:username|user[-_]?name|아이디|ユーザー名|用户名)[^"\']*["\'][^>]*/?>',
+        ),
+        # 2FA / OTP
+        (
+            "2fa",
+            r'type=["\']number["\'][^>]*maxlength=["\'][46]["\']'
+            r"|verification\s*code|인증\s*코드|確認コード|code\s*de\s*v\xe9rification"
+            r"|2fa|two[-_]?factor|otp|one[-_]?time\s*password",
+        ),
+        (
+            "age_gate",
+            r"(?:age[-_]?(?:gate|verify|verification|check|confirm)"
+            r"|are[-_]?you[-_]?(?:over|at[-_]?least|old[-_]?enough)"
+            r"|birth[-_]?(?:date|day|year)"
+            r"|나이\s*확인|연령\s*확인|생년월일"
+            r"|年齢確認|生年月日"
+            r"|v\xe9rification.+\xe2ge)",
+        ),
+        # Date picker / age gate extended
+        ("date_picker", r"<(?:select|input)[^>]*(?:year|month|day|birth|년|월|일|年|月|日)[^>]*/?>"),
+        (
+            "region_block",
+            r"(?:not\s+available\s+in\s+your\s+(?:region|country|location)"
+            r"|not[-_]?available[-_]?(?:in[-_]?your|this)[-_]?(?:region|country|location)"
+            r"|region[-_]?(?:restricted|blocked|unavailable)"
+            r"|geo[-_]?(?:blocked|restricted|fence)"
+            r"|이\s*지역에서\s*(?:이용|사용)\s*(?:불가|할\s*수\s*없)"
+            r"|お住まいの地域ではご利用いただけません"
+            r"|此地区不可用)",
+        ),
+        *((f"oauth_{name}", source) for name, source in _OAUTH_PROVIDERS),
+    ),
 )
 
 _REQUIRED_RE = re.compile(r"\brequired\b", re.IGNORECASE)
@@ -56,56 +93,6 @@ _LABEL_RE = re.compile(
     re.IGNORECASE | re.DOTALL,
 )
 
-_OAUTH_PATTERNS: tuple[tuple[str, re.Pattern[str]], ...] = (
-    ("google", re.compile(r"google[-_]?(?:sign[-_]?in|login|oauth|auth)|accounts\.google\.com", re.IGNORECASE)),
-    ("facebook", re.compile(r"facebook[-_]?(?:sign[-_]?in|login|oauth|auth)|facebook\.com/v\d+", re.IGNORECASE)),
-    ("apple", re.compile(r"apple[-_]?(?:sign[-_]?in|login|auth)|appleid\.apple\.com", re.IGNORECASE)),
-    ("kakao", re.compile(r"kakao[-_]?(?:sign[-_]?in|login|oauth|auth)|kauth\.kakao\.com", re.IGNORECASE)),
-    ("naver", re.compile(r"naver[-_]?(?:sign[-_]?in|login|oauth|auth)|nid\.naver\.com", re.IGNORECASE)),
-    ("github", re.compile(r"github[-_]?(?:sign[-_]?in|login|oauth|auth)|github\.com/login/oauth", re.IGNORECASE)),
-    ("twitter", re.compile(r"twitter[-_]?(?:sign[-_]?in|login|oauth|auth)|api\.twitter\.com", re.IGNORECASE)),
-    ("line", re.compile(r"line[-_]?(?:sign[-_]?in|login|oauth|auth)|access\.line\.me", re.IGNORECASE)),
-    ("wechat", re.compile(r"wechat[-_]?(?:sign[-_]?in|login|oauth|auth)|open\.weixin\.qq\.com", re.IGNORECASE)),
-)
-
-_AGE_GATE_RE = re.compile(
-    r"(?:age[-_]?(?:gate|verify|verification|check|confirm)"
-    r"|are[-_]?you[-_]?(?:over|at[-_]?least|old[-_]?enough)"
-    r"|birth[-_]?(?:date|day|year)"
-    r"|나이\s*확인|연령\s*확인|생년월일"
-    r"|年齢確認|生年月日"
-    r"|v\xe9rification.+\xe2ge)",
-    re.IGNORECASE,
-)
-
-_REGION_BLOCK_RE = re.compile(
-    r"(?:not\s+available\s+in\s+your\s+(?:region|country|location)"
-    r"|not[-_]?available[-_]?(?:in[-_]?your|this)[-_]?(?:region|country|location)"
-    r"|region[-_]?(?:restricted|blocked|unavailable)"
-    r"|geo[-_]?(?:blocked|restricted|fence)"
-    r"|이\s*지역에서\s*(?:이용|사용)\s*(?:불가|할\s*수\s*없)"
-    r"|お住まいの地域ではご利用いただけません"
-    r"|此地区不可用)",
-    re.IGNORECASE,
-)
-
-
-# ── 2FA / OTP detection ────────────────────────────────────────────
-
-_2FA_RE = re.compile(
-    r'type=["\']number["\'][^>]*maxlength=["\'][46]["\']'
-    r"|verification\s*code|인증\s*코드|確認コード|code\s*de\s*v\xe9rification"
-    r"|2fa|two[-_]?factor|otp|one[-_]?time\s*password",
-    re.IGNORECASE,
-)
-
-# ── Date picker / age gate extended ────────────────────────────────
-
-_DATE_PICKER_RE = re.compile(
-    r"<(?:select|input)[^>]*(?:year|month|day|birth|년|월|일|年|月|日)[^>]*/?>",
-    re.IGNORECASE,
-)
-
 _AGE_ACCEPT_TERMS: tuple[str, ...] = (
     # en
     "i am over 18",
@@ -172,7 +159,7 @@ def _extract_form_fields(raw_html: str, html_lower: str) -> tuple[dict[str, Any]
     """Extract login form field info (sanitized, no password name/id)."""
     fields: list[dict[str, Any]] = []
 
-    email_match = _EMAIL_FIELD_RE.search(raw_html)
+    email_match = _LOGIN_RULES.search("email_field", html_lower)
     if email_match:
         email_tag = email_match.group(0)
         fields.append(
@@ -183,7 +170,7 @@ def _extract_form_fields(raw_html: str, html_lower: str) -> tuple[dict[str, Any]
             }
         )
 
-    if _USERNAME_FIELD_RE.search(raw_html):
+    if _LOGIN_RULES.search("username_field", html_lower):
         fields.append(
             {
                 "field_type": "username",
@@ -192,7 +179,7 @@ def _extract_form_fields(raw_html: str, html_lower: str) -> tuple[dict[str, Any]
             }
         )
 
-    if _PASSWORD_FIELD_RE.search(raw_html):
+    if _LOGIN_RULES.search("password_field", html_lower):
         fields.append(
             {
                 "field_type": "password",
@@ -204,13 +191,9 @@ def _extract_form_fields(raw_html: str, html_lower: str) -> tuple[dict[str, Any]
     return tuple(fields)
 
 
-def _detect_oauth_providers(raw_html: str) -> tuple[str, ...]:
+def _detect_oauth_providers(html_lower: str) -> tuple[str, ...]:
     """Detect OAuth/social login providers."""
-    providers: list[str] = []
-    for provider_name, pattern in _OAUTH_PATTERNS:
-        if pattern.search(raw_html):
-            providers.append(provider_name)
-    return tuple(providers)
+    return tuple(rule_id.removeprefix("oauth_") for rule_id in _LOGIN_RULES.matching(html_lower, _OAUTH_RULE_IDS))
 
 
 def detect_login_wall(
@@ -229,25 +212,25 @@ def detect_login_wall(
         confidence = 0.0
 
         # Check for login form
-        has_login_form = bool(_LOGIN_FORM_RE.search(raw_html))
+        has_login_form = bool(_LOGIN_RULES.search("login_form", html_lower))
         if has_login_form:
             signals.append("login_form_tag")
             confidence += 0.4
 
         # Check for login modal/overlay
-        has_login_modal = bool(_LOGIN_MODAL_RE.search(raw_html))
+        has_login_modal = bool(_LOGIN_RULES.search("login_modal", html_lower))
         if has_login_modal:
             signals.append("login_modal")
             confidence += 0.3
 
         # Check for password field (strong signal)
-        has_password = bool(_PASSWORD_FIELD_RE.search(raw_html))
+        has_password = bool(_LOGIN_RULES.search("password_field", html_lower))
         if has_password:
             signals.append("password_field")
             confidence += 0.3
 
-        has_email = bool(_EMAIL_FIELD_RE.search(raw_html))
-        has_username = bool(_USERNAME_FIELD_RE.search(raw_html))
+        has_email = bool(_LOGIN_RULES.search("email_field", html_lower))
+        has_username = bool(_LOGIN_RULES.search("username_field", html_lower))
 
         # Check interactables for login-related elements
         login_interactable_count = 0
@@ -266,10 +249,10 @@ def detect_login_wall(
         confidence = min(confidence, 1.0)
 
         form_fields = _extract_form_fields(raw_html, html_lower)
-        oauth_providers = _detect_oauth_providers(raw_html)
+        oauth_providers = _detect_oauth_providers(html_lower)
 
         # 2FA detection
-        has_2fa = bool(_2FA_RE.search(raw_html))
+        has_2fa = bool(_LOGIN_RULES.search("2fa", html_lower))
         if has_2fa:
             signals.append("2fa_detected")
 
@@ -308,12 +291,12 @@ def detect_age_gate_extended(
     Never raises.
     """
     try:
-        match = _AGE_GATE_RE.search(html_lower)
+        match = _LOGIN_RULES.search("age_gate", html_lower)
         if not match:
             return None
 
         signals = [f"age_gate:{match.group()[:50]}"]
-        has_date_picker = bool(_DATE_PICKER_RE.search(html_lower))
+        has_date_picker = bool(_LOGIN_RULES.search("date_picker", html_lower))
 
         if has_date_picker:
             signals.append("date_picker_detected")
@@ -349,7 +332,7 @@ def detect_age_gate(html_lower: str) -> tuple[float, tuple[str, ...]]:
 def detect_region_block(html_lower: str) -> tuple[float, tuple[str, ...]]:
     """Detect region restriction. Returns (confidence, signals)."""
     try:
-        match = _REGION_BLOCK_RE.search(html_lower)
+        match = _LOGIN_RULES.search("region_block", html_lower)
         if match:
             return 0.80, (f"region_block:{match.group()[:50]}",)
         return 0.0, ()
@@ -11,47 +11,47 @@ Never raises — returns None if no popup detected.
 
 from __future__ import annotations
 
-import re
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .. import Interactable
 
+from ..pattern_set import PatternSet
 from .cookie_patterns import _DISMISS_TERMS
 
-# ── Negative filters (skip these even if they look like popups) ───
-
-_NEGATIVE_RE = re.compile(
-    r"quick[-_\s]?view|product[-_\s]?modal|size[-_\s]?guide|cart[-_\s]?drawer"
-    r"|mini[-_\s]?cart|accessibility[-_\s]?dialog|cookie|login|sign[-_\s]?in"
-    r"|age[-_\s]?verif|age[-_\s]?gate|consent",
-    re.IGNORECASE,
-)
-
-# ── Promotional content keywords ──────────────────────────────────
-
-_PROMO_KEYWORDS_RE = re.compile(
-    r"newsletter|subscribe|sign[-_]?up|email[-_]?list|promo(?:tion)?"
-    r"|discount|coupon|offer|deal|popup|exit[-_]?intent|app[-_]?banner"
-    r"|download[-_]?app|install[-_]?app|notification|alert"
-    r"|뉴스레터|구독|이메일|할인|쿠폰|앱\s*다운",
-    re.IGNORECASE,
-)
-
-# ── HTML regex patterns for popup detection ───────────────────────
-
-_POPUP_HTML_RE = re.compile(
-    r'(?:class|id|aria-label)=["\'][^"\']*(?:'
-    r"newsletter[-_]?(?:popup|modal|overlay|signup)"
-    r"|app[-_]?(?:banner|download|promo)"
-    r"|promo[-_]?(?:popup|modal|overlay|banner)"
-    r"|exit[-_]?intent"
-    r"|subscribe[-_]?(?:popup|modal|overlay)"
-    r"|popup[-_]?(?:overlay|modal|banner|container)"
-    r"|modal[-_]?(?:overlay|popup|newsletter)"
-    r')[^"\']*["\']',
-    re.IGNORECASE,
+_POPUP_RULES = PatternSet(
+    "popup",
+    (
+        # Negative filters (skip these even if they look like popups)
+        (
+            "negative",
+            r"quick[-_\s]?view|product[-_\s]?modal|size[-_\s]?guide|cart[-_\s]?drawer"
+            r"|mini[-_\s]?cart|accessibility[-_\s]?dialog|cookie|login|sign[-_\s]?in"
+            r"|age[-_\s]?verif|age[-_\s]?gate|consent",
+        ),
+        # Promotional content keywords
+        (
+            "promo_keywords",
+            r"newsletter|subscribe|sign[-_]?up|email[-_]?list|promo(?:tion)?"
+            r"|discount|coupon|offer|deal|popup|exit[-_]?intent|app[-_]?banner"
+            r"|download[-_]?app|install[-_]?app|notification|alert"
+            r"|뉴스레터|구독|이메일|할인|쿠폰|앱\s*다운",
+        ),
+        # HTML regex pattern for popup detection
+        (
+            "popup_html",
+            r'(?:class|id|aria-label)=["\'][^"\']*(?:'
+            r"newsletter[-_]?(?:popup|modal|overlay|signup)"
+            r"|app[-_]?(?:banner|download|promo)"
+            r"|promo[-_]?(?:popup|modal|overlay|banner)"
+            r"|exit[-_]?intent"
+            r"|subscribe[-_]?(?:popup|modal|overlay)"
+            r"|popup[-_]?(?:overlay|modal|banner|container)"
+            r"|modal[-_]?(?:overlay|popup|newsletter)"
+            r')[^"\']*["\']',
+        ),
+    ),
 )
 
 
@@ -66,8 +66,8 @@ class PopupOverlayResult:
 
 
 def _is_negative_context(text: str) -> bool:
-    """Check if the text matches negative filters (not a promotional popup)."""
-    return bool(_NEGATIVE_RE.search(text))
+    """Check if lowercased text matches negative filters (not a promotional popup)."""
+    return _POPUP_RULES.search("negative", text) is not None
 
 
 def _detect_ax_dialog(interactables: list[Interactable]) -> PopupOverlayResult | None:
@@ -87,7 +87,7 @@ def _detect_ax_dialog(interactables: list[Interactable]) -> PopupOverlayResult |
             continue
 
         # Check for promotional content
-        has_promo = bool(_PROMO_KEYWORDS_RE.search(name_lower))
+        has_promo = _POPUP_RULES.search("promo_keywords", name_lower) is not None
         confidence = 0.85 if has_promo else 0.70
 
         return PopupOverlayResult(
@@ -103,7 +103,7 @@ def _detect_ax_dialog(interactables: list[Interactable]) -> PopupOverlayResult |
 def _detect_html_popup(html_lower: str) -> PopupOverlayResult | None:
     """Phase 2: HTML regex fallback for popup detection."""
     # Skip if negative patterns present in the match context
-    match = _POPUP_HTML_RE.search(html_lower)
+    match = _POPUP_RULES.search("popup_html", html_lower)
     if match is None:
         return None
 
@@ -125,7 +125,7 @@ def _detect_html_popup(html_lower: str) -> PopupOverlayResult | None:
         provider = "newsletter"
 
     # Confidence based on specificity
-    has_promo = bool(_PROMO_KEYWORDS_RE.search(html_lower[:5000]))
+    has_promo = _POPUP_RULES.search("promo_keywords", html_lower[:5000]) is not None
     confidence = 0.80 if has_promo else 0.65
 
     return PopupOverlayResult(
@@ -11,7 +11,6 @@ Never raises — returns empty ProductResult on failure.
 from __future__ import annotations
 
 import contextlib
-import json
 import logging
 import re
 from typing import TYPE_CHECKING, Any
@@ -19,11 +18,11 @@ from typing import TYPE_CHECKING, Any
 if TYPE_CHECKING:
     from .. import Interactable
 
+from ..embedded_data import embedded_data
 from ..i18n import AVAILABILITY_TERMS, OPTION_TERMS, SHIPPING_TERMS
 from ..preprocessing.normalize import infer_currency, normalize_numeric, normalize_price
 from ..sanitizer import sanitize_text
 from . import OptionGroup, ProductResult
-from ._card_extractor import _JSONLD_RE
 
 logger = logging.getLogger(__name__)
 
@@ -63,11 +62,7 @@ _SCHEMA_AVAILABILITY: dict[str, str] = {
 
 def _extract_product_from_jsonld(raw_html: str) -> dict[str, Any] | None:
     """Extract product data from JSON-LD Product schema."""
-    for m in _JSONLD_RE.finditer(raw_html):
-        try:
-            data = json.loads(m.group(1))
-        except (json.JSONDecodeError, TypeError):
-            continue
+    for data in embedded_data(raw_html).json_ld_data():
         product = _find_product(data)
         if product:
             return product
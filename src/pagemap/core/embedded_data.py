@@ -0,0 +1,256 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Embedded script payloads (JSON-LD, hydration state, RSC) located once per document.
+
+The preprocessor, page classifier, schema sniffing and the product / listing
+/ card engines all read JSON-LD; the preprocessor also reads Next.js RSC
+pushes.  Each used to run its own regex over the raw HTML and ``json.loads``
+the same blobs again, and the RSC pattern (a tempered ``(?!</script>).``
+scan) cost >100 ms on multi-megabyte SPA pages.
+
+:func:`embedded_data` tokenizes ``<script>`` elements in one pass and keeps
+spans, not copies, for:
+
+- ``json_ld`` — ``type="application/ld+json"``
+- ``state``   — other ``application/json`` scripts (``__NEXT_DATA__``,
+  ``__NUXT_DATA__``, Apollo state …)
+- ``rsc``     — inline scripts calling ``self.__next_f.push(``
+
+Parsed views are lazy and cached on the payload.  Parsing is bounded:
+a payload larger than ``PAGEMAP_EMBEDDED_BLOB_BUDGET`` characters, or one
+that would take the document past ``PAGEMAP_EMBEDDED_TOTAL_BUDGET``, is not
+parsed (its view is ``None``) and counted as ``skipped``.  ``orjson`` is used
+when installed (optional, not a dependency; ``PAGEMAP_JSON_BACKEND=json``
+forces the stdlib); documents it rejects are retried with :func:`json.loads`,
+so both backends accept the same input.
+
+The last document's :class:`EmbeddedData` is memoized per thread by string
+identity — every consumer in one build receives the same ``raw_html``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from .stats import Counter, StatsCollector, register_collector
+
+logger = logging.getLogger(__name__)
+
+EMBEDDED_BLOB_BUDGET = int(os.environ.get("PAGEMAP_EMBEDDED_BLOB_BUDGET", str(2 * 1024 * 1024)))
+EMBEDDED_TOTAL_BUDGET = int(os.environ.get("PAGEMAP_EMBEDDED_TOTAL_BUDGET", str(8 * 1024 * 1024)))
+JSON_BACKEND = os.environ.get("PAGEMAP_JSON_BACKEND", "auto").strip().lower()  # auto | orjson | json
+
+METRIC_PAYLOADS = "pagemap_embedded_payloads_total"
+METRIC_PARSE_SECONDS = "pagemap_embedded_parse_seconds_total"
+
+JSON_LD = "json_ld"
+STATE = "state"
+RSC = "rsc"
+
+_OUTCOMES = ("parsed", "invalid", "skipped")
+
+_OPEN_RE = re.compile(r"<script\b([^>]*)>", re.IGNORECASE)
+_CLOSE_RE = re.compile(r"</script\s*>", re.IGNORECASE)
+_ATTR_RE = re.compile(r"""\b(type|id)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+_RSC_MARKER = "self.__next_f.push("
+
+
+def _resolve_backend() -> tuple[str, Callable[[Any], Any]]:
+    if JSON_BACKEND != "json":
+        try:
+            import orjson
+
+            return "orjson", orjson.loads
+        except ImportError:
+            if JSON_BACKEND == "orjson":
+                logger.warning("PAGEMAP_JSON_BACKEND=orjson but orjson is not installed; using json")
+    return "json", json.loads
+
+
+_backend_name, _backend_loads = _resolve_backend()
+
+
+def _loads(text: str) -> Any:
+    """Parse JSON with the fast backend, falling back to the stdlib for what it rejects."""
+    if _backend_loads is not json.loads:
+        try:
+            return _backend_loads(text)
+        except (ValueError, TypeError):
+            pass  # NaN / Infinity / big ints: retry with json for identical results
+    return json.loads(text)
+
+
+class EmbeddedDataStats(StatsCollector):
+    """Payload parse counters per outcome, plus scanned documents."""
+
+    LABELS = ("outcome",)
+    FIELDS = ("count", "seconds")
+    SEED = (*((o,) for o in _OUTCOMES), ("documents",))
+    COUNTERS = (
+        Counter(METRIC_PAYLOADS, "Embedded JSON payloads by parse outcome", "count", only=_OUTCOMES),
+        Counter(METRIC_PARSE_SECONDS, "Time spent parsing embedded JSON payloads", "seconds", labelled=False),
+    )
+
+    __slots__ = ()
+
+    def record_document(self) -> None:
+        self.add(("documents",), 1)
+
+    def record(self, outcome: str, seconds: float = 0.0) -> None:
+        self.add((outcome,), 1, seconds)
+
+    def snapshot(self) -> dict[str, Any]:
+        rows = self.rows()
+        snap: dict[str, Any] = {outcome: row[0] for (outcome,), row in rows.items()}
+        snap["parse_ms"] = round(sum(row[1] for row in rows.values()) * 1000, 3)
+        snap["backend"] = _backend_name
+        return snap
+
+
+embedded_stats = EmbeddedDataStats()
+register_collector("embedded_data", lambda: embedded_stats)
+
+_UNPARSED = object()
+
+
+class ScriptPayload:
+    """One ``<script>`` body: a span of the document, sliced and parsed on demand."""
+
+    __slots__ = ("kind", "index", "attrs", "_owner", "_start", "_end", "_text", "_data")
+
+    def __init__(self, owner: EmbeddedData, kind: str, index: int, attrs: dict[str, str], start: int, end: int) -> None:
+        self.kind = kind
+        self.index = index  # ordinal within its kind
+        self.attrs = attrs  # lowercased ``type`` / ``id`` attribute names
+        self._owner = owner
+        self._start = start
+        self._end = end
+        self._text: str | None = None
+        self._data: Any = _UNPARSED
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    @property
+    def text(self) -> str:
+        """Raw script body (not stripped)."""
+        if self._text is None:
+            self._text = self._owner.html[self._start : self._end]
+        return self._text
+
+    @property
+    def data(self) -> Any:
+        """Parsed JSON value; ``None`` if invalid or over the parse budget."""
+        if self._data is _UNPARSED:
+            self._data = self._owner._parse(self)
+        return self._data
+
+
+class EmbeddedData:
+    """Script payloads of one document, by kind, in document order."""
+
+    __slots__ = ("html", "json_ld", "state", "rsc", "_parsed_chars", "_by_text")
+
+    def __init__(self, html: str) -> None:
+        self.html = html
+        self._parsed_chars = 0
+        self._by_text: dict[str, ScriptPayload] | None = None
+        found: dict[str, list[ScriptPayload]] = {JSON_LD: [], STATE: [], RSC: []}
+        pos = 0
+        while True:
+            open_m = _OPEN_RE.search(html, pos)
+            if open_m is None:
+                break
+            close_m = _CLOSE_RE.search(html, open_m.end())
+            if close_m is None:
+                break
+            start, end = open_m.end(), close_m.start()
+            pos = close_m.end()
+            attrs = {
+                m.group(1).lower(): (m.group(2) or m.group(3) or m.group(4) or "").strip()
+                for m in _ATTR_RE.finditer(open_m.group(1))
+            }
+            script_type = attrs.get("type", "").lower()
+            if script_type == "application/ld+json":
+                kind = JSON_LD
+            elif script_type == "application/json":
+                kind = STATE
+            elif html.find(_RSC_MARKER, start, end) >= 0:
+                kind = RSC
+            else:
+                continue
+            found[kind].append(ScriptPayload(self, kind, len(found[kind]), attrs, start, end))
+        self.json_ld: tuple[ScriptPayload, ...] = tuple(found[JSON_LD])
+        self.state: tuple[ScriptPayload, ...] = tuple(found[STATE])
+        self.rsc: tuple[ScriptPayload, ...] = tuple(found[RSC])
+
+    @property
+    def next_data(self) -> ScriptPayload | None:
+        """The Next.js ``__NEXT_DATA__`` hydration blob, if present."""
+        return next((p for p in self.state if p.attrs.get("id") == "__NEXT_DATA__"), None)
+
+    def json_ld_data(self) -> list[Any]:
+        """Parsed JSON-LD values in document order (invalid / over-budget blobs left out)."""
+        return [data for p in self.json_ld if (data := p.data) is not None]
+
+    def json_ld_for_text(self, text: str) -> ScriptPayload | None:
+        """The JSON-LD payload whose stripped body is *text* (for consumers holding chunks)."""
+        if self._by_text is None:
+            self._by_text = {p.text.strip(): p for p in self.json_ld}
+        return self._by_text.get(text)
+
+    def _parse(self, payload: ScriptPayload) -> Any:
+        size = len(payload)
+        if size > EMBEDDED_BLOB_BUDGET or self._parsed_chars + size > EMBEDDED_TOTAL_BUDGET:
+            embedded_stats.record("skipped")
+            return None
+        self._parsed_chars += size
+        t0 = time.perf_counter()
+        try:
+            data = _loads(payload.text)
+            outcome = "parsed"
+        except (ValueError, TypeError, RecursionError):
+            data, outcome = None, "invalid"
+        embedded_stats.record(outcome, time.perf_counter() - t0)
+        return data
+
+
+_local = threading.local()
+
+
+def embedded_data(raw_html: str) -> EmbeddedData:
+    """Script payloads of *raw_html* (memoized for the thread's last document)."""
+    last: EmbeddedData | None = getattr(_local, "last", None)
+    if last is not None and last.html is raw_html:
+        return last
+    data = EmbeddedData(raw_html)
+    _local.last = data
+    embedded_stats.record_document()
+    return data
+
+
+def parse_json_ld_text(text: str) -> Any:
+    """Parse a JSON-LD body already extracted from the thread's last document.
+
+    Reuses the cached view when *text* is one of its payloads; otherwise parses
+    under the same per-blob budget.  Raises ``ValueError`` on invalid JSON.
+    """
+    last: EmbeddedData | None = getattr(_local, "last", None)
+    payload = last.json_ld_for_text(text) if last is not None else None
+    if payload is not None:
+        data = payload.data
+        if data is None:
+            raise ValueError("JSON-LD payload invalid or over budget")
+        return data
+    if len(text) > EMBEDDED_BLOB_BUDGET:
+        embedded_stats.record("skipped")
+        raise ValueError("JSON-LD payload over budget")
+    return _loads(text)
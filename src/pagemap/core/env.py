@@ -0,0 +1,16 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Environment-variable feature flags."""
+
+from __future__ import annotations
+
+import os
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """True when env var *name* is ``1``, ``true`` or ``yes`` (any case); *default* when it is unset."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes")
@@ -510,10 +510,11 @@ def _walk_ax_tree(
                 )
             )
 
-            # Track backendDOMNodeId for CSS selector resolution
-            if backend_id_map is not None:
-                backend_dom_id = node.get("backendDOMNodeId")
-                if backend_dom_id is not None:
+            # Track backendDOMNodeId for CSS selector resolution and direct dispatch
+            backend_dom_id = node.get("backendDOMNodeId")
+            if backend_dom_id is not None:
+                results[-1].backend_node_id = backend_dom_id
+                if backend_id_map is not None:
                     backend_id_map[ref_counter[0]] = backend_dom_id
 
     # Recurse into children
@@ -11,12 +11,12 @@ Uses lxml for last-resort price extraction from pruned HTML (Amazon nested spans
 from __future__ import annotations
 
 import html as _html
-import json
 import logging
 import re
 from collections.abc import Callable
 from typing import Any
 
+from .embedded_data import parse_json_ld_text
 from .pruning import ChunkType, HtmlChunk
 from .sanitizer import sanitize_text
 
@@ -132,8 +132,8 @@ def _parse_jsonld_chunks(meta_chunks: list[HtmlChunk]) -> list[Any]:
         if chunk.attrs.get("type") != "application/ld+json":
             continue
         try:
-            parsed.append(json.loads(chunk.text))
-        except (json.JSONDecodeError, TypeError):
+            parsed.append(parse_json_ld_text(chunk.text))
+        except (ValueError, TypeError):
             continue
     return parsed
 
@@ -19,13 +19,14 @@ score exceeding 2× the type threshold.
 
 from __future__ import annotations
 
-import json
 import re
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
+from .embedded_data import embedded_data
+
 if TYPE_CHECKING:
     from .config_registry import ClassifierConfig
 
@@ -72,13 +73,9 @@ class ClassificationResult:
 
 
 # ---------------------------------------------------------------------------
-# JSON-LD helpers (reuse regex from page_map_builder)
+# JSON-LD helpers (shared script payloads, see embedded_data.py)
 # ---------------------------------------------------------------------------
 
-_JSONLD_RE = re.compile(
-    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-    re.DOTALL | re.IGNORECASE,
-)
 
 _JSONLD_TYPE_TO_PAGE: dict[str, str] = {
     "Product": "product_detail",
@@ -137,11 +134,7 @@ _PAGE_LEVEL_JSONLD_TYPES: frozenset[str] = frozenset({"listing", "search_results
 def _detect_jsonld_page_type(raw_html: str) -> str | None:
     """Sniff JSON-LD @type from raw HTML. Page-level types win over item-level."""
     candidates: list[str] = []
-    for m in _JSONLD_RE.finditer(raw_html):
-        try:
-            data = json.loads(m.group(1))
-        except (json.JSONDecodeError, TypeError):
-            continue
+    for data in embedded_data(raw_html).json_ld_data():
         candidates.extend(_resolve_jsonld_page_type(data))
     if not candidates:
         return None
@@ -21,11 +21,14 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from pagemap.security.browser_report import BrowserSecurityReport
+
     from .config_registry import ClassifierConfig
 
 from pagemap.errors import ResourceExhaustionError
 
 from . import Interactable, PageMap
+from .embedded_data import embedded_data
 from .i18n import (
     LOAD_MORE_TERMS,
     NEXT_BUTTON_TERMS,
@@ -34,7 +37,7 @@ from .i18n import (
 )
 from .interactive_detector import _is_table_noise, detect_all
 from .page_classifier import classify_page
-from .pipeline_timer import PipelineTimer
+from .pipeline_timer import PipelineTimer, span
 from .preprocessing.preprocess import count_tokens, count_tokens_approx
 from .protocols import BrowserSessionProtocol
 from .pruned_context_builder import (
@@ -47,6 +50,7 @@ from .pruned_context_builder import (
     extract_pagination_structured,
     extract_product_images,
 )
+from .scroll_delta import _IS_HIDDEN_JS, ScrollDelta, delta_interactables
 from .template_cache import (
     InMemoryTemplateCache,
     PageTemplate,
@@ -75,8 +79,12 @@ MAX_DOM_NODES = 50_000  # Reject pages with >50K DOM nodes (memory exhaustion de
 MAX_HTML_SIZE_BYTES = 8 * 1024 * 1024  # 8MB limit on page.content() (OOM prevention)
 
 # ── DOM guard + hidden content detection (single evaluate call) ───────
-_DOM_GUARD_AND_HIDDEN_JS = """
+_DOM_GUARD_AND_HIDDEN_JS = (
+    """
 (() => {
+  const isHidden = """
+    + _IS_HIDDEN_JS
+    + """;
   const all = document.body.querySelectorAll('*');
   const nodeCount = all.length;
   let hiddenRemoved = 0;
@@ -86,22 +94,7 @@ _DOM_GUARD_AND_HIDDEN_JS = """
     if (tag === 'script' || tag === 'style' || tag === 'noscript' || tag === 'link' || tag === 'meta') continue;
     if (!el.parentNode) continue;
     try {
-      const cs = getComputedStyle(el);
-      if (
-        cs.display === 'none' ||
-        cs.visibility === 'hidden' ||
-        cs.opacity === '0' ||
-        (cs.fontSize === '0px' && el.children.length === 0) ||
-        cs.clipPath === 'inset(100%)' ||
-        /scale\\(0[),\\s]/.test(cs.transform) ||
-        (parseInt(cs.textIndent) <= -9000 && cs.overflow === 'hidden') ||
-        (cs.overflow === 'hidden' && parseInt(cs.height) === 0 && el.children.length === 0) ||
-        (cs.position === 'absolute' && (
-          parseInt(cs.left) < -9000 || parseInt(cs.top) < -9000 ||
-          (parseInt((cs.clip || '').split(',')[0]?.replace('rect(','')) === 0 &&
-           parseInt((cs.clip || '').split(',')[1]) === 0)
-        ))
-      ) {
+      if (isHidden(el)) {
         el.remove();
         hiddenRemoved++;
       }
@@ -110,6 +103,7 @@ _DOM_GUARD_AND_HIDDEN_JS = """
   return { nodeCount, hiddenRemoved };
 })()
 """
+)
 
 
 def _merge_structured_images(
@@ -215,6 +209,23 @@ def _check_blocked_page(
         pass
 
 
+async def _read_browser_security(session: BrowserSessionProtocol, warnings: list[str]) -> BrowserSecurityReport | None:
+    """In-page security scanner report, or None. Fail-open."""
+    try:
+        if hasattr(session, "read_security_report"):
+            raw_report = await session.read_security_report()
+            if raw_report:
+                from pagemap.security.browser_report import BrowserSecurityReport
+
+                report = BrowserSecurityReport.from_js_report(raw_report)
+                if report and report.is_safe_mode:
+                    warnings.append("Browser security scanner entered safe mode due to repeated errors")
+                return report
+    except Exception:  # nosec B110 — fail-open
+        pass
+    return None
+
+
 async def _check_resource_limits(page, raw_html: str) -> str:
     """HTML size + DOM guard + hidden content JS. Returns (possibly refreshed) HTML.
 
@@ -373,6 +384,7 @@ async def _build_pruned_context_async(
     template: Any = _NO_TEMPLATE,
     enable_lang_filter: bool = True,
     task_hint: str | None = None,
+    page_url: str = "",
 ) -> tuple[str, int, dict]:
     """Run build_pruned_context in a worker thread to unblock the event loop.
 
@@ -393,6 +405,7 @@ async def _build_pruned_context_async(
             template=template,
             enable_lang_filter=enable_lang_filter,
             task_hint=task_hint,
+            page_url=page_url,
         ),
         timeout=_PRUNED_CONTEXT_THREAD_TIMEOUT,
     )
@@ -462,10 +475,6 @@ def detect_schema(url: str) -> str:
 # JSON-LD schema sniffing (used for Generic → concrete schema override)
 # ---------------------------------------------------------------------------
 
-_JSONLD_RE = re.compile(
-    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-    re.DOTALL | re.IGNORECASE,
-)
 
 _JSONLD_TYPE_TO_SCHEMA: dict[str, str] = {
     "Product": "Product",
@@ -518,12 +527,8 @@ def _resolve_jsonld_type(data: Any) -> str | None:
 
 
 def _detect_schema_from_jsonld(raw_html: str) -> str | None:
-    """Lightweight JSON-LD @type sniffing — regex + json.loads, no lxml."""
-    for m in _JSONLD_RE.finditer(raw_html):
-        try:
-            data = json.loads(m.group(1))
-        except (json.JSONDecodeError, TypeError):
-            continue
+    """Lightweight JSON-LD @type sniffing over the shared script payloads, no lxml."""
+    for data in embedded_data(raw_html).json_ld_data():
         result = _resolve_jsonld_type(data)
         if result is not None:
             return result
@@ -614,18 +619,7 @@ async def build_page_map_live(
     warnings.extend(detect_warnings)
 
     # ── Browser security report (must read BEFORE DOM Guard removes hidden elements) ──
-    browser_security_report = None
-    try:
-        if hasattr(session, "read_security_report"):
-            _raw_report = await session.read_security_report()
-            if _raw_report:
-                from pagemap.security.browser_report import BrowserSecurityReport
-
-                browser_security_report = BrowserSecurityReport.from_js_report(_raw_report)
-                if browser_security_report and browser_security_report.is_safe_mode:
-                    warnings.append("Browser security scanner entered safe mode due to repeated errors")
-    except Exception:  # nosec B110 — fail-open
-        pass
+    browser_security_report = await _read_browser_security(session, warnings)
 
     # ── Resource exhaustion guards ────────────────────────────────────
     raw_html = await _check_resource_limits(session.page, raw_html)
@@ -639,7 +633,8 @@ async def build_page_map_live(
         if ECOMMERCE_ENABLED:
             from .ecommerce.barrier_handler import detect_barriers
 
-            barrier_result = detect_barriers(raw_html, html_lower, page_url, interactables, page_type)
+            with span("barrier_detect"):
+                barrier_result = detect_barriers(raw_html, html_lower, page_url, interactables, page_type)
     except Exception:  # nosec B110
         pass
 
@@ -664,6 +659,7 @@ async def build_page_map_live(
         locale=locale,
         template=template,
         task_hint=task_hint,
+        page_url=page_url,
     )
     metadata["_total_budget"] = budget.total
 
@@ -707,20 +703,21 @@ async def build_page_map_live(
         if DIAGNOSTICS_ENABLED:
             from .diagnostics import run_page_diagnostics
 
-            diagnostics_result = run_page_diagnostics(
-                raw_html=raw_html,
-                html_lower=html_lower,
-                page_url=page_url,
-                page_type=page_type,
-                interactables=interactables,
-                barrier=barrier_result,
-                warnings=warnings,
-                metadata=metadata,
-                http_status=nav_result.http_status if nav_result else None,
-                pruning_result=_pruning_result,
-                pruned_regions=_pruned_regions,
-                spa_signals=spa_signals,
-            )
+            with span("diagnostics"):
+                diagnostics_result = run_page_diagnostics(
+                    raw_html=raw_html,
+                    html_lower=html_lower,
+                    page_url=page_url,
+                    page_type=page_type,
+                    interactables=interactables,
+                    barrier=barrier_result,
+                    warnings=warnings,
+                    metadata=metadata,
+                    http_status=nav_result.http_status if nav_result else None,
+                    pruning_result=_pruning_result,
+                    pruned_regions=_pruned_regions,
+                    spa_signals=spa_signals,
+                )
     except Exception:  # nosec B110
         pass
 
@@ -761,6 +758,7 @@ async def build_page_map_live(
                 actual_metadata_source=actual_source,
                 actual_aom_removal_ratio=actual_aom_ratio,
                 actual_chunk_selection_ratio=actual_chunk_ratio,
+                fast_path=_pruning_result.fast_path == "hit",
             )
             if validation.passed:
                 template_cache.record_validation_pass(_template_key)
@@ -772,8 +770,9 @@ async def build_page_map_live(
     if timer:
         timer.stage("assembly")
     # Extract product images
-    images, _img_stats = extract_product_images(raw_html, page_url)
-    images, _img_merged = _merge_structured_images(images, metadata)
+    with span("images"):
+        images, _img_stats = extract_product_images(raw_html, page_url)
+        images, _img_merged = _merge_structured_images(images, metadata)
     _img_stats["structured_image_merged"] = _img_merged
     try:
         from .telemetry import emit, events
@@ -802,7 +801,8 @@ async def build_page_map_live(
             )
 
     # Navigation hints (after budget filter so refs match)
-    navigation_hints = _build_navigation_hints(interactables, raw_html, page_type)
+    with span("navigation_hints"):
+        navigation_hints = _build_navigation_hints(interactables, raw_html, page_type)
 
     # ── Barrier ref matching + Ecommerce engine (Layer 1 + 2) ──────
     try:
@@ -817,15 +817,16 @@ async def build_page_map_live(
             if page_type in ("search_results", "listing", "product_detail"):
                 from .ecommerce import run_ecommerce_engine
 
-                ecom = run_ecommerce_engine(
-                    page_type=page_type,
-                    raw_html=raw_html,
-                    html_lower=html_lower,
-                    interactables=interactables,
-                    metadata=metadata,
-                    page_url=page_url,
-                    navigation_hints=navigation_hints,
-                )
+                with span("ecommerce"):
+                    ecom = run_ecommerce_engine(
+                        page_type=page_type,
+                        raw_html=raw_html,
+                        html_lower=html_lower,
+                        interactables=interactables,
+                        metadata=metadata,
+                        page_url=page_url,
+                        navigation_hints=navigation_hints,
+                    )
                 if ecom:
                     metadata["ecommerce"] = ecom
     except Exception as e:
@@ -834,6 +835,8 @@ async def build_page_map_live(
     if timer:
         timer.finalize()
         metadata["stage_timing"] = timer.success_metadata()
+        if spans := timer.span_timings():
+            metadata["span_timing"] = spans
 
     elapsed_ms = (time.monotonic() - start) * 1000
 
@@ -932,6 +935,7 @@ async def build_page_map_from_page(
         max_tokens=budget.pruned_context,
         locale=locale,
         template=template,
+        page_url=page_url,
     )
     metadata["_total_budget"] = budget.total
 
@@ -1104,6 +1108,7 @@ async def rebuild_content_only(
         locale=locale,
         template=template,
         task_hint=task_hint,
+        page_url=page_url,
     )
     metadata["_total_budget"] = budget.total
 
@@ -1192,6 +1197,7 @@ async def rebuild_content_only(
                 actual_metadata_source=actual_source,
                 actual_aom_removal_ratio=actual_aom_ratio,
                 actual_chunk_selection_ratio=actual_chunk_ratio,
+                fast_path=_pruning_result.fast_path == "hit",
             )
             if validation.passed:
                 template_cache.record_validation_pass(_template_key)
@@ -1333,6 +1339,98 @@ async def rebuild_interactables_only(
     return page_map
 
 
+async def rebuild_scroll_delta(
+    session: BrowserSessionProtocol,
+    cached: PageMap,
+    delta: ScrollDelta,
+    max_pruned_tokens: int = DEFAULT_PRUNED_CONTEXT_TOKENS,
+    task_hint: str | None = None,
+) -> PageMap | None:
+    """Tier S: content appended by scrolling (infinite feeds, lazy sections).
+
+    Prunes only the added subtrees and appends them to the cached
+    pruned_context; new interactables get refs after the cached ones, so
+    existing refs stay valid.  Skips ``page.content()`` and detect_all;
+    hidden subtrees were already dropped in-page by the collector and the
+    browser security report is re-read so findings in the new content
+    surface as in a full build.
+
+    Args:
+        session: active BrowserSession
+        cached: the PageMap the scroll delta was armed against
+        delta: additions collected by :func:`collect_scroll_delta`
+        max_pruned_tokens: token budget for one delta (the combined
+            context may grow to twice this before a full rebuild is due)
+
+    Returns:
+        New PageMap, or None when the result would be too large and the
+        caller should fall back to a full build.
+    """
+    start = time.monotonic()
+
+    page_url = await session.get_page_url()
+    page_title = await session.get_page_title()
+    warnings = list(cached.warnings)
+    browser_security = await _read_browser_security(session, warnings)
+
+    delta_context = ""
+    delta_tokens = 0
+    if delta.fragments:
+        fragment_html = "<html><body><main>" + "".join(delta.fragments) + "</main></body></html>"
+        _check_html_size(fragment_html)
+        delta_context, delta_tokens, _ = await _build_pruned_context_async(
+            raw_html=fragment_html,
+            page_type=cached.page_type,
+            site_id=_extract_site_id(page_url),
+            page_id="live",
+            schema_name=detect_schema(page_url),
+            max_tokens=max_pruned_tokens,
+            locale=detect_locale(page_url),
+            task_hint=task_hint,
+            page_url=page_url,
+        )
+    if cached.pruned_tokens + delta_tokens > 2 * max_pruned_tokens:
+        return None
+
+    new_interactables = delta_interactables(delta.elements, cached.interactables)
+    interactables = [*cached.interactables, *new_interactables]
+    pruned_context = f"{cached.pruned_context}\n{delta_context}" if delta_context else cached.pruned_context
+
+    metadata = dict(cached.metadata)  # don't mutate cached
+    metadata["scroll_delta"] = {
+        "added_roots": len(delta.fragments),
+        "new_refs": len(new_interactables),
+        "removed_nodes": delta.removed,
+    }
+    elapsed_ms = (time.monotonic() - start) * 1000
+
+    page_map = PageMap(
+        url=page_url,
+        title=page_title,
+        page_type=cached.page_type,
+        interactables=interactables,
+        pruned_context=pruned_context,
+        pruned_tokens=cached.pruned_tokens + delta_tokens,
+        generation_ms=elapsed_ms,
+        images=cached.images,
+        metadata=metadata,
+        warnings=warnings,
+        navigation_hints=cached.navigation_hints,
+        pruned_regions=cached.pruned_regions,
+        barrier=cached.barrier,
+        diagnostics=cached.diagnostics,
+        browser_security=browser_security or cached.browser_security,
+    )
+
+    logger.info(
+        "PageMap scroll-delta rebuild: +%d interactables, +%d pruned tokens, %.0fms",
+        len(new_interactables),
+        delta_tokens,
+        elapsed_ms,
+    )
+    return page_map
+
+
 def _extract_interactables_from_html(raw_html: str) -> list[Interactable]:
     """Extract interactive elements from raw HTML via static parsing.
 
@@ -1497,6 +1595,7 @@ def build_page_map_offline(
     page_type: str | None = None,
     schema_name: str | None = None,
     max_pruned_tokens: int = DEFAULT_PRUNED_CONTEXT_TOKENS,
+    timer: PipelineTimer | None = None,
 ) -> PageMap:
     """Build a PageMap from offline HTML (no browser, no AX tree).
 
@@ -1512,6 +1611,7 @@ def build_page_map_offline(
         page_type: override page type detection
         schema_name: override schema detection
         max_pruned_tokens: token budget for pruned_context
+        timer: optional stage timer (page_info → pruning → detection → assembly)
 
     Returns:
         PageMap with statically-extracted interactables
@@ -1521,6 +1621,9 @@ def build_page_map_offline(
     # HTML size guard (no browser — cannot run DOM/hidden JS)
     _check_html_size(raw_html)
 
+    if timer:
+        timer.stage("page_info")
+
     if page_type is None:
         page_type = detect_page_type(url, raw_html)
     if schema_name is None:
@@ -1532,6 +1635,8 @@ def build_page_map_offline(
 
     locale = detect_locale(url)
     budget = compute_token_budget(locale, raw_html, base_pruned=max_pruned_tokens)
+    if timer:
+        timer.stage("pruning")
     pruned_context, pruned_tokens, metadata = build_pruned_context(
         raw_html=raw_html,
         page_type=page_type,
@@ -1540,6 +1645,7 @@ def build_page_map_offline(
         schema_name=schema_name,
         max_tokens=budget.pruned_context,
         locale=locale,
+        page_url=url,
     )
     metadata["_total_budget"] = budget.total
 
@@ -1562,8 +1668,12 @@ def build_page_map_offline(
     _check_blocked_page(page_type, warnings, metadata, url=url)
 
     # Extract interactables from HTML (static parsing)
+    if timer:
+        timer.stage("detection")
     interactables = _extract_interactables_from_html(raw_html)
 
+    if timer:
+        timer.stage("assembly")
     # Extract product images
     images, _img_stats = extract_product_images(raw_html, url)
     images, _img_merged = _merge_structured_images(images, metadata)
@@ -1597,6 +1707,12 @@ def build_page_map_offline(
                 f"{affected} interactable(s) in pruned regions ({region_list}) — surrounding context unavailable"
             )
 
+    if timer:
+        timer.finalize()
+        metadata["stage_timing"] = timer.success_metadata()
+        if spans := timer.span_timings():
+            metadata["span_timing"] = spans
+
     elapsed_ms = (time.monotonic() - start) * 1000
 
     page_map = PageMap(
@@ -1645,7 +1761,6 @@ async def build_page_map_from_snapshot(
     Returns:
         PageMap with interactables from AX tree + pruned context
     """
-    import json
 
     start = time.monotonic()
 
@@ -1709,6 +1824,7 @@ async def build_page_map_from_snapshot(
         schema_name=schema_name,
         max_tokens=budget.pruned_context,
         locale=locale,
+        page_url=url,
     )
     structured_meta["_total_budget"] = budget.total
 
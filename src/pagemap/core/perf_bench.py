@@ -0,0 +1,353 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Offline throughput and latency benchmark for the page-map build pipeline.
+
+Runs ``build_page_map_offline`` over a bundled corpus (``data/perf_corpus``
+plus synthesized huge SPA and huge embedded-state pages) and reports:
+
+  - per-stage p50/p95/p99 wall and CPU time (PipelineTimer stages;
+    nested spans such as ``pruning.prune_page.decompose`` report wall time)
+  - per-page p50 wall time and peak Python allocation (tracemalloc pass)
+  - pages/s at 1..N worker processes
+  - regressions against a stored baseline result
+
+No network, browser or LLM access is needed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+RESULT_VERSION = 1
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "data" / "perf_corpus"
+HUGE_SPA_NAME = "huge_spa"
+HUGE_STATE_NAME = "huge_state"
+
+_HUGE_SPA_CARDS = 1000
+_HUGE_STATE_ITEMS = 25_000
+_HUGE_STATE_RSC_PUSHES = 60
+_DEFAULT_TOLERANCE = 0.2
+# Stage timings below this floor are too noisy to flag as regressions
+_MIN_COMPARABLE_MS = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class PerfPage:
+    """One corpus page."""
+
+    name: str
+    url: str
+    html: str
+
+
+def _synth_huge_spa() -> str:
+    """Deterministic ~0.5MB client-rendered page: hydration state blob + deep card grid."""
+    state = {
+        "props": {
+            "pageProps": {
+                "items": [
+                    {"id": i, "title": f"Item {i}", "price": 1000 + i, "tags": ["a", "b", "c"], "seller": f"s{i % 50}"}
+                    for i in range(_HUGE_SPA_CARDS)
+                ]
+            }
+        }
+    }
+    cards = "".join(
+        f'<div class="css-1x{i % 97} grid-cell" data-testid="card-{i}"><div class="css-inner"><div class="css-media">'
+        f'<img src="https://cdn.example.com/i/{i}.webp" alt="Item {i}"></div><div class="css-body">'
+        f'<a href="/item/{i}" class="product-name">Item {i} wireless noise cancelling headphones</a>'
+        f'<span class="price">${10 + i % 300}.99</span><span>Rating 4.{i % 10} ({i % 700} reviews)</span>'
+        f'<button type="button" aria-label="Add item {i} to cart">Add</button></div></div></div>'
+        for i in range(_HUGE_SPA_CARDS)
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Deals | Example SPA</title>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>'
+        '<script src="/_next/static/chunks/main.js"></script></head>'
+        '<body><div id="__next"><header><nav><a href="/">Home</a> <a href="/deals">Deals</a></nav></header>'
+        f'<main><h1>Today\'s deals</h1><section class="grid">{cards}</section></main>'
+        "<footer><p>Example SPA</p></footer></div></body></html>"
+    )
+
+
+def _synth_huge_state() -> str:
+    """Deterministic ~3MB product page whose weight is embedded state, not DOM.
+
+    A multi-megabyte ``__NEXT_DATA__`` blob, streamed RSC pushes and a Product
+    JSON-LD block around a small server-rendered body.
+    """
+    state = {
+        "props": {
+            "pageProps": {
+                "recommendations": [
+                    {"id": i, "title": f"Related item {i}", "price": 1000 + i, "rating": 4.5, "seller": f"s{i % 50}"}
+                    for i in range(_HUGE_STATE_ITEMS)
+                ]
+            }
+        }
+    }
+    product = {
+        "@context": "https://schema.org",
+        "@type": "Product",
+        "name": "Wireless noise cancelling headphones",
+        "brand": {"@type": "Brand", "name": "Example"},
+        "offers": {"@type": "Offer", "price": "199.99", "priceCurrency": "USD", "availability": "InStock"},
+    }
+    rsc = "".join(
+        f'<script>self.__next_f.push([1,"{i:x}:[\\"$\\",\\"div\\",null,{{\\"date\\":\\"2025-03-{i % 28 + 1:02d}'
+        f'\\",\\"pad\\":\\"{"x" * 4000}\\"}}]\\n"])</script>'
+        for i in range(_HUGE_STATE_RSC_PUSHES)
+    )
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Headphones | Example Shop</title>'
+        f'<script type="application/ld+json">{json.dumps(product)}</script>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script></head>'
+        '<body><div id="__next"><main><h1>Wireless noise cancelling headphones</h1>'
+        '<span class="price">$199.99</span><button type="button">Add to cart</button>'
+        "<p>Up to 30 hours of battery life with adaptive noise cancelling.</p></main></div>"
+        f"{rsc}</body></html>"
+    )
+
+
+def load_corpus(names: list[str] | None = None) -> list[PerfPage]:
+    """Load bundled fixtures (and the synthesized pages), optionally filtered by name."""
+    entries = json.loads((CORPUS_DIR / "corpus.json").read_text(encoding="utf-8"))
+    pages = [
+        PerfPage(name=e["name"], url=e["url"], html=(CORPUS_DIR / e["file"]).read_text(encoding="utf-8"))
+        for e in entries
+        if names is None or e["name"] in names
+    ]
+    if names is None or HUGE_SPA_NAME in names:
+        pages.append(PerfPage(name=HUGE_SPA_NAME, url="https://spa.example.com/deals", html=_synth_huge_spa()))
+    if names is None or HUGE_STATE_NAME in names:
+        pages.append(
+            PerfPage(name=HUGE_STATE_NAME, url="https://shop.example.com/p/headphones", html=_synth_huge_state())
+        )
+    return pages
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    """Nearest-rank p50/p95/p99 (rounded to 0.01)."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    ordered = sorted(values)
+    out = {}
+    for pct in (50, 95, 99):
+        rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+        out[f"p{pct}"] = round(ordered[rank], 2)
+    return out
+
+
+def _build_timed(page: PerfPage) -> tuple[dict[str, float], dict[str, float]]:
+    """Build one page; return (wall_ms per stage/span, cpu_ms per stage) incl. ``total``."""
+    from .page_map_builder import build_page_map_offline
+    from .pipeline_timer import PipelineTimer
+
+    timer = PipelineTimer()
+    wall0, cpu0 = time.perf_counter(), time.thread_time()
+    with timer.activate():
+        build_page_map_offline(raw_html=page.html, url=page.url, site_id="perf", page_id=page.name, timer=timer)
+    wall = timer.elapsed_per_stage()
+    wall.update(timer.span_timings())
+    cpu = timer.cpu_per_stage()
+    wall["total"] = (time.perf_counter() - wall0) * 1000
+    cpu["total"] = (time.thread_time() - cpu0) * 1000
+    return wall, cpu
+
+
+def _build_untimed(page: PerfPage) -> None:
+    from .page_map_builder import build_page_map_offline
+
+    build_page_map_offline(raw_html=page.html, url=page.url, site_id="perf", page_id=page.name)
+
+
+def _noop(_: Any) -> None:
+    return None
+
+
+def measure_latency(pages: list[PerfPage], iterations: int) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Per-stage and per-page latency over ``iterations`` builds of every page (after 1 warm-up)."""
+    stage_wall: dict[str, list[float]] = {}
+    stage_cpu: dict[str, list[float]] = {}
+    page_wall: dict[str, list[float]] = {p.name: [] for p in pages}
+
+    for page in pages:
+        _build_untimed(page)  # warm-up: imports, regex compilation, caches
+
+    for _ in range(iterations):
+        for page in pages:
+            wall, cpu = _build_timed(page)
+            page_wall[page.name].append(wall["total"])
+            for name, ms in wall.items():
+                stage_wall.setdefault(name, []).append(ms)
+            for name, ms in cpu.items():
+                stage_cpu.setdefault(name, []).append(ms)
+
+    stages: dict[str, Any] = {}
+    for name, values in stage_wall.items():
+        stages[name] = {"wall_ms": _percentiles(values)}
+        if name in stage_cpu:  # spans record wall time only
+            stages[name]["cpu_ms"] = _percentiles(stage_cpu[name])
+    per_page = {name: {"wall_ms": _percentiles(values)} for name, values in page_wall.items()}
+    return stages, per_page
+
+
+def measure_memory(pages: list[PerfPage]) -> dict[str, float]:
+    """Peak traced Python allocation (MB) per page — separate pass, tracing skews timing."""
+    peaks: dict[str, float] = {}
+    for page in pages:
+        tracemalloc.start()
+        try:
+            _build_untimed(page)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peaks[page.name] = round(peak / (1024 * 1024), 2)
+    return peaks
+
+
+def measure_throughput(pages: list[PerfPage], worker_counts: list[int], rounds: int) -> dict[str, float]:
+    """Pages/s building the corpus ``rounds`` times per worker count (pool start-up excluded)."""
+    work = [p for _ in range(rounds) for p in pages]
+    result: dict[str, float] = {}
+    for workers in worker_counts:
+        if workers <= 1:
+            start = time.perf_counter()
+            for page in work:
+                _build_untimed(page)
+            elapsed = time.perf_counter() - start
+        else:
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(processes=workers) as pool:
+                pool.map(_noop, range(workers))  # spawn + import before timing
+                pool.map(_build_untimed, pages)  # warm-up per worker
+                start = time.perf_counter()
+                pool.map(_build_untimed, work, chunksize=1)
+                elapsed = time.perf_counter() - start
+        result[str(workers)] = round(len(work) / elapsed, 2) if elapsed > 0 else 0.0
+    return result
+
+
+def default_worker_counts(max_workers: int) -> list[int]:
+    """1, 2, 4, ... up to ``max_workers`` (always including ``max_workers``)."""
+    counts = [1]
+    while counts[-1] * 2 < max_workers:
+        counts.append(counts[-1] * 2)
+    if max_workers > 1:
+        counts.append(max_workers)
+    return counts
+
+
+def run_perf(
+    *,
+    iterations: int = 5,
+    max_workers: int = 1,
+    rounds: int = 2,
+    names: list[str] | None = None,
+) -> dict[str, Any]:
+    """Run the full benchmark and return a JSON-serializable result."""
+    pages = load_corpus(names)
+    stages, per_page = measure_latency(pages, iterations)
+    for name, peak in measure_memory(pages).items():
+        per_page[name]["peak_alloc_mb"] = peak
+    throughput = measure_throughput(pages, default_worker_counts(max_workers), rounds)
+    return {
+        "version": RESULT_VERSION,
+        "env": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {"iterations": iterations, "rounds": rounds, "pages": [p.name for p in pages]},
+        "stages": stages,
+        "pages": per_page,
+        "throughput_pages_per_s": throughput,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _peak_rss_mb() -> float | None:
+    """Peak resident set size of this process in MB (None where ``resource`` is unavailable)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes on Linux and the BSDs
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def compare_to_baseline(
+    result: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = _DEFAULT_TOLERANCE,
+) -> list[str]:
+    """Return human-readable regressions (empty list = no regression).
+
+    Flags stage/page p50 and p95 wall times more than ``tolerance`` slower
+    than baseline, and throughput more than ``tolerance`` lower.
+    Timings under 1ms in the baseline are ignored as noise.
+    """
+    regressions: list[str] = []
+
+    def _check_latency(label: str, cur: dict[str, float], base: dict[str, float]) -> None:
+        for key in ("p50", "p95"):
+            b, c = base.get(key), cur.get(key)
+            if b is None or c is None or b < _MIN_COMPARABLE_MS:
+                continue
+            if c > b * (1 + tolerance):
+                regressions.append(f"{label} {key}: {c:.1f}ms vs baseline {b:.1f}ms (+{(c / b - 1) * 100:.0f}%)")
+
+    for name, base_stage in baseline.get("stages", {}).items():
+        cur_stage = result.get("stages", {}).get(name)
+        if cur_stage:
+            _check_latency(f"stage {name} wall", cur_stage["wall_ms"], base_stage["wall_ms"])
+    for name, base_page in baseline.get("pages", {}).items():
+        cur_page = result.get("pages", {}).get(name)
+        if cur_page:
+            _check_latency(f"page {name} wall", cur_page["wall_ms"], base_page["wall_ms"])
+    for workers, base_pps in baseline.get("throughput_pages_per_s", {}).items():
+        cur_pps = result.get("throughput_pages_per_s", {}).get(workers)
+        if cur_pps is not None and base_pps > 0 and cur_pps < base_pps * (1 - tolerance):
+            regressions.append(
+                f"throughput @{workers} workers: {cur_pps:.2f} pages/s vs baseline {base_pps:.2f} "
+                f"(-{(1 - cur_pps / base_pps) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def format_report(result: dict[str, Any]) -> str:
+    """Plain-text summary table of a benchmark result."""
+    lines = [f"{'stage':<36}{'wall p50':>10}{'p95':>10}{'p99':>10}{'cpu p50':>10}{'p95':>10}{'p99':>10}"]
+    for name, stage in result["stages"].items():
+        row = "".join(f"{stage['wall_ms'][k]:>10.1f}" for k in ("p50", "p95", "p99"))
+        if "cpu_ms" in stage:
+            row += "".join(f"{stage['cpu_ms'][k]:>10.1f}" for k in ("p50", "p95", "p99"))
+        lines.append(f"{name:<36}{row}")
+    lines.append("")
+    lines.append(f"{'page':<36}{'wall p50':>10}{'peak MB':>10}")
+    for name, page in result["pages"].items():
+        lines.append(f"{name:<36}{page['wall_ms']['p50']:>10.1f}{page.get('peak_alloc_mb', 0.0):>10.2f}")
+    lines.append("")
+    lines.append(
+        "throughput: "
+        + ", ".join(f"{w} worker(s) {pps:.2f} pages/s" for w, pps in result["throughput_pages_per_s"].items())
+    )
+    if result.get("peak_rss_mb") is not None:
+        lines.append(f"peak RSS: {result['peak_rss_mb']:.1f} MB")
+    return "\n".join(lines)
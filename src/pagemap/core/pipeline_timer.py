@@ -5,11 +5,21 @@
 
 Created outside asyncio.wait_for so it survives cancellation and can
 produce a meaningful timeout_report even when the pipeline is interrupted.
+
+Fine-grained spans: code deep in the pipeline wraps work in
+``with span("decompose"):``.  Spans are recorded only while a timer is
+activated (``with timer.activate():``); otherwise ``span()`` returns a
+shared no-op context manager, so instrumented code costs one ContextVar
+lookup when disabled.  Span keys are dotted paths under the current
+stage, e.g. ``pruning.prune_page.decompose``.
 """
 
 from __future__ import annotations
 
+import contextlib
 import time
+from collections.abc import Iterator
+from contextvars import ContextVar
 from dataclasses import dataclass
 
 
@@ -18,30 +28,41 @@ class StageRecord:
     name: str
     start_ns: int
     end_ns: int = 0
+    cpu_start_ns: int = 0
+    cpu_end_ns: int = 0
 
 
 class PipelineTimer:
-    """Track pipeline stage transitions for latency reporting."""
+    """Track pipeline stage transitions for latency reporting.
+
+    CPU time is per-thread (``time.thread_time_ns``); on an event loop it
+    includes any other coroutine that ran on the same thread mid-stage.
+    """
 
-    __slots__ = ("_stages", "_current", "_start_ns")
+    __slots__ = ("_stages", "_current", "_start_ns", "_spans", "_span_path")
 
     def __init__(self) -> None:
         self._stages: list[StageRecord] = []
         self._current: StageRecord | None = None
         self._start_ns: int = time.monotonic_ns()
+        self._spans: dict[str, float] = {}
+        self._span_path: list[str] = []
 
     def stage(self, name: str) -> None:
         """End previous stage + start new stage."""
         now = time.monotonic_ns()
+        cpu = time.thread_time_ns()
         if self._current is not None:
             self._current.end_ns = now
+            self._current.cpu_end_ns = cpu
             self._stages.append(self._current)
-        self._current = StageRecord(name=name, start_ns=now)
+        self._current = StageRecord(name=name, start_ns=now, cpu_start_ns=cpu)
 
     def finalize(self) -> None:
         """End current stage. Call on success or error."""
         if self._current is not None:
             self._current.end_ns = time.monotonic_ns()
+            self._current.cpu_end_ns = time.thread_time_ns()
             self._stages.append(self._current)
             self._current = None
 
@@ -59,6 +80,23 @@ class PipelineTimer:
             result[self._current.name] = round((now - self._current.start_ns) / 1e6, 1)
         return result
 
+    def cpu_per_stage(self) -> dict[str, float]:
+        """Return {stage_name: cpu_ms} for completed stages."""
+        return {s.name: round((s.cpu_end_ns - s.cpu_start_ns) / 1e6, 1) for s in self._stages}
+
+    @contextlib.contextmanager
+    def activate(self) -> Iterator[PipelineTimer]:
+        """Make this timer the target of :func:`span` for the enclosed block."""
+        token = _active_timer.set(self)
+        try:
+            yield self
+        finally:
+            _active_timer.reset(token)
+
+    def span_timings(self) -> dict[str, float]:
+        """Return {dotted_span_path: elapsed_ms}; repeated spans are summed."""
+        return {k: round(v, 1) for k, v in self._spans.items()}
+
     def timeout_report(self) -> dict:
         """Structured diagnostic for timeout errors."""
         now = time.monotonic_ns()
@@ -88,3 +126,43 @@ class PipelineTimer:
     def success_metadata(self) -> dict[str, float]:
         """Return stage timing for successful builds (metadata enrichment)."""
         return self.elapsed_per_stage()
+
+
+class _Span:
+    """Records one nested span into the active timer (see :func:`span`)."""
+
+    __slots__ = ("_timer", "_name", "_key", "_start_ns")
+
+    def __init__(self, timer: PipelineTimer, name: str) -> None:
+        self._timer = timer
+        self._name = name
+        self._key = ""
+        self._start_ns = 0
+
+    def __enter__(self) -> None:
+        timer = self._timer
+        timer._span_path.append(self._name)
+        prefix = timer._current.name if timer._current is not None else "pipeline"
+        self._key = prefix + "." + ".".join(timer._span_path)
+        self._start_ns = time.monotonic_ns()
+
+    def __exit__(self, *exc: object) -> None:
+        elapsed_ms = (time.monotonic_ns() - self._start_ns) / 1e6
+        timer = self._timer
+        timer._spans[self._key] = timer._spans.get(self._key, 0.0) + elapsed_ms
+        timer._span_path.pop()
+
+
+_active_timer: ContextVar[PipelineTimer | None] = ContextVar("pagemap_active_timer", default=None)
+_NULL_SPAN = contextlib.nullcontext()
+
+
+def span(name: str) -> contextlib.AbstractContextManager[None]:
+    """Time the enclosed block as a sub-span of the active timer's current stage.
+
+    No-op (shared ``nullcontext``) when no timer is active.
+    """
+    timer = _active_timer.get()
+    if timer is None:
+        return _NULL_SPAN
+    return _Span(timer, name)
@@ -11,26 +11,32 @@ Two levels:
 from __future__ import annotations
 
 import re
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-import tiktoken
 from bs4 import BeautifulSoup, Comment
 
+if TYPE_CHECKING:
+    import tiktoken
+
 _STRIP_TAGS = {"script", "style", "svg", "noscript", "link", "meta", "path", "defs"}
 
 _ZERO_SIZE_RE = re.compile(r"(?:width|height)\s*:\s*0(?:px)?(?:[;\s]|$)")
 
-_enc: tiktoken.Encoding = tiktoken.get_encoding("cl100k_base")
-
 _CJK_APPROX_RE = re.compile(r"[\u3000-\u9fff\uac00-\ud7af]")
 
 
+@lru_cache(maxsize=1)
 def _get_encoder() -> tiktoken.Encoding:
-    return _enc
+    """cl100k_base encoder, loaded on first use (BPE table load is ~0.25s)."""
+    import tiktoken
+
+    return tiktoken.get_encoding("cl100k_base")
 
 
 def count_tokens(text: str) -> int:
     """Count tokens using cl100k_base (GPT-4 / Claude tokenizer approximation)."""
-    return len(_enc.encode(text))
+    return len(_get_encoder().encode(text))
 
 
 def count_tokens_approx(text: str) -> int:
@@ -40,9 +40,12 @@ from .i18n import (
     LocaleConfig,
     get_locale,
 )
+from .pipeline_timer import span
 from .preprocessing.preprocess import count_tokens
 from .pruning import ChunkType, HtmlChunk
-from .pruning.pipeline import prune_page
+from .pruning.boilerplate import BOILERPLATE_INDEX_ENABLED, boilerplate_index
+from .pruning.pipeline import PruningResult, prune_page
+from .template_cache import FAST_PATH_MIN_TOKEN_SHARE, TEMPLATE_FAST_PATH_ENABLED, fast_path_ready, fast_path_stats
 
 logger = logging.getLogger(__name__)
 
@@ -2784,6 +2787,15 @@ _COMPRESSORS: dict[str, Callable[[CompressorContext], str]] = {
 }
 
 
+def _fast_path_accepted(result: PruningResult, template: Any) -> bool:
+    """True if the template's regions held enough content for the fast-path result to stand."""
+    return (
+        not result.errors
+        and result.chunk_count_selected > 0
+        and result.pruned_token_count >= FAST_PATH_MIN_TOKEN_SHARE * template.data.content_tokens
+    )
+
+
 def build_pruned_context(
     raw_html: str,
     page_type: str = "default",
@@ -2795,6 +2807,7 @@ def build_pruned_context(
     template: Any = _NO_TEMPLATE,
     enable_lang_filter: bool = True,
     task_hint: str | None = None,
+    page_url: str = "",
 ) -> tuple[str, int, dict]:
     """Build pruned context from raw HTML.
 
@@ -2810,6 +2823,7 @@ def build_pruned_context(
         locale: locale code (e.g. "ko", "ja", "fr"). None → default ("ko").
         template: optional PageTemplate with structural hints for optimization
         enable_lang_filter: filter non-dominant-script noise from output (default True)
+        page_url: page URL; keys the cross-page boilerplate index
 
     Returns:
         (pruned_context_text, token_count, metadata_dict)
@@ -2823,12 +2837,19 @@ def build_pruned_context(
     _source_hint: str | None = None
     _card_hint: str | None = None
     _pag_hint: str | None = None
+    _fast_regions: tuple[str, ...] = ()
     if template is not None and template is not _NO_TEMPLATE:
         _source_hint = template.data.metadata_source or None
         _card_hint = template.data.card_strategy
         _pag_hint = template.data.pagination_param
         if not template.data.has_pagination:
             _pag_hint = "none"
+        # Confident template: prune only its content regions, with its learned schema
+        if fast_path_ready(template):
+            _fast_regions = template.data.content_regions
+            if schema_name == "Generic" and template.data.schema_name:
+                schema_name = template.data.schema_name
+    _learn_regions = TEMPLATE_FAST_PATH_ENABLED and _template_caching_active and template is None
 
     # Schema refinement: Generic → detect from JSON-LD in raw HTML
     if schema_name == "Generic":
@@ -2847,7 +2868,36 @@ def build_pruned_context(
     _pruning_exception: Exception | None = None
     try:
         _pruning_budget = max_tokens * 30 if max_tokens else None
-        result = prune_page(raw_html, site_id, page_id, schema_name, max_tokens=_pruning_budget, task_hint=task_hint)
+        with span("prune_page"):
+            result = prune_page(
+                raw_html,
+                site_id,
+                page_id,
+                schema_name,
+                max_tokens=_pruning_budget,
+                task_hint=task_hint,
+                content_regions=_fast_regions,
+                learn_regions=_learn_regions,
+                page_url=page_url,
+                record_boilerplate=False,
+            )
+            if result.fast_path == "hit" and not _fast_path_accepted(result, template):
+                # Regions found but (nearly) empty here: rerun on the whole document
+                result = prune_page(
+                    raw_html,
+                    site_id,
+                    page_id,
+                    schema_name,
+                    max_tokens=_pruning_budget,
+                    task_hint=task_hint,
+                    page_url=page_url,
+                    record_boilerplate=False,
+                )
+                result.fast_path = "fallback"
+        if BOILERPLATE_INDEX_ENABLED:
+            boilerplate_index.record(page_url, result.boilerplate)
+        if TEMPLATE_FAST_PATH_ENABLED and template is not None and template is not _NO_TEMPLATE:
+            fast_path_stats.record(template.key.domain, result.fast_path or "generic", _time.monotonic() - t0)
         pruned_html = result.pruned_html
         selected_chunks = result.selected_chunks
         logger.info(
@@ -2862,13 +2912,14 @@ def build_pruned_context(
         try:
             from .metadata import extract_metadata
 
-            metadata = extract_metadata(
-                result.meta_chunks,
-                result.heading_chunks,
-                schema_name,
-                source_hint=_source_hint,
-                pruned_html=pruned_html,
-            )
+            with span("metadata"):
+                metadata = extract_metadata(
+                    result.meta_chunks,
+                    result.heading_chunks,
+                    schema_name,
+                    source_hint=_source_hint,
+                    pruned_html=pruned_html,
+                )
             if metadata:
                 logger.info("Structured metadata: %s", list(metadata.keys()))
         except Exception as e:
@@ -2923,7 +2974,8 @@ def build_pruned_context(
             compressor = _SCHEMA_COMPRESSORS.get(schema_name, _compress_default_dispatch)
             if compressor is not _compress_default_dispatch:
                 logger.debug("Schema compressor: %s (page_type=%s)", schema_name, page_type)
-    context = compressor(ctx)
+    with span("compressor"):
+        context = compressor(ctx)
     # Release DOM reference and raw HTML (memory)
     ctx.doc = None
     ctx.raw_html = ""
@@ -2938,7 +2990,8 @@ def build_pruned_context(
             context = context.rstrip() + "\n" + pagination
 
     # MCG: Minimum Content Guarantee — never return empty for a real page
-    context_tokens = count_tokens(context) if context.strip() else 0
+    with span("token_count"):
+        context_tokens = count_tokens(context) if context.strip() else 0
     _mcg_activated = False
     if context_tokens < _MCG_MIN_TOKENS and page_type not in _MCG_SKIP_TYPES and len(raw_html) > 500:
         context = _extract_minimum_content(
@@ -2954,6 +3007,8 @@ def build_pruned_context(
 
     token_count = count_tokens(context) if _mcg_activated else context_tokens
     _template_status = "hit" if (template is not None and template is not _NO_TEMPLATE) else "miss"
+    if result is not None and result.fast_path == "hit":
+        _template_status = "fast_path"
     logger.info(
         "pruned_context: %d tokens (budget: %d) prune=%.0fms meta=%.0fms compress=%.0fms template=%s",
         token_count,
@@ -87,7 +87,14 @@ class PruneReason(StrEnum):
 
 @dataclass(frozen=True, slots=True)
 class HtmlChunk:
-    """An atomic HTML chunk extracted from the DOM tree."""
+    """An atomic HTML chunk extracted from the DOM tree.
+
+    ``node_id`` / ``parent_id`` / ``branch_id`` are pre-order document
+    indices assigned during decomposition (-1 = not from the DOM, e.g.
+    META chunks or hand-built chunks).  Ordering, sibling and ancestry
+    checks compare these integers and fall back to the xpath strings
+    only when a chunk carries no index.
+    """
 
     xpath: str
     html: str
@@ -98,6 +105,14 @@ class HtmlChunk:
     parent_xpath: str = ""
     depth: int = 0
     in_main: bool = False
+    node_id: int = -1  # pre-order index of the element
+    parent_id: int = -1  # pre-order index of the parent element
+    branch_id: int = -1  # pre-order index of the top-level <body> child containing the element
+
+    @property
+    def parent_key(self) -> int | str:
+        """Grouping key for "same parent" checks (index when available, else parent_xpath)."""
+        return self.parent_id if self.parent_id >= 0 else self.parent_xpath
 
 
 class PruningError(PageMapError):
@@ -0,0 +1,299 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Per-site boilerplate index: drop chrome blocks already seen on other pages.
+
+Pages of one site repeat the same header, mega-menu, footer and cookie
+text, and :func:`prune_page` used to grid-scan, AOM-score, decompose,
+rule-match and token-count them on every visit.  With
+``PAGEMAP_BOILERPLATE_INDEX=1`` :data:`boilerplate_index` fingerprints the
+outermost *chrome blocks* of each page — ``header`` / ``nav`` / ``footer`` /
+``aside``, their ARIA roles, and elements whose id/class names a header,
+footer, menu or consent block — that do not hold ``main``, ``article`` or an
+``h1``.  A fingerprint is the structural path from ``<body>`` plus the
+block's normalized text (case, whitespace and digits folded).
+
+A fingerprint seen on ``MIN_PAGES`` distinct URLs of a site is
+boilerplate: on later pages the block is removed from the DOM right after
+preprocessing, before any other pruning stage.  Sites are registrable
+domains (``shop.example.co.uk`` and ``www.example.co.uk`` share chrome,
+unrelated ``.co.uk`` sites do not), and rebuilding one URL never counts
+twice however much its HTML changes (nonces, cart counts, post-click
+state).  Only identical normalized
+text qualifies, so page-specific navigation (breadcrumbs, active filters) never
+matches; a page whose chrome would exceed ``MAX_DROP_SHARE`` of its text
+(error and landing pages) is left whole.
+
+The index keeps ``MAX_BLOCKS_PER_SITE`` fingerprints for ``MAX_SITES``
+sites (LRU) and, with ``PAGEMAP_BOILERPLATE_INDEX_PATH``, persists them as
+JSON.  :class:`BoilerplateStats` reports pages, dropped blocks, tokens saved
+and the estimated pruning CPU saved (downstream pruning CPU of the page ×
+dropped share of its nodes).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlparse
+
+import lxml.html
+from lxml import etree
+
+from ..atomic_io import write_text_atomic
+from ..cache import normalize_cache_url
+from ..env import env_flag
+from ..preprocessing.preprocess import count_tokens_approx
+from ..stats import Counter, StatsCollector, register_collector
+
+logger = logging.getLogger(__name__)
+
+BOILERPLATE_INDEX_ENABLED = env_flag("PAGEMAP_BOILERPLATE_INDEX")
+BOILERPLATE_INDEX_PATH = os.environ.get("PAGEMAP_BOILERPLATE_INDEX_PATH", "").strip()
+
+MIN_PAGES = 3  # distinct pages a block must appear on before it is dropped
+MIN_TEXT_CHARS = 20  # shorter blocks are not worth a fingerprint
+MAX_DROP_SHARE = 0.6  # never drop more than this share of a page's text
+MAX_SITES = 512
+MAX_BLOCKS_PER_SITE = 256
+MAX_DEPTH = 12  # chrome blocks sit near the top of <body>
+SAVE_EVERY = 50  # persist after this many observed pages
+
+METRIC_PAGES = "pagemap_boilerplate_pages_total"
+METRIC_BLOCKS = "pagemap_boilerplate_blocks_dropped_total"
+METRIC_TOKENS = "pagemap_boilerplate_tokens_saved_total"
+METRIC_CPU = "pagemap_boilerplate_cpu_saved_seconds_total"
+
+_CHROME_TAGS = frozenset({"header", "nav", "footer", "aside"})
+_CHROME_ROLES = frozenset({"banner", "navigation", "contentinfo", "complementary"})
+_CONTENT_TAGS = frozenset({"main", "article"})
+_CHROME_HINT_RE = re.compile(
+    r"(?:^|[\s_-])(?:header|footer|gnb|lnb|nav|navbar|menu|megamenu|cookie|consent)(?:$|[\s_-])",
+    re.IGNORECASE,
+)
+_HOLDS_CONTENT = etree.XPath("boolean(.//main | .//article | .//h1 | .//*[@role='main'])")
+_DIGITS_RE = re.compile(r"\d+")
+# Second-level labels under two-letter country TLDs that are public suffixes (co.kr, co.uk, com.au, ne.jp…)
+_SECOND_LEVEL_SUFFIXES = frozenset({"ac", "co", "com", "edu", "go", "gov", "ne", "net", "or", "org"})
+_INDEX_VERSION = 2
+
+
+@dataclass(frozen=True, slots=True)
+class BoilerplateReport:
+    """What the index removed from one page."""
+
+    blocks: int
+    nodes: int
+    tokens_saved: int
+    cpu_saved_ms: float = 0.0  # estimated; filled in by prune_page
+
+
+def _is_chrome(el: lxml.html.HtmlElement, tag: str) -> bool:
+    if tag in _CHROME_TAGS or el.get("role", "").lower() in _CHROME_ROLES:
+        return True
+    hint = f"{el.get('id', '')} {el.get('class', '')}"
+    return bool(hint.strip()) and _CHROME_HINT_RE.search(hint) is not None
+
+
+def _chrome_blocks(
+    el: lxml.html.HtmlElement, path: str = "body", depth: int = 0
+) -> Iterator[tuple[lxml.html.HtmlElement, str]]:
+    """Outermost chrome blocks below *el* that hold no main content, with their paths."""
+    if depth > MAX_DEPTH:
+        return
+    for child in el:
+        if not isinstance(child.tag, str):
+            continue
+        tag = child.tag.lower()
+        role = child.get("role", "").lower()
+        if tag in _CONTENT_TAGS or role == "main":
+            continue
+        child_path = f"{path}/{tag}[{role}]" if role else f"{path}/{tag}"
+        if _is_chrome(child, tag) and not _HOLDS_CONTENT(child):
+            yield child, child_path
+        else:
+            yield from _chrome_blocks(child, child_path, depth + 1)
+
+
+def _registrable_domain(url: str) -> str:
+    """Site key for *url*: ``shop.example.co.kr`` → ``example.co.kr``. Empty without a host."""
+    try:
+        host = (urlparse(url).hostname or "").rstrip(".")
+    except ValueError:
+        return ""
+    labels = host.split(".")
+    if len(labels) <= 2 or labels[-1].isdigit():  # bare domain, localhost, IPv4
+        return host
+    keep = 3 if len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL_SUFFIXES else 2
+    return ".".join(labels[-keep:])
+
+
+def _normalize(text: str) -> str:
+    return _DIGITS_RE.sub("0", " ".join(text.split()).lower())
+
+
+def _fingerprint(path: str, text: str) -> str:
+    return hashlib.blake2b(f"{path}\x00{text}".encode(), digest_size=8).hexdigest()
+
+
+class BoilerplateStats(StatsCollector):
+    """Boilerplate drop counters, per page outcome (``dropped`` / ``none``)."""
+
+    LABELS = ("outcome",)
+    FIELDS = ("pages", "blocks", "tokens", "cpu_ms")
+    SEED = (("dropped",), ("none",))
+    COUNTERS = (
+        Counter(METRIC_PAGES, "Pruned pages by boilerplate outcome", "pages"),
+        Counter(METRIC_BLOCKS, "Boilerplate blocks dropped before pruning", "blocks", labelled=False),
+        Counter(METRIC_TOKENS, "Approximate tokens in dropped boilerplate", "tokens", labelled=False),
+        Counter(METRIC_CPU, "Estimated pruning CPU saved by boilerplate drops", "cpu_ms", labelled=False, scale=0.001),
+    )
+
+    __slots__ = ()
+
+    def record_page(self, report: BoilerplateReport | None) -> None:
+        if report is None:
+            self.add(("none",), 1)
+        else:
+            self.add(("dropped",), 1, report.blocks, report.tokens_saved, report.cpu_saved_ms)
+
+    def snapshot(self) -> dict[str, float]:
+        rows = self.rows()
+        dropped, blocks, tokens, cpu_ms = rows[("dropped",)]
+        pages = dropped + rows[("none",)][0]
+        snap: dict[str, float] = {
+            "pages": pages,
+            "pages_dropped": dropped,
+            "blocks": blocks,
+            "tokens_saved": tokens,
+            "cpu_saved_ms": round(cpu_ms, 1),
+        }
+        snap["avg_tokens_saved"] = round(snap["tokens_saved"] / pages, 1) if pages else 0.0
+        snap["avg_cpu_saved_ms"] = round(snap["cpu_saved_ms"] / pages, 2) if pages else 0.0
+        return snap
+
+
+class BoilerplateIndex:
+    """registrable domain → {block fingerprint → distinct page URL digests}.  Thread-safe."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._path = Path(path) if path else None
+        self._sites: OrderedDict[str, OrderedDict[str, list[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._unsaved = 0
+        self.stats = BoilerplateStats()
+        if self._path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._sites)
+
+    def known_blocks(self, site: str) -> int:
+        """Fingerprints of *site* (a registrable domain) that are already treated as boilerplate."""
+        with self._lock:
+            blocks = self._sites.get(site, {})
+            return sum(1 for pages in blocks.values() if len(pages) >= MIN_PAGES)
+
+    def apply(self, page_url: str, doc: lxml.html.HtmlElement) -> BoilerplateReport | None:
+        """Drop known boilerplate from *doc* (the page at *page_url*) in place and learn its chrome blocks.
+
+        Returns what was dropped, or None if nothing was (always None without a URL host).
+        Stats are not touched: call :meth:`record` once for the pruning run that is kept.
+        """
+        site_id = _registrable_domain(page_url)
+        if not site_id:
+            return None
+        body = doc.body if doc.body is not None else doc
+        page = hashlib.blake2b(normalize_cache_url(page_url).encode(), digest_size=8).hexdigest()
+        blocks: list[tuple[lxml.html.HtmlElement, str, str]] = []
+        for el, path in _chrome_blocks(body):
+            text = _normalize(el.text_content())
+            if len(text) >= MIN_TEXT_CHARS:
+                blocks.append((el, _fingerprint(path, text), text))
+
+        with self._lock:
+            site = self._sites.get(site_id)
+            if site is None:
+                site = self._sites[site_id] = OrderedDict()
+                while len(self._sites) > MAX_SITES:
+                    self._sites.popitem(last=False)
+            self._sites.move_to_end(site_id)
+            known = [(el, text) for el, fp, text in blocks if len(site.get(fp, ())) >= MIN_PAGES]
+            for _el, fp, _text in blocks:
+                pages = site.get(fp)
+                if pages is None:
+                    pages = site[fp] = []
+                    while len(site) > MAX_BLOCKS_PER_SITE:
+                        site.popitem(last=False)
+                site.move_to_end(fp)
+                if len(pages) < MIN_PAGES and page not in pages:
+                    pages.append(page)
+
+        report = None
+        if known:
+            dropped_chars = sum(len(text) for _el, text in known)
+            if dropped_chars <= MAX_DROP_SHARE * len(_normalize(body.text_content())):
+                report = BoilerplateReport(
+                    blocks=len(known),
+                    nodes=sum(sum(1 for _ in el.iter()) for el, _text in known),
+                    tokens_saved=sum(count_tokens_approx(text) for _el, text in known),
+                )
+                for el, _text in known:
+                    el.drop_tree()
+        return report
+
+    def record(self, page_url: str, report: BoilerplateReport | None) -> None:
+        """Count one pruned page (skipped without a URL host) and persist every ``SAVE_EVERY`` pages."""
+        if not _registrable_domain(page_url):
+            return
+        self.stats.record_page(report)
+        with self._lock:
+            self._unsaved += 1
+            save_due = self._path is not None and self._unsaved >= SAVE_EVERY
+        if save_due:
+            self.save()
+
+    # -- persistence --
+
+    def save(self) -> None:
+        """Atomically write the index to its path. Never raises."""
+        with self._lock:
+            self._unsaved = 0
+            if self._path is None:
+                return
+            payload = json.dumps(
+                {"version": _INDEX_VERSION, "sites": {site: dict(blocks) for site, blocks in self._sites.items()}},
+                separators=(",", ":"),
+            )
+        try:
+            write_text_atomic(self._path, payload)
+        except Exception as e:
+            logger.debug("Boilerplate index not saved: %s", e)
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))  # type: ignore[union-attr]
+            if data.get("version") != _INDEX_VERSION:
+                return
+            for site_id, blocks in list(data.get("sites", {}).items())[-MAX_SITES:]:
+                self._sites[site_id] = OrderedDict(
+                    (fp, [str(p) for p in pages][:MIN_PAGES])
+                    for fp, pages in list(blocks.items())[-MAX_BLOCKS_PER_SITE:]
+                )
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable boilerplate index %s: %s", self._path, e)
+            self._sites.clear()
+
+
+boilerplate_index = BoilerplateIndex(BOILERPLATE_INDEX_PATH or None)
+register_collector("boilerplate", lambda: boilerplate_index.stats if BOILERPLATE_INDEX_ENABLED else None)
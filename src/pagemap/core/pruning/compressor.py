@@ -69,6 +69,17 @@ def _xpath_sort_key(xpath: str) -> tuple[tuple[str, int], ...]:
     return tuple(parts)
 
 
+def _doc_order_key(chunk: HtmlChunk) -> tuple[int, int, tuple[tuple[str, int], ...]]:
+    """Document-order sort key: integer ``node_id`` first, xpath parsing only for unindexed chunks.
+
+    Indexed DOM chunks sort ahead of unindexed ones (META, hand-built),
+    which keep the legacy xpath ordering among themselves.
+    """
+    if chunk.node_id >= 0:
+        return (0, chunk.node_id, ())
+    return (1, 0, _xpath_sort_key(chunk.xpath))
+
+
 # Attributes to preserve during compression
 _KEEP_ATTRS = {
     "itemprop",
@@ -142,30 +153,31 @@ def remerge_chunks(chunks: list[HtmlChunk], *, enable_block_tree: bool = True) -
     """Re-merge selected chunks into a single HTML string.
 
     When enable_block_tree=True (default), consecutive chunks sharing
-    the same parent_xpath are wrapped in a parent tag with a
+    the same parent are wrapped in a parent tag with a
     data-section attribute for structure preservation (HtmlRAG principle).
     """
     if not chunks:
         return ""
 
-    # Sort by xpath to approximate document order
-    sorted_chunks = sorted(chunks, key=lambda c: _xpath_sort_key(c.xpath))
+    # Sort into document order (integer node ids; xpath fallback for unindexed chunks)
+    sorted_chunks = sorted(chunks, key=_doc_order_key)
 
     if not enable_block_tree:
         parts = [c.html for c in sorted_chunks]
         inner = "\n".join(parts)
         return f"<html><body>\n{inner}\n</body></html>"
 
-    # Group consecutive chunks by parent_xpath
-    groups: list[tuple[str, list[HtmlChunk]]] = []
+    # Group consecutive chunks by parent
+    groups: list[tuple[int | str, list[HtmlChunk]]] = []
     for chunk in sorted_chunks:
-        if groups and groups[-1][0] == chunk.parent_xpath:
+        if groups and groups[-1][0] == chunk.parent_key:
             groups[-1][1].append(chunk)
         else:
-            groups.append((chunk.parent_xpath, [chunk]))
+            groups.append((chunk.parent_key, [chunk]))
 
     parts: list[str] = []
-    for parent_xpath, group_chunks in groups:
+    for _parent_key, group_chunks in groups:
+        parent_xpath = group_chunks[0].parent_xpath
         inner_html = "\n".join(c.html for c in group_chunks)
         wrapper_tag = _extract_wrapper_tag(parent_xpath)
         if wrapper_tag and len(group_chunks) > 1:
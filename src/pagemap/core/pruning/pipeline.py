@@ -22,19 +22,22 @@ from __future__ import annotations
 import contextlib
 import logging
 import time
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from ..config_registry import PruningConfig
 
+from ..pipeline_timer import span
 from ..preprocessing.preprocess import count_tokens, count_tokens_approx
 from . import HtmlChunk, PruningError
 from .aom_filter import AomFilterStats, _detect_repeating_grids, aom_filter
+from .boilerplate import BOILERPLATE_INDEX_ENABLED, BoilerplateReport, boilerplate_index
 from .compressor import compress_html, remerge_chunks
 from .context import StageAlphas, _clamp, build_pruning_context, compute_stage_alphas
 from .preprocessor import _decompose_element, preprocess
 from .pruner import PruneDecision, apply_budget_selection, boost_adjacent_chunks, prune_chunks
+from .regions import chrome_holders, isolate_content_regions, learn_content_regions
 
 logger = logging.getLogger(__name__)
 
@@ -73,6 +76,10 @@ class PruningResult:
     task_hint: str | None = None  # A1: task hint used
     interactive_chunk_total: int = 0  # A4: chunks with >=1 interactive element
     interactive_chunk_selected: int = 0  # A4: kept chunks with >=1 interactive element
+    boilerplate: BoilerplateReport | None = None  # site chrome dropped before pruning
+    schema_name: str = ""  # schema the page was pruned with
+    fast_path: str = ""  # "hit" | "fallback" when template content regions were given
+    content_regions: tuple[str, ...] = ()  # learned region selectors (learn_regions=True only)
 
 
 def prune_page(
@@ -84,6 +91,10 @@ def prune_page(
     config: PruningConfig | None = None,
     max_tokens: int | None = None,
     task_hint: str | None = None,
+    content_regions: tuple[str, ...] = (),
+    learn_regions: bool = False,
+    page_url: str = "",
+    record_boilerplate: bool = True,
 ) -> PruningResult:
     """Run the full pruning pipeline on a single page.
 
@@ -96,22 +107,46 @@ def prune_page(
         max_tokens: Optional token budget. When set, activates A2
             context-aware pruning (budget_pressure < 1.0 → elevated
             alphas) and budget_selection.
+        content_regions: Template fast path — region selectors that replace
+            ``<body>`` before grid detection / AOM filter / decomposition.
+            Falls back to the whole page (``fast_path="fallback"``) if any
+            selector does not match exactly one element.
+        learn_regions: Learn ``content_regions`` from the selected chunks.
+        page_url: Page URL for the cross-page boilerplate index (skipped
+            when empty).
+        record_boilerplate: Count this run in the boilerplate stats. Callers
+            that may rerun the page pass False and call
+            ``boilerplate_index.record`` once for the run they keep.
 
     Returns:
         PruningResult with pruned HTML and metrics
     """
-    result = PruningResult(site_id=site_id, page_id=page_id)
+    result = PruningResult(site_id=site_id, page_id=page_id, schema_name=schema_name)
     start = time.monotonic()
 
     try:
         # Measure raw tokens (approx for large HTML — metrics only, not budget-critical)
-        if len(raw_html) > 50_000:
-            result.raw_token_count = count_tokens_approx(raw_html)
-        else:
-            result.raw_token_count = count_tokens(raw_html)
-
-        # Step 1-3: Preprocess (no chunk decomposition yet)
-        meta_chunks, doc = preprocess(raw_html)
+        with span("preprocess"):
+            if len(raw_html) > 50_000:
+                result.raw_token_count = count_tokens_approx(raw_html)
+            else:
+                result.raw_token_count = count_tokens(raw_html)
+
+            # Step 1-3: Preprocess (no chunk decomposition yet)
+            meta_chunks, doc = preprocess(raw_html)
+
+        # Step 3.1: Drop site boilerplate already seen on earlier pages (opt-in)
+        if BOILERPLATE_INDEX_ENABLED:
+            with span("boilerplate"):
+                result.boilerplate = boilerplate_index.apply(page_url, doc)
+        pruning_cpu_start = time.thread_time()
+
+        # Step 3.2: Template fast path — keep only the known content regions
+        if content_regions:
+            with span("content_regions"):
+                regions = isolate_content_regions(doc, content_regions)
+            result.fast_path = "hit" if regions is not None else "fallback"
+        holders = chrome_holders(doc) if learn_regions else None
 
         cfg = config or _default_cfg()
 
@@ -159,18 +194,20 @@ def prune_page(
         # but budget_pressure — the dominant signal — is unaffected.)
 
         # Step 3.5: Detect repeating grids for AOM whitelist
-        grid_whitelist = _detect_repeating_grids(doc)
+        with span("grid_detect"):
+            grid_whitelist = _detect_repeating_grids(doc)
         if grid_whitelist:
             logger.info("Grid whitelist: %d containers", len(grid_whitelist))
 
         # Step 4: AOM filter (in-place on DOM, with grid whitelist)
-        result.aom_filter_stats = aom_filter(
-            doc,
-            schema_name=schema_name,
-            threshold=0.5 * alphas.aom,
-            grid_whitelist=grid_whitelist,
-            enable_text_density=cfg.enable_text_density_signal,
-        )
+        with span("aom_filter"):
+            result.aom_filter_stats = aom_filter(
+                doc,
+                schema_name=schema_name,
+                threshold=0.5 * alphas.aom,
+                grid_whitelist=grid_whitelist,
+                enable_text_density=cfg.enable_text_density_signal,
+            )
 
         # Preserve post-AOM doc for downstream DOM card detection
         result.doc = doc
@@ -178,12 +215,13 @@ def prune_page(
         # Step 5: Chunk decomposition — single pass after AOM filter
         body = doc.body if doc.body is not None else doc
         tree = doc.getroottree()
-        dom_chunks = _decompose_element(
-            body,
-            tree,
-            enable_sibling_grouping=cfg.enable_sibling_grouping,
-            grouping_alpha=alphas.grouping,
-        )
+        with span("decompose"):
+            dom_chunks = _decompose_element(
+                body,
+                tree,
+                enable_sibling_grouping=cfg.enable_sibling_grouping,
+                grouping_alpha=alphas.grouping,
+            )
         all_chunks = meta_chunks + dom_chunks
 
         result.chunk_count_total = len(all_chunks)
@@ -209,12 +247,13 @@ def prune_page(
             pass
 
         # Step 5: Rule-based pruning
-        decisions = prune_chunks(all_chunks, schema_name, has_main=has_main, config=config, stage_alpha=alphas.rule)
+        with span("rule_prune"):
+            decisions = prune_chunks(all_chunks, schema_name, has_main=has_main, config=config, stage_alpha=alphas.rule)
 
-        # Step 5b: Adjacent chunk boosting
-        if cfg.enable_adjacent_boost:
-            flip_count = boost_adjacent_chunks(decisions)
-            result.boost_flip_count = flip_count
+            # Step 5b: Adjacent chunk boosting
+            if cfg.enable_adjacent_boost:
+                flip_count = boost_adjacent_chunks(decisions)
+                result.boost_flip_count = flip_count
 
         # Step 5c: A1 fitness scoring (task_hint present only)
         validated_hint = None
@@ -238,7 +277,8 @@ def prune_page(
 
         # Step 5d: Budget-aware selection (greedy deletion of lowest-score chunks)
         if max_tokens is not None and cfg.enable_scoring:
-            apply_budget_selection(decisions, max_tokens, score_bias=alphas.budget)
+            with span("budget_select"):
+                apply_budget_selection(decisions, max_tokens, score_bias=alphas.budget)
 
         # Step 5e: A5 tier processing (task_hint present only)
         if validated_hint is not None:
@@ -276,6 +316,8 @@ def prune_page(
         result.chunk_count_selected = len(selected)
         result.selected_chunks = selected
         result.selected_decisions = {c.xpath: d for c, d in decisions if d.keep}
+        if holders is not None:
+            result.content_regions = learn_content_regions(doc, selected, holders)
 
         # A4: compute interactive chunk counts for PruningOutputProfile
         try:
@@ -283,11 +325,10 @@ def prune_page(
 
             _int_total = 0
             _int_selected = 0
-            _kept_xpaths = result.selected_decisions or {}
             for chunk, _dec in decisions:
                 if _INTERACTIVE_RE.search(chunk.html):
                     _int_total += 1
-                    if chunk.xpath in _kept_xpaths:
+                    if _dec.keep:
                         _int_selected += 1
             result.interactive_chunk_total = _int_total
             result.interactive_chunk_selected = _int_selected
@@ -302,14 +343,17 @@ def prune_page(
             return result
 
         # Step 6: Re-merge (with block-tree parent preservation)
-        merged = remerge_chunks(selected, enable_block_tree=cfg.enable_block_tree_remerge)
+        with span("remerge"):
+            merged = remerge_chunks(selected, enable_block_tree=cfg.enable_block_tree_remerge)
 
         # Step 7: HTMLRAG Pass 2 compression
-        compressed = compress_html(merged, extra_passes=alphas.compress)
+        with span("compress"):
+            compressed = compress_html(merged, extra_passes=alphas.compress)
         result.pruned_html = compressed
 
         # Token measurement
-        result.pruned_token_count = count_tokens(compressed)
+        with span("token_count"):
+            result.pruned_token_count = count_tokens(compressed)
         if result.raw_token_count > 0:
             result.token_reduction_pct = (1.0 - result.pruned_token_count / result.raw_token_count) * 100
 
@@ -323,11 +367,25 @@ def prune_page(
         result.pruned_html = raw_html
         result.pruned_token_count = count_tokens(raw_html) if raw_html else 0
         logger.error("Unexpected error for %s/%s: %s", site_id, page_id, e, exc_info=True)
+    else:
+        if result.boilerplate is not None:
+            result.boilerplate = _estimate_boilerplate_cpu(
+                result.boilerplate, time.thread_time() - pruning_cpu_start, result.aom_filter_stats.total_nodes
+            )
+
+    if record_boilerplate and BOILERPLATE_INDEX_ENABLED:
+        boilerplate_index.record(page_url, result.boilerplate)
 
     result.elapsed_ms = (time.monotonic() - start) * 1000
     return result
 
 
+def _estimate_boilerplate_cpu(report: BoilerplateReport, cpu_s: float, remaining_nodes: int) -> BoilerplateReport:
+    """Scale the page's pruning CPU by the dropped share of its nodes."""
+    saved_ms = cpu_s * 1000 * report.nodes / max(report.nodes + remaining_nodes, 1)
+    return replace(report, cpu_saved_ms=round(saved_ms, 3))
+
+
 def measure_pruner_recall(
     pruned_html: str,
     ground_truth: dict,
@@ -14,10 +14,12 @@ from __future__ import annotations
 
 import logging
 import re
+from dataclasses import dataclass
 
 import lxml.html
 from lxml import etree
 
+from ..embedded_data import embedded_data
 from . import ChunkType, HtmlChunk, PruningError
 
 logger = logging.getLogger(__name__)
@@ -80,9 +82,6 @@ _HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
 # Semantic container tags that recurse into children
 _CONTAINER_TAGS = {"article", "section", "main", "aside", "nav", "header", "footer", "div", "body", "html"}
 
-# RSC payload pattern
-_RSC_PATTERN = re.compile(r"self\.__next_f\.push\(\s*\[.*?\]\s*\)", re.DOTALL)
-
 _RSC_PAYLOAD_TRUNCATE_LEN = 500
 
 _MAX_DECOMPOSE_DEPTH = 100
@@ -96,16 +95,12 @@ _SIBLING_MIN_MERGE_CHARS = 20  # minimum text length for merge eligibility (pric
 def _extract_json_ld(html: str) -> list[HtmlChunk]:
     """Extract JSON-LD scripts from raw HTML before stripping."""
     chunks = []
-    pattern = re.compile(
-        r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>',
-        re.DOTALL | re.IGNORECASE,
-    )
-    for i, m in enumerate(pattern.finditer(html)):
-        content = m.group(1).strip()
+    for payload in embedded_data(html).json_ld:
+        content = payload.text.strip()
         if content:
             chunks.append(
                 HtmlChunk(
-                    xpath=f"/json-ld[{i}]",
+                    xpath=f"/json-ld[{payload.index}]",
                     html=f'<script type="application/ld+json">{content}</script>',
                     text=content,
                     tag="script",
@@ -152,22 +147,18 @@ def _extract_og_meta(html: str) -> list[HtmlChunk]:
 def _extract_rsc_data(html: str) -> list[HtmlChunk]:
     """Extract Next.js RSC payload data (Naver News date extraction)."""
     chunks = []
-    # Find self.__next_f.push() calls
-    pattern = re.compile(
-        r"<script[^>]*>((?:(?!</script>).)*self\.__next_f\.push\((?:(?!</script>).)*\)(?:(?!</script>).)*)(?:</script>)",
-        re.DOTALL | re.IGNORECASE,
-    )
     date_pattern = re.compile(r"\d{4}[-./]\d{1,2}[-./]\d{1,2}")
 
-    for i, m in enumerate(pattern.finditer(html)):
-        content = m.group(1)
+    # self.__next_f.push() calls
+    for payload in embedded_data(html).rsc:
+        content = payload.text
         # Look for date-like data in RSC payloads
         dates = date_pattern.findall(content)
         if dates:
             text = f"RSC dates: {', '.join(dates)}"
             chunks.append(
                 HtmlChunk(
-                    xpath=f"/rsc-data[{i}]",
+                    xpath=f"/rsc-data[{payload.index}]",
                     html=f"<script>{content[:_RSC_PAYLOAD_TRUNCATE_LEN]}</script>",
                     text=text,
                     tag="script",
@@ -274,6 +265,68 @@ def _is_in_main(el: lxml.html.HtmlElement) -> bool:
     return False
 
 
+@dataclass(slots=True)
+class _DocIndex:
+    """Pre-order integer positions for every element of a parsed tree."""
+
+    order: dict[etree._Element, int]
+    depth: dict[etree._Element, int]
+    branch: dict[etree._Element, int]
+
+
+def _build_doc_index(tree: etree._ElementTree) -> _DocIndex:
+    """Number every element in document order with a single tree walk.
+
+    ``branch`` maps each element to the pre-order id of its depth-2
+    ancestor-or-self (``/html/body/X``), -1 above that level.
+    """
+    order: dict[etree._Element, int] = {}
+    depth: dict[etree._Element, int] = {}
+    branch: dict[etree._Element, int] = {}
+    level = 0
+    current_branch = -1
+    for event, el in etree.iterwalk(tree.getroot(), events=("start", "end")):
+        if event == "end":
+            level -= 1
+            continue
+        idx = len(order)
+        order[el] = idx
+        depth[el] = level
+        if level == 2:
+            current_branch = idx
+        branch[el] = current_branch if level >= 2 else -1
+        level += 1
+    return _DocIndex(order=order, depth=depth, branch=branch)
+
+
+def _element_chunk(
+    el: lxml.html.HtmlElement,
+    tree: etree._ElementTree,
+    index: _DocIndex,
+    *,
+    tag: str,
+    text: str,
+    chunk_type: ChunkType,
+    in_main: bool,
+) -> HtmlChunk:
+    """Build an HtmlChunk for a DOM element, stamping its document-order indices."""
+    parent = el.getparent()
+    return HtmlChunk(
+        xpath=tree.getpath(el),
+        html=_get_html(el),
+        text=text,
+        tag=tag,
+        chunk_type=chunk_type,
+        attrs=_get_semantic_attrs(el),
+        parent_xpath=tree.getpath(parent) if parent is not None else "",
+        depth=index.depth[el] if el in index.depth else _compute_depth(el),
+        in_main=in_main,
+        node_id=index.order.get(el, -1),
+        parent_id=index.order.get(parent, -1) if parent is not None else -1,
+        branch_id=index.branch.get(el, -1),
+    )
+
+
 _CJK_RE = re.compile(r"[\u3040-\u30FF\u4E00-\u9FFF\uAC00-\uD7AF]")
 
 
@@ -283,11 +336,11 @@ def _has_cjk(text: str) -> bool:
 
 
 def _group_small_siblings(chunks: list[HtmlChunk], *, alpha: float = 1.0) -> list[HtmlChunk]:
-    """Merge consecutive small TEXT_BLOCK chunks that share the same parent_xpath.
+    """Merge consecutive small TEXT_BLOCK chunks that share the same parent.
 
     Grouping rules:
       - Only TEXT_BLOCK chunks with len(text) < _SIBLING_SINGLE_MAX_CHARS are eligible.
-      - Consecutive eligible chunks sharing the same parent_xpath are merged
+      - Consecutive eligible chunks sharing the same parent (``parent_key``) are merged
         if their combined text < _SIBLING_GROUP_MAX_CHARS.
       - HEADING and atomic chunks (TABLE, LIST, FORM, MEDIA) stay standalone.
       - Cross-script merging prevented (CJK vs non-CJK).
@@ -307,7 +360,7 @@ def _group_small_siblings(chunks: list[HtmlChunk], *, alpha: float = 1.0) -> lis
     grouped: list[HtmlChunk] = []
     buf: list[HtmlChunk] = []
     buf_chars = 0
-    buf_parent = ""
+    buf_parent: int | str = ""
 
     def _flush() -> None:
         nonlocal buf, buf_chars, buf_parent
@@ -329,6 +382,9 @@ def _group_small_siblings(chunks: list[HtmlChunk], *, alpha: float = 1.0) -> lis
                     parent_xpath=buf[0].parent_xpath,
                     depth=buf[0].depth,
                     in_main=any(c.in_main for c in buf),
+                    node_id=buf[0].node_id,
+                    parent_id=buf[0].parent_id,
+                    branch_id=buf[0].branch_id,
                 )
             )
         buf = []
@@ -354,7 +410,7 @@ def _group_small_siblings(chunks: list[HtmlChunk], *, alpha: float = 1.0) -> lis
             continue
 
         # Check parent continuity
-        if buf and chunk.parent_xpath != buf_parent:
+        if buf and chunk.parent_key != buf_parent:
             _flush()
 
         # Check script consistency (prevent CJK + non-CJK merging)
@@ -367,7 +423,7 @@ def _group_small_siblings(chunks: list[HtmlChunk], *, alpha: float = 1.0) -> lis
 
         buf.append(chunk)
         buf_chars += len(chunk.text)
-        buf_parent = chunk.parent_xpath
+        buf_parent = chunk.parent_key
 
     _flush()
     return grouped
@@ -381,8 +437,13 @@ def _decompose_element(
     max_depth: int = _MAX_DECOMPOSE_DEPTH,
     enable_sibling_grouping: bool = True,
     grouping_alpha: float = 1.0,
+    index: _DocIndex | None = None,
 ) -> list[HtmlChunk]:
-    """Recursively decompose a DOM element into atomic chunks."""
+    """Recursively decompose a DOM element into atomic chunks.
+
+    ``index`` is built once on the outermost call and shared by the
+    recursion so every chunk carries integer document-order ids.
+    """
     if depth > max_depth:
         logger.warning(
             "Max decomposition depth %d exceeded at <%s>, skipping subtree",
@@ -400,6 +461,9 @@ def _decompose_element(
     if tag in _REMOVE_TAGS:
         return []
 
+    if index is None:
+        index = _build_doc_index(tree)
+
     text = _get_text(el)
 
     # Atomic boundary tags — whole subtree = 1 chunk
@@ -407,15 +471,13 @@ def _decompose_element(
         if not text:
             return []
         return [
-            HtmlChunk(
-                xpath=tree.getpath(el),
-                html=_get_html(el),
-                text=text,
+            _element_chunk(
+                el,
+                tree,
+                index,
                 tag=tag,
+                text=text,
                 chunk_type=_ATOMIC_TAGS[tag],
-                attrs=_get_semantic_attrs(el),
-                parent_xpath=tree.getpath(el.getparent()) if el.getparent() is not None else "",
-                depth=_compute_depth(el),
                 in_main=_is_in_main(el) or tag == "main",
             )
         ]
@@ -425,17 +487,7 @@ def _decompose_element(
         if not text:
             return []
         return [
-            HtmlChunk(
-                xpath=tree.getpath(el),
-                html=_get_html(el),
-                text=text,
-                tag=tag,
-                chunk_type=ChunkType.HEADING,
-                attrs=_get_semantic_attrs(el),
-                parent_xpath=tree.getpath(el.getparent()) if el.getparent() is not None else "",
-                depth=_compute_depth(el),
-                in_main=_is_in_main(el),
-            )
+            _element_chunk(el, tree, index, tag=tag, text=text, chunk_type=ChunkType.HEADING, in_main=_is_in_main(el))
         ]
 
     # Paragraph — independent text block
@@ -443,16 +495,8 @@ def _decompose_element(
         if not text:
             return []
         return [
-            HtmlChunk(
-                xpath=tree.getpath(el),
-                html=_get_html(el),
-                text=text,
-                tag=tag,
-                chunk_type=ChunkType.TEXT_BLOCK,
-                attrs=_get_semantic_attrs(el),
-                parent_xpath=tree.getpath(el.getparent()) if el.getparent() is not None else "",
-                depth=_compute_depth(el),
-                in_main=_is_in_main(el),
+            _element_chunk(
+                el, tree, index, tag=tag, text=text, chunk_type=ChunkType.TEXT_BLOCK, in_main=_is_in_main(el)
             )
         ]
 
@@ -471,6 +515,7 @@ def _decompose_element(
                             max_depth=max_depth,
                             enable_sibling_grouping=enable_sibling_grouping,
                             grouping_alpha=grouping_alpha,
+                            index=index,
                         )
                     )
             return _group_small_siblings(chunks, alpha=grouping_alpha) if enable_sibling_grouping else chunks
@@ -479,16 +524,8 @@ def _decompose_element(
             if not text:
                 return []
             return [
-                HtmlChunk(
-                    xpath=tree.getpath(el),
-                    html=_get_html(el),
-                    text=text,
-                    tag=tag,
-                    chunk_type=ChunkType.TEXT_BLOCK,
-                    attrs=_get_semantic_attrs(el),
-                    parent_xpath=tree.getpath(el.getparent()) if el.getparent() is not None else "",
-                    depth=_compute_depth(el),
-                    in_main=_is_in_main(el),
+                _element_chunk(
+                    el, tree, index, tag=tag, text=text, chunk_type=ChunkType.TEXT_BLOCK, in_main=_is_in_main(el)
                 )
             ]
 
@@ -506,21 +543,14 @@ def _decompose_element(
                             max_depth=max_depth,
                             enable_sibling_grouping=enable_sibling_grouping,
                             grouping_alpha=grouping_alpha,
+                            index=index,
                         )
                     )
             return chunks
         elif text:
             return [
-                HtmlChunk(
-                    xpath=tree.getpath(el),
-                    html=_get_html(el),
-                    text=text,
-                    tag=tag,
-                    chunk_type=ChunkType.TEXT_BLOCK,
-                    attrs=_get_semantic_attrs(el),
-                    parent_xpath=tree.getpath(el.getparent()) if el.getparent() is not None else "",
-                    depth=_compute_depth(el),
-                    in_main=_is_in_main(el),
+                _element_chunk(
+                    el, tree, index, tag=tag, text=text, chunk_type=ChunkType.TEXT_BLOCK, in_main=_is_in_main(el)
                 )
             ]
 
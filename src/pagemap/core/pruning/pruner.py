@@ -475,6 +475,17 @@ def _xpath_common_depth(xpath1: str, xpath2: str) -> int:
 _PRICE_SAME_CONTAINER_DEPTH = 3  # /html/body/divX 이상 공유 필요
 
 
+def _same_price_container(first: HtmlChunk, chunk: HtmlChunk) -> bool:
+    """True when both chunks live under the same top-level ``<body>`` child.
+
+    Compares integer ``branch_id`` when both chunks are indexed; falls
+    back to xpath segment matching otherwise.
+    """
+    if first.branch_id >= 0 and chunk.branch_id >= 0:
+        return first.branch_id == chunk.branch_id
+    return _xpath_common_depth(first.xpath, chunk.xpath) >= _PRICE_SAME_CONTAINER_DEPTH
+
+
 # ---------------------------------------------------------------------------
 # Pruner
 # ---------------------------------------------------------------------------
@@ -527,7 +538,7 @@ def boost_adjacent_chunks(
 ) -> int:
     """Boost scores of chunks adjacent to SCHEMA_MATCH chunks.
 
-    Only boosts neighbours sharing the same parent_xpath (prevents
+    Only boosts neighbours sharing the same parent (prevents
     cross-section contamination).  Rejected chunks that reach the
     threshold and have sufficient text are flipped to keep=True.
 
@@ -546,13 +557,15 @@ def boost_adjacent_chunks(
     boost_map: dict[int, float] = {}
     for si in schema_indices:
         src_chunk = results[si][0]
+        src_parent = src_chunk.parent_key
+        if src_parent == "":
+            continue
         for dist in range(1, _ADJACENT_BOOST_RANGE + 1):
             boost = _ADJACENT_BOOST_PER_DISTANCE / dist
             for ni in (si - dist, si + dist):
                 if 0 <= ni < len(results):
-                    neighbour_chunk = results[ni][0]
-                    # Only boost same parent_xpath neighbours
-                    if neighbour_chunk.parent_xpath and neighbour_chunk.parent_xpath == src_chunk.parent_xpath:
+                    # Only boost same-parent neighbours
+                    if results[ni][0].parent_key == src_parent:
                         boost_map[ni] = max(boost_map.get(ni, 0.0), boost)
 
     # Apply boosts
@@ -692,7 +705,7 @@ def prune_chunks(
     results: list[tuple[HtmlChunk, PruneDecision]] = []
 
     # For Coupang: track first product price block to detect recommendation repeats
-    first_price_xpath: str | None = None
+    first_price_chunk: HtmlChunk | None = None
     price_count = 0
 
     for chunk in chunks:
@@ -722,11 +735,10 @@ def prune_chunks(
             # Rule 6: Coupang recommendation filtering
             if schema_name == "Product" and "price" in matched_fields:
                 price_count += 1
-                if first_price_xpath is None:
-                    first_price_xpath = chunk.xpath
+                if first_price_chunk is None:
+                    first_price_chunk = chunk
                 elif price_count > cfg.coupang_price_count_limit and not chunk.in_main:
-                    shared = _xpath_common_depth(first_price_xpath, chunk.xpath)
-                    if shared < _PRICE_SAME_CONTAINER_DEPTH:
+                    if not _same_price_container(first_price_chunk, chunk):
                         # Different container → likely recommendation section
                         results.append(
                             (
@@ -0,0 +1,144 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Content-region selectors for the template fast path.
+
+A *content region* is an element addressable by a selector that survives
+across pages of one template — ``//main``, ``//*[@role='main']`` or
+``//*[@id='…']`` (ids with 3+ digit runs are treated as page-specific).
+
+:func:`learn_content_regions` runs on the first build of a template.  For
+every selected DOM chunk it takes the outermost region ancestor that held no
+site chrome (``header`` / ``nav`` / ``footer`` and their ARIA roles outside
+``main`` / ``article``) before the AOM filter — :func:`chrome_holders` records those before filtering,
+because the filter removes the chrome itself.  The regions are kept only if
+they cover ``MIN_REGION_COVERAGE`` of the selected text.
+
+:func:`isolate_content_regions` applies them on later pages: the regions
+become the only children of ``<body>`` (wrapped in ``<main>`` when they sat
+inside one), so grid detection, the AOM filter and decomposition only walk
+the content.  It returns ``None`` — and leaves the DOM untouched — when any
+selector does not match exactly one element.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from itertools import chain
+
+import lxml.html
+from lxml import etree
+
+from . import HtmlChunk
+
+MIN_REGION_COVERAGE = 0.9  # share of selected chunk text the regions must hold
+MAX_REGIONS = 4
+
+_CHROME = etree.XPath(
+    "(//header | //nav | //footer | //*[@role='banner' or @role='navigation' or @role='contentinfo'])"
+    "[not(ancestor::main or ancestor::article or ancestor::*[@role='main'])]"
+)
+_STABLE_ID_RE = re.compile(r"^[A-Za-z_][\w:-]*$")
+_PAGE_SPECIFIC_ID_RE = re.compile(r"\d{3,}")
+
+
+def _region_selector(el: lxml.html.HtmlElement) -> str | None:
+    """The cross-page selector addressing *el*, if it has one."""
+    if not isinstance(el.tag, str):
+        return None
+    if el.tag.lower() == "main":
+        return "//main"
+    if el.get("role", "").lower() == "main":
+        return "//*[@role='main']"
+    el_id = el.get("id", "")
+    if el_id and _STABLE_ID_RE.match(el_id) and not _PAGE_SPECIFIC_ID_RE.search(el_id):
+        return f"//*[@id='{el_id}']"
+    return None
+
+
+def _in_main(el: lxml.html.HtmlElement) -> bool:
+    return any(
+        isinstance(a.tag, str) and (a.tag.lower() == "main" or a.get("role", "").lower() == "main")
+        for a in el.iterancestors()
+    )
+
+
+def chrome_holders(doc: lxml.html.HtmlElement) -> frozenset[str]:
+    """Selectors of region candidates that contain (or are) site chrome — call before the AOM filter."""
+    holders: set[str] = set()
+    for el in _CHROME(doc):
+        for anc in chain((el,), el.iterancestors()):
+            selector = _region_selector(anc)
+            if selector is not None:
+                holders.add(selector)
+    return frozenset(holders)
+
+
+def learn_content_regions(
+    doc: lxml.html.HtmlElement, chunks: list[HtmlChunk], holders: frozenset[str]
+) -> tuple[str, ...]:
+    """Selectors of the regions holding *chunks* (document order), or ``()`` if they do not cover them."""
+    tree = doc.getroottree()
+    covered: Counter[str] = Counter()
+    total = 0
+    for chunk in chunks:
+        if chunk.node_id < 0 or not chunk.xpath:
+            continue
+        total += len(chunk.text)
+        try:
+            found = tree.xpath(chunk.xpath)
+        except etree.XPathError:
+            continue
+        if not found:
+            continue
+        best = None
+        for anc in chain(found[:1], found[0].iterancestors()):
+            if isinstance(anc.tag, str) and anc.tag.lower() in ("body", "html"):
+                break
+            selector = _region_selector(anc)
+            if selector is not None and selector not in holders:
+                best = selector
+        if best is not None:
+            covered[best] += len(chunk.text)
+    if not covered or len(covered) > MAX_REGIONS or sum(covered.values()) < MIN_REGION_COVERAGE * total:
+        return ()
+    if any(len(doc.xpath(selector)) != 1 for selector in covered):
+        return ()
+    return tuple(covered)
+
+
+def isolate_content_regions(
+    doc: lxml.html.HtmlElement, selectors: tuple[str, ...]
+) -> list[lxml.html.HtmlElement] | None:
+    """Replace ``<body>``'s children with the regions of *selectors*; ``None`` (DOM untouched) if any is missing."""
+    body = doc.body
+    if body is None or not selectors:
+        return None
+    regions: list[lxml.html.HtmlElement] = []
+    for selector in selectors:
+        try:
+            found = doc.xpath(selector)
+        except etree.XPathError:
+            return None
+        if len(found) != 1:
+            return None
+        regions.append(found[0])
+    region_set = set(regions)
+    if any(a in region_set for r in regions for a in r.iterancestors()):
+        return None  # nested regions: the template no longer fits this layout
+
+    wrapped = [_in_main(r) for r in regions]
+    for child in list(body):
+        body.remove(child)
+    body.text = None
+    main = None
+    for region, in_main in zip(regions, wrapped, strict=True):
+        region.tail = None
+        if in_main:
+            if main is None:
+                main = etree.SubElement(body, "main")
+            main.append(region)
+        else:
+            body.append(region)
+    return regions
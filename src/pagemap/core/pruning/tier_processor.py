@@ -141,7 +141,7 @@ def _derive_label(chunk: HtmlChunk, decisions: list[tuple[HtmlChunk, PruneDecisi
     """Derive a section label for a Tier C reference."""
     # 1. Nearest HEADING in same parent
     for c, _d in decisions:
-        if c.parent_xpath == chunk.parent_xpath and c.chunk_type == ChunkType.HEADING and c.text:
+        if c.parent_key == chunk.parent_key and c.chunk_type == ChunkType.HEADING and c.text:
             return c.text[:50]
 
     # 2. aria-label
@@ -217,17 +217,17 @@ def generate_dropped_references(
     decisions: list[tuple[HtmlChunk, PruneDecision]],
 ) -> list[HtmlChunk]:
     """Generate Tier C references for budget-dropped chunks."""
-    # Group budget-dropped chunks by parent_xpath
-    groups: dict[str, list[tuple[HtmlChunk, PruneDecision]]] = defaultdict(list)
+    # Group budget-dropped chunks by parent
+    groups: dict[int | str, list[tuple[HtmlChunk, PruneDecision]]] = defaultdict(list)
     for chunk, decision in decisions:
         if not decision.keep and "budget-drop" in decision.reason_detail:
-            groups[chunk.parent_xpath].append((chunk, decision))
+            groups[chunk.parent_key].append((chunk, decision))
 
     if not groups:
         return []
 
     references: list[HtmlChunk] = []
-    for _parent_xpath, group_items in groups.items():
+    for _parent_key, group_items in groups.items():
         first_chunk = group_items[0][0]
         label = _derive_label(first_chunk, decisions)
         count = len(group_items)
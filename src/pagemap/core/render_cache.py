@@ -0,0 +1,162 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Per-PageMap memo for rendered prompts and security scan verdicts.
+
+A cached PageMap is served many times (Tier-A hits, diff fallbacks,
+``batch_get_page_map`` re-reads), and each serialization used to redo the
+same work: sanitize and render every section, run the output and content
+scanners over ``pruned_context``, and tokenize the result for the Meta
+line.  The serializer now keeps those results on the PageMap itself
+(``PageMap._render_memo``), keyed by :class:`SectionHashes` plus the render
+options, so a repeat render is a dict lookup.
+
+The hashes are recomputed on every lookup — they are cheap (``str`` hashes
+are cached by the interpreter) and make the memo safe against in-place
+edits such as ``page_map.metadata["barrier_auto_dismissed"] = ...``.  Diff
+rendering compares them instead of full section text.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from .env import env_flag
+from .preprocessing.preprocess import count_tokens
+from .stats import Counter, StatsCollector, register_collector
+
+if TYPE_CHECKING:
+    from . import PageMap
+
+RENDER_CACHE_ENABLED = env_flag("PAGEMAP_RENDER_CACHE", default=True)
+MAX_MEMO_ENTRIES = 8  # per PageMap; (kind, hashes, options) combinations seen in practice are 2-3
+
+METRIC_LOOKUPS = "pagemap_render_cache_lookups_total"
+METRIC_SAVED = "pagemap_render_cache_saved_seconds_total"
+
+
+@dataclass(frozen=True, slots=True)
+class SectionHashes:
+    """Content hashes of each prompt section of a PageMap."""
+
+    header: int  # url, title, type, warnings, barrier, diagnostics
+    ecommerce: int
+    actions: int  # semantic: role, name, affordance, value, options (refs excluded)
+    action_lines: int  # everything else an action line renders: ref, tier, region, name source
+    navigation: int
+    info: int
+    images: int
+    security: int  # browser-side scan report (input to the secure render)
+
+
+def section_hashes(page_map: PageMap) -> SectionHashes:
+    """Hash every section of *page_map*. Pure; O(interactables)."""
+    metadata = page_map.metadata or {}
+    items = page_map.interactables
+    return SectionHashes(
+        header=hash(
+            (
+                page_map.url,
+                page_map.title,
+                page_map.page_type,
+                tuple(page_map.warnings),
+                repr(page_map.barrier),
+                repr(page_map.diagnostics),
+                repr(metadata.get("barrier_auto_dismissed")),
+            )
+        ),
+        ecommerce=hash(repr(metadata.get("ecommerce"))),
+        actions=hash(tuple((i.role, i.name, i.affordance, i.value, tuple(i.options)) for i in items)),
+        action_lines=hash(
+            (
+                tuple((i.ref, i.tier, i.region, i.name_source) for i in items),
+                frozenset(page_map.pruned_regions),
+            )
+        ),
+        navigation=hash(repr(page_map.navigation_hints)),
+        info=hash(page_map.pruned_context),
+        images=hash(tuple(page_map.images)),
+        security=hash(repr(page_map.browser_security)),
+    )
+
+
+@dataclass(slots=True)
+class RenderedPrompt:
+    """A rendered prompt body (everything before ``## Meta``) and its token count."""
+
+    text: str
+    cost_ms: float  # render (and scan) time this entry saves on a hit
+    _tokens: int | None = None
+    _tokens_ms: float = 0.0
+
+    def tokens(self) -> int:
+        """Token count of :attr:`text`, computed once."""
+        if self._tokens is None:
+            t0 = time.perf_counter()
+            self._tokens = count_tokens(self.text)
+            self._tokens_ms = (time.perf_counter() - t0) * 1000
+        else:
+            render_cache_stats.record_saved(self._tokens_ms)
+        return self._tokens
+
+
+def memo_get(page_map: PageMap, key: Hashable) -> Any | None:
+    """Memoized value for *key* on *page_map*, counting the hit or miss."""
+    value = page_map._render_memo.get(key)
+    if value is None:
+        render_cache_stats.record_miss()
+    else:
+        render_cache_stats.record_hit(value.cost_ms)
+    return value
+
+
+def memo_put(page_map: PageMap, key: Hashable, value: Any) -> None:
+    """Store *value* (anything with ``cost_ms``) under *key*; the memo is cleared when full."""
+    memo = page_map._render_memo
+    if len(memo) >= MAX_MEMO_ENTRIES:
+        memo.clear()
+    memo[key] = value
+
+
+class RenderCacheStats(StatsCollector):
+    """Hit/miss and saved-time counters."""
+
+    LABELS = ("outcome",)
+    FIELDS = ("count", "saved_ms")
+    SEED = (("hit",), ("miss",))
+    COUNTERS = (
+        Counter(METRIC_LOOKUPS, "Prompt render memo lookups on cached page maps", "count"),
+        Counter(
+            METRIC_SAVED, "Render, scan and tokenize time saved by the memo", "saved_ms", labelled=False, scale=0.001
+        ),
+    )
+
+    __slots__ = ()
+
+    def record_hit(self, saved_ms: float) -> None:
+        self.add(("hit",), 1, saved_ms)
+
+    def record_miss(self) -> None:
+        self.add(("miss",), 1)
+
+    def record_saved(self, saved_ms: float) -> None:
+        self.add(("hit",), 0, saved_ms)
+
+    def snapshot(self) -> dict[str, float]:
+        """``{hits, misses, hit_rate, saved_ms}``."""
+        rows = self.rows()
+        (hits, saved), (misses, _) = rows[("hit",)], rows[("miss",)]
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 3) if total else 0.0,
+            "saved_ms": round(saved, 1),
+        }
+
+
+render_cache_stats = RenderCacheStats()
+register_collector("render_cache", lambda: render_cache_stats if RENDER_CACHE_ENABLED else None)
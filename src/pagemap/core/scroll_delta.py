@@ -0,0 +1,290 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Scroll-delta tracking for incremental page map rebuilds.
+
+``scroll_page`` arms an in-page MutationObserver tagged with the cache
+generation of the page map the scroll started from.  The observer keeps
+the element nodes added since then and counts removals of pre-existing
+nodes.  On the next ``get_page_map`` :func:`collect_scroll_delta` returns
+the top-most added subtrees (outerHTML) plus their interactive elements,
+so only new content is pruned and new refs are appended after the
+existing ones — existing refs stay valid.  Subtrees hidden by computed
+style (the checks the full build's DOM guard applies) are dropped before
+serialization, so hidden text never reaches the pruned context.
+
+The delta is unusable (→ full rebuild) when the observer overflowed,
+when more than :data:`MAX_REMOVED_NODES` pre-existing nodes were removed
+(virtualised lists recycle rows, so old refs may be gone; a few removals
+are tolerated for loaders and spinners), or when the generation no
+longer matches (new document, different cache entry).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from . import Interactable
+from .interactive_detector import _UNIQUE_SELECTOR_JS, AFFORDANCE_MAP
+from .sanitizer import sanitize_text
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+MAX_REMOVED_NODES = 3  # loaders/spinners; more means existing content was recycled
+MAX_ADDED_NODES = 5000
+MAX_DELTA_BYTES = 1_000_000
+MAX_DELTA_ELEMENTS = 300
+_EVAL_TIMEOUT_S = 3.0
+
+# Hidden-text prompt-injection defense: the same computed-style checks the
+# full build's DOM guard applies (page_map_builder._DOM_GUARD_AND_HIDDEN_JS)
+_IS_HIDDEN_JS = """(el) => {
+  const cs = getComputedStyle(el);
+  return (
+    cs.display === 'none' ||
+    cs.visibility === 'hidden' ||
+    cs.opacity === '0' ||
+    (cs.fontSize === '0px' && el.children.length === 0) ||
+    cs.clipPath === 'inset(100%)' ||
+    /scale\\(0[),\\s]/.test(cs.transform) ||
+    (parseInt(cs.textIndent) <= -9000 && cs.overflow === 'hidden') ||
+    (cs.overflow === 'hidden' && parseInt(cs.height) === 0 && el.children.length === 0) ||
+    (cs.position === 'absolute' && (
+      parseInt(cs.left) < -9000 || parseInt(cs.top) < -9000 ||
+      (parseInt((cs.clip || '').split(',')[0]?.replace('rect(','')) === 0 &&
+       parseInt((cs.clip || '').split(',')[1]) === 0)
+    ))
+  );
+}"""
+
+_ARM_JS = """([gen, maxAdded]) => {
+  const prev = window.__pagemapDelta;
+  if (gen === null) return !!prev;
+  if (prev && prev.gen === gen) return true;
+  if (prev) prev.observer.disconnect();
+  const SKIP = new Set(['SCRIPT', 'STYLE', 'LINK', 'META', 'NOSCRIPT', 'TEMPLATE']);
+  const state = {gen, added: new Set(), removed: 0, overflow: false, observer: null};
+  const insideAdded = (node) => {
+    for (let p = node; p; p = p.parentNode) if (state.added.has(p)) return true;
+    return false;
+  };
+  state.observer = new MutationObserver((records) => {
+    for (const r of records) {
+      for (const n of r.addedNodes) {
+        if (n.nodeType === 1 && !SKIP.has(n.tagName)) state.added.add(n);
+      }
+      for (const n of r.removedNodes) {
+        if (n.nodeType !== 1 || SKIP.has(n.tagName)) continue;
+        if (state.added.delete(n) || insideAdded(r.target)) continue;
+        state.removed++;
+      }
+    }
+    if (state.added.size > maxAdded) {
+      state.overflow = true;
+      state.added.clear();
+      state.observer.disconnect();
+    }
+  });
+  state.observer.observe(document.body || document.documentElement, {childList: true, subtree: true});
+  window.__pagemapDelta = state;
+  return true;
+}"""
+
+_COLLECT_JS = (
+    """([gen, maxBytes, maxElements]) => {
+  const d = window.__pagemapDelta;
+  if (!d || d.gen !== gen) return null;
+  if (d.overflow) return {gen, overflow: true, removed: d.removed, fragments: [], elements: []};
+  const uniqueSelector = (el) => ("""
+    + _UNIQUE_SELECTOR_JS.strip()
+    + """).call(el);
+  const isHidden = """
+    + _IS_HIDDEN_JS
+    + """;
+  const NO_STYLE = new Set(['SCRIPT', 'STYLE', 'NOSCRIPT', 'LINK', 'META']);
+  const hidden = new Set();
+  const checkHidden = (el) => {
+    if (NO_STYLE.has(el.tagName)) return false;
+    try { if (isHidden(el)) { hidden.add(el); return true; } } catch (e) {}
+    return false;
+  };
+  const insideHidden = (el, root) => {
+    for (let p = el; p; p = p === root ? null : p.parentElement) if (hidden.has(p)) return true;
+    return false;
+  };
+  // outerHTML of root with hidden descendants dropped (live styles, detached copy)
+  const visibleHTML = (root) => {
+    const live = root.querySelectorAll('*');
+    const copy = root.cloneNode(true);
+    const copies = copy.querySelectorAll('*');
+    for (let i = live.length - 1; i >= 0; i--) if (checkHidden(live[i])) copies[i].remove();
+    return copy.outerHTML;
+  };
+  const nodes = [...d.added].filter((n) => n.isConnected);
+  const set = new Set(nodes);
+  const roots = nodes.filter((n) => {
+    for (let p = n.parentElement; p; p = p.parentElement) if (set.has(p)) return false;
+    return true;
+  }).filter((n) => {
+    for (let p = n; p && p !== document.body; p = p.parentElement) if (checkHidden(p)) return false;
+    return true;
+  });
+  const roleOf = (el) => {
+    const explicit = el.getAttribute('role');
+    if (explicit) return explicit;
+    const tag = el.localName;
+    if (tag === 'a') return el.hasAttribute('href') ? 'link' : null;
+    if (tag === 'button') return 'button';
+    if (tag === 'textarea') return 'textbox';
+    if (tag === 'select') return el.multiple || el.size > 1 ? 'listbox' : 'combobox';
+    if (tag !== 'input') return null;
+    const type = (el.type || 'text').toLowerCase();
+    if (type === 'hidden') return null;
+    if (['button', 'submit', 'reset', 'image'].includes(type)) return 'button';
+    if (type === 'checkbox' || type === 'radio') return type;
+    if (type === 'search') return 'searchbox';
+    if (type === 'number') return 'spinbutton';
+    if (type === 'range') return 'slider';
+    return 'textbox';
+  };
+  const nameOf = (el) => {
+    const label = el.getAttribute('aria-label');
+    if (label && label.trim()) return [label.trim(), 'aria-label'];
+    if (el.labels && el.labels.length) return [el.labels[0].innerText.trim(), 'labelledby'];
+    for (const attr of ['placeholder', 'title', 'alt']) {
+      const v = el.getAttribute(attr);
+      if (v && v.trim()) return [v.trim(), attr];
+    }
+    const img = el.querySelector && el.querySelector('img[alt]');
+    const text = (el.innerText || '').trim().replace(/\\s+/g, ' ');
+    if (text) return [text.slice(0, 100), 'contents'];
+    if (img && img.alt.trim()) return [img.alt.trim(), 'alt'];
+    return ['', ''];
+  };
+  const regionOf = (el) => {
+    const lm = el.closest('header, nav, footer, aside, [role=banner], [role=navigation], [role=contentinfo], [role=complementary]');
+    if (!lm) return 'main';
+    const r = lm.getAttribute('role') || lm.localName;
+    return {header: 'header', banner: 'header', nav: 'navigation', navigation: 'navigation',
+            footer: 'footer', contentinfo: 'footer', aside: 'complementary', complementary: 'complementary'}[r] || 'main';
+  };
+  const QUERY = 'a[href], button, input, select, textarea, [role]';
+  let bytes = 0;
+  const fragments = [];
+  const elements = [];
+  for (const root of roots) {
+    const html = visibleHTML(root);
+    bytes += html.length;
+    if (bytes > maxBytes) return {gen, overflow: true, removed: d.removed, fragments: [], elements: []};
+    fragments.push(html);
+    const candidates = root.matches(QUERY) ? [root, ...root.querySelectorAll(QUERY)] : root.querySelectorAll(QUERY);
+    for (const el of candidates) {
+      if (elements.length >= maxElements) break;
+      const role = roleOf(el);
+      if (!role || el.getClientRects().length === 0 || insideHidden(el, root)) continue;
+      const [name, nameSource] = nameOf(el);
+      const item = {role, name, nameSource, region: regionOf(el), selector: uniqueSelector(el), value: '', options: []};
+      if (el.localName === 'select') item.options = [...el.options].slice(0, 10).map((o) => o.text.trim());
+      else if (el.localName === 'input' || el.localName === 'textarea') item.value = (el.value || '').slice(0, 100);
+      elements.push(item);
+    }
+  }
+  return {gen, overflow: false, removed: d.removed, fragments, elements};
+}"""
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ScrollDelta:
+    """Content added to the page since the delta was armed."""
+
+    fragments: tuple[str, ...]  # outerHTML of top-most added subtrees
+    elements: tuple[dict, ...]  # interactive elements inside them (raw, in document order)
+    removed: int = 0  # pre-existing element nodes removed
+    overflow: bool = False
+
+    @property
+    def usable(self) -> bool:
+        """No overflow and at most :data:`MAX_REMOVED_NODES` pre-existing nodes removed."""
+        return not self.overflow and self.removed <= MAX_REMOVED_NODES
+
+
+async def arm_scroll_delta(page: Page, generation_id: str | None) -> bool:
+    """Start tracking additions for *generation_id* (``None`` keeps the current tracker).
+
+    Re-arming with the same generation keeps the accumulated delta, so
+    repeated scrolls between two get_page_map calls add up.  Never raises.
+    """
+    try:
+        return bool(
+            await asyncio.wait_for(
+                page.evaluate(_ARM_JS, [generation_id, MAX_ADDED_NODES]),
+                timeout=_EVAL_TIMEOUT_S,
+            )
+        )
+    except Exception as e:
+        logger.debug("Scroll delta arm failed: %s", e)
+        return False
+
+
+async def collect_scroll_delta(page: Page, generation_id: str) -> ScrollDelta | None:
+    """Additions since :func:`arm_scroll_delta` for *generation_id*, or None. Never raises."""
+    try:
+        raw = await asyncio.wait_for(
+            page.evaluate(_COLLECT_JS, [generation_id, MAX_DELTA_BYTES, MAX_DELTA_ELEMENTS]),
+            timeout=_EVAL_TIMEOUT_S,
+        )
+    except Exception as e:
+        logger.debug("Scroll delta collect failed: %s", e)
+        return None
+    if not isinstance(raw, dict) or raw.get("gen") != generation_id:
+        return None
+    return ScrollDelta(
+        fragments=tuple(raw.get("fragments") or ()),
+        elements=tuple(raw.get("elements") or ()),
+        removed=int(raw.get("removed", 0)),
+        overflow=bool(raw.get("overflow", False)),
+    )
+
+
+def delta_interactables(elements: tuple[dict, ...], existing: list[Interactable]) -> list[Interactable]:
+    """Interactables for new *elements*, numbered after the highest existing ref.
+
+    Pure function.  Elements whose (role, name, selector) match an existing
+    interactable (re-mounted nodes) are skipped so that ref keeps pointing
+    at them.
+    """
+    known = {(el.role, el.name, el.selector) for el in existing}
+    next_ref = max((el.ref for el in existing), default=0)
+    results: list[Interactable] = []
+    for raw in elements:
+        role = str(raw.get("role", ""))
+        if role not in AFFORDANCE_MAP:
+            continue
+        name = sanitize_text(str(raw.get("name", "")))
+        selector = str(raw.get("selector", ""))
+        if (role, name, selector) in known:
+            continue
+        known.add((role, name, selector))
+        next_ref += 1
+        results.append(
+            Interactable(
+                ref=next_ref,
+                role=role,
+                name=name,
+                affordance=AFFORDANCE_MAP[role],
+                region=str(raw.get("region", "main")),
+                tier=1 if name else 2,
+                value=sanitize_text(str(raw.get("value", ""))),
+                options=[sanitize_text(str(o)) for o in raw.get("options") or []],
+                selector=selector,
+                name_source=str(raw.get("nameSource", "")),
+            )
+        )
+    return results
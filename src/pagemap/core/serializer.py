@@ -12,10 +12,21 @@ Three output formats:
 from __future__ import annotations
 
 import json
+import time
+from dataclasses import dataclass
 from typing import Any
 
 from . import Interactable, PageMap
 from .preprocessing.preprocess import count_tokens
+from .render_cache import (
+    RENDER_CACHE_ENABLED,
+    RenderedPrompt,
+    SectionHashes,
+    memo_get,
+    memo_put,
+    render_cache_stats,
+    section_hashes,
+)
 from .sanitizer import add_content_boundary, sanitize_content_block, sanitize_text
 
 
@@ -228,6 +239,7 @@ def to_agent_prompt(
     page_map: PageMap,
     include_meta: bool = False,
     cache_meta: str = "",
+    timing_meta: str = "",
 ) -> str:
     """Serialize PageMap to minimal-token agent prompt format.
 
@@ -249,10 +261,52 @@ def to_agent_prompt(
         page_map: PageMap to serialize
         include_meta: include token counts and generation time
         cache_meta: optional cache status string for Meta section
+        timing_meta: optional per-stage timing string for Meta section
 
     Returns:
         Formatted string for LLM consumption
     """
+    return _compose(page_map, _body(page_map), include_meta, cache_meta, timing_meta)
+
+
+def _compose(
+    page_map: PageMap,
+    body: RenderedPrompt,
+    include_meta: bool = False,
+    cache_meta: str = "",
+    timing_meta: str = "",
+) -> str:
+    """Rendered body plus the per-call Meta section."""
+    if not include_meta:
+        return body.text
+    lines = [body.text]
+    lines.append("## Meta")
+    lines.append(f"Tokens: ~{body.tokens()}")
+    lines.append(f"Interactables: {page_map.total_interactables}")
+    lines.append(f"Generation: {page_map.generation_ms:.0f}ms")
+    if cache_meta:
+        lines.append(f"Cache: {cache_meta}")
+    if timing_meta:
+        lines.append(f"Timing: {timing_meta}")
+    return "\n".join(lines)
+
+
+def _body(page_map: PageMap, hashes: SectionHashes | None = None) -> RenderedPrompt:
+    """Memoized :func:`_render_body` for *page_map*."""
+    if not RENDER_CACHE_ENABLED:
+        return RenderedPrompt(_render_body(page_map), 0.0)
+    key = ("body", hashes or section_hashes(page_map))
+    body = memo_get(page_map, key)
+    if body is None:
+        t0 = time.perf_counter()
+        text = _render_body(page_map)
+        body = RenderedPrompt(text, (time.perf_counter() - t0) * 1000)
+        memo_put(page_map, key, body)
+    return body
+
+
+def _render_body(page_map: PageMap) -> str:
+    """All prompt sections up to (not including) Meta."""
     lines: list[str] = []
 
     # Header
@@ -373,22 +427,45 @@ def to_agent_prompt(
             lines.append(f"  [{i}] {url}")
         lines.append("")
 
-    # Optional meta
-    if include_meta:
-        prompt_text = "\n".join(lines)
-        total_tokens = count_tokens(prompt_text)
-        lines.append("## Meta")
-        lines.append(f"Tokens: ~{total_tokens}")
-        lines.append(f"Interactables: {page_map.total_interactables}")
-        lines.append(f"Generation: {page_map.generation_ms:.0f}ms")
-        if cache_meta:
-            lines.append(f"Cache: {cache_meta}")
-
     return "\n".join(lines)
 
 
+@dataclass(slots=True)
+class _SecureRender:
+    """Scan verdicts for one PageMap: the (possibly redacted) body and security section."""
+
+    body: RenderedPrompt
+    security_section: str
+    cost_ms: float  # scan time; a hit also saves the body's own cost
+
+
 def to_agent_prompt_secure(page_map: PageMap, **kwargs) -> str:
-    """Output scanning wrapper — scans pruned_context before serialization."""
+    """Output scanning wrapper — scans pruned_context before serialization.
+
+    Scan verdicts and the rendered body are memoized on *page_map*
+    (core/render_cache.py), so serving a cached PageMap again skips both.
+    """
+    if RENDER_CACHE_ENABLED:
+        hashes = section_hashes(page_map)
+        key = ("secure", hashes)
+        rendered = memo_get(page_map, key)
+        if rendered is None:
+            rendered = _scan(page_map, hashes)
+            memo_put(page_map, key, rendered)
+        else:
+            render_cache_stats.record_saved(rendered.body.cost_ms)
+    else:
+        rendered = _scan(page_map, None)
+
+    prompt = _compose(page_map, rendered.body, **kwargs)
+    if rendered.security_section:
+        prompt = prompt.rstrip("\n") + "\n\n" + rendered.security_section
+    return prompt
+
+
+def _scan(page_map: PageMap, hashes: SectionHashes | None) -> _SecureRender:
+    """Run the output, content and browser scanners and render the resulting body."""
+    t0 = time.perf_counter()
     # Preserve original for non-destructive advisory scan (before output_scanner modifies it)
     original_page_map = page_map
 
@@ -406,8 +483,6 @@ def to_agent_prompt_secure(page_map: PageMap, **kwargs) -> str:
     except ImportError:
         pass  # security module not available — fail-open for import only
 
-    prompt = to_agent_prompt(page_map, **kwargs)
-
     # Non-destructive content scanner — advisory metadata (scans original, pre-redaction)
     content_matches: list = []
     try:
@@ -433,14 +508,21 @@ def to_agent_prompt_secure(page_map: PageMap, **kwargs) -> str:
     # Cross-validate: both scanners agree → severity="high"
     all_matches = _cross_validate(content_matches, browser_matches)
 
+    security_section = ""
     if all_matches:
         from pagemap.security.content_scanner import SecurityReport as _SR
 
         merged_report = _SR(matches=tuple(all_matches))
         if merged_report.has_detections:
-            prompt = prompt.rstrip("\n") + "\n\n" + merged_report.render_section()
+            security_section = merged_report.render_section()
+    scan_ms = (time.perf_counter() - t0) * 1000
 
-    return prompt
+    if page_map is original_page_map:
+        body = _body(page_map, hashes)  # unredacted — shared with plain to_agent_prompt
+    else:
+        t0 = time.perf_counter()
+        body = RenderedPrompt(_render_body(page_map), (time.perf_counter() - t0) * 1000)
+    return _SecureRender(body=body, security_section=security_section, cost_ms=scan_ms)
 
 
 def _browser_threats_to_matches(browser_report) -> list:
@@ -504,48 +586,7 @@ def _cross_validate(
 
 def estimate_prompt_tokens(page_map: PageMap) -> int:
     """Estimate total token count of the agent prompt format."""
-    prompt = to_agent_prompt(page_map)
-    return count_tokens(prompt)
-
-
-# ---------------------------------------------------------------------------
-# Section comparison helpers (for diff output)
-# ---------------------------------------------------------------------------
-
-
-def _interactables_equal(old: list[Interactable], new: list[Interactable]) -> bool:
-    """Compare interactable lists by semantic content (role, name, affordance, value, options)."""
-    if len(old) != len(new):
-        return False
-    for a, b in zip(old, new, strict=True):
-        if (a.role, a.name, a.affordance, a.value, tuple(a.options)) != (
-            b.role,
-            b.name,
-            b.affordance,
-            b.value,
-            tuple(b.options),
-        ):
-            return False
-    return True
-
-
-def _pruned_context_equal(old: str, new: str) -> bool:
-    return old == new
-
-
-def _images_equal(old: list[str], new: list[str]) -> bool:
-    return old == new
-
-
-def _navigation_equal(old: dict, new: dict) -> bool:
-    return old == new
-
-
-def _ecommerce_equal(old: PageMap, new: PageMap) -> bool:
-    """Compare ecommerce metadata between two PageMaps."""
-    old_ecom = old.metadata.get("ecommerce") if old.metadata else None
-    new_ecom = new.metadata.get("ecommerce") if new.metadata else None
-    return old_ecom == new_ecom
+    return _body(page_map).tokens()
 
 
 # ---------------------------------------------------------------------------
@@ -604,12 +645,14 @@ def to_agent_prompt_diff(
 
     Returns None if savings are below threshold (caller should fall back to full prompt).
     """
-    # Compare each section
-    actions_same = _interactables_equal(old.interactables, new.interactables)
-    info_same = _pruned_context_equal(old.pruned_context, new.pruned_context)
-    images_same = _images_equal(old.images, new.images)
-    nav_same = _navigation_equal(old.navigation_hints, new.navigation_hints)
-    ecom_same = _ecommerce_equal(old, new)
+    # Compare each section by its precomputed hash
+    old_h = section_hashes(old)
+    new_h = section_hashes(new)
+    actions_same = old_h.actions == new_h.actions
+    info_same = old_h.info == new_h.info
+    images_same = old_h.images == new_h.images
+    nav_same = old_h.navigation == new_h.navigation
+    ecom_same = old_h.ecommerce == new_h.ecommerce
 
     # All sections identical → "unchanged" response
     if actions_same and info_same and images_same and nav_same and ecom_same:
@@ -617,7 +660,7 @@ def to_agent_prompt_diff(
         if new.interactables:
             lines.append(f"Refs: 1-{len(new.interactables)} still valid")
         if include_meta:
-            full_tokens = count_tokens(to_agent_prompt(new))
+            full_tokens = _body(new, new_h).tokens()
             lines.append("")
             lines.append("## Meta")
             lines.append(f"Tokens: ~{count_tokens(chr(10).join(lines))} (full: ~{full_tokens})")
@@ -743,8 +786,7 @@ def to_agent_prompt_diff(
     diff_text = "\n".join(lines)
 
     # Check savings threshold
-    full_text = to_agent_prompt(new)
-    full_tokens = count_tokens(full_text)
+    full_tokens = _body(new, new_h).tokens()
     diff_tokens = count_tokens(diff_text)
     savings = (full_tokens - diff_tokens) / max(full_tokens, 1)
     if savings < savings_threshold:
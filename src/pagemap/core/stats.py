@@ -0,0 +1,124 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Thread-safe labelled counters shared by the feature stats behind /metrics.
+
+A :class:`StatsCollector` keeps one row of numeric fields per label tuple
+under a lock.  Subclasses declare their labels, fields and exported
+:class:`Counter` families, write ``record*`` methods on top of :meth:`add`
+and build their own ``snapshot()``.  The collector protocol lives here
+once: prometheus-client is only imported at scrape time.
+
+Features expose their collector with :func:`register_collector`; the
+/metrics endpoint registers every enabled one on its per-scrape registry.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+Key = tuple[str, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class Counter:
+    """A counter family exported from one row field.
+
+    ``labelled=False`` exports a single total over the selected rows;
+    ``only`` keeps the rows whose last label is one of the given values.
+    """
+
+    name: str
+    help: str
+    field: str
+    labelled: bool = True
+    scale: float = 1.0
+    only: tuple[str, ...] | None = None
+
+
+class StatsCollector:
+    """Label tuple → field row counters; also a prometheus-client collector."""
+
+    LABELS: ClassVar[tuple[str, ...]] = ()
+    FIELDS: ClassVar[tuple[str, ...]] = ("count",)
+    SEED: ClassVar[tuple[Key, ...]] = ()  # rows reported even before anything is recorded
+    COUNTERS: ClassVar[tuple[Counter, ...]] = ()
+
+    __slots__ = ("_lock", "_rows")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._rows: OrderedDict[Key, list[Any]] = OrderedDict()
+        self.reset()
+
+    def _new_row(self) -> list[Any]:
+        return [0] * len(self.FIELDS)
+
+    def _row(self, key: Key) -> list[Any]:
+        """The row for *key*, created on first use.  Caller holds ``self._lock``."""
+        row = self._rows.get(key)
+        if row is None:
+            row = self._rows[key] = self._new_row()
+        return row
+
+    def add(self, key: Key, *deltas: float) -> None:
+        """Add *deltas* to the leading fields of *key*'s row."""
+        with self._lock:
+            row = self._row(key)
+            for i, delta in enumerate(deltas):
+                row[i] += delta
+
+    def rows(self) -> dict[Key, list[Any]]:
+        """Copy of every row, in row order."""
+        with self._lock:
+            return {key: list(row) for key, row in self._rows.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._rows.clear()
+            for key in self.SEED:
+                self._rows[key] = self._new_row()
+
+    def collect(self) -> Iterator[Any]:
+        """prometheus-client collector protocol (imported lazily)."""
+        from prometheus_client.core import CounterMetricFamily
+
+        rows = self.rows()
+        for counter in self.COUNTERS:
+            i = self.FIELDS.index(counter.field)
+            values = sorted(
+                (key, row[i]) for key, row in rows.items() if counter.only is None or key[-1] in counter.only
+            )
+            if counter.labelled:
+                family = CounterMetricFamily(counter.name, counter.help, labels=list(self.LABELS))
+                for key, value in values:
+                    family.add_metric(list(key), value * counter.scale)
+            else:
+                total = sum(value for _, value in values)
+                family = CounterMetricFamily(counter.name, counter.help, value=total * counter.scale)
+            yield family
+        yield from self._extra_metrics(rows)
+
+    def _extra_metrics(self, rows: dict[Key, list[Any]]) -> Iterator[Any]:
+        """Families that are not plain counters (gauges, summaries, histograms)."""
+        return iter(())
+
+
+_collectors: dict[str, Callable[[], Any]] = {}
+
+
+def register_collector(name: str, provider: Callable[[], Any]) -> None:
+    """Expose the collector returned by *provider* on /metrics (``None`` → feature off, skipped).
+
+    Registering a *name* again replaces its provider.
+    """
+    _collectors[name] = provider
+
+
+def enabled_collectors() -> list[Any]:
+    """Collectors of every registered feature that is currently on."""
+    return [collector for provider in _collectors.values() if (collector := provider()) is not None]
@@ -12,6 +12,15 @@ The template cache is independent of the PageMap URL LRU cache — domain
 structural knowledge survives browser crashes and session resets.
 
 Architecture mirrors cache.py: OrderedDict LRU + TTL + Stats.
+
+Fast path (``PAGEMAP_TEMPLATE_FAST_PATH=1``): a template learned with
+content-region selectors that has passed ``FAST_PATH_MIN_PASSES``
+validations with no failure since is *confident*.  Builds against it prune
+only those regions with the learned schema (see
+:func:`pagemap.core.pruning.regions.isolate_content_regions`) and rerun the
+whole page if a region is missing or yields under ``FAST_PATH_MIN_TOKEN_SHARE``
+of the learned content.  :data:`fast_path_stats` reports hit rate and pruning
+latency per domain.
 """
 
 from __future__ import annotations
@@ -23,6 +32,9 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 from urllib.parse import urlparse
 
+from .env import env_flag
+from .stats import Counter, StatsCollector, register_collector
+
 if TYPE_CHECKING:
     from .pruning.pipeline import PruningResult
 
@@ -36,6 +48,15 @@ DEFAULT_MAX_TEMPLATES = 50
 DEFAULT_TTL_SECONDS = 86_400.0  # 24 hours
 MAX_CONSECUTIVE_FAILURES = 3
 
+TEMPLATE_FAST_PATH_ENABLED = env_flag("PAGEMAP_TEMPLATE_FAST_PATH")
+FAST_PATH_MIN_PASSES = 2  # validations a template must pass before it is trusted
+FAST_PATH_MIN_TOKEN_SHARE = 0.25  # fast-path content below this share of the learned tokens → rerun
+MAX_FAST_PATH_DOMAINS = 200
+
+METRIC_FAST_PATH = "pagemap_template_fast_path_total"
+METRIC_FAST_PATH_SECONDS = "pagemap_template_fast_path_seconds_total"
+FAST_PATH_OUTCOMES = ("hit", "fallback", "generic")
+
 
 # ---------------------------------------------------------------------------
 # Template key
@@ -84,6 +105,8 @@ class TemplateData:
     pagination_param: str | None = None  # "page" | "p" | "none" etc.
     aom_removal_ratio: float = 0.0
     chunk_selection_ratio: float = 0.0
+    content_regions: tuple[str, ...] = ()  # region selectors for the fast path
+    content_tokens: int = 0  # pruned tokens of the learning build
 
 
 # ---------------------------------------------------------------------------
@@ -99,11 +122,22 @@ class PageTemplate:
     key: TemplateKey
     hit_count: int = 0
     consecutive_failures: int = 0
+    validation_passes: int = 0
     created_at: float = field(default_factory=time.monotonic)
     last_used_at: float = 0.0
     source_url: str = ""
 
 
+def fast_path_ready(template: PageTemplate) -> bool:
+    """True if *template* may skip the whole-page pipeline (flag on, regions learned, validated)."""
+    return (
+        TEMPLATE_FAST_PATH_ENABLED
+        and bool(template.data.content_regions)
+        and template.consecutive_failures == 0
+        and template.validation_passes >= FAST_PATH_MIN_PASSES
+    )
+
+
 # ---------------------------------------------------------------------------
 # Validation
 # ---------------------------------------------------------------------------
@@ -126,10 +160,14 @@ def validate_template(
     actual_metadata_source: str,
     actual_aom_removal_ratio: float,
     actual_chunk_selection_ratio: float,
+    *,
+    fast_path: bool = False,
 ) -> ValidationResult:
     """Validate a cached template against actual page build results.
 
-    Checks structural invariants. Returns mismatches on failure.
+    Checks structural invariants. Returns mismatches on failure.  A
+    fast-path build pruned only the content regions, so its AOM / chunk
+    ratios are not comparable and are not checked.
     """
     mismatches: list[str] = []
     td = template.data
@@ -140,6 +178,9 @@ def validate_template(
     if td.metadata_source and actual_metadata_source and td.metadata_source != actual_metadata_source:
         mismatches.append(f"metadata_source: expected={td.metadata_source}, actual={actual_metadata_source}")
 
+    if fast_path:
+        return ValidationResult(passed=len(mismatches) == 0, mismatches=tuple(mismatches))
+
     if abs(td.aom_removal_ratio - actual_aom_removal_ratio) > _AOM_RATIO_TOLERANCE:
         mismatches.append(
             f"aom_removal_ratio: expected={td.aom_removal_ratio:.2f}, actual={actual_aom_removal_ratio:.2f}"
@@ -176,6 +217,55 @@ class TemplateCacheStats:
         return self.hits / total if total > 0 else 0.0
 
 
+class FastPathStats(StatsCollector):
+    """Per-domain fast-path outcomes and pruning latency.
+
+    Outcomes: ``hit`` (regions pruned), ``fallback`` (fast path abandoned,
+    whole page rerun — its latency includes both attempts) and ``generic``
+    (template found but not yet confident).
+    """
+
+    LABELS = ("domain", "outcome")
+    FIELDS = ("count", "seconds")
+    COUNTERS = (
+        Counter(METRIC_FAST_PATH, "Template builds by fast-path outcome", "count"),
+        Counter(METRIC_FAST_PATH_SECONDS, "Pruning time of template builds", "seconds"),
+    )
+
+    __slots__ = ()
+
+    def record(self, domain: str, outcome: str, seconds: float) -> None:
+        with self._lock:
+            # A domain's outcome rows move together, so evicting the oldest rows drops whole domains
+            for o in FAST_PATH_OUTCOMES:
+                self._row((domain, o))
+                self._rows.move_to_end((domain, o))
+            row = self._rows[(domain, outcome)]
+            row[0] += 1
+            row[1] += seconds
+            while len(self._rows) > MAX_FAST_PATH_DOMAINS * len(FAST_PATH_OUTCOMES):
+                self._rows.popitem(last=False)
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """``{domain: {hit, fallback, generic, hit_rate, <outcome>_ms_avg}}``."""
+        rows: dict[str, dict[str, list[float]]] = {}
+        for (domain, outcome), row in self.rows().items():
+            rows.setdefault(domain, {})[outcome] = row
+        snap: dict[str, dict[str, float]] = {}
+        for domain, row in rows.items():
+            total = sum(n for n, _ in row.values())
+            entry: dict[str, float] = {o: int(n) for o, (n, _) in row.items()}
+            entry["hit_rate"] = round(row["hit"][0] / total, 3) if total else 0.0
+            for outcome, (n, seconds) in row.items():
+                entry[f"{outcome}_ms_avg"] = round(seconds * 1000 / n, 2) if n else 0.0
+            snap[domain] = entry
+        return snap
+
+
+fast_path_stats = FastPathStats()
+register_collector("template_fast_path", lambda: fast_path_stats if TEMPLATE_FAST_PATH_ENABLED else None)
+
+
 # ---------------------------------------------------------------------------
 # InMemoryTemplateCache
 # ---------------------------------------------------------------------------
@@ -277,14 +367,20 @@ class InMemoryTemplateCache:
         entry = self._entries.get(key)
         if entry is not None:
             entry.consecutive_failures = 0
+            entry.validation_passes += 1
             self._stats.validations_passed += 1
 
     def record_validation_failure(self, key: TemplateKey) -> None:
-        """Record a validation failure.  Auto-invalidates after 3 consecutive failures."""
+        """Record a validation failure.  Auto-invalidates after 3 consecutive failures.
+
+        Also restarts the pass count, so the fast path needs
+        ``FAST_PATH_MIN_PASSES`` fresh passes after any failure.
+        """
         entry = self._entries.get(key)
         if entry is None:
             return
         entry.consecutive_failures += 1
+        entry.validation_passes = 0
         self._stats.validations_failed += 1
 
         if entry.consecutive_failures >= MAX_CONSECUTIVE_FAILURES:
@@ -301,6 +397,10 @@ class InMemoryTemplateCache:
     def stats(self) -> TemplateCacheStats:
         return self._stats
 
+    def has_domain(self, domain: str) -> bool:
+        """True if any template for *domain* is cached (no stats/LRU change)."""
+        return any(k.domain == domain for k in self._entries)
+
     def peek(self, key: TemplateKey) -> PageTemplate | None:
         """Return a template without modifying stats or LRU order."""
         return self._entries.get(key)
@@ -421,7 +521,7 @@ def learn_template(
         has_pagination = pagination_param is not None
 
     data = TemplateData(
-        schema_name=schema_name,
+        schema_name=pruning_result.schema_name or schema_name,
         has_main=has_main,
         has_json_ld=has_json_ld,
         metadata_source=metadata_source,
@@ -431,6 +531,8 @@ def learn_template(
         pagination_param=pagination_param,
         aom_removal_ratio=aom_removal_ratio,
         chunk_selection_ratio=chunk_selection_ratio,
+        content_regions=pruning_result.content_regions,
+        content_tokens=pruning_result.pruned_token_count,
     )
 
     return PageTemplate(
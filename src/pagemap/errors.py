@@ -58,3 +58,12 @@ class RateLimitError(PageMapError):
         self.retry_after = retry_after
         self.limit = limit
         self.remaining = remaining
+
+
+class OverloadedError(PageMapError):
+    """Server is at capacity; the request was shed before any work started."""
+
+    def __init__(self, message: str, *, retry_after: float = 1.0, reason: str = "") -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.reason = reason
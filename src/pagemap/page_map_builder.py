@@ -31,6 +31,7 @@ from pagemap.core.page_map_builder import (  # noqa: F401
     detect_schema,
     rebuild_content_only,
     rebuild_interactables_only,
+    rebuild_scroll_delta,
 )
 
 __all__ = [
@@ -49,4 +50,5 @@ __all__ = [
     "detect_schema",
     "rebuild_content_only",
     "rebuild_interactables_only",
+    "rebuild_scroll_delta",
 ]
@@ -9,7 +9,7 @@ Tools:
 - get_page_map: Get structured Page Map for current/specified URL
 - execute_action: Execute an interaction by ref number (click, type, select, hover, press_key)
 - get_page_state: Lightweight page state check
-- take_screenshot: Capture page screenshot (viewport or full page)
+- take_screenshot: Capture page screenshot (viewport, full page or one element; png/jpeg/webp within a byte budget)
 - navigate_back: Go back in browser history
 - scroll_page: Scroll the page up or down
 - fill_form: Fill multiple form fields in one batch call
@@ -36,17 +36,22 @@ from contextlib import suppress
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from playwright.async_api import Locator, Page
+
     from pagemap.core.config_registry import ClassifierConfig, PruningConfig
 
-import structlog
 from mcp.server.fastmcp import Context as McpContext, FastMCP, Image as McpImage
 from mcp.server.transport_security import TransportSecuritySettings
 from mcp.types import ToolAnnotations
-from playwright.async_api import Error as PlaywrightError, Locator, Page
 from pydantic import BaseModel, Field
 
-from pagemap import Interactable
+from pagemap import Interactable, PageMap
 from pagemap.cache import InvalidationReason, PageMapCache, normalize_cache_url
+from pagemap.core.action_settle import ActionSettler
+from pagemap.core.env import env_flag
+from pagemap.core.pipeline_timer import _active_timer
+from pagemap.core.scroll_delta import arm_scroll_delta, collect_scroll_delta
+from pagemap.core.stats import register_collector
 from pagemap.dom_change_detector import (
     capture_dom_fingerprint,
     detect_dom_changes,
@@ -131,7 +136,9 @@ from .action_helpers import (
     _is_retryable_error as _is_retryable_error,
 )
 from .browser_session import BrowserConfig, BrowserSession
-from .context import RequestContext
+from .consent_seed import CONSENT_SEED_ENABLED, consent_seed_stats, detected_cmps
+from .context import BuildContext, RequestContext
+from .form_batch import MIN_BATCH_SIZE, batchable_run, run_fill_batch
 from .http_server import (
     _health_check as _health_check,
     _liveness_probe as _liveness_probe,
@@ -144,7 +151,11 @@ from .http_server import (
     _startup_probe as _startup_probe,
     register_health_routes,
 )
-from .multi_tab import MultiTabSession, TabOpStatus
+from .multi_tab import MultiTabSession, TabInstance, TabOpStatus
+from .node_actions import dispatch_via_handle, handles_valid
+from .screenshot import ELEMENT_RECT_JS, SCREENSHOT_FORMATS, ScreenshotTooLarge, capture_screenshot
+from .shared_cache import SharedPageMapCache, shareable_document_digest
+from .speculation import SPECULATIVE_PREBUILD_ENABLED, SpeculationResult, SpeculativePrebuilder
 from .tool_authz import (
     TOOL_RISK_STATIC as TOOL_RISK_STATIC,
     RiskTier as RiskTier,
@@ -153,6 +164,7 @@ from .tool_authz import (
     emit_authz_log as _emit_authz_log,
     emit_authz_telem as _emit_authz_telem,
 )
+from .tool_lock import ToolLock, hold_tool_lock
 from .url_validation import (
     _CLOUD_METADATA_HOSTS as _CLOUD_METADATA_HOSTS,
     _CLOUD_METADATA_NETWORKS as _CLOUD_METADATA_NETWORKS,
@@ -206,6 +218,7 @@ __all__ = [
     "switch_tab",
     "list_tabs",
     "close_tab",
+    "map_tabs",
     # Core
     "mcp",
     "main",
@@ -322,12 +335,17 @@ _max_stdio_navigations: int = int(os.environ.get("PAGEMAP_MAX_NAVIGATIONS", "50"
 _max_stdio_session_age: float = float(os.environ.get("PAGEMAP_MAX_SESSION_AGE", "1800"))
 
 # Auto-dismiss barrier feature flags (opt-in, default OFF)
-_AUTO_DISMISS_ENABLED: bool = os.environ.get("PAGEMAP_AUTO_DISMISS", "0").lower() in ("1", "true", "yes")
+_AUTO_DISMISS_ENABLED: bool = env_flag("PAGEMAP_AUTO_DISMISS")
 _COOKIE_POLICY: str = os.environ.get("PAGEMAP_COOKIE_POLICY", "reject").lower()
 if _COOKIE_POLICY not in ("reject", "accept", "dismiss", "none"):
     _COOKIE_POLICY = "reject"
 _AUTO_DISMISS_BARRIER_TYPES = frozenset({"cookie_consent", "age_verification", "popup_overlay"})
 
+# Stage timing (opt-in): nested pipeline spans for /metrics histograms, and a
+# "Timing:" line in the get_page_map Meta section. Coarse stages are always recorded.
+_STAGE_SPANS_ENABLED: bool = env_flag("PAGEMAP_STAGE_SPANS")
+_STAGE_TIMING_IN_RESPONSE: bool = env_flag("PAGEMAP_STAGE_TIMING_RESPONSE")
+
 # Detail level → token budget mapping for pruned content
 _DETAIL_LEVEL_TOKENS: dict[str, int] = {
     "compact": 1500,  # DEFAULT_PRUNED_CONTEXT_TOKENS (current default)
@@ -375,6 +393,9 @@ _MIN_ATTEMPT_SECONDS = 5.0  # minimum time to justify another attempt
 
 # Timeout for entire execute_action operation (seconds)
 EXECUTE_ACTION_TIMEOUT_SECONDS = 30
+# Post-action quiescence cap per action — never longer than the fixed sleep it replaced
+_ACTION_SETTLE_MAX_MS = {"click": 1000, "hover": 500, "press_key": 500}
+_SETTLING_ACTIONS = frozenset(_ACTION_SETTLE_MAX_MS)
 
 # ── fill_form types + configuration ──────────────────────────────
 
@@ -393,7 +414,9 @@ class FormField(BaseModel):
 FILL_FORM_TIMEOUT_SECONDS = 60
 MAX_FILL_FORM_FIELDS = 20
 FILL_FORM_VALID_ACTIONS = frozenset({"type", "select", "click"})
-_FILL_FORM_SETTLE_MS = 300  # inter-field settle for dynamic forms
+_FILL_FORM_SETTLE_MS = 300  # per-field quiescence cap for dynamic forms (former fixed sleep)
+_FILL_FORM_CLICK_SETTLE_MS = 800  # click fields used to sleep 500 + 300 ms
+_FILL_FORM_BATCH_ENABLED: bool = env_flag("PAGEMAP_FILL_FORM_BATCH", default=True)
 
 # ── wait_for configuration ───────────────────────────────────────
 
@@ -522,7 +545,7 @@ class ServerState:
         self.cache: PageMapCache = PageMapCache()
         self.template_cache: InMemoryTemplateCache = InMemoryTemplateCache()
         self._session_lock: asyncio.Lock = asyncio.Lock()
-        self.tool_lock: asyncio.Lock = asyncio.Lock()
+        self.tool_lock: ToolLock = ToolLock()
         # Lock ordering invariant: tool_lock → _session_lock (reverse prohibited)
         self.session_id: str = uuid.uuid4().hex[:16]
         # S9: Scroll merge state for infinite scroll dedup
@@ -616,6 +639,10 @@ class ServerState:
             self._navigation_count += 1
             return self.session
 
+    def peek_session(self) -> BrowserSession | None:
+        """The current session as is — no health check, recycle or creation."""
+        return self.session
+
     def _check_stdio_recycle(self) -> str | None:
         """D2-style recycle check for STDIO mode."""
         if self._navigation_count >= _max_stdio_navigations:
@@ -705,6 +732,10 @@ def _schedule_background(coro) -> None:  # type: ignore[type-arg]
 
 _state = ServerState()
 
+# Speculative prebuild after state-changing actions (PAGEMAP_SPECULATIVE_PREBUILD)
+_prebuilder = SpeculativePrebuilder()
+register_collector("speculation", lambda: _prebuilder.stats if SPECULATIVE_PREBUILD_ENABLED else None)
+
 # SingleFlight: coalesce concurrent get_page_map calls for same URL (HTTP mode)
 _page_map_singleflight = SingleFlight(ttl=90.0) if SingleFlight is not None else None
 
@@ -748,6 +779,10 @@ _webhook_cleanup: object | None = None  # S8: WebhookCleanup — initialized whe
 _sli_tracker: object | None = None  # S7: ErrorBudgetTracker — initialized in _run_http_server()
 _data_retention: object | None = None  # S1: DataRetentionCleanup — initialized in _run_http_server()
 _tool_schema_registry: object | None = None  # ToolSchemaRegistry — initialized in main() when SECURITY_ADVANCED
+_shared_cache: SharedPageMapCache | None = None  # L2 page-map cache — initialized in _run_http_server()
+_admission: object | None = None  # AdmissionController — initialized in _run_http_server() when enabled
+register_collector("shared_cache", lambda: _shared_cache.stats if _shared_cache is not None else None)
+register_collector("admission", lambda: _admission.stats if _admission is not None else None)  # type: ignore[attr-defined]
 
 
 def _record_sli(*, success: bool) -> None:
@@ -769,6 +804,11 @@ async def _get_session():
     return await _state.get_session()
 
 
+def _peek_session():
+    """Lookup-only counterpart of :func:`_get_session`. Tests may patch this."""
+    return _state.peek_session()
+
+
 def _telem(event_type: str, payload: dict, *, request_id: str = "", session_id: str = "", trace_id: str = "") -> None:
     """Emit a telemetry event. No-op when telemetry is disabled."""
     try:
@@ -949,6 +989,7 @@ def _create_stdio_context() -> RequestContext:
         cache=_state.cache,
         template_cache=_state.template_cache,
         get_session=_get_session,
+        peek_session=_peek_session,
         scroll_merge_state=_state.get_scroll_merge_state(),
         multi_tab=_state.multi_tab,
         get_or_create_multi_tab=_state.get_or_create_multi_tab,
@@ -957,11 +998,16 @@ def _create_stdio_context() -> RequestContext:
 
 async def _acquire_context(
     mcp_ctx: McpContext | None = None,
-) -> tuple[RequestContext, asyncio.Lock]:
+    *,
+    cancel_speculation: bool = True,
+) -> tuple[RequestContext, ToolLock]:
     """Get per-request context + tool lock.
 
     HTTP mode: extracts session_id from MCP Context -> per-session isolation.
     STDIO mode: uses global ServerState (single session).
+
+    Cancels the session's speculative prebuild unless *cancel_speculation*
+    is False (``get_page_map`` on the current page waits for it instead).
     """
     req = None
     if mcp_ctx is not None:
@@ -979,6 +1025,8 @@ async def _acquire_context(
     else:
         ctx = _create_stdio_context()
         lock = _state.tool_lock
+    if cancel_speculation:
+        _prebuilder.cancel(ctx.session_id)
 
     # Extract gateway metadata (client_ip, request_id) from scope["state"]
     gateway_request_id = ""
@@ -995,6 +1043,8 @@ async def _acquire_context(
             replacements["client_ip"] = client_ip
         ctx = dataclasses.replace(ctx, **replacements)
 
+    import structlog
+
     structlog.contextvars.bind_contextvars(
         request_id=ctx.request_id,
         session_id=ctx.session_id,
@@ -1019,6 +1069,15 @@ def _resolve_multi_tab_context(ctx: RequestContext) -> RequestContext:
     tab = multi_tab.get_active_tab()
     if tab is None:
         return ctx  # No active tab — will be caught by session lookup
+    return _tab_context(ctx, tab)
+
+
+def _tab_context(ctx: RequestContext, tab: TabInstance) -> RequestContext:
+    """RequestContext bound to *tab*'s session, cache and build state.
+
+    Mutable per-build state is never shared with the session context or
+    other tabs (map_tabs builds tabs concurrently).
+    """
 
     async def _get_tab_session():
         return tab.session
@@ -1027,10 +1086,29 @@ def _resolve_multi_tab_context(ctx: RequestContext) -> RequestContext:
         ctx,
         cache=tab.cache,
         get_session=_get_tab_session,
-        scroll_merge_state=None,  # tab-scoped: each tab gets its own scroll state
+        peek_session=lambda: tab.session,
+        scroll_merge_state=tab.get_scroll_merge_state(),
+        build_context=BuildContext() if ctx.build_context is not None else None,
     )
 
 
+def _reader_context(ctx: RequestContext) -> RequestContext | None:
+    """*ctx* for a reader under the shared tool lock, or None when it must run exclusively.
+
+    The reader's ``get_session()`` only looks the session up: health-check
+    recovery and recycling replace the session other readers are using, so
+    they run under the exclusive lock.  None when there is no session yet.
+    """
+    session = ctx.peek_session() if ctx.peek_session is not None else None
+    if session is None:
+        return None
+
+    async def _existing_session():
+        return session
+
+    return dataclasses.replace(ctx, get_session=_existing_session)
+
+
 # ── MCP Tools ────────────────────────────────────────────────────────
 
 
@@ -1067,7 +1145,7 @@ async def get_page_map(
         max_content_tokens: Override token budget for pruned content.
             Takes precedence over detail_level. Clamped to [100, 50000].
     """
-    ctx, lock = await _acquire_context(mcp_ctx)
+    ctx, lock = await _acquire_context(mcp_ctx, cancel_speculation=url is not None)
     ctx = _resolve_multi_tab_context(ctx)
     # URL validation is fast — do before acquiring lock
     if url is not None:
@@ -1092,7 +1170,16 @@ async def get_page_map(
 
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            # Unchanged current page: serve the cached map alongside other readers
+            if url is None and not _prebuilder.pending(ctx.session_id):
+                async with hold_tool_lock(lock, "get_page_map", shared=True):
+                    _authz_active_url = ctx.cache.active.url if ctx.cache.active is not None else None
+                    reader = _reader_context(ctx)
+                    result = await _serve_cached_page_map(reader) if reader is not None else None
+                    if result is not None:
+                        _record_tool_call("get_page_map", session_id=ctx.session_id, url=url, request_id=ctx.request_id)
+                        return _finish_get_page_map(ctx, result, url=url, active_url=_authz_active_url)
+            async with hold_tool_lock(lock, "get_page_map"):
                 _record_tool_call("get_page_map", session_id=ctx.session_id, url=url, request_id=ctx.request_id)
                 # S8-3: Tool authorization gate — capture before impl so URL reflects pre-navigation state
                 _authz_active_url = ctx.cache.active.url if ctx.cache.active is not None else None
@@ -1103,28 +1190,82 @@ async def get_page_map(
                     max_content_tokens=max_content_tokens,
                     ctx=ctx,
                 )
-                result = _apply_tool_authz(
-                    "get_page_map",
-                    result,
-                    url=url,
-                    active_url=_authz_active_url,
-                    request_id=ctx.request_id,
-                    session_id=ctx.session_id,
-                )
-                # S11: CQP downgrade detection — report get_page_map success/failure
-                if _cqp_emitter is not None:
-                    with suppress(Exception):  # nosec B110
-                        _cqp_emitter.record_tool_result(  # type: ignore[union-attr]
-                            session_id=ctx.session_id,
-                            tool_name="get_page_map",
-                            success=not result.startswith("Error:"),
-                        )
-                return result
+                return _finish_get_page_map(ctx, result, url=url, active_url=_authz_active_url)
     except TimeoutError:
         logger.error("Tool lock acquisition timed out for get_page_map")
         return "Error: Server busy — another tool call is in progress. Wait a moment, then retry."
 
 
+def _finish_get_page_map(ctx: RequestContext, result: str, *, url: str | None, active_url: str | None) -> str:
+    """Tool authorization gate + CQP success reporting for a get_page_map response."""
+    result = _apply_tool_authz(
+        "get_page_map",
+        result,
+        url=url,
+        active_url=active_url,
+        request_id=ctx.request_id,
+        session_id=ctx.session_id,
+    )
+    # S11: CQP downgrade detection — report get_page_map success/failure
+    if _cqp_emitter is not None:
+        with suppress(Exception):  # nosec B110
+            _cqp_emitter.record_tool_result(  # type: ignore[union-attr]
+                session_id=ctx.session_id,
+                tool_name="get_page_map",
+                success=not result.startswith("Error:"),
+            )
+    return result
+
+
+async def _serve_cached_page_map(ctx: RequestContext) -> str | None:
+    """Tier-A response for the current page under the shared tool lock, or None.
+
+    Read-only: only answers when the URL and fingerprint still match the
+    active entry, no DOM mutation is pending and the page has no barrier;
+    anything else falls through to the full path, which runs exclusively.
+    """
+    entry = ctx.cache.active_entry
+    if entry is None or entry.fingerprint is None or entry.page_map.barrier is not None:
+        return None
+    try:
+        session = await ctx.get_session()
+        current_url = await session.get_page_url()
+        if normalize_cache_url(current_url) != normalize_cache_url(entry.page_map.url):
+            return None
+        if await session.peek_mutation_severity() != 0:
+            return None
+        timer = PipelineTimer()
+        timer.stage("fingerprint")
+        if await capture_dom_fingerprint(session.page) != entry.fingerprint:
+            return None
+        timer.stage("post_validation")
+        if await _validate_url_with_dns(current_url):
+            return None  # let the full path report the blocked URL
+    except Exception:
+        logger.debug("Shared get_page_map fast path unavailable", exc_info=True)
+        return None
+
+    from pagemap.serializer import to_agent_prompt_diff
+
+    page_map = entry.page_map
+    timer.stage("serialization")
+    diff = to_agent_prompt_diff(
+        page_map, page_map, cache_age_s=_time_mod.monotonic() - entry.created_at, include_meta=True
+    )
+    if diff is None:
+        return None
+    ctx.cache.record_hit()
+    session.drain_dialogs()
+    _record_stage_timing(timer, page_map.page_type, "A")
+    logger.info(
+        "get_page_map: request=%s tier=A interactables=%d cache=hit (shared)",
+        ctx.request_id,
+        page_map.total_interactables,
+    )
+    _record_sli(success=True)
+    return _check_response_size(diff, tool="get_page_map")
+
+
 async def _get_page_map_impl(
     url: str | None = None,
     *,
@@ -1164,7 +1305,14 @@ async def _get_page_map_inner(
     detail_level: str | None = None,
     max_content_tokens: int | None = None,
     ctx: RequestContext,
+    speculation: bool = True,
 ) -> str:
+    """Build (or serve from cache) the Page Map for *ctx*'s session.
+
+    *speculation* is False for map_tabs: its per-tab builds share the
+    caller's session_id, so they must neither remember options for nor
+    consume the session's speculative prebuild.
+    """
     import time as _time
 
     request_id = ctx.request_id
@@ -1172,6 +1320,7 @@ async def _get_page_map_inner(
     logger.info("get_page_map: request=%s url=%s", request_id, url or "(current)")
 
     timer = PipelineTimer()
+    _span_token = _active_timer.set(timer) if _STAGE_SPANS_ENABLED else None
 
     _tracer = None
     try:
@@ -1187,9 +1336,12 @@ async def _get_page_map_inner(
         from pagemap.page_map_builder import (
             build_page_map_live,
             rebuild_content_only,
+            rebuild_scroll_delta,
         )
 
         budget = _resolve_pruned_token_budget(detail_level, max_content_tokens)
+        if speculation:
+            _prebuilder.remember(ctx.session_id, budget, task_hint)
         from pagemap.serializer import to_agent_prompt_diff, to_agent_prompt_secure
 
         # Step 1: Navigate if url provided → hard invalidation
@@ -1310,6 +1462,52 @@ async def _get_page_map_inner(
             else:
                 cache.record_fingerprint_mismatch()
 
+        # TIER S: Scroll delta — prune only content appended since the cached build
+        if (
+            page_map is None
+            and _SCROLL_DELTA_ENABLED
+            and url is None
+            and active_entry is not None
+            and _mutation_sev < 2
+        ):
+            delta = await collect_scroll_delta(page, active_entry.generation_id)
+            if delta is not None and delta.usable:
+                timer.stage("scroll_delta")
+                if _tracer:
+                    _tracer.start_stage("scroll_delta")
+                page_map = await asyncio.wait_for(
+                    rebuild_scroll_delta(
+                        session=session,
+                        cached=active_entry.page_map,
+                        delta=delta,
+                        max_pruned_tokens=budget,
+                        task_hint=task_hint,
+                    ),
+                    timeout=PAGE_MAP_TIMEOUT_SECONDS,
+                )
+                if page_map is not None:
+                    tier = "S"
+                    cache.record_scroll_delta()
+
+        # TIER L2: Shared cache — another replica of this tenant already built this exact document
+        shared_age_s = 0.0
+        shared_digest: str | None = None
+        if page_map is None and _shared_cache is not None:
+            timer.stage("shared_cache")
+            shared_url = await session.get_page_url()
+            shared_digest = await shareable_document_digest(page, shared_url)
+            shared = (
+                await _shared_cache.get_page_map(shared_url, shared_digest, ctx.tenant_id)
+                if shared_digest is not None
+                else None
+            )
+            if shared is not None:
+                tier = "L2"
+                page_map, shared_age_s = shared
+                cache.record_shared_hit()
+            else:
+                await _shared_cache.pull_templates(extract_template_domain(shared_url), ctx.template_cache)
+
         # TIER C: Full rebuild
         if page_map is None:
             timer.stage("build")
@@ -1335,6 +1533,15 @@ async def _get_page_map_inner(
                 timeout=PAGE_MAP_TIMEOUT_SECONDS,
             )
             cache.record_miss()
+            if shared_digest is not None:
+                _publish_shared(page_map, shared_digest, ctx.tenant_id, ctx.template_cache)
+
+        # Speculative prebuild served: the agent never saw it, so no diff against it
+        prebuilt = speculation and _prebuilder.consume(
+            ctx.session_id, active_entry.generation_id if tier == "A" else None
+        )
+        if prebuilt:
+            old_page_map = None
 
         # A4: Reset ContextVar (fire-and-forget)
         if _a4_token is not None:
@@ -1511,6 +1718,14 @@ async def _get_page_map_inner(
             except Exception:  # nosec B110
                 pass
 
+        # Consent pre-seeding: count builds of hosts whose CMP was already seeded, and
+        # remember the CMP so later navigations seed its reject cookies. A suppressed
+        # banner still goes through auto-dismiss below (the CMP JS API needs no buttons).
+        if CONSENT_SEED_ENABLED and page_map.barrier is not None:
+            if detected_cmps.get(page_map.url) == page_map.barrier.provider:
+                consent_seed_stats.record(page_map.barrier)
+            detected_cmps.remember(page_map.url, page_map.barrier)
+
         # ── Auto-dismiss barrier (opt-in, max 1 attempt) ──
         if _AUTO_DISMISS_ENABLED and page_map.barrier is not None:
             _ad_barrier = page_map.barrier
@@ -1555,6 +1770,7 @@ async def _get_page_map_inner(
                                 "type": _ad_result.barrier_type,
                                 "method": _ad_result.method,
                                 "elapsed_ms": round(_ad_result.elapsed_ms, 1),
+                                "stability_ms": _ad_result.stability_ms,
                             }
                     except Exception as _ad_exc:
                         logger.debug("Auto-dismiss pipeline error: %s", _ad_exc)
@@ -1579,18 +1795,27 @@ async def _get_page_map_inner(
         cache_status = f"miss | template={_tmpl_status} | built={page_map.generation_ms:.0f}ms"
         if tier == "A":
             age_s = _time.monotonic() - active_entry.created_at
-            cache_status = f"hit | age={age_s:.0f}s"
+            cache_status = f"{'prebuilt' if prebuilt else 'hit'} | age={age_s:.0f}s"
         elif tier == "B":
             age_s = _time.monotonic() - active_entry.created_at
             cache_status = (
                 f"content_refresh | template={_tmpl_status} | age={age_s:.0f}s | built={page_map.generation_ms:.0f}ms"
             )
+        elif tier == "L2":
+            cache_status = f"shared | age={shared_age_s:.0f}s | built={page_map.generation_ms:.0f}ms"
+        elif tier == "S":
+            _delta_meta = page_map.metadata.get("scroll_delta", {})
+            cache_status = (
+                f"scroll_delta | +{_delta_meta.get('new_refs', 0)} refs | built={page_map.generation_ms:.0f}ms"
+            )
 
         # Try diff output for tiers A and B
+        timer.stage("serialization")
         if tier in ("A", "B") and old_page_map is not None:
             age_s = _time.monotonic() - active_entry.created_at
             diff = to_agent_prompt_diff(old_page_map, page_map, cache_age_s=age_s, include_meta=True)
             if diff is not None:
+                _record_stage_timing(timer, page_map.page_type, tier)
                 logger.info(
                     "get_page_map: request=%s tier=%s interactables=%d cache=%s",
                     request_id,
@@ -1601,7 +1826,13 @@ async def _get_page_map_inner(
                 _record_sli(success=True)
                 return _check_response_size(diff, tool="get_page_map")
 
-        prompt = to_agent_prompt_secure(page_map, include_meta=True, cache_meta=cache_status)
+        prompt = to_agent_prompt_secure(
+            page_map,
+            include_meta=True,
+            cache_meta=cache_status,
+            timing_meta=_format_stage_timing(timer) if _STAGE_TIMING_IN_RESPONSE else "",
+        )
+        _record_stage_timing(timer, page_map.page_type, tier)
         logger.info(
             "get_page_map: request=%s tier=%s interactables=%d pruned_tokens=%d cache=%s",
             request_id,
@@ -1635,6 +1866,122 @@ async def _get_page_map_inner(
         logger.error("get_page_map: request=%s failed", request_id)
         _record_sli(success=False)
         return _safe_error("get_page_map", e, request_id=request_id)
+    finally:
+        if _span_token is not None:
+            _active_timer.reset(_span_token)
+
+
+def _playwright_error() -> type[Exception]:
+    """``playwright.async_api.Error``, imported on first use so server import stays light."""
+    from playwright.async_api import Error
+
+    return Error
+
+
+def _format_stage_timing(timer: PipelineTimer) -> str:
+    """Compact ``stage=ms`` list (stages, then nested spans) for the Meta section."""
+    parts = [f"{name}={ms:.0f}ms" for name, ms in timer.elapsed_per_stage().items()]
+    parts.extend(f"{name}={ms:.0f}ms" for name, ms in timer.span_timings().items())
+    return " ".join(parts)
+
+
+def _publish_shared(page_map: PageMap, digest: str, scope: str, template_cache: InMemoryTemplateCache) -> None:
+    """Offer a fresh full build (and a newly learned template) to the shared L2 tier in the background."""
+    if _shared_cache is None:
+        return
+    entry = _shared_cache.prepare(page_map, digest, scope)
+    if entry is not None:
+        _schedule_background(_shared_cache.put(*entry))
+    template = template_cache.peek(TemplateKey(extract_template_domain(page_map.url), page_map.page_type))
+    if template is not None and template.hit_count == 0:
+        _schedule_background(_shared_cache.push_template(template))
+
+
+def _action_failed(result: str) -> bool:
+    """Whether a state-changing tool's response reports a failure.
+
+    Covers ``Error…`` text, execute_action's JSON ``error`` key and a
+    fill_form that stopped on anything other than a navigation.
+    """
+    if result.startswith("Error"):
+        return True
+    if result.startswith("{"):
+        try:
+            return "error" in json.loads(result)
+        except ValueError:
+            return True
+    header = result.partition("\n")[0]
+    return header.startswith("fill_form:") and "(stopped:" in header and "(stopped: navigation)" not in header
+
+
+def _speculate(ctx: RequestContext, lock: ToolLock, result: str) -> None:
+    """Schedule a background page-map prebuild for *ctx* once the current tool releases *lock*.
+
+    Only after a successful action (*result* is the tool's response).
+    """
+    if SPECULATIVE_PREBUILD_ENABLED and not _action_failed(result):
+        _prebuilder.schedule(ctx.session_id, lambda: _speculative_build(ctx, lock))
+
+
+async def _speculative_build(ctx: RequestContext, lock: ToolLock) -> SpeculationResult:
+    """Full build of the current page into ``ctx.cache`` so the next get_page_map is a Tier-A hit.
+
+    Runs under the tool lock.  Skips pages the interactive path must handle
+    itself (blocked URLs, barriers, bot blocks, critical DOM mutations) and
+    discards the build if the DOM fingerprint moved while it ran.
+    """
+    from pagemap.page_map_builder import build_page_map_live
+
+    async with hold_tool_lock(lock, "speculative_prebuild"):
+        session = await ctx.get_session()
+        if await _validate_url_with_dns(await session.get_page_url()):
+            return SpeculationResult("skipped")
+        if await session.read_mutation_severity() >= 2:
+            ctx.cache.invalidate(InvalidationReason.DOM_MAJOR)  # leave the full security path to get_page_map
+            return SpeculationResult("skipped")
+        fingerprint = await capture_dom_fingerprint(session.page)
+        entry = ctx.cache.active_entry
+        if fingerprint is None or (entry is not None and entry.fingerprint == fingerprint):
+            return SpeculationResult("skipped")
+        budget, task_hint = _prebuilder.options(ctx.session_id) or (_resolve_pruned_token_budget(None, None), None)
+        t0 = _time_mod.perf_counter()
+        page_map = await asyncio.wait_for(
+            build_page_map_live(
+                session=session,
+                url=None,
+                enable_tier3=True,
+                max_pruned_tokens=budget,
+                template_cache=ctx.template_cache,
+                spa_signals=fingerprint.spa_signals,
+                task_hint=task_hint,
+            ),
+            timeout=PAGE_MAP_TIMEOUT_SECONDS,
+        )
+        build_ms = (_time_mod.perf_counter() - t0) * 1000
+        metadata = page_map.metadata or {}
+        if (
+            page_map.barrier is not None
+            or page_map.page_type == "blocked"
+            or metadata.get("blocked_info")
+            or metadata.get("_force_cache_evict")
+        ):
+            return SpeculationResult("skipped", build_ms=build_ms)
+        if await capture_dom_fingerprint(session.page) != fingerprint:
+            return SpeculationResult("stale", build_ms=build_ms)
+        generation_id = ctx.cache.store(page_map, fingerprint)
+        logger.debug("Speculative prebuild ready: url=%s gen=%s build=%.0fms", page_map.url, generation_id, build_ms)
+        return SpeculationResult("ready", generation_id=generation_id, build_ms=build_ms)
+
+
+def _record_stage_timing(timer: PipelineTimer, page_type: str, tier: str) -> None:
+    """Close the timer and feed it into the /metrics stage histograms (fail-open)."""
+    timer.finalize()
+    try:
+        from pagemap.server.stage_metrics import stage_histograms
+
+        stage_histograms.observe_timer(timer, page_type=page_type or "unknown", cache_tier=tier)
+    except Exception:  # nosec B110
+        pass
 
 
 async def _resolve_locator(page: Page, target: Interactable) -> tuple[Locator, str]:
@@ -1659,7 +2006,7 @@ async def _resolve_locator(page: Page, target: Interactable) -> tuple[Locator, s
         try:
             role_locator = page.get_by_role(target.role, name=target.name, exact=True)
             role_count = await role_locator.count()
-        except PlaywrightError:
+        except _playwright_error():
             role_count = 0
 
         if role_count == 1:
@@ -1672,7 +2019,7 @@ async def _resolve_locator(page: Page, target: Interactable) -> tuple[Locator, s
             css_count = await css_locator.count()
             if css_count >= 1:
                 return css_locator, "css"
-        except PlaywrightError:
+        except _playwright_error():
             pass
 
     # Strategy 3: role locator with multiple matches (degraded)
@@ -1707,7 +2054,7 @@ async def _execute_locator_action_with_retry(
     Click retried only on pre-dispatch failures (double-submission safety).
 
     Returns: locator method ("role" or "css")
-    Raises: ValueError (element not found), PlaywrightError (non-retryable/exhausted)
+    Raises: ValueError (element not found), playwright Error (non-retryable/exhausted)
     """
     import time
 
@@ -1760,7 +2107,7 @@ async def _execute_locator_action_with_retry(
             elif action == "select":
                 await locator.first.select_option(value, timeout=5000)
             return method  # Success
-        except PlaywrightError as exc:
+        except _playwright_error() as exc:
             last_error = exc
             if not _is_retryable_error(exc, action):
                 raise
@@ -1774,6 +2121,40 @@ async def _execute_locator_action_with_retry(
     raise RuntimeError("Retry loop exited unexpectedly")
 
 
+async def _execute_target_action(
+    session: BrowserSession,
+    target: Interactable,
+    action: str,
+    value: str | None,
+    request_id: str,
+    original_url: str,
+    *,
+    use_handle: bool,
+) -> str:
+    """Dispatch straight to the build-time node handle; role/CSS locators only if it is stale.
+
+    Returns: "node", or the locator method ("role" / "css")
+    Raises: same as _execute_locator_action_with_retry
+    """
+    if use_handle and target.backend_node_id is not None:
+        try:
+            cdp = await session.get_cdp_session()
+        except Exception:
+            logger.debug("No CDP session for node handle ref=%d, using locator", target.ref, exc_info=True)
+        else:
+            # Raises only after a click's mouse press was sent (never retried)
+            if await dispatch_via_handle(cdp, target.backend_node_id, action, value):
+                return "node"
+    return await _execute_locator_action_with_retry(
+        session.page,
+        target,
+        action,
+        value,
+        request_id,
+        original_url,
+    )
+
+
 @mcp.tool(
     annotations=ToolAnnotations(
         title="Execute Action", readOnlyHint=False, destructiveHint=True, openWorldHint=True, riskTierHint="medium"
@@ -1799,9 +2180,10 @@ async def execute_action(ref: int, action: str = "click", value: str | None = No
     ctx = _resolve_multi_tab_context(ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "execute_action"):
                 _record_tool_call("execute_action", session_id=ctx.session_id, request_id=ctx.request_id)
                 _ea_result = await _execute_action_impl(ref, action, value, ctx=ctx)
+                _speculate(ctx, lock, _ea_result)
                 # S8-3: Tool authorization gate (JSON response → authz_advisory key)
                 _ea_active_url = ctx.cache.active.url if ctx.cache.active is not None else None
                 return _apply_tool_authz(
@@ -1913,30 +2295,34 @@ async def _execute_action_impl(
         # For HTTP transport (future), wrap action+fingerprint in broader lock.
         pre_fingerprint = await capture_dom_fingerprint(page)
 
+        # Post-action settle: return as soon as network + DOM are quiet (capped)
+        settle_ms: int | None = None
         if action == "press_key":
-            await page.keyboard.press(value)
-            await page.wait_for_timeout(500)
+            with ActionSettler(page) as settler:
+                await page.keyboard.press(value)
+                settle_ms = (await settler.settle(max_ms=_ACTION_SETTLE_MAX_MS["press_key"])).waited_ms
             description = f"Pressed key '{value}'"
         else:
-            # Execute action with retry on transient failures
-            try:
-                method = await _execute_locator_action_with_retry(
-                    page,
-                    target,
-                    action,
-                    value,
-                    request_id,
-                    current_page_map.url,
-                )
-            except ValueError as loc_err:
-                return _build_action_error(str(loc_err))
-            # PlaywrightError falls through to outer except handler
+            # Node handle first (same document, unchanged structure), then locator with retry
+            active_entry = ctx.cache.active_entry
+            use_handle = active_entry is not None and handles_valid(active_entry.fingerprint, pre_fingerprint)
+            with ActionSettler(page) as settler:
+                try:
+                    method = await _execute_target_action(
+                        session,
+                        target,
+                        action,
+                        value,
+                        request_id,
+                        current_page_map.url,
+                        use_handle=use_handle,
+                    )
+                except ValueError as loc_err:
+                    return _build_action_error(str(loc_err))
+                # playwright Error falls through to outer except handler
 
-            # Post-action settle
-            if action == "click":
-                await page.wait_for_timeout(1000)
-            elif action == "hover":
-                await page.wait_for_timeout(500)
+                if action in _SETTLING_ACTIONS:
+                    settle_ms = (await settler.settle(max_ms=_ACTION_SETTLE_MAX_MS[action])).waited_ms
 
             # Build description
             if action == "click":
@@ -1967,6 +2353,7 @@ async def _execute_action_impl(
                 dialogs = _collect_dialogs(session)
                 return _build_action_result(
                     description=description,
+                    settle_ms=settle_ms,
                     current_url=current_page_map.url,
                     change="none",
                     refs_expired=False,
@@ -1985,6 +2372,7 @@ async def _execute_action_impl(
                     pass
                 return _build_action_result(
                     description=description,
+                    settle_ms=settle_ms,
                     current_url=popup_url,
                     change="new_tab",
                     refs_expired=True,
@@ -2031,6 +2419,7 @@ async def _execute_action_impl(
                 pass
             return _build_action_result(
                 description=description,
+                settle_ms=settle_ms,
                 current_url=new_url,
                 change="navigation",
                 refs_expired=True,
@@ -2091,6 +2480,7 @@ async def _execute_action_impl(
 
             return _build_action_result(
                 description=description,
+                settle_ms=settle_ms,
                 current_url=new_url,
                 change=change,
                 refs_expired=refs_expired,
@@ -2231,7 +2621,13 @@ async def get_page_state(mcp_ctx: McpContext = None) -> str:
     ctx = _resolve_multi_tab_context(ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "get_page_state", shared=True):
+                reader = _reader_context(ctx)
+                if reader is not None:
+                    _record_tool_call("get_page_state", session_id=ctx.session_id, request_id=ctx.request_id)
+                    return await _get_page_state_impl(ctx=reader)
+            # No session yet: creating one runs exclusively
+            async with hold_tool_lock(lock, "get_page_state"):
                 _record_tool_call("get_page_state", session_id=ctx.session_id, request_id=ctx.request_id)
                 return await _get_page_state_impl(ctx=ctx)
     except TimeoutError:
@@ -2273,60 +2669,137 @@ SCREENSHOT_TIMEOUT_SECONDS = 15
 @mcp.tool(
     annotations=ToolAnnotations(title="Take Screenshot", readOnlyHint=True, openWorldHint=True, riskTierHint="low")
 )
-async def take_screenshot(full_page: bool = False, mcp_ctx: McpContext = None) -> list | str:
+async def take_screenshot(
+    full_page: bool = False,
+    format: str = "png",
+    quality: int | None = None,
+    scale: float = 1.0,
+    ref: int | None = None,
+    max_bytes: int | None = None,
+    mcp_ctx: McpContext = None,
+) -> list | str:
     """Take a screenshot of the current page.
 
-    Standalone diagnostic tool — does not require an active Page Map.
+    Standalone diagnostic tool — does not require an active Page Map
+    (except with ``ref``).
 
     Args:
         full_page: If True, capture the full scrollable page. Default: viewport only.
+        format: "png" (default), "jpeg" or "webp".
+        quality: 1-100 for jpeg/webp. Default: 80.
+        scale: Downscale factor, 0.1-1.0. Default: 1.0.
+        ref: Clip to this element's bounding box (ref from the current Page Map).
+        max_bytes: Byte budget; quality and scale are stepped down until the image fits.
     """
     ctx, lock = await _acquire_context(mcp_ctx)
     ctx = _resolve_multi_tab_context(ctx)
+    screenshot = functools.partial(
+        _take_screenshot_impl, full_page, fmt=format, quality=quality, scale=scale, ref=ref, max_bytes=max_bytes
+    )
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "take_screenshot", shared=True):
+                reader = _reader_context(ctx)
+                if reader is not None:
+                    _record_tool_call("take_screenshot", session_id=ctx.session_id, request_id=ctx.request_id)
+                    return await screenshot(ctx=reader)
+            # No session yet: creating one runs exclusively
+            async with hold_tool_lock(lock, "take_screenshot"):
                 _record_tool_call("take_screenshot", session_id=ctx.session_id, request_id=ctx.request_id)
-                return await _take_screenshot_impl(full_page, ctx=ctx)
+                return await screenshot(ctx=ctx)
     except TimeoutError:
         logger.error("Tool lock acquisition timed out for take_screenshot")
         return "Error: Server busy — another tool call is in progress. Wait a moment, then retry."
 
 
-async def _take_screenshot_impl(full_page: bool = False, *, ctx: RequestContext | None = None) -> list | str:
+async def _take_screenshot_impl(
+    full_page: bool = False,
+    *,
+    ctx: RequestContext | None = None,
+    fmt: str = "png",
+    quality: int | None = None,
+    scale: float = 1.0,
+    ref: int | None = None,
+    max_bytes: int | None = None,
+) -> list | str:
     if ctx is None:
         ctx = _create_stdio_context()
 
+    # Input validation
+    fmt = fmt.lower().strip()
+    if fmt == "jpg":
+        fmt = "jpeg"
+    if fmt not in SCREENSHOT_FORMATS:
+        return f"Error: Invalid format '{fmt}'. Allowed: png, jpeg, webp."
+    if quality is not None and not 1 <= quality <= 100:
+        return f"Error: quality must be 1-100, got {quality}."
+    if not 0.1 <= scale <= 1.0:
+        return f"Error: scale must be 0.1-1.0, got {scale}."
+    if max_bytes is not None and max_bytes <= 0:
+        return f"Error: max_bytes must be positive, got {max_bytes}."
+    budget = min(max_bytes, MAX_SCREENSHOT_SIZE_BYTES) if max_bytes is not None else MAX_SCREENSHOT_SIZE_BYTES
+
     try:
         session = await ctx.get_session()
-        screenshot_bytes = await asyncio.wait_for(
-            session.page.screenshot(full_page=full_page, type="png"),
-            timeout=SCREENSHOT_TIMEOUT_SECONDS,
-        )
-        if len(screenshot_bytes) > MAX_SCREENSHOT_SIZE_BYTES:
-            try:
-                from pagemap.telemetry.events import RESPONSE_SIZE_EXCEEDED
 
-                _telem(
-                    RESPONSE_SIZE_EXCEEDED,
-                    {
-                        "tool": "take_screenshot",
-                        "size": len(screenshot_bytes),
-                        "limit": MAX_SCREENSHOT_SIZE_BYTES,
-                    },
+        clip = None
+        if ref is not None:
+            current_page_map = ctx.cache.active
+            if current_page_map is None:
+                return "Error: No active Page Map. Call get_page_map first to load current page refs."
+            target = next((item for item in current_page_map.interactables if item.ref == ref), None)
+            if target is None:
+                return (
+                    f"Error: ref [{ref}] not found. Valid refs: 1-{len(current_page_map.interactables)}. "
+                    "Call get_page_map to refresh refs."
                 )
-            except Exception:  # nosec B110
-                pass
-            return (
-                f"Error: Screenshot too large ({len(screenshot_bytes):,} bytes, "
-                f"limit {MAX_SCREENSHOT_SIZE_BYTES:,}). "
-                "Use full_page=False for a smaller capture."
-            )
+            locator, _strategy = await _resolve_locator(session.page, target)
+            clip = await locator.evaluate(ELEMENT_RECT_JS)
+            if not clip or clip["width"] <= 0 or clip["height"] <= 0:
+                return f"Error: ref [{ref}] is not visible (empty bounding box)."
+
+        shot = await asyncio.wait_for(
+            capture_screenshot(
+                session,
+                fmt=fmt,
+                quality=quality,
+                scale=scale,
+                clip=clip,
+                full_page=full_page,
+                budget=budget,
+            ),
+            timeout=SCREENSHOT_TIMEOUT_SECONDS,
+        )
         dialog_warning = _format_dialog_warnings(session.drain_dialogs())
+        settings = shot.format if shot.quality is None else f"{shot.format} q{shot.quality}"
+        if shot.scale != 1.0:
+            settings += f", scale {shot.scale:g}"
+        timing = f"capture {shot.capture_ms:.0f}ms"
+        if shot.attempts > 1:
+            timing += f", re-encode {shot.encode_ms:.0f}ms over {shot.attempts - 1} step(s) to fit {budget:,} bytes"
         return [
-            McpImage(data=screenshot_bytes, format="png"),
-            f"Screenshot captured ({len(screenshot_bytes)} bytes){dialog_warning}",
+            McpImage(data=shot.data, format=shot.format),
+            f"Screenshot captured ({len(shot.data)} bytes, {settings}; {timing}){dialog_warning}",
         ]
+    except ScreenshotTooLarge as e:
+        try:
+            from pagemap.telemetry.events import RESPONSE_SIZE_EXCEEDED
+
+            _telem(
+                RESPONSE_SIZE_EXCEEDED,
+                {
+                    "tool": "take_screenshot",
+                    "size": e.smallest,
+                    "limit": budget,
+                },
+            )
+        except Exception:  # nosec B110
+            pass
+        return (
+            f"Error: Screenshot too large ({e.smallest:,} bytes at the smallest setting, "
+            f"limit {budget:,}). "
+            "Use full_page=False, ref= to clip to one element, or a larger max_bytes."
+        )
     except TimeoutError:
         return f"Error: Screenshot timed out after {SCREENSHOT_TIMEOUT_SECONDS}s. The page may be unresponsive. Call get_page_map to check page state."
     except Exception as e:
@@ -2355,9 +2828,11 @@ async def navigate_back(mcp_ctx: McpContext = None) -> str:
     ctx = _resolve_multi_tab_context(ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "navigate_back"):
                 _record_tool_call("navigate_back", session_id=ctx.session_id, request_id=ctx.request_id)
-                return await _navigate_back_impl(ctx=ctx)
+                result = await _navigate_back_impl(ctx=ctx)
+                _speculate(ctx, lock, result)
+                return result
     except TimeoutError:
         logger.error("Tool lock acquisition timed out for navigate_back")
         return "Error: Server busy — another tool call is in progress. Wait a moment, then retry."
@@ -2417,6 +2892,7 @@ async def _navigate_back_impl(*, ctx: RequestContext | None = None) -> str:
 VALID_SCROLL_DIRECTIONS = frozenset({"up", "down"})
 VALID_SCROLL_AMOUNTS = frozenset({"page", "half"})
 SCROLL_TIMEOUT_SECONDS = 10
+_SCROLL_DELTA_ENABLED: bool = env_flag("PAGEMAP_SCROLL_DELTA", default=True)
 _MAX_SCROLL_PIXELS = 50000
 
 
@@ -2435,9 +2911,11 @@ async def scroll_page(direction: str = "down", amount: str = "page", mcp_ctx: Mc
     ctx = _resolve_multi_tab_context(ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "scroll_page"):
                 _record_tool_call("scroll_page", session_id=ctx.session_id, request_id=ctx.request_id)
-                return await _scroll_page_impl(direction, amount, ctx=ctx)
+                result = await _scroll_page_impl(direction, amount, ctx=ctx)
+                _speculate(ctx, lock, result)
+                return result
     except TimeoutError:
         logger.error("Tool lock acquisition timed out for scroll_page")
         return "Error: Server busy — another tool call is in progress. Wait a moment, then retry."
@@ -2483,6 +2961,12 @@ async def _scroll_page_impl(direction: str = "down", amount: str = "page", *, ct
         # Apply direction
         delta_y = -pixels if direction == "up" else pixels
 
+        # Track content appended by this scroll for an incremental rebuild
+        # (None keeps a tracker armed by an earlier scroll of the same map)
+        if _SCROLL_DELTA_ENABLED:
+            active_entry = ctx.cache.active_entry
+            await arm_scroll_delta(session.page, active_entry.generation_id if active_entry else None)
+
         # Execute scroll
         result_pos = await asyncio.wait_for(
             session.scroll(delta_y=delta_y),
@@ -2576,9 +3060,10 @@ async def fill_form(fields: list[FormField], mcp_ctx: McpContext = None) -> str:
     ctx = _resolve_multi_tab_context(ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "fill_form"):
                 _record_tool_call("fill_form", session_id=ctx.session_id, request_id=ctx.request_id)
                 _ff_result = await _fill_form_impl(fields, ctx=ctx)
+                _speculate(ctx, lock, _ff_result)
                 # S8-3: Tool authorization gate (text response → trailing append)
                 _ff_active_url = ctx.cache.active.url if ctx.cache.active is not None else None
                 return _apply_tool_authz(
@@ -2659,60 +3144,103 @@ async def _fill_form_impl(fields: list[FormField], *, ctx: RequestContext | None
 
         # Pre-batch DOM fingerprint
         pre_fingerprint = await capture_dom_fingerprint(page)
+        active_entry = ctx.cache.active_entry
+        use_handle = active_entry is not None and handles_valid(active_entry.fingerprint, pre_fingerprint)
 
         completed: list[str] = []
         completed_count = 0
+        settle_ms = 0
 
-        for f in fields:
+        i = 0
+        batch_ok = _FILL_FORM_BATCH_ENABLED
+        while i < len(fields):
+            f = fields[i]
             target = ref_map[f.ref]
 
-            # Execute field action with retry
-            try:
-                method = await _execute_locator_action_with_retry(
-                    page,
-                    target,
-                    f.action,
-                    f.value,
+            # ── Batch path: consecutive type/select fields in one in-page evaluation ──
+            run = batchable_run(fields, ref_map, i) if batch_ok else []
+            batched = 0
+            if len(run) >= MIN_BATCH_SIZE:
+                with ActionSettler(page) as settler:
+                    outcome = await run_fill_batch(page, run, ref_map)
+                    if outcome.done:
+                        settle = await settler.settle(max_ms=_FILL_FORM_SETTLE_MS)
+                        settle_ms += settle.waited_ms
+                batched = outcome.done
+                # A partial batch hands the field it stopped at to the per-field path
+                batch_ok = batched == len(run)
+                logger.debug(
+                    "fill_form batch: request=%s done=%d/%d stop=%s",
                     request_id,
-                    current_page_map.url,
-                )
-            except ValueError as loc_err:
-                completed.append(f'[{f.ref}] {target.role} "{target.name}": Error — {loc_err}')
-                return _format_fill_form_result(
-                    completed,
-                    completed_count,
-                    len(fields),
-                    stopped_reason="locator error",
-                    session=session,
-                )
-            except PlaywrightError as pw_err:
-                if _is_browser_dead_error(pw_err):
-                    raise  # Let outer handler deal with browser death
-                completed.append(f'[{f.ref}] {target.role} "{target.name}": Error — {_truncate(str(pw_err), 100)}')
-                return _format_fill_form_result(
-                    completed,
-                    completed_count,
-                    len(fields),
-                    stopped_reason="action error",
-                    session=session,
+                    batched,
+                    len(run),
+                    outcome.stop_reason,
                 )
 
-            # Record success
-            if f.action == "type":
-                completed.append(f'[{f.ref}] {target.role} "{target.name}": typed')
-            elif f.action == "select":
-                completed.append(f'[{f.ref}] {target.role} "{target.name}": selected')
-            elif f.action == "click":
-                completed.append(f'[{f.ref}] {target.role} "{target.name}": clicked')
-            completed_count += 1
+            if batched:
+                for bf in run[:batched]:
+                    bt = ref_map[bf.ref]
+                    completed.append(
+                        f'[{bf.ref}] {bt.role} "{bt.name}": {"typed" if bf.action == "type" else "selected"}'
+                    )
+                completed_count += batched
+                i += batched
+            else:
+                i += 1
+                batch_ok = _FILL_FORM_BATCH_ENABLED
+                with ActionSettler(page) as settler:
+                    # Execute field action with retry
+                    try:
+                        method = await _execute_target_action(
+                            session,
+                            target,
+                            f.action,
+                            f.value,
+                            request_id,
+                            current_page_map.url,
+                            use_handle=use_handle,
+                        )
+                    except ValueError as loc_err:
+                        completed.append(f'[{f.ref}] {target.role} "{target.name}": Error — {loc_err}')
+                        return _format_fill_form_result(
+                            completed,
+                            completed_count,
+                            len(fields),
+                            stopped_reason="locator error",
+                            session=session,
+                            settle_ms=settle_ms,
+                        )
+                    except _playwright_error() as pw_err:
+                        if _is_browser_dead_error(pw_err):
+                            raise  # Let outer handler deal with browser death
+                        completed.append(
+                            f'[{f.ref}] {target.role} "{target.name}": Error — {_truncate(str(pw_err), 100)}'
+                        )
+                        return _format_fill_form_result(
+                            completed,
+                            completed_count,
+                            len(fields),
+                            stopped_reason="action error",
+                            session=session,
+                            settle_ms=settle_ms,
+                        )
+
+                    # Post-field settle: return once network + DOM are quiet (capped)
+                    settle_cap = _FILL_FORM_CLICK_SETTLE_MS if f.action == "click" else _FILL_FORM_SETTLE_MS
+                    settle = await settler.settle(max_ms=settle_cap)
+                settle_ms += settle.waited_ms
 
-            if method == "css":
-                completed[-1] += " (via CSS selector)"
+                # Record success
+                if f.action == "type":
+                    completed.append(f'[{f.ref}] {target.role} "{target.name}": typed')
+                elif f.action == "select":
+                    completed.append(f'[{f.ref}] {target.role} "{target.name}": selected')
+                elif f.action == "click":
+                    completed.append(f'[{f.ref}] {target.role} "{target.name}": clicked')
+                completed_count += 1
 
-            # Post-field settle
-            if f.action == "click":
-                await page.wait_for_timeout(500)
-            await page.wait_for_timeout(_FILL_FORM_SETTLE_MS)
+                if method == "css":
+                    completed[-1] += " (via CSS selector)"
 
             # ── Check for popup ──
             new_page = session.consume_new_page()
@@ -2735,6 +3263,7 @@ async def _fill_form_impl(fields: list[FormField], *, ctx: RequestContext | None
                         stopped_reason="popup blocked",
                         nav_warning=f"⚠ Popup to blocked URL was closed — {ssrf_error}",
                         session=session,
+                        settle_ms=settle_ms,
                     )
                 else:
                     await session.switch_page(new_page)
@@ -2750,6 +3279,7 @@ async def _fill_form_impl(fields: list[FormField], *, ctx: RequestContext | None
                             "Call get_page_map to refresh."
                         ),
                         session=session,
+                        settle_ms=settle_ms,
                     )
 
             # ── Check for navigation ──
@@ -2774,6 +3304,7 @@ async def _fill_form_impl(fields: list[FormField], *, ctx: RequestContext | None
                         stopped_reason="navigation blocked",
                         nav_warning=f"⚠ Navigation to blocked URL — {ssrf_error}\nPage has been reset. Call get_page_map with a safe URL.",
                         session=session,
+                        settle_ms=settle_ms,
                     )
 
                 ctx.cache.invalidate(InvalidationReason.NAVIGATION)
@@ -2784,6 +3315,7 @@ async def _fill_form_impl(fields: list[FormField], *, ctx: RequestContext | None
                     stopped_reason="navigation" if completed_count < len(fields) else None,
                     nav_warning=(f"⚠ Page navigated to {new_url}. Refs are now expired. Call get_page_map to refresh."),
                     session=session,
+                    settle_ms=settle_ms,
                 )
 
         # ── All fields completed — DOM change detection ──
@@ -2822,6 +3354,7 @@ async def _fill_form_impl(fields: list[FormField], *, ctx: RequestContext | None
             completed_count,
             len(fields),
             session=session,
+            settle_ms=settle_ms,
         )
         if dom_warning:
             result += dom_warning
@@ -2875,7 +3408,7 @@ async def wait_for(
     ctx = _resolve_multi_tab_context(ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "wait_for"):
                 _record_tool_call("wait_for", session_id=ctx.session_id, request_id=ctx.request_id)
                 return await _wait_for_impl(text, text_gone, timeout, ctx=ctx)
     except TimeoutError:
@@ -2935,7 +3468,7 @@ async def _wait_for_impl(
             t0 = time.monotonic()
             try:
                 await page.wait_for_function(js_expr, target_text, timeout=timeout_ms)
-            except PlaywrightError as e:
+            except _playwright_error() as e:
                 if "timeout" in str(e).lower():
                     try:
                         from pagemap.telemetry.events import WAIT_FOR_RESULT as _WFR_T
@@ -2978,7 +3511,7 @@ async def _wait_for_impl(
             t0 = time.monotonic()
             try:
                 await page.wait_for_function(js_expr, target_text, timeout=timeout_ms)
-            except PlaywrightError as e:
+            except _playwright_error() as e:
                 if "timeout" in str(e).lower():
                     try:
                         from pagemap.telemetry.events import WAIT_FOR_RESULT as _WFR_G
@@ -3047,9 +3580,10 @@ async def open_tab(
 ) -> str:
     """Open a new browser tab with an independent session.
 
-    Each tab has its own cookies, storage, and login state.
+    Each tab has its own cookies, storage, and login state (in shared-context
+    mode, tabs share one site session instead).
     The newly opened tab becomes the active tab.
-    Maximum 5 tabs can be open simultaneously.
+    Maximum 5 tabs can be open simultaneously (20 in shared-context mode).
 
     Args:
         name: Unique tab identifier (alphanumeric + underscore, max 30 chars).
@@ -3063,7 +3597,7 @@ async def open_tab(
         return json.dumps({"status": TabOpStatus.INVALID_URL, "error": f"URL blocked: {ssrf_error}"})
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "open_tab"):
                 _record_tool_call("open_tab", session_id=ctx.session_id, url=url, request_id=ctx.request_id)
                 multi_tab = await ctx.get_or_create_multi_tab()
                 ua = None
@@ -3101,7 +3635,7 @@ async def switch_tab(name: str, mcp_ctx: McpContext = None) -> str:
     ctx, lock = await _acquire_context(mcp_ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "switch_tab"):
                 _record_tool_call("switch_tab", session_id=ctx.session_id, request_id=ctx.request_id)
                 multi_tab = ctx.multi_tab
                 if multi_tab is None or not multi_tab.is_multi_tab:
@@ -3126,7 +3660,7 @@ async def list_tabs(mcp_ctx: McpContext = None) -> str:
     ctx, lock = await _acquire_context(mcp_ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "list_tabs", shared=True):
                 _record_tool_call("list_tabs", session_id=ctx.session_id, request_id=ctx.request_id)
                 multi_tab = ctx.multi_tab
                 if multi_tab is None or not multi_tab.is_multi_tab:
@@ -3138,6 +3672,7 @@ async def list_tabs(mcp_ctx: McpContext = None) -> str:
                             "tabs": [],
                         }
                     )
+                await multi_tab.sample_memory()
                 result = multi_tab.list_tabs()
                 return json.dumps(result, ensure_ascii=False, indent=2)
     except TimeoutError:
@@ -3164,7 +3699,7 @@ async def close_tab(name: str, mcp_ctx: McpContext = None) -> str:
     ctx, lock = await _acquire_context(mcp_ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "close_tab"):
                 _record_tool_call("close_tab", session_id=ctx.session_id, request_id=ctx.request_id)
                 multi_tab = ctx.multi_tab
                 if multi_tab is None or not multi_tab.is_multi_tab:
@@ -3176,6 +3711,218 @@ async def close_tab(name: str, mcp_ctx: McpContext = None) -> str:
         return json.dumps({"status": "error", "error": "Server busy — another tool call is in progress."})
 
 
+# ── map_tabs ──────────────────────────────────────────────────────
+
+MAP_TABS_MAX_CONCURRENCY = 4
+MAP_TABS_OVERALL_TIMEOUT_SECONDS = 120
+
+
+@mcp.tool(
+    annotations=ToolAnnotations(
+        title="Map Tabs",
+        readOnlyHint=True,
+        destructiveHint=False,
+        openWorldHint=True,
+    )
+)
+async def map_tabs(
+    names: list[str] | None = None,
+    task_hint: str | None = None,
+    detail_level: str | None = None,
+    max_concurrency: int = MAP_TABS_MAX_CONCURRENCY,
+    mcp_ctx: McpContext = None,
+) -> str:
+    """Get Page Maps for several open tabs at once.
+
+    Each tab is mapped concurrently with its own cache (unchanged tabs are
+    cache hits). The active tab does not change. Tabs that have not
+    finished by the shared deadline are reported as timed out; results of
+    the others are still returned.
+
+    Args:
+        names: Tabs to map (default: all open tabs).
+        task_hint: Same as get_page_map, applied to every tab.
+        detail_level: Same as get_page_map, applied to every tab.
+        max_concurrency: Maximum tabs built at once (default 4, max 4).
+    """
+    ctx, lock = await _acquire_context(mcp_ctx)
+    try:
+        async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
+            async with hold_tool_lock(lock, "map_tabs"):
+                _record_tool_call("map_tabs", session_id=ctx.session_id, request_id=ctx.request_id)
+
+                async def _progress(done: int, total: int, message: str) -> None:
+                    if mcp_ctx is not None:
+                        with suppress(Exception):
+                            await mcp_ctx.report_progress(done, total, message=message)
+
+                return await _map_tabs_impl(
+                    names,
+                    task_hint=task_hint,
+                    detail_level=detail_level,
+                    max_concurrency=max_concurrency,
+                    ctx=ctx,
+                    on_progress=_progress,
+                )
+    except TimeoutError:
+        logger.error("Tool lock acquisition timed out for map_tabs")
+        return json.dumps({"status": "error", "error": "Server busy — another tool call is in progress."})
+
+
+async def _map_tabs_impl(
+    names: list[str] | None,
+    *,
+    task_hint: str | None = None,
+    detail_level: str | None = None,
+    max_concurrency: int = MAP_TABS_MAX_CONCURRENCY,
+    ctx: RequestContext | None = None,
+    on_progress=None,
+) -> str:
+    import time as _time
+
+    if ctx is None:
+        ctx = _create_stdio_context()
+
+    multi_tab = ctx.multi_tab
+    if not isinstance(multi_tab, MultiTabSession) or not multi_tab.is_multi_tab:
+        return json.dumps({"status": "error", "error": "No tabs open. Use open_tab first."})
+    await multi_tab.prune_expired_tabs()
+    tabs, missing = multi_tab.get_tabs(names)
+    if not tabs:
+        return json.dumps(
+            {"status": TabOpStatus.TAB_NOT_FOUND, "error": f"No matching tabs. Available: {multi_tab.tab_names}"}
+        )
+
+    start = _time.monotonic()
+    semaphore = asyncio.Semaphore(max(1, min(max_concurrency, MAP_TABS_MAX_CONCURRENCY)))
+
+    async def _map_one(tab: TabInstance) -> tuple[str, str, float]:
+        async with semaphore:
+            t0 = _time.monotonic()
+            # Full per-tab tier logic (A/B/S/C); pruning runs in worker threads
+            result = await _get_page_map_inner(
+                None,
+                task_hint=task_hint,
+                detail_level=detail_level,
+                ctx=_tab_context(ctx, tab),
+                speculation=False,
+            )
+            return tab.name, result, (_time.monotonic() - t0) * 1000
+
+    tasks = {asyncio.ensure_future(_map_one(tab)): tab.name for tab in tabs}
+    results: list[dict] = [{"tab": name, "status": "error", "error": "Tab not found"} for name in missing]
+    pending = set(tasks)
+    deadline = start + MAP_TABS_OVERALL_TIMEOUT_SECONDS
+    # Collect in completion order so slow tabs do not hold back finished ones
+    while pending:
+        remaining = deadline - _time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is not None:
+                results.append(
+                    {
+                        "tab": tasks[task],
+                        "status": "error",
+                        "error": _safe_error(f"map_tabs [{tasks[task]}]", task.exception(), request_id=ctx.request_id),
+                    }
+                )
+                continue
+            name, result, elapsed_ms = task.result()
+            entry: dict = {"tab": name, "elapsed_ms": round(elapsed_ms)}
+            if result.startswith("Error:"):
+                entry.update(status="error", error=result)
+            else:
+                entry.update(status="ok", page_map=result)
+            results.append(entry)
+        if on_progress is not None:
+            # Partial results: which tabs are finished and how, before the final response
+            finished = ", ".join(f"{r['tab']}: {r['status']}" for r in results)
+            await on_progress(len(tasks) - len(pending), len(tasks), finished)
+
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    results.extend(
+        {"tab": tasks[task], "status": "timeout", "error": f"Not finished within {MAP_TABS_OVERALL_TIMEOUT_SECONDS}s"}
+        for task in pending
+    )
+
+    success = sum(1 for r in results if r["status"] == "ok")
+    elapsed_ms = round((_time.monotonic() - start) * 1000)
+    logger.info(
+        "map_tabs: request=%s tabs=%d ok=%d timed_out=%d elapsed_ms=%d",
+        ctx.request_id,
+        len(tasks),
+        success,
+        len(pending),
+        elapsed_ms,
+    )
+    response = {
+        "results": results,
+        "summary": {
+            "total": len(results),
+            "success": success,
+            "failed": len(results) - success - len(pending),
+            "timed_out": len(pending),
+            "elapsed_ms": elapsed_ms,
+        },
+    }
+    _fit_tab_results(response, MAX_RESPONSE_SIZE_BYTES)
+    # Final guard only: per-tab trimming already keeps the JSON within the limit
+    return _check_response_size(json.dumps(response, ensure_ascii=False), tool="map_tabs")
+
+
+def _json_size(value: object) -> int:
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+def _fit_tab_results(response: dict, limit: int) -> None:
+    """Trim per-tab page maps in *response* so its JSON fits in *limit* bytes.
+
+    Byte-cutting the serialized response would leave invalid JSON, so each
+    ``page_map`` is shortened instead. Small maps are kept whole and the
+    budget they leave is shared by the larger ones; a trimmed map ends
+    with a note and its entry is marked ``"truncated": true``.
+    """
+    entries = [r for r in response["results"] if "page_map" in r]
+    if _json_size(response) <= limit or not entries:
+        return
+    note = "\n\n[Truncated to fit the map_tabs response limit. Call switch_tab + get_page_map for the full map.]"
+    # Envelope: everything except the map strings, with every entry already marked truncated
+    maps = {id(r): r.pop("page_map") for r in entries}
+    for r in entries:
+        r["page_map"] = ""
+        r["truncated"] = True
+    budget = limit - _json_size(response)
+    for r in entries:
+        del r["truncated"]
+    remaining = len(entries)
+    for r in sorted(entries, key=lambda e: len(maps[id(e)])):
+        share = max(0, budget // remaining)
+        text = maps[id(r)]
+        size = _json_size(text) - 2  # without the quotes already counted for ""
+        if size > share:
+            text = _truncate_json_string(text, share - (_json_size(note) - 2)) + note
+            r["truncated"] = True
+            size = _json_size(text) - 2
+        r["page_map"] = text
+        budget -= size
+        remaining -= 1
+
+
+def _truncate_json_string(text: str, max_bytes: int) -> str:
+    """Longest prefix of *text* whose JSON-escaped form is at most *max_bytes*."""
+    if max_bytes <= 0:
+        return ""
+    cut = min(len(text), max_bytes)
+    while cut > 0 and _json_size(text[:cut]) - 2 > max_bytes:
+        cut = cut * 9 // 10
+    return text[:cut]
+
+
 # ── batch_get_page_map ────────────────────────────────────────────
 
 BATCH_MAX_URLS = 10
@@ -3201,7 +3948,7 @@ async def batch_get_page_map(urls: list[str], max_concurrency: int = 5, mcp_ctx:
     ctx, lock = await _acquire_context(mcp_ctx)
     try:
         async with asyncio.timeout(_TOOL_LOCK_TIMEOUT):
-            async with lock:
+            async with hold_tool_lock(lock, "batch_get_page_map"):
                 _record_tool_call("batch_get_page_map", session_id=ctx.session_id, request_id=ctx.request_id)
                 _batch_result = await _batch_get_page_map_impl(urls, max_concurrency, ctx=ctx)
                 # S8-3: Tool authorization gate (HIGH tier, JSON response → authz_advisory key)
@@ -3422,12 +4169,18 @@ def _format_fill_form_result(
     stopped_reason: str | None = None,
     nav_warning: str = "",
     session: BrowserSession | None = None,
+    settle_ms: int = 0,
 ) -> str:
-    """Format fill_form result with field details and warnings."""
+    """Format fill_form result with field details and warnings.
+
+    ``settle_ms`` is the total post-field quiescence wait actually spent.
+    """
     if stopped_reason:
         header = f"fill_form: {completed_count}/{total} fields completed (stopped: {stopped_reason})."
     else:
         header = f"fill_form: {completed_count}/{total} fields completed."
+    if settle_ms:
+        header += f" Settle: {settle_ms}ms."
 
     lines = [header]
     for line in completed:
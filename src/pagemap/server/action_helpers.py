@@ -51,10 +51,12 @@ def _build_action_result(
     refs_expired: bool,
     change_details: list[str] | None = None,
     dialogs: list[DialogInfo] | None = None,
+    settle_ms: int | None = None,
 ) -> str:
     """Build a structured JSON success response for execute_action.
 
     Keys with empty/None/False values are omitted to save tokens.
+    ``settle_ms`` is the post-action quiescence wait actually spent.
     """
     data: dict = {
         "description": description,
@@ -64,6 +66,8 @@ def _build_action_result(
     }
     if change_details:
         data["change_details"] = change_details
+    if settle_ms:
+        data["settle_ms"] = settle_ms
     if dialogs:
         data["dialogs"] = [
             {
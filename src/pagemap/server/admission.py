@@ -0,0 +1,344 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Admission control and load shedding for the HTTP transport.
+
+Without it, a burst beyond capacity queues on the BrowserPool semaphore or
+a session tool lock and fails only when those timeouts run out, after the
+request has already spent memory and CPU.  With ``PAGEMAP_ADMISSION_CONTROL=1``
+every MCP ``POST`` passes :class:`AdmissionMiddleware` first:
+
+- :class:`LoadMonitor` samples event-loop lag, event-loop thread CPU, RSS
+  and BrowserPool utilization in the background and turns them into a
+  *pressure* (1.0 = at a configured limit);
+- :class:`AdmissionController` scales the in-flight limit down as pressure
+  rises, parks excess requests in a bounded queue with a deadline, and
+  otherwise sheds them at once;
+- requests of sessions that already hold server state (``mcp-session-id``
+  known to the session manager) are preferred: new sessions are shed from
+  :data:`NEW_SESSION_PRESSURE` and on a full pool, and queued session
+  requests are admitted first.
+
+Shed requests get ``503`` with ``Retry-After`` and a JSON body marked
+``retryable``.  Health, readiness and metrics routes are never gated.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from pagemap.core.env import env_flag
+from pagemap.core.stats import Counter, StatsCollector
+from pagemap.errors import OverloadedError
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_ENABLED = env_flag("PAGEMAP_ADMISSION_CONTROL")
+MAX_INFLIGHT = int(os.environ.get("PAGEMAP_ADMISSION_MAX_INFLIGHT", "32"))
+QUEUE_SIZE = int(os.environ.get("PAGEMAP_ADMISSION_QUEUE", "64"))
+QUEUE_TIMEOUT_S = float(os.environ.get("PAGEMAP_ADMISSION_QUEUE_TIMEOUT", "5"))
+MAX_LOOP_LAG_MS = float(os.environ.get("PAGEMAP_ADMISSION_MAX_LOOP_LAG_MS", "250"))
+MAX_CPU = float(os.environ.get("PAGEMAP_ADMISSION_MAX_CPU", "0.9"))  # fraction of one core (the event loop)
+MAX_RSS_MB = int(os.environ.get("PAGEMAP_ADMISSION_MAX_RSS_MB", "0"))  # 0 = not monitored
+
+NEW_SESSION_PRESSURE = 0.8  # new sessions are shed from here; known sessions at 1.0
+FULL_CAPACITY_PRESSURE = 0.5  # in-flight limit starts shrinking above this
+SAMPLE_INTERVAL_S = 0.5
+MAX_RETRY_AFTER_S = 30
+
+SESSION = "session"  # request of a session that already holds server state
+NEW = "new"
+
+EXEMPT_PATHS = frozenset({"/health", "/ready", "/livez", "/readyz", "/startupz", "/metrics", "/v1/sla"})
+
+METRIC_REQUESTS = "pagemap_admission_requests_total"
+METRIC_INFLIGHT = "pagemap_admission_inflight"
+METRIC_QUEUED = "pagemap_admission_queued"
+METRIC_PRESSURE = "pagemap_admission_pressure"
+
+_OUTCOMES = ("admitted", "queued", "shed_pressure", "shed_queue_full", "shed_deadline")
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process (Linux /proc; peak RSS elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1_048_576
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@dataclass(frozen=True, slots=True)
+class LoadSample:
+    """One reading of the load signals."""
+
+    loop_lag_ms: float = 0.0
+    cpu: float = 0.0  # event-loop thread CPU time / wall time over the last interval
+    rss_mb: float = 0.0
+    pool_utilization: float = 0.0  # active browser contexts / max contexts
+
+    def pressure(self, *, new_session: bool = False) -> float:
+        """Highest signal relative to its limit; pool utilization only counts for new sessions."""
+        ratios = [self.loop_lag_ms / MAX_LOOP_LAG_MS if MAX_LOOP_LAG_MS > 0 else 0.0]
+        ratios.append(self.cpu / MAX_CPU if MAX_CPU > 0 else 0.0)
+        if MAX_RSS_MB > 0:
+            ratios.append(self.rss_mb / MAX_RSS_MB)
+        if new_session:
+            ratios.append(self.pool_utilization)
+        return max(ratios)
+
+
+class LoadMonitor:
+    """Background sampler of event-loop lag, CPU, RSS and pool utilization.
+
+    CPU is ``time.thread_time()`` of the loop thread (the sampler runs on
+    it), so ``asyncio.to_thread`` pruning workers do not count toward
+    :data:`MAX_CPU`.
+    """
+
+    def __init__(
+        self,
+        pool_utilization: Callable[[], float] | None = None,
+        *,
+        interval_s: float = SAMPLE_INTERVAL_S,
+    ) -> None:
+        self._pool_utilization = pool_utilization
+        self._interval_s = interval_s
+        self._task: asyncio.Task | None = None  # type: ignore[type-arg]
+        self.sample = LoadSample()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="pagemap-load-monitor")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _run(self) -> None:
+        lag_ms = 0.0
+        wall, cpu_time = time.monotonic(), time.thread_time()
+        while True:
+            await asyncio.sleep(self._interval_s)
+            now, now_cpu = time.monotonic(), time.thread_time()
+            elapsed = now - wall
+            # EWMA so a single slow callback does not flip admission on its own
+            lag_ms = 0.7 * lag_ms + 0.3 * max(0.0, (elapsed - self._interval_s) * 1000)
+            try:
+                self.sample = LoadSample(
+                    loop_lag_ms=lag_ms,
+                    cpu=(now_cpu - cpu_time) / elapsed if elapsed > 0 else 0.0,
+                    rss_mb=_rss_mb() if MAX_RSS_MB > 0 else 0.0,
+                    pool_utilization=self._pool_utilization() if self._pool_utilization else 0.0,
+                )
+            except Exception:  # nosec B110 — keep the last sample
+                logger.debug("Load sample failed", exc_info=True)
+            wall, cpu_time = now, now_cpu
+
+
+class AdmissionStats(StatsCollector):
+    """Per-priority outcome counters plus in-flight, queue and pressure gauges."""
+
+    LABELS = ("priority", "outcome")
+    SEED = tuple((p, o) for p in (SESSION, NEW) for o in _OUTCOMES)
+    COUNTERS = (Counter(METRIC_REQUESTS, "MCP requests by priority and admission outcome", "count"),)
+
+    __slots__ = ("_controller",)
+
+    def __init__(self, controller: AdmissionController) -> None:
+        self._controller = controller
+        super().__init__()
+
+    def record(self, priority: str, outcome: str) -> None:
+        self.add((priority, outcome), 1)
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        """``{priority: {outcome: count}}``."""
+        rows = self.rows()
+        return {p: {o: rows[(p, o)][0] for o in _OUTCOMES} for p in (SESSION, NEW)}
+
+    def _extra_metrics(self, rows: dict) -> Iterator[Any]:
+        from prometheus_client.core import GaugeMetricFamily
+
+        controller = self._controller
+        yield GaugeMetricFamily(METRIC_INFLIGHT, "Admitted MCP requests in flight", value=controller.inflight)
+        yield GaugeMetricFamily(METRIC_QUEUED, "MCP requests waiting for admission", value=controller.queued)
+        pressure = GaugeMetricFamily(METRIC_PRESSURE, "Load relative to its limit (1.0 = shed)", labels=["signal"])
+        sample = controller.monitor.sample
+        pressure.add_metric(["loop_lag"], sample.loop_lag_ms / MAX_LOOP_LAG_MS if MAX_LOOP_LAG_MS > 0 else 0.0)
+        pressure.add_metric(["cpu"], sample.cpu / MAX_CPU if MAX_CPU > 0 else 0.0)
+        pressure.add_metric(["rss"], sample.rss_mb / MAX_RSS_MB if MAX_RSS_MB > 0 else 0.0)
+        pressure.add_metric(["pool"], sample.pool_utilization)
+        yield pressure
+
+
+class AdmissionController:
+    """Pressure-scaled in-flight limit with a bounded, deadline-aware priority queue."""
+
+    def __init__(
+        self,
+        monitor: LoadMonitor,
+        *,
+        max_inflight: int = MAX_INFLIGHT,
+        queue_size: int = QUEUE_SIZE,
+        queue_timeout_s: float = QUEUE_TIMEOUT_S,
+    ) -> None:
+        self.monitor = monitor
+        self._max_inflight = max(1, max_inflight)
+        self._queue_size = queue_size
+        self._queue_timeout_s = queue_timeout_s
+        self._waiters: dict[str, deque[asyncio.Future[None]]] = {SESSION: deque(), NEW: deque()}
+        self._service_s = 1.0  # EWMA of admitted request duration
+        self.inflight = 0
+        self.stats = AdmissionStats(self)
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters[SESSION]) + len(self._waiters[NEW])
+
+    def capacity(self, pressure: float) -> int:
+        """In-flight limit at *pressure*: full up to FULL_CAPACITY_PRESSURE, then linearly down to 1."""
+        if pressure <= FULL_CAPACITY_PRESSURE:
+            return self._max_inflight
+        scale = max(0.0, (1.0 - pressure) / (1.0 - FULL_CAPACITY_PRESSURE))
+        return max(1, int(self._max_inflight * scale))
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free: queued work ahead over the current limit."""
+        ahead = (self.queued + 1) * self._service_s / self._max_inflight
+        return min(MAX_RETRY_AFTER_S, max(1, math.ceil(ahead)))
+
+    async def admit(self, priority: str) -> None:
+        """Take an in-flight slot or raise :class:`OverloadedError`; pair with :meth:`release`."""
+        pressure = self.monitor.sample.pressure(new_session=priority == NEW)
+        if pressure >= (NEW_SESSION_PRESSURE if priority == NEW else 1.0):
+            self._shed(priority, "shed_pressure")
+        ahead = self.queued if priority == NEW else len(self._waiters[SESSION])
+        if ahead == 0 and self.inflight < self.capacity(pressure):
+            self.inflight += 1
+            self.stats.record(priority, "admitted")
+            return
+        room = self._queue_size if priority == SESSION else self._queue_size // 2
+        if self.queued >= self._queue_size or len(self._waiters[priority]) >= room:
+            self._shed(priority, "shed_queue_full")
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(fut)
+        try:
+            async with asyncio.timeout(self._queue_timeout_s):
+                await fut
+        except TimeoutError:
+            if not self._granted(priority, fut):
+                self._shed(priority, "shed_deadline")
+        except asyncio.CancelledError:
+            if self._granted(priority, fut):
+                self.inflight -= 1
+                self._wake()
+            raise
+        self.stats.record(priority, "queued")
+
+    def release(self, service_s: float) -> None:
+        """Free a slot held for *service_s* seconds and hand it to the next waiter."""
+        self._service_s = 0.8 * self._service_s + 0.2 * service_s
+        self.inflight -= 1
+        self._wake()
+
+    def _shed(self, priority: str, outcome: str) -> None:
+        self.stats.record(priority, outcome)
+        raise OverloadedError("Server overloaded", retry_after=self.retry_after(), reason=outcome.removeprefix("shed_"))
+
+    def _granted(self, priority: str, fut: asyncio.Future[None]) -> bool:
+        """After an interrupted wait: True if the slot was granted anyway, else leave the queue."""
+        if fut.done() and not fut.cancelled():
+            return True
+        if fut in self._waiters[priority]:
+            self._waiters[priority].remove(fut)
+        return False
+
+    def _wake(self) -> None:
+        limit = self.capacity(self.monitor.sample.pressure())
+        for priority in (SESSION, NEW):
+            waiters = self._waiters[priority]
+            while waiters and self.inflight < limit:
+                fut = waiters.popleft()
+                if not fut.done():
+                    self.inflight += 1
+                    fut.set_result(None)
+
+
+class AdmissionMiddleware:
+    """ASGI middleware: admit or shed each MCP POST before it reaches the app."""
+
+    def __init__(
+        self,
+        app: Any,
+        controller: AdmissionController,
+        *,
+        is_known_session: Callable[[str], bool] | None = None,
+    ) -> None:
+        self.app = app
+        self.controller = controller
+        self._is_known_session = is_known_session
+
+    def _priority(self, scope: dict) -> str:
+        for name, value in scope.get("headers", ()):
+            if name == b"mcp-session-id":
+                sid = value.decode("latin-1")
+                known = self._is_known_session
+                return SESSION if known is None or known(sid) else NEW
+        return NEW
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope.get("method") != "POST" or scope.get("path") in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+        priority = self._priority(scope)
+        try:
+            await self.controller.admit(priority)
+        except OverloadedError as e:
+            logger.warning("Admission shed: priority=%s reason=%s retry_after=%ss", priority, e.reason, e.retry_after)
+            await _send_overloaded(send, e)
+            return
+        t0 = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(time.monotonic() - t0)
+
+
+async def _send_overloaded(send: Any, error: OverloadedError) -> None:
+    body = json.dumps(
+        {
+            "error": "overloaded",
+            "message": "Server is at capacity. Retry after the indicated delay.",
+            "reason": error.reason,
+            "retryable": True,
+            "retry_after": error.retry_after,
+        }
+    ).encode()
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(int(error.retry_after)).encode()),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -3,6 +3,9 @@
 
 """Auto-dismiss barrier execution — JS API + button click with DOM stability.
 
+Stability is event-driven: ``BrowserSession.wait_for_dom_settle`` resolves
+after ``DISMISS_QUIET_MS`` without mutations, bounded by a hard cap.
+
 Safety: never raises, try/except wrapped.
 Only auto-dismisses COOKIE_CONSENT, AGE_VERIFICATION, POPUP_OVERLAY.
 Never auto-dismisses LOGIN_REQUIRED or REGION_RESTRICTED.
@@ -10,7 +13,9 @@ Never auto-dismisses LOGIN_REQUIRED or REGION_RESTRICTED.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
 import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
@@ -29,6 +34,9 @@ _AUTO_DISMISS_TYPES = frozenset({"cookie_consent", "age_verification", "popup_ov
 # Max button name length to prevent prompt injection
 _MAX_BUTTON_NAME_LEN = 50
 
+# Mutation-free window that counts as "barrier gone, DOM stable"
+DISMISS_QUIET_MS = int(os.environ.get("PAGEMAP_DISMISS_QUIET_MS", "150"))
+
 
 @dataclass(frozen=True, slots=True)
 class AutoDismissResult:
@@ -40,40 +48,36 @@ class AutoDismissResult:
     click_ref: int | None
     elapsed_ms: float
     error: str = ""
+    stability_ms: int = 0  # part of elapsed_ms spent waiting for the DOM to settle
 
 
-async def _wait_for_dom_stability(page, max_wait: float = 3.0) -> None:
-    """Wait for DOM to stabilize after dismiss action.
-
-    Uses fingerprint-based polling instead of fixed delay.
+async def _wait_for_dom_stability(
+    session: BrowserSession,
+    max_wait: float = 3.0,
+    quiet_ms: int = DISMISS_QUIET_MS,
+) -> dict:
+    """Wait until the DOM has been mutation-free for *quiet_ms*, capped at *max_wait* s.
+
+    One ``session.wait_for_dom_settle`` call — a banner that disappears in
+    one frame costs ~``quiet_ms`` instead of a fixed second of polling.
+    Never raises; a failed settle (page navigating/closed) reports
+    ``reason="error"`` without waiting further.  ``waited_ms`` is wall time.
     """
-    import asyncio
-
+    start = time.monotonic()
+    max_ms = max(1, int(max_wait * 1000))
     try:
-        from pagemap.dom_change_detector import capture_dom_fingerprint
-
-        await asyncio.sleep(0.5)
-        fp1 = await capture_dom_fingerprint(page)
-        await asyncio.sleep(0.5)
-        fp2 = await capture_dom_fingerprint(page)
-
-        if fp1 == fp2:
-            return  # DOM is stable
-
-        # Poll up to max_wait more with 500ms intervals
-        remaining = max_wait - 1.0
-        while remaining > 0:
-            await asyncio.sleep(0.5)
-            remaining -= 0.5
-            fp_new = await capture_dom_fingerprint(page)
-            if fp_new == fp2:
-                return
-            fp2 = fp_new
-    except Exception:
-        # Fallback: fixed 1s wait
-        import asyncio
-
-        await asyncio.sleep(1.0)
+        # Python-side cap in case the page never runs the timer (e.g. frozen tab)
+        settle = await asyncio.wait_for(
+            session.wait_for_dom_settle(quiet_ms=quiet_ms, max_ms=max_ms), timeout=max_wait + 0.5
+        )
+    except Exception as e:
+        logger.debug("DOM stability wait failed: %s", e)
+        settle = None
+    return {
+        "waited_ms": round((time.monotonic() - start) * 1000),
+        "mutations": int(settle.get("mutations", 0)) if settle else 0,
+        "reason": str(settle.get("reason", "quiet")) if settle else "error",
+    }
 
 
 async def _execute_js_dismiss(session: BrowserSession, js_call: str) -> bool:
@@ -83,7 +87,6 @@ async def _execute_js_dismiss(session: BrowserSession, js_call: str) -> bool:
         if page is None:
             return False
         await page.evaluate(js_call)
-        await _wait_for_dom_stability(page, max_wait=2.0)
         return True
     except Exception as e:
         logger.debug("JS dismiss failed: %s", e)
@@ -131,9 +134,6 @@ async def _execute_click_dismiss(
             logger.warning("URL changed after barrier dismiss click, aborting")
             return False
 
-        # Wait for DOM stability
-        await _wait_for_dom_stability(page, max_wait=3.0)
-
         return True
 
     except Exception as e:
@@ -195,15 +195,17 @@ async def try_auto_dismiss(
                 js_call = _CMP_JS_ACCEPT.get(barrier.provider, js_call)
 
             success = await _execute_js_dismiss(session, js_call)
-            elapsed = (time.monotonic() - start) * 1000
             if success:
-                _emit_dismiss_telemetry(barrier, "js_api", cookie_policy, elapsed)
+                stability = await _wait_for_dom_stability(session, max_wait=2.0)
+                elapsed = (time.monotonic() - start) * 1000
+                _emit_dismiss_telemetry(barrier, "js_api", cookie_policy, elapsed, stability)
                 return AutoDismissResult(
                     success=True,
                     method="js_api",
                     barrier_type=barrier_type_str,
                     click_ref=None,
                     elapsed_ms=elapsed,
+                    stability_ms=stability["waited_ms"],
                 )
             # JS API failed, fall through to button click
 
@@ -226,18 +228,21 @@ async def try_auto_dismiss(
                 barrier.accept_ref,
                 interactables,
             )
-            elapsed = (time.monotonic() - start) * 1000
             method = barrier.match_tier or "accept"
             if success:
-                _emit_dismiss_telemetry(barrier, method, cookie_policy, elapsed)
+                stability = await _wait_for_dom_stability(session, max_wait=3.0)
+                elapsed = (time.monotonic() - start) * 1000
+                _emit_dismiss_telemetry(barrier, method, cookie_policy, elapsed, stability)
                 return AutoDismissResult(
                     success=True,
                     method=method,
                     barrier_type=barrier_type_str,
                     click_ref=barrier.accept_ref,
                     elapsed_ms=elapsed,
+                    stability_ms=stability["waited_ms"],
                 )
             else:
+                elapsed = (time.monotonic() - start) * 1000
                 _emit_dismiss_failure(barrier, "click failed")
                 return AutoDismissResult(
                     success=False,
@@ -277,6 +282,7 @@ def _emit_dismiss_telemetry(
     method: str,
     cookie_policy: str,
     elapsed_ms: float,
+    stability: dict | None = None,
 ) -> None:
     """Emit telemetry for successful barrier dismiss. Never raises."""
     try:
@@ -289,6 +295,8 @@ def _emit_dismiss_telemetry(
                 "method": method,
                 "provider": barrier.provider,
                 "elapsed_ms": round(elapsed_ms, 1),
+                "stability_ms": stability["waited_ms"] if stability else None,
+                "stability_reason": stability["reason"] if stability else None,
                 "cookie_policy": cookie_policy,
             },
         )
@@ -19,20 +19,26 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import sys
 import time
 from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, field
 from types import TracebackType
-
-from playwright.async_api import Browser, Playwright, async_playwright
+from typing import TYPE_CHECKING
 
 from .browser_session import (
     BrowserConfig,
     BrowserSession,
+    ContextMemory,
     _auto_install_chromium,
+    async_playwright,
     chromium_launch_args,
 )
 
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Playwright
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,6 +55,8 @@ class PoolHealth:
     max_contexts: int
     waiting: int
     browser_connected: bool
+    memory: dict[str, ContextMemory] = field(default_factory=dict)  # last sample per session
+    renderer_rss_bytes: int = 0  # all renderer processes; 0 = not sampled / unavailable
 
 
 # ---------------------------------------------------------------------------
@@ -65,6 +73,19 @@ class _PooledContext:
     created_at: float = field(default_factory=time.monotonic)
     last_used_at: float = field(default_factory=time.monotonic)
     holds_semaphore: bool = False  # True when acquired via acquire(), not session() CM
+    memory: ContextMemory | None = None  # last sample_memory() result
+
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _process_rss_bytes(pid: int) -> int:
+    """Resident set size of *pid* from ``/proc``; 0 if the process is gone."""
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
 
 
 # ---------------------------------------------------------------------------
@@ -106,6 +127,7 @@ class BrowserPool:
         self._contexts: dict[str, _PooledContext] = {}
         self._reaper_task: asyncio.Task | None = None
         self._shutdown_event = asyncio.Event()
+        self._renderer_rss: tuple[int, float] = (0, 0.0)  # (bytes, sampled_at)
 
     # ── AsyncContextManager ──────────────────────────────────────────
 
@@ -218,6 +240,7 @@ class BrowserPool:
         if entry.holds_semaphore:
             self._available_slots += 1
             self._semaphore.release()
+        self._renderer_rss = (0, 0.0)  # resample before acting on the pool-wide limit again
         logger.info("Pool released session: %s", session_id)
 
     # ── Monitoring ───────────────────────────────────────────────────
@@ -231,8 +254,56 @@ class BrowserPool:
             max_contexts=self._max_contexts,
             waiting=waiting,
             browser_connected=browser_ok,
+            memory={sid: entry.memory for sid, entry in self._contexts.items() if entry.memory is not None},
+            renderer_rss_bytes=self._renderer_rss[0],
         )
 
+    async def sample_memory(self, session_id: str, *, max_age_s: float = 0.0) -> ContextMemory | None:
+        """Sample (or reuse a sample younger than *max_age_s*) of a session's memory."""
+        entry = self._contexts.get(session_id)
+        if entry is None:
+            return None
+        if entry.memory is not None and time.monotonic() - entry.memory.sampled_at < max_age_s:
+            return entry.memory
+        memory = await entry.session.sample_memory()
+        if memory is not None:
+            entry.memory = memory
+        return memory
+
+    async def sample_renderer_rss(self, *, max_age_s: float = 0.0) -> int:
+        """Resident memory of all renderer processes in bytes; 0 when unavailable.
+
+        Chromium does not attribute renderer processes to BrowserContexts
+        (site isolation can put several sites of one context in separate
+        processes, or share one between contexts), so this is pool-wide.
+        Linux only: reads ``/proc/<pid>/statm`` for the pids reported by
+        ``SystemInfo.getProcessInfo``.  Never raises.
+        """
+        rss, sampled_at = self._renderer_rss
+        if sampled_at and time.monotonic() - sampled_at < max_age_s:
+            return rss
+        rss = 0
+        if self._browser is not None and sys.platform.startswith("linux"):
+            try:
+                cdp = await self._browser.new_browser_cdp_session()
+                try:
+                    info = await cdp.send("SystemInfo.getProcessInfo")
+                finally:
+                    with suppress(Exception):
+                        await cdp.detach()
+                for proc in info.get("processInfo", []):
+                    if proc.get("type") == "renderer":
+                        rss += _process_rss_bytes(int(proc["id"]))
+            except Exception:
+                rss = 0
+        self._renderer_rss = (rss, time.monotonic())
+        return rss
+
+    def heaviest_session(self) -> str | None:
+        """Session id with the largest sampled JS heap, or None without samples."""
+        sampled = [(entry.memory.js_heap_bytes, sid) for sid, entry in self._contexts.items() if entry.memory]
+        return max(sampled)[1] if sampled else None
+
     @property
     def active_count(self) -> int:
         return len(self._contexts)
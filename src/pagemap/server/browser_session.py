@@ -15,29 +15,43 @@ import logging
 import os
 import secrets
 import sys
+import time
 from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-from playwright.async_api import (
-    Browser,
-    BrowserContext,
-    CDPSession,
-    Dialog,
-    Page,
-    Playwright,
-    Route,
-    async_playwright,
-)
-
+from pagemap.core.action_settle import DOM_SETTLE_JS as _DOM_SETTLE_JS
 from pagemap.errors import BrowserError
-from pagemap.i18n import accept_language_for_url
 from pagemap.interactive_detector import _CDP_AX_TREE_TIMEOUT
 
+from .consent_seed import CONSENT_SEED_ENABLED, consent_cookies, consent_init_script, detected_cmps
+from .nav_profile import ADAPTIVE_NAV_WAIT_ENABLED, NavObservation, NavPlan, nav_profiles
+
+if TYPE_CHECKING:
+    from playwright.async_api import (
+        Browser,
+        BrowserContext,
+        CDPSession,
+        Dialog,
+        Page,
+        Playwright,
+        PlaywrightContextManager,
+        Route,
+    )
+
 logger = logging.getLogger(__name__)
 
+
+def async_playwright() -> PlaywrightContextManager:
+    """Deferred ``playwright.async_api.async_playwright`` — Playwright loads on first browser start."""
+    from playwright.async_api import async_playwright as _async_playwright
+
+    return _async_playwright()
+
+
 # Default browser config
 DEFAULT_VIEWPORT = {"width": 1280, "height": 800}
 
@@ -110,6 +124,20 @@ class NavigationResult:
     strategy: str  # "networkidle" | "load+settle" | "load"
     settle_metrics: dict | None  # DOM settle: {waited_ms, mutations, reason}
     http_status: int | None = None  # HTTP response status code
+    wait_profile: str | None = None  # adaptive wait mode: "default" | "probe" | "learned"
+
+
+@dataclass(frozen=True, slots=True)
+class ContextMemory:
+    """Resource use of a session's page, from CDP ``Performance.getMetrics``."""
+
+    js_heap_bytes: int
+    dom_nodes: int
+    sampled_at: float  # time.monotonic()
+
+    @property
+    def js_heap_mb(self) -> float:
+        return self.js_heap_bytes / (1024 * 1024)
 
 
 _BROWSER_DEAD_PATTERNS = (
@@ -246,6 +274,10 @@ class BrowserSession:
         self._scanner_cdp_session: CDPSession | None = None
         self._scanner_script_id: str | None = None
         self._scanner_context_id: int | None = None
+        self._scanner_pending: bool = False  # shared-context tab: install on first navigate
+        self._host: BrowserSession | None = None  # set by start_shared()
+        self._delegates: dict[Page, BrowserSession] = {}  # host side: tab page → tab session
+        self._perf_cdp: CDPSession | None = None  # CDP session with the Performance domain enabled
 
     @property
     def page(self) -> Page:
@@ -280,6 +312,23 @@ class BrowserSession:
         except Exception:
             return False
 
+    async def sample_memory(self) -> ContextMemory | None:
+        """JS heap and DOM node count of the page via CDP, or None. Never raises."""
+        try:
+            cdp = await self.get_cdp_session()
+            if self._perf_cdp is not cdp:
+                await cdp.send("Performance.enable")
+                self._perf_cdp = cdp
+            result = await cdp.send("Performance.getMetrics")
+            metrics = {m["name"]: m["value"] for m in result.get("metrics", [])}
+            return ContextMemory(
+                js_heap_bytes=int(metrics.get("JSHeapUsedSize", 0)),
+                dom_nodes=int(metrics.get("Nodes", 0)),
+                sampled_at=time.monotonic(),
+            )
+        except Exception:
+            return None
+
     def _chromium_launch_args(self) -> list[str]:
         """Return hardened Chromium launch arguments."""
         return chromium_launch_args(self.config)
@@ -334,6 +383,9 @@ class BrowserSession:
         # Stealth: main world, all frames (before page creation)
         await self._install_stealth()
 
+        # Consent pre-seeding (opt-in): localStorage part
+        await self._install_consent_seed()
+
         self._page = await self._context.new_page()
 
         # Security Scanner: CDP isolated world, main frame only
@@ -360,6 +412,25 @@ class BrowserSession:
         await self._create_context(browser)
         logger.info("Browser session started from pool (headless=%s)", self.config.headless)
 
+    async def start_shared(self, host: BrowserSession) -> None:
+        """Start as a page inside *host*'s context (shared-context tab mode).
+
+        No context is created: stealth, consent seed, scheme block and SSRF
+        route guard are context-level on the host and already cover this
+        page.  The security scanner is per page and is installed on first
+        navigation.  Cookies and storage are shared with the host's other
+        pages, so cross-domain navigation does not clear them.  stop()
+        closes only this page.
+        """
+        self._owns_browser = False
+        self._browser = host._browser
+        self._context = host.context
+        self._host = host
+        self._page = await host.create_batch_page()  # skipped by the host's popup handler
+        host._delegates[self._page] = self
+        self._scanner_pending = True
+        logger.info("Browser session started as shared-context page")
+
     async def _install_scheme_block_route(self) -> None:
         """Block dangerous URL schemes at context level (covers all pages).
 
@@ -395,6 +466,13 @@ class BrowserSession:
         await self._context.add_init_script(script=stealth_js)
         logger.debug("Stealth bundle injected (seed=%d)", seed)
 
+    async def _install_consent_seed(self) -> None:
+        """Pre-seeded CMP consent — localStorage records via init script."""
+        if not CONSENT_SEED_ENABLED:
+            return
+        await self._context.add_init_script(script=consent_init_script())
+        logger.debug("Consent seed init script installed")
+
     async def _install_security_scanner(self) -> None:
         """Security scanner — CDP isolated world, main frame only."""
         try:
@@ -480,6 +558,13 @@ class BrowserSession:
             0 = no mutations, 1 = normal, 2 = critical (script/iframe/form-action).
         Fail-open: returns 0 on any error.
         """
+        return await self._mutation_severity(reset=True)
+
+    async def peek_mutation_severity(self) -> int:
+        """Like :meth:`read_mutation_severity` but leaves the value for the next reader."""
+        return await self._mutation_severity(reset=False)
+
+    async def _mutation_severity(self, *, reset: bool) -> int:
         if not self._scanner_cdp_session or self._scanner_context_id is None:
             return 0
         try:
@@ -488,7 +573,8 @@ class BrowserSession:
                 {
                     "expression": (
                         "(() => { const s = window.__pagemap_mutation_severity || 0;"
-                        " window.__pagemap_mutation_severity = 0; return s; })()"
+                        + (" window.__pagemap_mutation_severity = 0;" if reset else "")
+                        + " return s; })()"
                     ),
                     "contextId": self._scanner_context_id,
                     "returnByValue": True,
@@ -549,8 +635,13 @@ class BrowserSession:
                 await self._cdp_session.detach()
             self._cdp_session = None
 
-        # Close context (common to both modes)
-        if self._context:
+        # Close context (common to both modes); a shared-context tab closes only its page
+        if self._host is not None:
+            if self._page is not None:
+                self._host._delegates.pop(self._page, None)
+                await self._host.close_batch_page(self._page)
+            self._context = None
+        elif self._context:
             with suppress(Exception):
                 await self._context.close()
             self._context = None
@@ -588,6 +679,10 @@ class BrowserSession:
         Policy: alert/beforeunload → accept, confirm/prompt → dismiss.
         CRITICAL: Must ALWAYS call accept() or dismiss() — failure freezes page.
         """
+        owner = self._delegates.get(getattr(dialog, "page", None)) if self._delegates else None
+        if owner is not None:
+            await owner._on_dialog(dialog)  # record on the shared-context tab it belongs to
+            return
         try:
             dtype = dialog.type
             message = dialog.message
@@ -628,6 +723,14 @@ class BrowserSession:
         """
         if page in getattr(self, "_batch_pages", set()):
             return  # batch-managed page — skip popup handler
+        if self._delegates:
+            opener = None
+            with suppress(Exception):
+                opener = await page.opener()
+            owner = self._delegates.get(opener)
+            if owner is not None:
+                await owner._on_new_page(page)  # popup of a shared-context tab
+                return
         old = self._pending_new_page
         self._pending_new_page = page
         if old is not None and not old.is_closed():
@@ -650,6 +753,10 @@ class BrowserSession:
                 await self._cdp_session.detach()
             self._cdp_session = None
         self._page = new_page
+        if self._host is not None:
+            self._host._delegates.pop(old_page, None)
+            self._host._batch_pages.discard(old_page)
+            self._host._delegates[new_page] = self
         if old_page is not None and not old_page.is_closed():
             with suppress(Exception):
                 await old_page.close()
@@ -657,13 +764,19 @@ class BrowserSession:
 
     async def create_batch_page(self) -> Page:
         """Create a new page for batch processing."""
-        page = await self.context.new_page()
+        if self._host is not None:
+            page = await self._host.create_batch_page()
+        else:
+            page = await self.context.new_page()
         self._batch_pages.add(page)
         return page
 
     async def close_batch_page(self, page: Page) -> None:
         """Close a batch-managed page."""
         self._batch_pages.discard(page)
+        if self._host is not None:
+            await self._host.close_batch_page(page)
+            return
         if not page.is_closed():
             with suppress(Exception):
                 await page.close()
@@ -694,19 +807,42 @@ class BrowserSession:
         import contextlib
         from urllib.parse import urlparse
 
-        # Clear cookies/storage when switching domains
+        shared = self._host is not None
+        if self._scanner_pending:
+            self._scanner_pending = False
+            await self._install_security_scanner()
+
+        # Clear cookies/storage when switching domains (not for a shared context:
+        # other tabs rely on its cookies)
         current_url = self.page.url
-        if current_url and current_url != "about:blank":
+        if not shared and current_url and current_url != "about:blank":
             current_host = urlparse(current_url).hostname or ""
             new_host = urlparse(url).hostname or ""
             if current_host and new_host and current_host != new_host:
                 await self.context.clear_cookies()
 
+        # Pre-seeded reject cookies of the host's detected CMP (opt-in); re-added
+        # after any clear above, never over a decision the context already holds
+        if CONSENT_SEED_ENABLED:
+            provider = detected_cmps.get(url)
+            seed_cookies = consent_cookies(url, provider) if provider else []
+            if seed_cookies:
+                try:
+                    present = {c["name"] for c in await self.context.cookies(url)}
+                    missing = [c for c in seed_cookies if c["name"] not in present]
+                    if missing:
+                        await self.context.add_cookies(missing)
+                except Exception as e:
+                    logger.debug("Consent seed cookies rejected: %s", e)
+
         # Set Accept-Language matching the target site's locale.
         # NOTE: set_extra_http_headers() REPLACES all extra headers.
         # If other extra headers are added in the future, merge them here.
+        from pagemap.i18n import accept_language_for_url
+
         accept_lang = accept_language_for_url(url)
-        await self.context.set_extra_http_headers({"Accept-Language": accept_lang})
+        headers_target = self.page if shared else self.context
+        await headers_target.set_extra_http_headers({"Accept-Language": accept_lang})
 
         strategy = self.config.wait_strategy
 
@@ -720,16 +856,28 @@ class BrowserSession:
                 http_status=response.status if response else None,
             )
 
+        # Adaptive per-domain budgets (hybrid only)
+        plan: NavPlan | None = None
+        idle_budget_ms = self.config.networkidle_budget_ms
+        settle_max_ms: int | None = None
+        if strategy == "hybrid" and ADAPTIVE_NAV_WAIT_ENABLED:
+            plan = nav_profiles.plan((urlparse(url).hostname or "").lower(), idle_budget_ms, self.config.settle_max_ms)
+            idle_budget_ms, settle_max_ms = plan.networkidle_ms, plan.settle_max_ms
+
         # Step 1: goto with "load" (window load event)
         response = await self.page.goto(url, wait_until="load", timeout=self.config.timeout_ms)
+        fingerprints = [await self._nav_fingerprint()] if plan is not None and plan.probe else None
 
         # Step 2: networkidle attempt (hybrid only, asyncio.wait for safe cancellation)
         used_strategy = "load"
-        if strategy == "hybrid":
+        idle_start = time.perf_counter()
+        if strategy == "hybrid" and idle_budget_ms <= 0:
+            used_strategy = "load+settle"  # learned: network idle never mattered on this domain
+        elif strategy == "hybrid":
             idle_task = asyncio.ensure_future(self.page.wait_for_load_state("networkidle"))
             done, _pending = await asyncio.wait(
                 {idle_task},
-                timeout=self.config.networkidle_budget_ms / 1000,
+                timeout=idle_budget_ms / 1000,
             )
             if idle_task in done:
                 exc = idle_task.exception()
@@ -748,17 +896,35 @@ class BrowserSession:
                 used_strategy = "load+settle"
                 logger.info(
                     "networkidle budget exceeded (%.1fs), proceeding with load+settle",
-                    self.config.networkidle_budget_ms / 1000,
+                    idle_budget_ms / 1000,
                 )
+        idle_ms = (time.perf_counter() - idle_start) * 1000
+        if fingerprints is not None:
+            fingerprints.append(await self._nav_fingerprint())
 
         # Step 3: DOM settle (always)
-        settle = await self.wait_for_dom_settle()
+        if settle_max_ms is None:
+            settle = await self.wait_for_dom_settle()
+        else:
+            settle = await self.wait_for_dom_settle(max_ms=settle_max_ms)
+        if plan is not None:
+            if fingerprints is not None:
+                fingerprints.append(await self._nav_fingerprint())
+            nav_profiles.record(plan, _nav_observation(idle_ms, used_strategy, settle, fingerprints))
         return NavigationResult(
             strategy=used_strategy,
             settle_metrics=settle,
             http_status=response.status if response else None,
+            wait_profile=plan.mode if plan is not None else None,
         )
 
+    async def _nav_fingerprint(self) -> tuple | None:
+        """Cheap DOM fingerprint for navigation wait learning. Never raises."""
+        try:
+            return tuple(await self.page.evaluate(_NAV_FINGERPRINT_JS))
+        except Exception:
+            return None
+
     async def load_html(self, html: str, base_url: str = "about:blank") -> None:
         """Load raw HTML content directly (offline mode)."""
         await self.page.set_content(html, wait_until="domcontentloaded")
@@ -894,42 +1060,30 @@ _SCROLL_POSITION_JS = """() => ({
     clientHeight: document.documentElement.clientHeight,
 })"""
 
-_DOM_SETTLE_JS = """([quietMs, maxMs]) => new Promise(resolve => {
-  let mutations = 0;
-  let quietTimer = null;
-  let maxTimer = null;
-  const start = performance.now();
-
-  const finish = (reason) => {
-    observer.disconnect();
-    if (quietTimer) clearTimeout(quietTimer);
-    if (maxTimer) clearTimeout(maxTimer);
-    resolve({
-      waited_ms: Math.round(performance.now() - start),
-      mutations: mutations,
-      reason: reason
-    });
-  };
-
-  const resetQuiet = () => {
-    if (quietTimer) clearTimeout(quietTimer);
-    quietTimer = setTimeout(() => finish('quiet'), quietMs);
-  };
-
-  const observer = new MutationObserver((records) => {
-    mutations += records.length;
-    resetQuiet();
-  });
-
-  observer.observe(document.documentElement, {
-    childList: true,
-    subtree: true,
-    characterData: true
-  });
-
-  resetQuiet();
-  maxTimer = setTimeout(() => finish('timeout'), maxMs);
-})"""
+# Node count, text length and title: changes when a wait phase rendered something.
+_NAV_FINGERPRINT_JS = (
+    "() => [document.getElementsByTagName('*').length,"
+    " document.body ? document.body.textContent.length : 0, document.title]"
+)
+
+
+def _nav_observation(
+    idle_ms: float, strategy: str, settle: dict | None, fingerprints: list[tuple | None] | None
+) -> NavObservation:
+    """Summarize the wait phases of a hybrid navigation for :data:`nav_profiles`."""
+    idle_changed = settle_changed = None
+    if fingerprints is not None and None not in fingerprints:
+        after_load, after_idle, after_settle = fingerprints
+        idle_changed = after_idle != after_load
+        settle_changed = after_settle != after_idle
+    return NavObservation(
+        idle_ms=idle_ms,
+        idle_reached=strategy == "networkidle",
+        settle_ms=float(settle.get("waited_ms", 0)) if settle else 0.0,
+        settle_timed_out=settle is None or settle.get("reason") == "timeout",
+        idle_changed=idle_changed,
+        settle_changed=settle_changed,
+    )
 
 
 @asynccontextmanager
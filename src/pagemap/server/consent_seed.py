@@ -0,0 +1,233 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Pre-emptive "reject non-essential" consent state for known CMPs.
+
+When ``PAGEMAP_CONSENT_SEED=1`` the browser context is primed before
+navigation with the cookie/localStorage records the CMPs recognised in
+``core/ecommerce/cookie_patterns.py`` write after a user rejects
+non-essential cookies.  The CMP then finds a stored decision and never
+renders its banner, so the build → detect → dismiss → rebuild cycle is
+skipped on later visits (including after the cross-domain cookie clear
+and in new sessions).
+
+- Cookies are host-only and only those of the CMP :data:`detected_cmps`
+  saw on the host, added per navigation (after the cross-domain cookie
+  clear in ``BrowserSession.navigate``) when the context lacks them, so a
+  real stored decision wins.
+- localStorage records come from one context init script and are only
+  written when the key is absent, so a real stored decision wins.
+- Quantcast Choice stores an encoded IAB TCF string whose validity
+  depends on the site's vendor list; it is not seeded.
+
+Seeding is skipped when ``PAGEMAP_COOKIE_POLICY`` is ``accept`` or
+``none``.  Hit rates are per CMP over builds of hosts where it was
+already detected (and so seeded): a *hit* is a build where none of its
+banner buttons reached the AX tree.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+from urllib.parse import quote, urlparse
+
+from pagemap.core.env import env_flag
+from pagemap.core.stats import Counter, StatsCollector, register_collector
+
+if TYPE_CHECKING:
+    from pagemap.core.ecommerce import BarrierResult
+
+CONSENT_SEED_ENABLED: bool = env_flag("PAGEMAP_CONSENT_SEED") and os.environ.get(
+    "PAGEMAP_COOKIE_POLICY", "reject"
+).lower() in ("reject", "dismiss")
+
+METRIC_NAME = "pagemap_consent_seed_total"
+MAX_HOSTS = 1024  # hosts whose detected CMP is remembered (LRU)
+
+
+def _iso(now: datetime) -> str:
+    return now.strftime("%Y-%m-%dT%H:%M:%S.") + f"{now.microsecond // 1000:03d}Z"
+
+
+def _didomi_token(now: datetime) -> str:
+    token = {
+        "user_id": str(uuid.uuid4()),
+        "created": _iso(now),
+        "updated": _iso(now),
+        "vendors": {"disabled": []},
+        "purposes": {"disabled": []},
+        "version": 2,
+    }
+    return base64.b64encode(json.dumps(token, separators=(",", ":")).encode()).decode()
+
+
+def _cookiebot(now: datetime) -> list[tuple[str, str]]:
+    utc = int(now.timestamp() * 1000)
+    value = (
+        "{stamp:%27-1%27%2Cnecessary:true%2Cpreferences:false%2Cstatistics:false"
+        f"%2Cmarketing:false%2Cmethod:%27explicit%27%2Cver:1%2Cutc:{utc}%2Cregion:%27eu%27}}"
+    )
+    return [("CookieConsent", value)]
+
+
+def _onetrust(now: datetime) -> list[tuple[str, str]]:
+    datestamp = quote(now.strftime("%a %b %d %Y %H:%M:%S GMT+0000 (Coordinated Universal Time)"))
+    consent = (
+        f"isGpcEnabled=0&datestamp={datestamp}&version=202401.1.0&isIABGlobal=false&hosts="
+        "&landingPath=NotLandingPage&groups=C0001%3A1%2CC0002%3A0%2CC0003%3A0%2CC0004%3A0%2CC0005%3A0"
+        "&interactionCount=1"
+    )
+    return [("OptanonAlertBoxClosed", _iso(now)), ("OptanonConsent", consent)]
+
+
+def _trustarc(now: datetime) -> list[tuple[str, str]]:
+    return [
+        ("notice_gdpr_prefs", "0:"),
+        ("notice_preferences", "0:"),
+        ("notice_behavior", "expressed,eu"),
+        ("cmapi_cookie_privacy", "permit 1 required"),
+    ]
+
+
+def _didomi_cookies(now: datetime) -> list[tuple[str, str]]:
+    return [("didomi_token", _didomi_token(now))]
+
+
+# provider → (now → [(cookie name, value)])
+_CMP_REJECT_COOKIES: dict[str, Callable[[datetime], list[tuple[str, str]]]] = {
+    "cookiebot": _cookiebot,
+    "onetrust": _onetrust,
+    "trustarc": _trustarc,
+    "didomi": _didomi_cookies,
+}
+
+# provider → (now → {localStorage key: value})
+_CMP_REJECT_STORAGE: dict[str, Callable[[datetime], dict[str, str]]] = {
+    "didomi": lambda now: {"didomi_token": _didomi_token(now)},
+    "usercentrics": lambda now: {"uc_user_interaction": "true"},
+}
+
+SEEDED_PROVIDERS: frozenset[str] = frozenset(_CMP_REJECT_COOKIES) | frozenset(_CMP_REJECT_STORAGE)
+
+_EPOCH = datetime(2000, 1, 1, tzinfo=UTC)
+# Names written by seeding itself — not evidence of a user-specific session
+SEEDED_COOKIE_NAMES: frozenset[str] = frozenset(
+    name for build in _CMP_REJECT_COOKIES.values() for name, _ in build(_EPOCH)
+)
+SEEDED_STORAGE_KEYS: frozenset[str] = frozenset(key for build in _CMP_REJECT_STORAGE.values() for key in build(_EPOCH))
+
+
+def consent_cookies(url: str, provider: str, now: datetime | None = None) -> list[dict[str, Any]]:
+    """Playwright ``add_cookies`` records of *provider* for *url*'s host.
+
+    Empty for non-http URLs and providers without a cookie seed format.
+    """
+    parsed = urlparse(url)
+    build = _CMP_REJECT_COOKIES.get(provider)
+    if build is None or parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return []
+    origin = f"{parsed.scheme}://{parsed.netloc}"
+    return [
+        {"name": name, "value": value, "url": origin, "sameSite": "Lax"}
+        for name, value in build(now or datetime.now(UTC))
+    ]
+
+
+def consent_init_script(now: datetime | None = None) -> str:
+    """Init script writing the localStorage records (top frame, absent keys only)."""
+    now = now or datetime.now(UTC)
+    seeds: dict[str, str] = {}
+    for build in _CMP_REJECT_STORAGE.values():
+        seeds.update(build(now))
+    return (
+        "(() => { if (window.top !== window) return; try {"
+        f" const seeds = {json.dumps(seeds)};"
+        " for (const [k, v] of Object.entries(seeds)) {"
+        " if (window.localStorage.getItem(k) === null) window.localStorage.setItem(k, v); }"
+        " } catch (e) {} })();"
+    )
+
+
+class DetectedCmps:
+    """Thread-safe host → CMP provider seen by the barrier detector (bounded LRU)."""
+
+    __slots__ = ("_hosts", "_lock")
+
+    def __init__(self) -> None:
+        self._hosts: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> str | None:
+        """Seedable provider detected on *url*'s host, if any."""
+        host = (urlparse(url).hostname or "").lower()
+        with self._lock:
+            return self._hosts.get(host)
+
+    def remember(self, url: str, barrier: BarrierResult | None) -> None:
+        """Record the CMP of a cookie barrier on *url*'s host (seedable providers only)."""
+        if barrier is None or barrier.barrier_type.value != "cookie_consent":
+            return
+        if barrier.provider not in SEEDED_PROVIDERS:
+            return
+        host = (urlparse(url).hostname or "").lower()
+        if not host:
+            return
+        with self._lock:
+            self._hosts[host] = barrier.provider
+            self._hosts.move_to_end(host)
+            while len(self._hosts) > MAX_HOSTS:
+                self._hosts.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+
+
+class ConsentSeedStats(StatsCollector):
+    """Per-CMP hit/miss counters."""
+
+    LABELS = ("provider", "outcome")
+    COUNTERS = (
+        Counter(METRIC_NAME, "Seeded builds with a detected CMP, by whether its banner was suppressed", "count"),
+    )
+
+    __slots__ = ()
+
+    def record(self, barrier: BarrierResult | None) -> bool:
+        """Count one seeded build of a page with *barrier*. True → banner suppressed.
+
+        Only named CMPs with a seed format are counted; everything else is
+        not a hit.
+        """
+        if barrier is None or barrier.barrier_type.value != "cookie_consent":
+            return False
+        if barrier.provider not in SEEDED_PROVIDERS:
+            return False
+        hit = barrier.accept_ref is None
+        with self._lock:
+            self._row((barrier.provider, "hit"))[0] += hit
+            self._row((barrier.provider, "miss"))[0] += not hit
+        return hit
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """``{provider: {hits, misses, hit_rate}}``."""
+        rows = self.rows()
+        providers = sorted({provider for provider, _ in rows})
+        snap: dict[str, dict[str, float]] = {}
+        for p in providers:
+            h, m = rows[(p, "hit")][0], rows[(p, "miss")][0]
+            snap[p] = {"hits": h, "misses": m, "hit_rate": round(h / (h + m), 3)}
+        return snap
+
+
+consent_seed_stats = ConsentSeedStats()
+register_collector("consent_seed", lambda: consent_seed_stats if CONSENT_SEED_ENABLED else None)
+detected_cmps = DetectedCmps()
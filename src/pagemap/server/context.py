@@ -47,6 +47,9 @@ class RequestContext:
     cache: PageMapCache
     template_cache: InMemoryTemplateCache
     get_session: Callable[[], Awaitable] = dataclasses.field(repr=False)
+    # Lookup-only: the current session without health check, recycle or creation (None if
+    # there is none). Readers under the shared tool lock use this; get_session() runs exclusive.
+    peek_session: Callable[[], object | None] | None = dataclasses.field(default=None, repr=False)
     client_ip: str = ""
     trace_id: str = ""  # S6: OTel trace ID (from middleware or request_id fallback)
     auth_method: str = ""  # S4: "api_key" | "jwt" | "" (STDIO)
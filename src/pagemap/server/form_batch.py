@@ -0,0 +1,173 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Single-round-trip in-page execution of consecutive fill_form type/select fields.
+
+The per-field path (role count, optional CSS count, Playwright action,
+settle, popup/URL checks) costs a dozen browser round-trips per field.
+For a run of consecutive type/select fields whose targets carry a CSS
+selector, :func:`run_fill_batch` resolves each target once and sets
+values inside one ``page.evaluate`` — with the native value setter
+(so React/Vue controlled inputs notice) followed by ``input`` and
+``change`` events.
+
+Selectors are positional, so before each write the element they resolve
+to must still carry the target's role and accessible name (from
+``aria-labelledby``, ``aria-label``, ``<label>``, ``title`` or
+``placeholder``).  The batch stops early — leaving the rest to the
+Playwright per-field path — when a target is missing, is a different
+element, is hidden, disabled/readonly or not a plain text/select control,
+when a select has no matching option, when a write adds or removes nodes
+inside the field's form (dependent fields re-rendered), or when the
+document is swapped / the URL changes (navigation).  Clicks are never
+batched.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+    from pagemap import Interactable
+
+    from . import FormField
+
+logger = logging.getLogger(__name__)
+
+BATCHABLE_ACTIONS = frozenset({"type", "select"})
+MIN_BATCH_SIZE = 2  # a single field gains nothing over the per-field path
+
+
+@dataclass(frozen=True, slots=True)
+class BatchFillOutcome:
+    """Result of one in-page batch: ``done`` leading ops were applied."""
+
+    done: int
+    stop_reason: str | None = None  # why the batch stopped before the end
+    mutations: int = 0
+
+
+# ops: [[selector, action, value, role, name], ...] → {done, stop, mutations}
+_BATCH_FILL_JS = """async (ops) => {
+  const NON_TEXT = new Set(['checkbox', 'radio', 'file', 'button', 'submit', 'image', 'reset', 'hidden', 'range', 'color']);
+  const startHref = location.href;
+  const root = document.documentElement;
+  let pending = [];
+  const observer = new MutationObserver((records) => { pending.push(...records); });
+  observer.observe(document, {childList: true, subtree: true});
+  let mutations = 0;
+  const drain = () => {
+    const records = pending.concat(observer.takeRecords());
+    pending = [];
+    mutations += records.length;
+    return records;
+  };
+  const result = (done, stop) => {
+    drain();
+    observer.disconnect();
+    return {done, stop, mutations};
+  };
+  const norm = (s) => (s || '').replace(/\\s+/g, ' ').trim();
+  // Implicit ARIA role of the controls the batch writes (explicit role wins)
+  const roleOf = (el) => {
+    const explicit = norm(el.getAttribute('role')).split(' ')[0];
+    if (explicit) return explicit;
+    if (el.tagName === 'TEXTAREA') return 'textbox';
+    if (el.tagName === 'SELECT') return el.multiple || el.size > 1 ? 'listbox' : 'combobox';
+    const type = (el.type || 'text').toLowerCase();
+    if (type === 'number') return 'spinbutton';
+    if (el.list) return 'combobox';
+    return type === 'search' ? 'searchbox' : 'textbox';
+  };
+  // Every source the accessible name can come from; the AX name must be one of them
+  const nameSources = (el) => {
+    const ids = norm(el.getAttribute('aria-labelledby')).split(' ').filter(Boolean);
+    const labelledBy = ids.map((id) => document.getElementById(id)).filter(Boolean);
+    return [
+      norm(labelledBy.map((n) => n.textContent).join(' ')),
+      norm(el.getAttribute('aria-label')),
+      norm(Array.from(el.labels || [], (l) => l.textContent).join(' ')),
+      norm(el.getAttribute('title')),
+      norm(el.getAttribute('placeholder')),
+    ];
+  };
+  const sameTarget = (el, role, name) => {
+    if (roleOf(el) !== role) return false;
+    const sources = nameSources(el);
+    return name ? sources.includes(name) : sources.every((s) => !s);
+  };
+  const setNative = (el, value) => {
+    const desc = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), 'value');
+    if (desc && desc.set) desc.set.call(el, value); else el.value = value;
+  };
+  for (let i = 0; i < ops.length; i++) {
+    const [selector, action, value, role, name] = ops[i];
+    let el;
+    try { el = document.querySelector(selector); } catch (e) { return result(i, 'bad selector'); }
+    if (!el) return result(i, 'not found');
+    if (!sameTarget(el, role, norm(name))) return result(i, 'different element');
+    if (!el.isConnected || el.getClientRects().length === 0) return result(i, 'not visible');
+    if (el.disabled || el.readOnly) return result(i, 'not editable');
+    const scope = el.form || el.closest('form') || document.body;
+    if (action === 'type') {
+      const tag = el.tagName;
+      const ok = tag === 'TEXTAREA' || (tag === 'INPUT' && !NON_TEXT.has((el.type || 'text').toLowerCase()));
+      if (!ok) return result(i, 'not a text field');
+      el.focus();
+      setNative(el, value);
+      el.dispatchEvent(new InputEvent('input', {bubbles: true, inputType: 'insertText', data: value}));
+      el.dispatchEvent(new Event('change', {bubbles: true}));
+    } else if (action === 'select') {
+      if (el.tagName !== 'SELECT') return result(i, 'not a select');
+      const opt = Array.from(el.options).find(
+        (o) => o.value === value || o.label === value || o.text.trim() === value
+      );
+      if (!opt) return result(i, 'no matching option');
+      el.focus();
+      setNative(el, opt.value);
+      el.dispatchEvent(new Event('input', {bubbles: true}));
+      el.dispatchEvent(new Event('change', {bubbles: true}));
+    } else {
+      return result(i, 'unsupported action');
+    }
+    // Let microtask-scheduled re-renders (Vue, React transitions) land before the next write
+    await Promise.resolve();
+    const records = drain();
+    if (location.href !== startHref) return result(i + 1, 'navigation');
+    if (!el.isConnected || records.some((r) => r.target === root || r.target === document)) {
+      return result(i + 1, 'document changed');
+    }
+    // Added/removed nodes in the form can re-target later positional selectors
+    if (records.some((r) => scope.contains(r.target))) return result(i + 1, 'form changed');
+  }
+  return result(ops.length, null);
+}"""
+
+
+def batchable_run(fields: list[FormField], ref_map: dict[int, Interactable], start: int) -> list[FormField]:
+    """Longest run of consecutive batchable fields beginning at *start*."""
+    run: list[FormField] = []
+    for f in fields[start:]:
+        target = ref_map[f.ref]
+        if f.action not in BATCHABLE_ACTIONS or not target.selector or f.value is None:
+            break
+        run.append(f)
+    return run
+
+
+async def run_fill_batch(page: Page, fields: list[FormField], ref_map: dict[int, Interactable]) -> BatchFillOutcome:
+    """Apply *fields* in one in-page evaluation. Never raises — ``done=0`` on failure."""
+    ops = [[ref_map[f.ref].selector, f.action, f.value, ref_map[f.ref].role, ref_map[f.ref].name] for f in fields]
+    try:
+        raw = await page.evaluate(_BATCH_FILL_JS, ops)
+    except Exception:
+        logger.debug("fill_form batch evaluate failed, falling back to per-field", exc_info=True)
+        return BatchFillOutcome(done=0, stop_reason="evaluate failed")
+    if not isinstance(raw, dict):
+        return BatchFillOutcome(done=0, stop_reason="evaluate failed")
+    done = max(0, min(int(raw.get("done", 0)), len(fields)))
+    return BatchFillOutcome(done=done, stop_reason=raw.get("stop"), mutations=int(raw.get("mutations", 0)))
@@ -19,6 +19,8 @@ import logging
 import os
 from contextlib import suppress
 
+from pagemap.core.env import env_flag
+
 __all__ = [
     "_health_check",
     "_liveness_probe",
@@ -234,7 +236,7 @@ async def _sla_report(request):
 
 
 async def _metrics_endpoint(request):
-    """Prometheus /metrics endpoint — exposes SLI, pool, and cache gauges."""
+    """Prometheus /metrics endpoint — exposes SLI, pool, cache gauges and stage histograms."""
     import pagemap.server as srv
 
     try:
@@ -267,6 +269,15 @@ async def _metrics_endpoint(request):
             Gauge("pagemap_pool_connected", "Browser connected (1/0)", registry=registry).set(
                 1.0 if h.browser_connected else 0.0
             )
+            Gauge("pagemap_pool_js_heap_bytes", "Sampled JS heap of all browser contexts", registry=registry).set(
+                sum(m.js_heap_bytes for m in h.memory.values())
+            )
+            Gauge("pagemap_pool_dom_nodes", "Sampled DOM nodes of all browser contexts", registry=registry).set(
+                sum(m.dom_nodes for m in h.memory.values())
+            )
+            Gauge("pagemap_pool_renderer_rss_bytes", "Resident memory of renderer processes", registry=registry).set(
+                h.renderer_rss_bytes
+            )
 
         # Session manager metrics
         if srv._session_manager is not None:
@@ -274,6 +285,16 @@ async def _metrics_endpoint(request):
                 srv._session_manager.active_sessions
             )
 
+        # Feature stats (stage histograms, tool lock, caches, prebuilds, detectors, ...) register
+        # themselves with pagemap.core.stats; import the lazily loaded build pipeline so its
+        # collectors are there before the first page map
+        import pagemap.core.page_map_builder  # noqa: F401
+        import pagemap.server.stage_metrics  # noqa: F401
+        from pagemap.core.stats import enabled_collectors
+
+        for collector in enabled_collectors():
+            registry.register(collector)
+
         from starlette.responses import Response
 
         return Response(generate_latest(registry), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -371,7 +392,8 @@ async def _run_http_server(
 
     Module globals modified via srv.X:
         _session_manager, _draining, _repository, _rate_limiter,
-        _paddle_config, _creem_config, _usage_sync, _webhook_cleanup, _sli_tracker, _outbox_poller
+        _paddle_config, _creem_config, _usage_sync, _webhook_cleanup, _sli_tracker, _outbox_poller,
+        _admission
     """
     import pagemap.server as srv
 
@@ -424,6 +446,14 @@ async def _run_http_server(
             srv._rate_limiter = RateLimiter()
     logger.info("Rate limiter initialized")
 
+    # ── Shared L2 page-map cache (opt-in) ──────────────────────────
+    from pagemap.server.shared_cache import SHARED_CACHE_URL, create_shared_cache
+
+    if SHARED_CACHE_URL and srv._shared_cache is None:
+        srv._shared_cache = await create_shared_cache(SHARED_CACHE_URL)
+        if srv._shared_cache is not None:
+            logger.info("Shared L2 page-map cache enabled (%s)", SHARED_CACHE_URL.split("://", 1)[0])
+
     # S7: SLI tracker — one-time initialization
     try:
         from pagemap.resilience.sli_slo import AVAILABILITY_SLO, ErrorBudgetTracker
@@ -451,7 +481,7 @@ async def _run_http_server(
 
             # ── Middleware chain (outermost wraps first, executes first) ──
             # Wrapping order is reverse of execution: last wrap = outermost.
-            # Request flow: Gateway → RateLimit → Paddle → Auth → RestApi → Credit → SecurityHeaders → App
+            # Request flow: Gateway → Admission → RateLimit → Paddle → Auth → RestApi → Credit → SecurityHeaders → App
             # ──────────────────────────────────────────────────────────────────────────────────
 
             # 5. SecurityHeaders (innermost middleware, closest to app)
@@ -613,7 +643,7 @@ async def _run_http_server(
                     logger.debug("Subscription handlers not available")
 
                 # S3: Outbox mode (feature flag)
-                _enable_outbox = os.environ.get("PAGEMAP_ENABLE_OUTBOX", "").strip().lower() in ("1", "true", "yes")
+                _enable_outbox = env_flag("PAGEMAP_ENABLE_OUTBOX")
                 _outbox_fsm = None
                 _outbox_saga = None
 
@@ -727,6 +757,23 @@ async def _run_http_server(
                 except ImportError:
                     logger.debug("Deadline propagation middleware not available")
 
+            # 1a. Admission control / load shedding (opt-in)
+            from pagemap.server.admission import (
+                ADMISSION_ENABLED,
+                AdmissionController,
+                AdmissionMiddleware,
+                LoadMonitor,
+            )
+
+            if ADMISSION_ENABLED:
+                _monitor = LoadMonitor(lambda: pool.active_count / max(pool.capacity, 1))
+                srv._admission = AdmissionController(_monitor)
+                starlette_app = AdmissionMiddleware(
+                    starlette_app, srv._admission, is_known_session=srv._session_manager.has_session
+                )
+                _monitor.start()
+                logger.info("Admission control enabled")
+
             # 1b. API Versioning (S5)
             try:
                 from pagemap.api_versioning import ApiVersioningMiddleware
@@ -998,6 +1045,16 @@ async def _run_http_server(
                 except Exception:  # nosec B110
                     pass
 
+            # Persist learned navigation wait profiles (no-op without PAGEMAP_NAV_PROFILE_PATH)
+            from pagemap.server.nav_profile import nav_profiles
+
+            await nav_profiles.flush()
+
+            # Persist the boilerplate index (no-op without PAGEMAP_BOILERPLATE_INDEX_PATH)
+            from pagemap.core.pruning.boilerplate import boilerplate_index
+
+            boilerplate_index.save()
+
             # S1: Shutdown degradation periodic task
             if _degrade_task is not None:
                 _degrade_shutdown_event.set()
@@ -1028,8 +1085,14 @@ async def _run_http_server(
             if srv._anomaly_detector is not None:
                 with suppress(Exception):  # nosec B110
                     srv._anomaly_detector.shutdown()
+            if srv._admission is not None:
+                await srv._admission.monitor.stop()  # type: ignore[attr-defined]
+                srv._admission = None
             await srv._session_manager.shutdown()
             srv._session_manager = None
+            if srv._shared_cache is not None:
+                await srv._shared_cache.close()
+                srv._shared_cache = None
             if srv._repository is not None:
                 await srv._repository.close()
                 srv._repository = None
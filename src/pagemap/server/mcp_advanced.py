@@ -260,6 +260,7 @@ TOOL_OUTPUT_SCHEMAS: dict[str, type[BaseModel] | None] = {
     "switch_tab": None,
     "list_tabs": None,
     "close_tab": None,
+    "map_tabs": None,
 }
 
 
@@ -7,6 +7,13 @@ Ported from Retio MVP ``multi-tab-session.ts``.
 Each tab has its own BrowserContext (isolated cookies/storage)
 and PageMapCache instance.
 
+Shared-context mode (``PAGEMAP_TAB_SHARED_CONTEXT=1``): tabs are pages in
+one BrowserContext owned by a hidden host session, so they share cookies
+and context setup (stealth, route guards) is paid once.  Each tab keeps
+its own PageMapCache; the per-page security scanner is installed on first
+navigation.  The cap is :data:`MAX_SHARED_TABS`, lowered further when the
+measured JS heap of open tabs would exceed :data:`TAB_MEMORY_BUDGET_MB`.
+
 Key differences from Retio TS:
 - Retio uses native WebView bridges; pagemap uses Playwright ``browser.new_context()``.
 - Per-tab cache isolation via ``PageMapCache`` instances (vs WebView JS context isolation).
@@ -16,23 +23,30 @@ Key differences from Retio TS:
 from __future__ import annotations
 
 import logging
+import os
 import re
 import time
 from contextlib import suppress
 from dataclasses import dataclass, field
 from enum import StrEnum
-
-from playwright.async_api import Browser, Page
+from typing import TYPE_CHECKING
 
 from pagemap.cache import PageMapCache
+from pagemap.core.env import env_flag
 
 from .browser_session import BrowserConfig, BrowserSession
 
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Page
+
 logger = logging.getLogger("pagemap.server.multi_tab")
 
 # ── Constants ─────────────────────────────────────────────────────────
 
 MAX_TABS = 5
+MAX_SHARED_TABS = int(os.environ.get("PAGEMAP_MAX_SHARED_TABS", "20"))
+TAB_MEMORY_BUDGET_MB = int(os.environ.get("PAGEMAP_TAB_MEMORY_BUDGET_MB", "1024"))
+TAB_SHARED_CONTEXT: bool = env_flag("PAGEMAP_TAB_SHARED_CONTEXT")
 TAB_TTL_SECONDS = 1800  # 30 minutes
 TAB_NAME_PATTERN = re.compile(r"^[a-zA-Z0-9_]{1,30}$")
 
@@ -54,12 +68,36 @@ class TabOpStatus(StrEnum):
 
 @dataclass(slots=True)
 class TabInstance:
-    """A single tab with its own browser context and cache."""
+    """A single tab with its own browser context (or shared-context page) and cache."""
 
     name: str
     session: BrowserSession
     cache: PageMapCache
     created_at: float = field(default_factory=time.monotonic)
+    open_ms: float = 0.0  # session start + first navigation
+    memory_bytes: int | None = None  # JS heap, last sample (None = unavailable)
+    scroll_merge_state: object | None = None  # S9: ScrollMergeState of this tab (lazy)
+
+    def get_scroll_merge_state(self) -> object | None:
+        """Get or create this tab's scroll merge state (lazy init)."""
+        if self.scroll_merge_state is None:
+            try:
+                from pagemap.diagnostics import ScrollMergeState
+
+                self.scroll_merge_state = ScrollMergeState()
+            except Exception:  # nosec B110
+                pass
+        return self.scroll_merge_state
+
+
+async def _page_memory_bytes(session: BrowserSession) -> int | None:
+    """Used JS heap of the session's page via CDP, or None. Never raises."""
+    try:
+        cdp = await session.get_cdp_session()
+        usage = await cdp.send("Runtime.getHeapUsage")
+        return int(usage["usedSize"])
+    except Exception:
+        return None
 
 
 # ── Cookie validation ─────────────────────────────────────────────────
@@ -106,14 +144,32 @@ class MultiTabSession:
     Each tab gets its own ``BrowserContext`` (via ``BrowserSession.start_from_pool``)
     for cookie/storage isolation, and its own ``PageMapCache``.
 
+    With *shared_context* every tab is a page in one context owned by a
+    hidden host ``BrowserSession`` (started with the first tab, stopped
+    with the last).
+
     Backward-compatible: when no tabs are open (``is_multi_tab == False``),
     the server falls back to the original single-session mode.
     """
 
-    def __init__(self, browser: Browser) -> None:
+    def __init__(self, browser: Browser, *, shared_context: bool = TAB_SHARED_CONTEXT) -> None:
         self._browser = browser
         self._tabs: dict[str, TabInstance] = {}
         self._active_tab: str | None = None
+        self._shared_context = shared_context
+        self._host: BrowserSession | None = None
+
+    @property
+    def max_tabs(self) -> int:
+        return MAX_SHARED_TABS if self._shared_context else MAX_TABS
+
+    def _memory_cap_reached(self) -> bool:
+        """True when one more tab of average size would exceed the memory budget."""
+        sampled = [tab.memory_bytes for tab in self._tabs.values() if tab.memory_bytes is not None]
+        if not sampled:
+            return False
+        used = sum(sampled)
+        return used + used / len(sampled) > TAB_MEMORY_BUDGET_MB * 1024 * 1024
 
     @property
     def is_multi_tab(self) -> bool:
@@ -151,6 +207,18 @@ class MultiTabSession:
             return None
         return tab.session
 
+    @property
+    def tab_names(self) -> list[str]:
+        return list(self._tabs)
+
+    def get_tabs(self, names: list[str] | None = None) -> tuple[list[TabInstance], list[str]]:
+        """Tabs for *names* (all tabs when None), plus the names not found."""
+        if names is None:
+            return list(self._tabs.values()), []
+        found = [self._tabs[n] for n in dict.fromkeys(names) if n in self._tabs]
+        missing = [n for n in dict.fromkeys(names) if n not in self._tabs]
+        return found, missing
+
     # ── Tab operations ────────────────────────────────────────────
 
     async def open_tab(
@@ -172,6 +240,7 @@ class MultiTabSession:
             url_validator: Sync URL validator for route guard (``_validate_url``).
             ssrf_validator: Async URL validator (``_validate_url_with_dns``).
             user_agent: Custom user-agent string (e.g. BOT_USER_AGENT for --bot-ua).
+                In shared-context mode it must match the first open tab's.
 
         Returns:
             dict with ``status``, ``tab_name``, ``url``, and ``tab_count``.
@@ -194,10 +263,15 @@ class MultiTabSession:
             }
 
         # Check limit
-        if len(self._tabs) >= MAX_TABS:
+        if len(self._tabs) >= self.max_tabs:
             return {
                 "status": TabOpStatus.MAX_TABS_REACHED,
-                "error": f"Maximum {MAX_TABS} tabs reached. Close a tab first.",
+                "error": f"Maximum {self.max_tabs} tabs reached. Close a tab first.",
+            }
+        if self._memory_cap_reached():
+            return {
+                "status": TabOpStatus.MAX_TABS_REACHED,
+                "error": f"Tab memory budget ({TAB_MEMORY_BUDGET_MB} MB) reached. Close a tab first.",
             }
 
         # Cookie validation (before resource allocation)
@@ -215,14 +289,35 @@ class MultiTabSession:
                     "error": f"URL blocked: {ssrf_error}",
                 }
 
-        # Create isolated browser session (new BrowserContext)
         config = BrowserConfig(headless=True, user_agent=user_agent) if user_agent else BrowserConfig(headless=True)
-        tab_session = BrowserSession(config)
-        await tab_session.start_from_pool(self._browser)
+        # Shared context: context options (user agent) are the host's, taken from the first tab
+        if self._shared_context and self._host is not None and config.user_agent != self._host.config.user_agent:
+            return {
+                "status": TabOpStatus.ERROR,
+                "error": (
+                    "Tabs in a shared browser context cannot use a different user_agent. "
+                    "Close all tabs first, or disable PAGEMAP_TAB_SHARED_CONTEXT."
+                ),
+            }
+
+        started = time.perf_counter()
+        if self._shared_context:
+            # New page in the shared context (route guard installed once, on the host)
+            host = await self._ensure_host(config, url_validator)
+            tab_session = BrowserSession(host.config)
+            try:
+                await tab_session.start_shared(host)
+            except Exception:
+                await self._release_idle_host()
+                raise
+        else:
+            # Create isolated browser session (new BrowserContext)
+            tab_session = BrowserSession(config)
+            await tab_session.start_from_pool(self._browser)
 
         try:
             # Install SSRF route guard on the new context
-            if url_validator is not None:
+            if url_validator is not None and not self._shared_context:
                 await tab_session.install_ssrf_route_guard(url_validator)
 
             # Inject cookies before navigation
@@ -234,6 +329,7 @@ class MultiTabSession:
         except Exception:
             with suppress(Exception):
                 await tab_session.stop()
+            await self._release_idle_host()
             raise
 
         # Create tab
@@ -241,11 +337,20 @@ class MultiTabSession:
             name=name,
             session=tab_session,
             cache=PageMapCache(),
+            open_ms=(time.perf_counter() - started) * 1000,
+            memory_bytes=await _page_memory_bytes(tab_session),
         )
         self._tabs[name] = tab
         self._active_tab = name
 
-        logger.info("Tab opened: name=%s url=%s total=%d", name, url, len(self._tabs))
+        logger.info(
+            "Tab opened: name=%s url=%s total=%d shared=%s open_ms=%.0f",
+            name,
+            url,
+            len(self._tabs),
+            self._shared_context,
+            tab.open_ms,
+        )
 
         return {
             "status": TabOpStatus.OK,
@@ -254,6 +359,31 @@ class MultiTabSession:
             "tab_count": len(self._tabs),
         }
 
+    async def _ensure_host(self, config: BrowserConfig, url_validator) -> BrowserSession:
+        """Start the hidden host session that owns the shared context (once)."""
+        if self._host is None:
+            host = BrowserSession(config)
+            await host.start_from_pool(self._browser)
+            try:
+                if url_validator is not None:
+                    await host.install_ssrf_route_guard(url_validator)
+            except Exception:
+                with suppress(Exception):
+                    await host.stop()
+                raise
+            self._host = host
+        return self._host
+
+    async def _release_idle_host(self) -> None:
+        """Stop the shared-context host once no tab uses it."""
+        if self._tabs or self._host is None:
+            return
+        host, self._host = self._host, None
+        try:
+            await host.stop()
+        except Exception:
+            logger.debug("Error closing shared tab context", exc_info=True)
+
     async def switch_tab(self, name: str) -> dict:
         """Switch the active tab.
 
@@ -296,6 +426,8 @@ class MultiTabSession:
                     "is_active": name == self._active_tab,
                     "age_seconds": round(now - tab.created_at),
                     "has_page_map": tab.cache.active is not None,
+                    "open_ms": round(tab.open_ms),
+                    "memory_mb": round(tab.memory_bytes / (1024 * 1024), 1) if tab.memory_bytes is not None else None,
                 }
             )
 
@@ -303,9 +435,16 @@ class MultiTabSession:
             "status": TabOpStatus.OK,
             "active_tab": self._active_tab,
             "tab_count": len(self._tabs),
+            "max_tabs": self.max_tabs,
+            "shared_context": self._shared_context,
             "tabs": tabs_info,
         }
 
+    async def sample_memory(self) -> None:
+        """Refresh each tab's JS heap sample (reported by list_tabs, used by the memory cap)."""
+        for tab in self._tabs.values():
+            tab.memory_bytes = await _page_memory_bytes(tab.session)
+
     async def close_tab(self, name: str) -> dict:
         """Close a tab and release its browser context.
 
@@ -336,6 +475,9 @@ class MultiTabSession:
             else:
                 self._active_tab = None
 
+        # Last shared-context tab gone → release the shared context
+        await self._release_idle_host()
+
         logger.info(
             "Tab closed: name=%s remaining=%d active=%s",
             name,
@@ -364,4 +506,5 @@ class MultiTabSession:
         names = list(self._tabs.keys())
         for name in names:
             await self.close_tab(name)
+        await self._release_idle_host()
         logger.info("All tabs closed")
@@ -0,0 +1,290 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Per-domain navigation wait budgets learned from observed page loads.
+
+The hybrid strategy in ``BrowserSession.navigate`` waits for ``load``, then
+up to ``networkidle_budget_ms`` for network idle, then up to
+``settle_max_ms`` for DOM quiet — the same for every site.  Sites that
+long-poll analytics always burn the whole networkidle budget although the
+page stopped changing at ``load``.  With ``PAGEMAP_ADAPTIVE_NAV_WAIT=1``
+:data:`nav_profiles` learns, per host:
+
+- **probe** navigations run with the default budgets and capture a cheap
+  DOM fingerprint after each phase, recording how long the phase took and
+  whether it changed the page.  The first ``MIN_PROBES`` navigations of a
+  host are probes, then every ``PROBE_EVERY``-th, so profiles follow
+  site changes;
+- **learned** navigations use budgets derived from the recent probes: a
+  phase that never changed the fingerprint is skipped (networkidle) or cut
+  to the observed quiet time (settle); one that did is capped at its
+  p90 duration plus headroom, never above the default.
+
+``PAGEMAP_NAV_PROFILE_PATH`` persists the probe windows as JSON across
+restarts.  :class:`NavProfileStats` reports navigations per mode and the
+estimated wait saved (default budget minus learned budget for every phase
+that ran to its learned cap).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import os
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from pagemap.core.atomic_io import write_text_atomic
+from pagemap.core.env import env_flag
+from pagemap.core.stats import Counter, StatsCollector, register_collector
+
+logger = logging.getLogger(__name__)
+
+ADAPTIVE_NAV_WAIT_ENABLED = env_flag("PAGEMAP_ADAPTIVE_NAV_WAIT")
+NAV_PROFILE_PATH = os.environ.get("PAGEMAP_NAV_PROFILE_PATH", "").strip()
+
+MIN_PROBES = 3  # full-budget measured navigations before a host's budgets adapt
+PROBE_EVERY = 10  # re-measure a learned host every Nth navigation
+WINDOW = 20  # probe observations kept per host
+MAX_DOMAINS = 2048
+SAVE_EVERY = 25  # persist after this many recorded navigations
+IDLE_FLOOR_MS = 250
+SETTLE_FLOOR_MS = 300
+HEADROOM = 1.5
+
+METRIC_NAVIGATIONS = "pagemap_nav_wait_navigations_total"
+METRIC_SAVED = "pagemap_nav_wait_saved_seconds_total"
+
+_MODES = ("default", "probe", "learned")
+
+
+@dataclass(frozen=True, slots=True)
+class NavPlan:
+    """Wait budgets for one navigation."""
+
+    host: str
+    mode: str  # "default" | "probe" | "learned"
+    networkidle_ms: int  # 0 = skip the networkidle phase
+    settle_max_ms: int
+    default_networkidle_ms: int
+    default_settle_max_ms: int
+
+    @property
+    def probe(self) -> bool:
+        return self.mode == "probe"
+
+
+@dataclass(frozen=True, slots=True)
+class NavObservation:
+    """What the wait phases of one navigation did."""
+
+    idle_ms: float
+    idle_reached: bool  # False: budget exceeded, errored or skipped
+    settle_ms: float
+    settle_timed_out: bool
+    idle_changed: bool | None = None  # fingerprint moved during networkidle (probes; None = unknown)
+    settle_changed: bool | None = None  # fingerprint moved during settle (probes; None = unknown)
+
+    def to_list(self) -> list[Any]:
+        return [
+            round(self.idle_ms, 1),
+            self.idle_reached,
+            round(self.settle_ms, 1),
+            self.settle_timed_out,
+            self.idle_changed,
+            self.settle_changed,
+        ]
+
+    @classmethod
+    def from_list(cls, raw: list[Any]) -> NavObservation:
+        idle_ms, idle_reached, settle_ms, settle_timed_out, idle_changed, settle_changed = raw
+        return cls(
+            float(idle_ms), bool(idle_reached), float(settle_ms), bool(settle_timed_out), idle_changed, settle_changed
+        )
+
+
+def _p90(values: list[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(0.9 * len(ordered)) - 1)]
+
+
+def _capped(observed_ms: float, floor_ms: int, default_ms: int) -> int:
+    return int(min(default_ms, max(floor_ms, observed_ms * HEADROOM)))
+
+
+class _HostProfile:
+    __slots__ = ("navigations", "probes")
+
+    def __init__(self) -> None:
+        self.navigations = 0
+        self.probes: deque[NavObservation] = deque(maxlen=WINDOW)
+
+    def budgets(self, default_idle_ms: int, default_settle_ms: int) -> tuple[int, int]:
+        """(networkidle_ms, settle_max_ms) from the probe window."""
+        probes = list(self.probes)
+        reached = [o.idle_ms for o in probes if o.idle_reached]
+        if all(o.idle_changed is False for o in probes):
+            idle_ms = 0  # network never went quiet for anything the page showed
+        elif len(reached) == len(probes):
+            idle_ms = _capped(_p90(reached), IDLE_FLOOR_MS, default_idle_ms)
+        else:
+            idle_ms = default_idle_ms
+        settle_ms = default_settle_ms
+        if all(o.settle_changed is False for o in probes):
+            quiet = [o.settle_ms for o in probes if not o.settle_timed_out]
+            settle_ms = _capped(_p90(quiet), SETTLE_FLOOR_MS, default_settle_ms) if quiet else SETTLE_FLOOR_MS
+        return idle_ms, settle_ms
+
+
+class NavProfileStats(StatsCollector):
+    """Navigation counters per wait-budget mode and the wait they saved."""
+
+    LABELS = ("mode",)
+    FIELDS = ("count", "saved_ms")
+    SEED = tuple((mode,) for mode in _MODES)
+    COUNTERS = (
+        Counter(METRIC_NAVIGATIONS, "Hybrid navigations by wait-budget mode", "count"),
+        Counter(
+            METRIC_SAVED, "Estimated navigation wait saved by learned budgets", "saved_ms", labelled=False, scale=0.001
+        ),
+    )
+
+    __slots__ = ()
+
+    def record(self, mode: str, saved_ms: float = 0.0) -> None:
+        self.add((mode,), 1, saved_ms)
+
+    def snapshot(self) -> dict[str, float]:
+        rows = self.rows()
+        snap: dict[str, float] = {mode: row[0] for (mode,), row in rows.items()}
+        snap["saved_ms"] = round(sum(row[1] for row in rows.values()), 1)
+        learned = snap["learned"]
+        snap["avg_saved_ms"] = round(snap["saved_ms"] / learned, 1) if learned else 0.0
+        return snap
+
+
+class NavProfileLearner:
+    """Per-host probe windows → adaptive navigation budgets (event-loop only)."""
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self._path = Path(path) if path else None
+        self._hosts: OrderedDict[str, _HostProfile] = OrderedDict()
+        self._unsaved = 0
+        self._flush_task: asyncio.Task[None] | None = None
+        self.stats = NavProfileStats()
+        if self._path is not None:
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._hosts)
+
+    def plan(self, host: str, default_networkidle_ms: int, default_settle_max_ms: int) -> NavPlan:
+        """Budgets for the next navigation to *host*."""
+        defaults = (default_networkidle_ms, default_settle_max_ms)
+        if not host:
+            return NavPlan(host, "default", *defaults, *defaults)
+        profile = self._hosts.get(host)
+        if profile is None:
+            profile = self._hosts[host] = _HostProfile()
+            while len(self._hosts) > MAX_DOMAINS:
+                self._hosts.popitem(last=False)
+        self._hosts.move_to_end(host)
+        profile.navigations += 1
+        if len(profile.probes) < MIN_PROBES or profile.navigations % PROBE_EVERY == 0:
+            return NavPlan(host, "probe", *defaults, *defaults)
+        return NavPlan(host, "learned", *profile.budgets(*defaults), *defaults)
+
+    def record(self, plan: NavPlan, observation: NavObservation) -> None:
+        """Feed back what the navigation planned by :meth:`plan` observed."""
+        saved_ms = 0.0
+        if plan.mode == "learned":
+            if not observation.idle_reached:
+                saved_ms += plan.default_networkidle_ms - plan.networkidle_ms
+            if observation.settle_timed_out:
+                saved_ms += plan.default_settle_max_ms - plan.settle_max_ms
+        self.stats.record(plan.mode, saved_ms)
+        if plan.probe:
+            profile = self._hosts.get(plan.host)
+            if profile is not None:
+                profile.probes.append(observation)
+        self._unsaved += 1
+        if self._path is not None and self._unsaved >= SAVE_EVERY:
+            self._flush_in_background()
+
+    def probes(self, host: str) -> list[NavObservation]:
+        profile = self._hosts.get(host)
+        return list(profile.probes) if profile else []
+
+    # -- persistence --
+
+    def save(self) -> None:
+        """Atomically write the probe windows to the profile path. Never raises.
+
+        Blocks on file I/O: on the event loop use :meth:`flush` instead.
+        """
+        self._unsaved = 0
+        if self._path is not None:
+            self._write(self._payload())
+
+    async def flush(self) -> None:
+        """Wait for a background write, then write the current windows from a worker thread."""
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+        self._unsaved = 0
+        if self._path is not None:
+            await asyncio.to_thread(self._write, self._payload())
+
+    def _flush_in_background(self) -> None:
+        """Write from a worker thread; the payload is serialized here, on the loop that owns ``_hosts``."""
+        if self._flush_task is not None and not self._flush_task.done():
+            return  # still writing; the next record() retries
+        self._unsaved = 0
+        payload = self._payload()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(payload)
+            return
+        self._flush_task = loop.create_task(asyncio.to_thread(self._write, payload))
+
+    def _payload(self) -> str:
+        return json.dumps(
+            {
+                "version": 1,
+                "hosts": {
+                    host: {"navigations": p.navigations, "probes": [o.to_list() for o in p.probes]}
+                    for host, p in self._hosts.items()
+                },
+            },
+            separators=(",", ":"),
+        )
+
+    def _write(self, payload: str) -> None:
+        try:
+            write_text_atomic(self._path, payload)  # type: ignore[arg-type]
+        except Exception as e:
+            logger.debug("Navigation profiles not saved: %s", e)
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self._path.read_text(encoding="utf-8"))  # type: ignore[union-attr]
+            if data.get("version") != 1:
+                return
+            for host, raw in list(data.get("hosts", {}).items())[-MAX_DOMAINS:]:
+                profile = _HostProfile()
+                profile.navigations = int(raw.get("navigations", 0))
+                profile.probes.extend(NavObservation.from_list(o) for o in raw.get("probes", []))
+                self._hosts[host] = profile
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable navigation profiles %s: %s", self._path, e)
+            self._hosts.clear()
+
+
+nav_profiles = NavProfileLearner(NAV_PROFILE_PATH or None)
+register_collector("nav_profile", lambda: nav_profiles.stats if ADAPTIVE_NAV_WAIT_ENABLED else None)
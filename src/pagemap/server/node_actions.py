@@ -0,0 +1,145 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Direct action dispatch through build-time node handles.
+
+Each AX-derived interactable keeps the backendDOMNodeId it had when the
+page map was built (``Interactable.backend_node_id``).  While the page is
+still the same document with the same structure, an action can go
+straight to that node over CDP — ``DOM.resolveNode`` plus one
+``Runtime.callFunctionOn`` — instead of ``get_by_role(...).count()``,
+which makes Playwright compute accessible names across the whole page.
+
+Handles are weak: backend ids do not pin nodes, and :func:`dispatch_via_handle`
+returns False whenever the node is gone, detached, hidden, obscured or
+not the right kind of control.  Callers then fall back to role/CSS
+locator resolution.
+"""
+
+from __future__ import annotations
+
+import logging
+from contextlib import suppress
+from typing import TYPE_CHECKING, Any
+
+from pagemap.dom_change_detector import fingerprints_structurally_equal
+
+if TYPE_CHECKING:
+    from playwright.async_api import CDPSession
+
+    from pagemap.dom_change_detector import DomFingerprint
+
+logger = logging.getLogger(__name__)
+
+HANDLE_ACTIONS = frozenset({"click", "hover", "type", "select"})
+
+# Runs with `this` = target node. Prepares the node for `action` and either
+# finishes it (select) or returns viewport coordinates (click/hover).
+_PREPARE_JS = """function(action, value) {
+  const el = this;
+  if (!el || !el.isConnected) return {ok: false, reason: 'detached'};
+  if (el.disabled) return {ok: false, reason: 'disabled'};
+  el.scrollIntoView({block: 'center', inline: 'center', behavior: 'instant'});
+  if (action === 'click' || action === 'hover') {
+    const r = el.getBoundingClientRect();
+    if (r.width === 0 || r.height === 0) return {ok: false, reason: 'not visible'};
+    const x = r.left + r.width / 2, y = r.top + r.height / 2;
+    const hit = document.elementFromPoint(x, y);
+    if (!hit || !(hit === el || el.contains(hit))) return {ok: false, reason: 'obscured'};
+    return {ok: true, x, y};
+  }
+  if (action === 'type') {
+    // insertText cannot drive picker-style inputs; those go through Playwright fill()
+    const NON_TEXT = ['checkbox', 'radio', 'file', 'button', 'submit', 'image', 'reset', 'hidden', 'range',
+      'color', 'date', 'datetime-local', 'month', 'week', 'time'];
+    const text = el.tagName === 'TEXTAREA' ||
+      (el.tagName === 'INPUT' && !NON_TEXT.includes((el.type || 'text').toLowerCase()));
+    if (!text) return {ok: false, reason: 'not a text field'};
+    if (el.readOnly) return {ok: false, reason: 'readonly'};
+    el.focus();
+    if (document.activeElement !== el) return {ok: false, reason: 'focus refused'};
+    try { el.select(); } catch (e) { el.value = ''; }
+    return {ok: true};
+  }
+  if (action === 'select') {
+    if (el.tagName !== 'SELECT') return {ok: false, reason: 'not a select'};
+    const opt = Array.from(el.options).find(
+      (o) => o.value === value || o.label === value || o.text.trim() === value
+    );
+    if (!opt) return {ok: false, reason: 'no matching option'};
+    el.focus();
+    el.value = opt.value;
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    return {ok: true};
+  }
+  return {ok: false, reason: 'unsupported action'};
+}"""
+
+
+def handles_valid(built: DomFingerprint | None, current: DomFingerprint | None) -> bool:
+    """True when *current* is the same document, structurally unchanged, as at build time."""
+    if built is None or current is None or built.document_id is None:
+        return False
+    return built.document_id == current.document_id and fingerprints_structurally_equal(built, current)
+
+
+async def dispatch_via_handle(
+    cdp: CDPSession,
+    backend_node_id: int,
+    action: str,
+    value: str | None,
+) -> bool:
+    """Perform *action* on the node directly. False → caller must fall back.
+
+    Raises only if a click failed after the mouse press was sent, so a
+    fallback can never double-submit.
+    """
+    if action not in HANDLE_ACTIONS or (action in ("type", "select") and not value):
+        return False
+    try:
+        resolved = await cdp.send("DOM.resolveNode", {"backendNodeId": backend_node_id})
+        object_id = resolved.get("object", {}).get("objectId")
+    except Exception:
+        logger.debug("Node handle %d stale", backend_node_id)
+        return False
+    if not object_id:
+        return False
+
+    pressed = False
+    try:
+        prep = await cdp.send(
+            "Runtime.callFunctionOn",
+            {
+                "objectId": object_id,
+                "functionDeclaration": _PREPARE_JS,
+                "arguments": [{"value": action}, {"value": value}],
+                "returnByValue": True,
+            },
+        )
+        result: dict[str, Any] = prep.get("result", {}).get("value") or {}
+        if not result.get("ok"):
+            logger.debug("Node handle %d not usable for %s: %s", backend_node_id, action, result.get("reason"))
+            return False
+
+        if action in ("click", "hover"):
+            x, y = result["x"], result["y"]
+            await cdp.send("Input.dispatchMouseEvent", {"type": "mouseMoved", "x": x, "y": y})
+            if action == "click":
+                pressed = True
+                for event_type in ("mousePressed", "mouseReleased"):
+                    await cdp.send(
+                        "Input.dispatchMouseEvent",
+                        {"type": event_type, "x": x, "y": y, "button": "left", "clickCount": 1},
+                    )
+        elif action == "type":
+            await cdp.send("Input.insertText", {"text": value})
+        return True
+    except Exception:
+        if pressed:
+            raise
+        logger.debug("Node handle dispatch failed for %d, falling back", backend_node_id, exc_info=True)
+        return False
+    finally:
+        with suppress(Exception):
+            await cdp.send("Runtime.releaseObject", {"objectId": object_id})
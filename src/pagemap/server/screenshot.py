@@ -0,0 +1,224 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Budgeted screenshot capture through CDP ``Page.captureScreenshot``.
+
+Chromium rasterises and encodes in one call, so format (PNG/JPEG/WebP),
+quality and downscale (``clip.scale``) are all applied browser-side with
+``optimizeForSpeed``.  When the encoded image is over the byte budget the
+capture is repeated down a ladder — PNG → JPEG, then lower quality, then
+smaller scale (jumping by the size ratio) — until it fits or
+:data:`MIN_SCALE` is reached.
+
+Without a CDP session (non-Chromium, mocked sessions) capture falls back
+to ``page.screenshot``, which supports the quality ladder but not
+scaling or WebP.
+"""
+
+from __future__ import annotations
+
+import base64
+import logging
+import math
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .browser_session import BrowserSession
+
+logger = logging.getLogger(__name__)
+
+SCREENSHOT_FORMATS = frozenset({"png", "jpeg", "webp"})
+DEFAULT_QUALITY = 80
+QUALITY_STEPS: tuple[int, ...] = (80, 60, 45, 30)
+MIN_SCALE = 0.25
+MAX_ATTEMPTS = 8
+
+# Element rect in document (not viewport) CSS pixels — the frame CDP clips use
+ELEMENT_RECT_JS = """(el) => {
+  const r = el.getBoundingClientRect();
+  return {x: r.left + window.scrollX, y: r.top + window.scrollY, width: r.width, height: r.height};
+}"""
+
+
+@dataclass(frozen=True, slots=True)
+class ScreenshotResult:
+    """An encoded screenshot that fits the budget, with how it was obtained."""
+
+    data: bytes
+    format: str
+    quality: int | None
+    scale: float
+    attempts: int
+    capture_ms: float  # first capture: raster + encode at the requested settings
+    encode_ms: float  # further captures spent stepping down to the budget
+    via: str  # "cdp" | "playwright"
+
+
+class ScreenshotTooLarge(Exception):
+    """No setting on the ladder fit the budget."""
+
+    def __init__(self, smallest: int, budget: int) -> None:
+        super().__init__(f"smallest capture {smallest} bytes exceeds budget {budget}")
+        self.smallest = smallest
+        self.budget = budget
+
+
+def _next_step(fmt: str, quality: int | None, scale: float, size: int, budget: int, *, can_scale: bool):
+    """Next (format, quality, scale) on the ladder after a *size*-byte miss, or None."""
+    if fmt == "png":
+        return "jpeg", DEFAULT_QUALITY, scale
+    lower = [q for q in QUALITY_STEPS if quality is None or q < quality]
+    if lower:
+        return fmt, lower[0], scale
+    if not can_scale or scale <= MIN_SCALE:
+        return None
+    # Encoded size tracks pixel count (scale²); aim just under the budget
+    factor = min(0.8, math.sqrt(budget / size) * 0.95)
+    return fmt, quality, max(MIN_SCALE, round(scale * factor, 3))
+
+
+async def _cdp_region(cdp, clip: dict[str, float] | None, full_page: bool) -> tuple[dict[str, float], bool]:
+    """Capture region in document CSS pixels, and whether it extends past the viewport."""
+    metrics = await cdp.send("Page.getLayoutMetrics")
+    vp = metrics["cssVisualViewport"]
+    viewport = {"x": vp["pageX"], "y": vp["pageY"], "width": vp["clientWidth"], "height": vp["clientHeight"]}
+    if clip is not None:
+        region = clip
+    elif full_page:
+        content = metrics["cssContentSize"]
+        region = {"x": 0, "y": 0, "width": content["width"], "height": content["height"]}
+    else:
+        return viewport, False
+    beyond = (
+        region["x"] < viewport["x"]
+        or region["y"] < viewport["y"]
+        or region["x"] + region["width"] > viewport["x"] + viewport["width"]
+        or region["y"] + region["height"] > viewport["y"] + viewport["height"]
+    )
+    return region, beyond
+
+
+async def _capture_cdp(
+    session: BrowserSession,
+    fmt: str,
+    quality: int | None,
+    scale: float,
+    clip: dict[str, float] | None,
+    full_page: bool,
+    budget: int,
+) -> ScreenshotResult:
+    cdp = await session.get_cdp_session()
+    region, beyond = await _cdp_region(cdp, clip, full_page)
+    attempts = 0
+    capture_ms = encode_ms = 0.0
+    smallest = 0
+    step: tuple[str, int | None, float] | None = (fmt, quality if fmt != "png" else None, scale)
+    while step is not None and attempts < MAX_ATTEMPTS:
+        cur_fmt, cur_q, cur_scale = step
+        params: dict[str, Any] = {
+            "format": cur_fmt,
+            "clip": {**region, "scale": cur_scale},
+            "fromSurface": True,
+            "captureBeyondViewport": beyond,
+            "optimizeForSpeed": True,
+        }
+        if cur_fmt != "png":
+            params["quality"] = cur_q if cur_q is not None else DEFAULT_QUALITY
+        t0 = time.perf_counter()
+        raw = await cdp.send("Page.captureScreenshot", params)
+        data = base64.b64decode(raw["data"])
+        elapsed = (time.perf_counter() - t0) * 1000
+        if attempts == 0:
+            capture_ms = elapsed
+        else:
+            encode_ms += elapsed
+        attempts += 1
+        if len(data) <= budget:
+            return ScreenshotResult(
+                data=data,
+                format=cur_fmt,
+                quality=params.get("quality"),
+                scale=cur_scale,
+                attempts=attempts,
+                capture_ms=capture_ms,
+                encode_ms=encode_ms,
+                via="cdp",
+            )
+        smallest = len(data) if not smallest else min(smallest, len(data))
+        step = _next_step(cur_fmt, cur_q, cur_scale, len(data), budget, can_scale=True)
+    raise ScreenshotTooLarge(smallest, budget)
+
+
+async def _capture_playwright(
+    session: BrowserSession,
+    fmt: str,
+    quality: int | None,
+    clip: dict[str, float] | None,
+    full_page: bool,
+    budget: int,
+) -> ScreenshotResult:
+    page = session.page
+    attempts = 0
+    capture_ms = encode_ms = 0.0
+    smallest = 0
+    cur_fmt = "jpeg" if fmt == "webp" else fmt  # Playwright cannot encode WebP
+    step: tuple[str, int | None, float] | None = (cur_fmt, quality if cur_fmt != "png" else None, 1.0)
+    while step is not None and attempts < MAX_ATTEMPTS:
+        cur_fmt, cur_q, _ = step
+        kwargs: dict[str, Any] = {"full_page": full_page, "type": cur_fmt}
+        if cur_fmt != "png":
+            cur_q = cur_q if cur_q is not None else DEFAULT_QUALITY
+            kwargs["quality"] = cur_q
+        if clip is not None:
+            # Playwright clips are document-relative only for full-page captures
+            kwargs["clip"] = clip
+            kwargs["full_page"] = True
+        t0 = time.perf_counter()
+        data = await page.screenshot(**kwargs)
+        elapsed = (time.perf_counter() - t0) * 1000
+        if attempts == 0:
+            capture_ms = elapsed
+        else:
+            encode_ms += elapsed
+        attempts += 1
+        if len(data) <= budget:
+            return ScreenshotResult(
+                data=data,
+                format=cur_fmt,
+                quality=cur_q if cur_fmt != "png" else None,
+                scale=1.0,
+                attempts=attempts,
+                capture_ms=capture_ms,
+                encode_ms=encode_ms,
+                via="playwright",
+            )
+        smallest = len(data) if not smallest else min(smallest, len(data))
+        step = _next_step(cur_fmt, cur_q, 1.0, len(data), budget, can_scale=False)
+    raise ScreenshotTooLarge(smallest, budget)
+
+
+async def capture_screenshot(
+    session: BrowserSession,
+    *,
+    fmt: str = "png",
+    quality: int | None = None,
+    scale: float = 1.0,
+    clip: dict[str, float] | None = None,
+    full_page: bool = False,
+    budget: int,
+) -> ScreenshotResult:
+    """Capture the viewport, full page or *clip* region within *budget* bytes.
+
+    *clip* is in document CSS pixels (see :data:`ELEMENT_RECT_JS`).
+    Raises :class:`ScreenshotTooLarge` when nothing on the ladder fits;
+    browser errors from the fallback path propagate.
+    """
+    try:
+        return await _capture_cdp(session, fmt, quality, scale, clip, full_page, budget)
+    except ScreenshotTooLarge:
+        raise
+    except Exception as e:
+        logger.debug("CDP screenshot unavailable, using page.screenshot: %s", e)
+    return await _capture_playwright(session, fmt, quality, clip, full_page, budget)
@@ -27,10 +27,11 @@ from pagemap.errors import ResourceExhaustionError
 from pagemap.template_cache import InMemoryTemplateCache
 
 from .context import RequestContext
+from .tool_lock import ToolLock
 
 if TYPE_CHECKING:
     from .browser_pool import BrowserPool
-    from .browser_session import BrowserSession
+    from .browser_session import BrowserSession, ContextMemory
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,11 @@ MAX_NAVIGATIONS = int(os.environ.get("PAGEMAP_MAX_NAVIGATIONS", "100"))
 MAX_SESSION_AGE = float(os.environ.get("PAGEMAP_MAX_SESSION_AGE", str(DEFAULT_SESSION_TTL)))
 MAX_TABS_PER_SESSION = int(os.environ.get("PAGEMAP_MAX_TABS", "5"))
 MAX_SESSIONS_PER_TENANT = int(os.environ.get("PAGEMAP_MAX_SESSIONS_PER_TENANT", "0"))  # 0 = unlimited
+# Memory high-water marks for D2 recycling (0 = check disabled)
+RECYCLE_MAX_JS_HEAP_MB = int(os.environ.get("PAGEMAP_RECYCLE_MAX_JS_HEAP_MB", "768"))
+RECYCLE_MAX_DOM_NODES = int(os.environ.get("PAGEMAP_RECYCLE_MAX_DOM_NODES", "400000"))
+RECYCLE_MAX_RENDERER_RSS_MB = int(os.environ.get("PAGEMAP_RECYCLE_MAX_RENDERER_RSS_MB", "0"))  # pool-wide
+MEMORY_SAMPLE_INTERVAL = float(os.environ.get("PAGEMAP_MEMORY_SAMPLE_INTERVAL", "15"))
 
 
 # ---------------------------------------------------------------------------
@@ -66,7 +72,7 @@ class SessionEntry:
 
     session_id: str
     cache: PageMapCache
-    tool_lock: asyncio.Lock
+    tool_lock: ToolLock
     session_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
     browser_session: BrowserSession | None = None
     created_at: float = field(default_factory=time.monotonic)
@@ -88,7 +94,7 @@ class SessionManagerProtocol(Protocol):
 
     async def get_context(self, session_id: str) -> RequestContext: ...
 
-    def get_tool_lock(self, session_id: str) -> asyncio.Lock: ...
+    def get_tool_lock(self, session_id: str) -> ToolLock: ...
 
     async def remove_session(self, session_id: str) -> None: ...
 
@@ -135,11 +141,12 @@ class StdioSessionManager:
             cache=self._state.cache,
             template_cache=self._state.template_cache,
             get_session=_srv._get_session,
+            peek_session=_srv._peek_session,
             multi_tab=self._state.multi_tab,
             get_or_create_multi_tab=self._state.get_or_create_multi_tab,
         )
 
-    def get_tool_lock(self, session_id: str = STDIO_SESSION_ID) -> asyncio.Lock:
+    def get_tool_lock(self, session_id: str = STDIO_SESSION_ID) -> ToolLock:
         """Return the single tool lock for STDIO."""
         return self._state.tool_lock
 
@@ -163,7 +170,7 @@ class StdioSessionManager:
 class HttpSessionManager:
     """Per-session state backed by BrowserPool.
 
-    Each HTTP session gets its own ``PageMapCache``, ``asyncio.Lock``,
+    Each HTTP session gets its own ``PageMapCache``, ``ToolLock``,
     and ``BrowserSession`` acquired from the shared pool.
 
     The ``InMemoryTemplateCache`` is shared across all sessions
@@ -210,12 +217,13 @@ class HttpSessionManager:
             cache=entry.cache,
             template_cache=self._template_cache,
             get_session=_get_session,
+            peek_session=lambda: entry.browser_session,
             tenant_id=tenant_id,
             multi_tab=entry.multi_tab,
             get_or_create_multi_tab=_get_or_create_multi_tab,
         )
 
-    def get_tool_lock(self, session_id: str) -> asyncio.Lock:
+    def get_tool_lock(self, session_id: str) -> ToolLock:
         """Return per-session tool lock."""
         entry = self._sessions.get(session_id)
         if entry is None:
@@ -251,6 +259,10 @@ class HttpSessionManager:
     def active_sessions(self) -> int:
         return len(self._sessions)
 
+    def has_session(self, session_id: str) -> bool:
+        """True if *session_id* already holds server state (cache, browser)."""
+        return session_id in self._sessions
+
     # ── Internal ─────────────────────────────────────────────────────
 
     def _decrement_tenant_counter(self, entry: SessionEntry) -> None:
@@ -295,9 +307,32 @@ class HttpSessionManager:
         """D3: Check if SessionEntry has exceeded its TTL."""
         return (time.monotonic() - entry.created_at) > self._session_ttl
 
-    def _check_recycle(self, entry: SessionEntry) -> str | None:
-        """D2: Return recycle reason if browser context should be refreshed, None otherwise."""
-        if entry.navigation_count >= MAX_NAVIGATIONS:
+    def _check_recycle(
+        self,
+        entry: SessionEntry,
+        memory: ContextMemory | None = None,
+        *,
+        renderer_rss_bytes: int = 0,
+    ) -> str | None:
+        """D2: Return recycle reason if browser context should be refreshed, None otherwise.
+
+        With a memory sample the JS heap / DOM node / renderer RSS high-water
+        marks decide; the navigation count is only a backstop for sessions
+        whose memory cannot be sampled.
+        """
+        if memory is not None:
+            if RECYCLE_MAX_JS_HEAP_MB > 0 and memory.js_heap_mb >= RECYCLE_MAX_JS_HEAP_MB:
+                return f"js_heap={memory.js_heap_mb:.0f}MB>={RECYCLE_MAX_JS_HEAP_MB}MB"
+            if RECYCLE_MAX_DOM_NODES > 0 and memory.dom_nodes >= RECYCLE_MAX_DOM_NODES:
+                return f"dom_nodes={memory.dom_nodes}>={RECYCLE_MAX_DOM_NODES}"
+            rss_mb = renderer_rss_bytes / (1024 * 1024)
+            if (
+                RECYCLE_MAX_RENDERER_RSS_MB > 0
+                and rss_mb >= RECYCLE_MAX_RENDERER_RSS_MB
+                and self._pool.heaviest_session() == entry.session_id
+            ):
+                return f"renderer_rss={rss_mb:.0f}MB>={RECYCLE_MAX_RENDERER_RSS_MB}MB (heaviest session)"
+        elif entry.navigation_count >= MAX_NAVIGATIONS:
             return f"nav_count={entry.navigation_count}>={MAX_NAVIGATIONS}"
         if entry.browser_acquired_at > 0:
             age = time.monotonic() - entry.browser_acquired_at
@@ -305,6 +340,17 @@ class HttpSessionManager:
                 return f"age={age:.0f}s>={MAX_SESSION_AGE:.0f}s"
         return None
 
+    async def _sample_memory(self, entry: SessionEntry) -> tuple[ContextMemory | None, int]:
+        """Memory sample of *entry* and pool-wide renderer RSS, rate-limited by the pool. Never raises."""
+        try:
+            memory = await self._pool.sample_memory(entry.session_id, max_age_s=MEMORY_SAMPLE_INTERVAL)
+            rss = 0
+            if RECYCLE_MAX_RENDERER_RSS_MB > 0:
+                rss = await self._pool.sample_renderer_rss(max_age_s=MEMORY_SAMPLE_INTERVAL)
+            return memory, rss
+        except Exception:
+            return None, 0
+
     async def _get_or_create_entry_with_tenant(self, session_id: str, tenant_id: str = "") -> SessionEntry:
         """Get existing session or create a new one (D3: TTL enforcement).
 
@@ -346,7 +392,7 @@ class HttpSessionManager:
             entry = SessionEntry(
                 session_id=session_id,
                 cache=PageMapCache(),
-                tool_lock=asyncio.Lock(),
+                tool_lock=ToolLock(),
                 tenant_id=tenant_id,
             )
             self._sessions[session_id] = entry
@@ -361,7 +407,8 @@ class HttpSessionManager:
     async def _get_session_for_entry(self, entry: SessionEntry) -> BrowserSession:
         """Get or create a BrowserSession for a session entry via the pool.
 
-        D2: transparent browser recycling on nav-count / age thresholds.
+        D2: transparent browser recycling on memory high-water marks
+        (nav-count backstop) and age, checked here between tool calls.
         D3: hard tab-quota rejection.
         """
         async with entry.session_lock:
@@ -376,7 +423,8 @@ class HttpSessionManager:
                     entry.navigation_count = 0
                 else:
                     # 2. Recycle check (D2)
-                    reason = self._check_recycle(entry)
+                    memory, renderer_rss = await self._sample_memory(entry)
+                    reason = self._check_recycle(entry, memory, renderer_rss_bytes=renderer_rss)
                     if reason is not None:
                         logger.info("Recycling browser for %s: %s", entry.session_id, reason)
                         entry.cache.invalidate_all()
@@ -385,15 +433,18 @@ class HttpSessionManager:
                         entry.browser_session = None
                         entry.navigation_count = 0
                         # Telemetry (lazy import preserves acyclic module graph)
-                        from pagemap.telemetry import emit, events
-
-                        emit(
-                            events.BROWSER_DEAD,
-                            events.browser_dead(
-                                session_id=entry.session_id,
-                                error=f"recycled ({reason})",
-                            ),
-                        )
+                        try:
+                            from pagemap.telemetry import emit, events
+
+                            emit(
+                                events.BROWSER_DEAD,
+                                events.browser_dead(
+                                    session_id=entry.session_id,
+                                    error=f"recycled ({reason})",
+                                ),
+                            )
+                        except Exception:  # nosec B110
+                            pass
                     else:
                         # 3. Tab quota check (D3)
                         if entry.browser_session.tab_count >= MAX_TABS_PER_SESSION:
@@ -0,0 +1,451 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Shared L2 page-map cache across server replicas.
+
+Per-session :class:`~pagemap.cache.PageMapCache` instances and the
+per-process template cache are not shared, so every replica behind a load
+balancer rebuilds the same public pages from zero.  This tier stores
+full-build results in a shared backend — Redis (``redis://``, the
+``redis`` extra) or a directory (``file://``, a stand-in for tests and
+single-host multi-process setups) — keyed by tenant, normalized URL and a
+SHA-256 digest of the full serialized document, so only byte-for-byte
+equivalent documents hit.
+
+Only anonymous browsing state is shared: a context holding cookies or
+web storage for the page (other than the records consent seeding writes
+itself) is neither served from nor published to this tier, so logged-in
+pages (cart, account, orders) never leave the session that built them.
+
+Entries are zlib-compressed compact JSON with a TTL and a per-entry size
+cap.  Only clean builds are shared: no barrier, no warnings, no
+diagnostics issues, no browser-side security findings.  CDP node ids are
+stripped (they belong to the browser that built the map); actions fall
+back to selector / role+name lookup.
+
+Learned templates are shared per domain, so a replica that misses the
+page map still skips template learning.
+
+Every backend operation is bounded by :data:`OP_TIMEOUT_S` and never
+raises — the shared tier is an optimization, not a dependency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, Protocol
+from urllib.parse import urlparse
+
+from pagemap import Interactable, PageMap
+from pagemap.cache import normalize_cache_url
+from pagemap.core.stats import Counter, StatsCollector
+from pagemap.template_cache import (
+    DEFAULT_TTL_SECONDS,
+    InMemoryTemplateCache,
+    PageTemplate,
+    TemplateData,
+    TemplateKey,
+)
+
+from .consent_seed import SEEDED_COOKIE_NAMES, SEEDED_STORAGE_KEYS
+
+logger = logging.getLogger(__name__)
+
+SHARED_CACHE_URL = os.environ.get("PAGEMAP_SHARED_CACHE_URL", "")  # redis://… | rediss://… | file:///dir
+SHARED_CACHE_TTL_S = int(os.environ.get("PAGEMAP_SHARED_CACHE_TTL", "600"))
+SHARED_CACHE_MAX_BYTES = int(os.environ.get("PAGEMAP_SHARED_CACHE_MAX_BYTES", "262144"))  # per entry, compressed
+OP_TIMEOUT_S = 0.25
+KEY_PREFIX = "pagemap:l2:v2:"
+_FORMAT_VERSION = 1
+
+METRIC_LOOKUPS = "pagemap_shared_cache_lookups_total"
+METRIC_WRITES = "pagemap_shared_cache_writes_total"
+METRIC_LATENCY = "pagemap_shared_cache_get_seconds"
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class SharedCacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl_s: int) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class RedisBackend:
+    """``redis.asyncio`` client; expiry is handled by Redis."""
+
+    def __init__(self, client: Any) -> None:
+        self._client = client
+
+    @classmethod
+    async def create(cls, url: str) -> RedisBackend:
+        import redis.asyncio as aioredis
+
+        client = aioredis.from_url(url)
+        await client.ping()
+        return cls(client)
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl_s: int) -> None:
+        await self._client.set(key, value, ex=ttl_s)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class FileBackend:
+    """One file per key under *root*: 8-byte expiry (unix time) + payload."""
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self._root / hashlib.sha256(key.encode()).hexdigest()
+
+    def _read(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            raw = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        (expires,) = struct.unpack(">d", raw[:8])
+        if expires < time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return raw[8:]
+
+    def _write(self, key: str, value: bytes, ttl_s: int) -> None:
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(struct.pack(">d", time.time() + ttl_s) + value)
+        os.replace(tmp, path)
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: bytes, ttl_s: int) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl_s)
+
+    async def close(self) -> None:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Keys and encoding
+# ---------------------------------------------------------------------------
+
+
+_DOCUMENT_STATE_JS = """() => {
+  const keys = (store) => { try { return Object.keys(store); } catch (e) { return []; } };
+  const doctype = document.doctype ? new XMLSerializer().serializeToString(document.doctype) : '';
+  return {
+    html: doctype + document.documentElement.outerHTML,
+    storage: keys(window.localStorage).concat(keys(window.sessionStorage)),
+  };
+}"""
+
+
+def document_digest(html: str) -> str:
+    """SHA-256 of the full serialized document."""
+    return hashlib.sha256(html.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+async def shareable_document_digest(page: Any, url: str) -> str | None:
+    """Digest of the live document when its browsing state is anonymous, else None.
+
+    Any cookie for *url* or any localStorage / sessionStorage key — except
+    the consent records seeded by this server — marks the context as
+    possibly authenticated and keeps the page out of the shared tier.
+    """
+    try:
+        cookies = await page.context.cookies([url])
+        if any(c.get("name") not in SEEDED_COOKIE_NAMES for c in cookies):
+            return None
+        state = await page.evaluate(_DOCUMENT_STATE_JS)
+    except Exception as e:
+        logger.debug("Shared cache document state failed: %s", e)
+        return None
+    if any(key not in SEEDED_STORAGE_KEYS for key in state.get("storage", ())):
+        return None
+    return document_digest(state.get("html", ""))
+
+
+def page_map_key(url: str, digest: str, scope: str = "") -> str:
+    """L2 key for *url* with document *digest*, visible only within *scope* (tenant id)."""
+    material = json.dumps([scope, normalize_cache_url(url), digest], ensure_ascii=False)
+    return f"{KEY_PREFIX}pm:{hashlib.sha256(material.encode()).hexdigest()}"
+
+
+def template_key(domain: str) -> str:
+    return f"{KEY_PREFIX}tmpl:{domain}"
+
+
+def is_shareable(page_map: PageMap) -> bool:
+    """Only clean, session-independent builds go to the shared tier."""
+    if page_map.barrier is not None or page_map.warnings:
+        return False
+    if page_map.diagnostics is not None and page_map.diagnostics.has_issues():
+        return False
+    if page_map.browser_security is not None and page_map.browser_security.has_threats:
+        return False
+    return not (page_map.metadata and page_map.metadata.get("_force_cache_evict"))
+
+
+def encode_page_map(page_map: PageMap) -> bytes:
+    """Compact encoding: interactables as positional rows, zlib-compressed. Raises TypeError."""
+    doc = {
+        "v": _FORMAT_VERSION,
+        "created": time.time(),
+        "url": page_map.url,
+        "title": page_map.title,
+        "page_type": page_map.page_type,
+        "i": [
+            [i.ref, i.role, i.name, i.affordance, i.region, i.tier, i.value, i.options, i.selector, i.name_source]
+            for i in page_map.interactables
+        ],
+        "ctx": page_map.pruned_context,
+        "tok": page_map.pruned_tokens,
+        "ms": page_map.generation_ms,
+        "img": page_map.images,
+        "meta": page_map.metadata,
+        "nav": page_map.navigation_hints,
+        "pr": sorted(page_map.pruned_regions),
+    }
+    return zlib.compress(json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode(), 6)
+
+
+def decode_page_map(blob: bytes) -> tuple[PageMap, float]:
+    """Inverse of :func:`encode_page_map` → (page_map, created unix time). Raises ValueError."""
+    doc = json.loads(zlib.decompress(blob))
+    if doc.get("v") != _FORMAT_VERSION:
+        raise ValueError(f"unsupported shared cache format {doc.get('v')!r}")
+    interactables = [
+        Interactable(
+            ref=ref,
+            role=role,
+            name=name,
+            affordance=affordance,
+            region=region,
+            tier=tier,
+            value=value,
+            options=options,
+            selector=selector,
+            name_source=name_source,
+        )
+        for ref, role, name, affordance, region, tier, value, options, selector, name_source in doc["i"]
+    ]
+    page_map = PageMap(
+        url=doc["url"],
+        title=doc["title"],
+        page_type=doc["page_type"],
+        interactables=interactables,
+        pruned_context=doc["ctx"],
+        pruned_tokens=doc["tok"],
+        generation_ms=doc["ms"],
+        images=doc["img"],
+        metadata=doc["meta"],
+        navigation_hints=doc["nav"],
+        pruned_regions=set(doc["pr"]),
+    )
+    return page_map, float(doc["created"])
+
+
+def _template_to_dict(template: PageTemplate) -> dict[str, Any]:
+    data = dataclasses.asdict(template.data)
+    data["metadata_fields_found"] = sorted(template.data.metadata_fields_found)
+    return {"data": data, "source_url": template.source_url}
+
+
+def _template_from_dict(domain: str, page_type: str, raw: dict[str, Any]) -> PageTemplate:
+    known = {f.name for f in dataclasses.fields(TemplateData)}
+    data = {k: v for k, v in raw["data"].items() if k in known}
+    data["metadata_fields_found"] = frozenset(data.get("metadata_fields_found", ()))
+    data["content_regions"] = tuple(data.get("content_regions", ()))
+    return PageTemplate(
+        data=TemplateData(**data),
+        key=TemplateKey(domain, page_type),
+        source_url=raw.get("source_url", ""),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------------
+
+
+class SharedCacheStats(StatsCollector):
+    """Lookup/write counters and get latency."""
+
+    LABELS = ("outcome",)
+    FIELDS = ("count", "get_s", "gets")
+    SEED = (("hit",), ("miss",), ("error",), ("written",), ("skipped",))
+    COUNTERS = (
+        Counter(METRIC_LOOKUPS, "Shared L2 page-map lookups", "count", only=("hit", "miss", "error")),
+        Counter(METRIC_WRITES, "Shared L2 page-map writes", "count", only=("written", "skipped")),
+    )
+
+    __slots__ = ()
+
+    def record(self, outcome: str) -> None:
+        self.add((outcome,), 1)
+
+    def record_get(self, outcome: str, seconds: float) -> None:
+        self.add((outcome,), 1, seconds, 1)
+
+    def snapshot(self) -> dict[str, float]:
+        """``{hits, misses, errors, writes, skipped, hit_rate, avg_get_ms}``."""
+        rows = self.rows()
+        counts = {outcome: row[0] for (outcome,), row in rows.items()}
+        get_s = sum(row[1] for row in rows.values())
+        get_n = sum(row[2] for row in rows.values())
+        lookups = counts["hit"] + counts["miss"]
+        return {
+            "hits": counts["hit"],
+            "misses": counts["miss"],
+            "errors": counts["error"],
+            "writes": counts["written"],
+            "skipped": counts["skipped"],
+            "hit_rate": round(counts["hit"] / lookups, 3) if lookups else 0.0,
+            "avg_get_ms": round(get_s / get_n * 1000, 2) if get_n else 0.0,
+        }
+
+    def _extra_metrics(self, rows: dict) -> Iterator[Any]:
+        from prometheus_client.core import SummaryMetricFamily
+
+        get_s = sum(row[1] for row in rows.values())
+        get_n = sum(row[2] for row in rows.values())
+        yield SummaryMetricFamily(
+            METRIC_LATENCY, "Shared L2 page-map lookup latency", count_value=get_n, sum_value=get_s
+        )
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+
+
+class SharedPageMapCache:
+    """L2 tier in front of full builds; per-session caches fall through to it."""
+
+    def __init__(
+        self,
+        backend: SharedCacheBackend,
+        *,
+        ttl_s: int = SHARED_CACHE_TTL_S,
+        max_bytes: int = SHARED_CACHE_MAX_BYTES,
+    ) -> None:
+        self._backend = backend
+        self._ttl_s = ttl_s
+        self._max_bytes = max_bytes
+        self.stats = SharedCacheStats()
+
+    async def get_page_map(self, url: str, digest: str, scope: str = "") -> tuple[PageMap, float] | None:
+        """(page_map, age seconds) built by any replica of *scope* for this document, or None."""
+        key = page_map_key(url, digest, scope)
+        t0 = time.perf_counter()
+        try:
+            blob = await asyncio.wait_for(self._backend.get(key), timeout=OP_TIMEOUT_S)
+            result = decode_page_map(blob) if blob is not None else None
+        except Exception as e:
+            logger.debug("Shared cache get failed: %s", e)
+            self.stats.record_get("error", time.perf_counter() - t0)
+            return None
+        self.stats.record_get("hit" if result else "miss", time.perf_counter() - t0)
+        if result is None:
+            return None
+        page_map, created = result
+        return page_map, max(0.0, time.time() - created)
+
+    def prepare(self, page_map: PageMap, digest: str, scope: str = "") -> tuple[str, bytes] | None:
+        """Encode *page_map* now (before callers mutate it); None when it must not be shared."""
+        key = page_map_key(page_map.url, digest, scope)
+        if not is_shareable(page_map):
+            self.stats.record("skipped")
+            return None
+        try:
+            blob = encode_page_map(page_map)
+        except (TypeError, ValueError) as e:
+            logger.debug("Shared cache encode failed: %s", e)
+            self.stats.record("skipped")
+            return None
+        if len(blob) > self._max_bytes:
+            self.stats.record("skipped")
+            return None
+        return key, blob
+
+    async def put(self, key: str, blob: bytes) -> None:
+        try:
+            await asyncio.wait_for(self._backend.set(key, blob, self._ttl_s), timeout=OP_TIMEOUT_S)
+        except Exception as e:
+            logger.debug("Shared cache put failed: %s", e)
+            self.stats.record("error")
+            return
+        self.stats.record("written")
+
+    async def pull_templates(self, domain: str, template_cache: InMemoryTemplateCache) -> int:
+        """Copy shared templates for *domain* into *template_cache* (local ones win). Returns count."""
+        if not domain or template_cache.has_domain(domain):
+            return 0
+        try:
+            blob = await asyncio.wait_for(self._backend.get(template_key(domain)), timeout=OP_TIMEOUT_S)
+            shared = json.loads(zlib.decompress(blob)) if blob is not None else {}
+            templates = [_template_from_dict(domain, page_type, raw) for page_type, raw in shared.items()]
+        except Exception as e:
+            logger.debug("Shared template pull failed: %s", e)
+            return 0
+        for template in templates:
+            template_cache.store(template)
+        return len(templates)
+
+    async def push_template(self, template: PageTemplate) -> None:
+        """Merge *template* into its domain's shared set (last writer wins per page type)."""
+        key = template_key(template.key.domain)
+        try:
+            blob = await asyncio.wait_for(self._backend.get(key), timeout=OP_TIMEOUT_S)
+            shared = json.loads(zlib.decompress(blob)) if blob is not None else {}
+            shared[template.key.page_type] = _template_to_dict(template)
+            payload = zlib.compress(json.dumps(shared, separators=(",", ":")).encode(), 6)
+            await asyncio.wait_for(self._backend.set(key, payload, int(DEFAULT_TTL_SECONDS)), timeout=OP_TIMEOUT_S)
+        except Exception as e:
+            logger.debug("Shared template push failed: %s", e)
+
+    async def close(self) -> None:
+        try:
+            await asyncio.wait_for(self._backend.close(), timeout=OP_TIMEOUT_S * 4)
+        except Exception as e:
+            logger.debug("Shared cache close failed: %s", e)
+
+
+async def create_shared_cache(url: str) -> SharedPageMapCache | None:
+    """Connect the backend for *url* (``redis://``, ``rediss://``, ``file://``). None on failure."""
+    scheme = urlparse(url).scheme
+    try:
+        if scheme in ("redis", "rediss"):
+            backend: SharedCacheBackend = await RedisBackend.create(url)
+        elif scheme == "file":
+            backend = FileBackend(Path(urlparse(url).path))
+        else:
+            logger.warning("Unsupported shared cache URL scheme: %r", scheme)
+            return None
+    except Exception as e:
+        logger.warning("Shared cache init failed, continuing without L2: %s", e)
+        return None
+    return SharedPageMapCache(backend)
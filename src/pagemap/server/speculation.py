@@ -0,0 +1,183 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Speculative background page-map prebuild after state-changing actions.
+
+After ``execute_action``, ``fill_form``, ``navigate_back`` or
+``scroll_page`` the agent nearly always calls ``get_page_map`` next, and the
+server would otherwise sit idle while the LLM thinks.  With
+``PAGEMAP_SPECULATIVE_PREBUILD=1`` those tools schedule a background build
+into the session cache once the action has settled.  The build runs under
+the session's tool lock:
+
+- a following ``get_page_map`` (current page) waits for it and becomes a
+  Tier-A cache hit — the prebuild is stored with the fingerprint it was
+  built from and only if the DOM fingerprint did not change meanwhile;
+- any other tool call cancels it before taking the lock.
+
+:class:`SpeculationStats` counts hits (prebuild served), waste (cancelled,
+stale, or stored but never served) and the build milliseconds on each side.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from pagemap.core.env import env_flag
+from pagemap.core.stats import Counter, StatsCollector
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_PREBUILD_ENABLED = env_flag("PAGEMAP_SPECULATIVE_PREBUILD")
+
+MAX_TRACKED_SESSIONS = 1024
+
+METRIC_OUTCOMES = "pagemap_speculation_total"
+METRIC_BUILD = "pagemap_speculation_build_seconds_total"
+
+_OUTCOMES = ("hit", "unused", "cancelled", "stale", "skipped", "failed")
+
+
+@dataclass(frozen=True, slots=True)
+class SpeculationResult:
+    """What a speculative build produced."""
+
+    status: str  # "ready" | "stale" | "skipped"
+    generation_id: str = ""  # cache generation of the stored page map (ready only)
+    build_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class _Speculation:
+    task: asyncio.Task  # type: ignore[type-arg]
+    started: float  # time.perf_counter()
+    result: SpeculationResult | None = None
+
+
+class SpeculationStats(StatsCollector):
+    """Outcome counters and build time per outcome."""
+
+    LABELS = ("outcome",)
+    FIELDS = ("count", "build_ms")
+    SEED = tuple((o,) for o in _OUTCOMES)
+    COUNTERS = (Counter(METRIC_OUTCOMES, "Speculative page-map prebuilds by outcome", "count"),)
+
+    __slots__ = ()
+
+    def record(self, outcome: str, build_ms: float = 0.0) -> None:
+        self.add((outcome,), 1, build_ms)
+
+    def _saved_wasted_ms(self, rows: dict) -> tuple[float, float]:
+        saved = rows[("hit",)][1]
+        return saved, sum(row[1] for row in rows.values()) - saved
+
+    def snapshot(self) -> dict[str, float]:
+        """Outcome counts plus ``hit_rate`` (of finished prebuilds), ``saved_ms`` and ``wasted_ms``."""
+        rows = self.rows()
+        snap: dict[str, float] = {outcome: row[0] for (outcome,), row in rows.items()}
+        saved, wasted = self._saved_wasted_ms(rows)
+        built = snap["hit"] + snap["unused"]
+        snap["hit_rate"] = round(snap["hit"] / built, 3) if built else 0.0
+        snap["saved_ms"] = round(saved, 1)
+        snap["wasted_ms"] = round(wasted, 1)
+        return snap
+
+    def _extra_metrics(self, rows: dict) -> Iterator[Any]:
+        from prometheus_client.core import CounterMetricFamily
+
+        saved, wasted = self._saved_wasted_ms(rows)
+        build = CounterMetricFamily(
+            METRIC_BUILD, "Speculative build time, served (saved) vs discarded (wasted)", labels=["kind"]
+        )
+        build.add_metric(["saved"], saved / 1000)
+        build.add_metric(["wasted"], wasted / 1000)
+        yield build
+
+
+class SpeculativePrebuilder:
+    """At most one speculative build per session key; cancellation and accounting."""
+
+    def __init__(self) -> None:
+        self._by_key: dict[str, _Speculation] = {}
+        self._options: OrderedDict[str, tuple[int, str | None]] = OrderedDict()
+        self.stats = SpeculationStats()
+
+    def remember(self, key: str, budget: int, task_hint: str | None) -> None:
+        """Record the budget / task hint of *key*'s latest ``get_page_map`` so prebuilds match it."""
+        self._options[key] = (budget, task_hint)
+        self._options.move_to_end(key)
+        while len(self._options) > MAX_TRACKED_SESSIONS:
+            self._options.popitem(last=False)
+
+    def options(self, key: str) -> tuple[int, str | None] | None:
+        return self._options.get(key)
+
+    def schedule(self, key: str, build: Callable[[], Coroutine[Any, Any, SpeculationResult]]) -> None:
+        """Start *build* in the background for *key*, replacing any previous speculation."""
+        self.cancel(key)
+        try:
+            task = asyncio.get_running_loop().create_task(build(), name=f"speculate:{key}")
+        except RuntimeError:
+            return  # No running event loop
+        self._by_key[key] = _Speculation(task=task, started=time.perf_counter())
+        task.add_done_callback(lambda t, key=key: self._on_done(key, t))
+
+    def _on_done(self, key: str, task: asyncio.Task) -> None:  # type: ignore[type-arg]
+        spec = self._by_key.get(key)
+        if spec is None or spec.task is not task or task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            logger.debug("Speculative prebuild failed: %s", exc)
+            self._by_key.pop(key, None)
+            self.stats.record("failed", (time.perf_counter() - spec.started) * 1000)
+            return
+        result = task.result()
+        if result.status != "ready":
+            self._by_key.pop(key, None)
+            self.stats.record(result.status, result.build_ms)
+            return
+        spec.result = result  # stored in the session cache; waits for consume() / cancel()
+
+    def cancel(self, key: str) -> None:
+        """Another tool call arrived: stop an in-flight build, or write off an unserved one."""
+        spec = self._by_key.get(key)
+        if spec is None:
+            return
+        if not spec.task.done():
+            del self._by_key[key]
+            spec.task.cancel()
+            self.stats.record("cancelled", (time.perf_counter() - spec.started) * 1000)
+            return
+        result = self._ready(key, spec)
+        if result is not None:
+            del self._by_key[key]
+            self.stats.record("unused", result.build_ms)
+
+    def consume(self, key: str, generation_id: str | None) -> bool:
+        """``get_page_map`` served cache generation *generation_id* (None → not a cache hit)."""
+        spec = self._by_key.get(key)
+        result = self._ready(key, spec) if spec is not None and spec.task.done() else None
+        if result is None:
+            return False  # nothing finished for this key (in-flight builds stay scheduled)
+        del self._by_key[key]
+        if generation_id is not None and generation_id == result.generation_id:
+            self.stats.record("hit", result.build_ms)
+            return True
+        self.stats.record("unused", result.build_ms)
+        return False
+
+    def _ready(self, key: str, spec: _Speculation) -> SpeculationResult | None:
+        """Result of a finished build, settling it now if its done-callback has not run yet."""
+        if spec.result is None:
+            self._on_done(key, spec.task)
+        return spec.result
+
+    def pending(self, key: str) -> bool:
+        return key in self._by_key
@@ -0,0 +1,96 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Per-stage page-map build latency histograms for the /metrics endpoint.
+
+Every get_page_map call feeds its PipelineTimer (coarse stages plus any
+nested spans) into :data:`stage_histograms`.  Recording is a row update
+under a lock; prometheus-client is only imported at scrape time, when the
+recorder is registered as a custom collector on the per-scrape registry.
+
+Labels: ``stage`` (e.g. ``pruning`` or ``pruning.prune_page.decompose``),
+``page_type`` and ``cache_tier`` (A = hit, B = content refresh, S = scroll delta,
+L2 = shared cache, C = full build).
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections.abc import Iterator
+from typing import Any
+
+from pagemap.core.pipeline_timer import PipelineTimer
+from pagemap.core.stats import StatsCollector, register_collector
+
+METRIC_NAME = "pagemap_stage_duration_seconds"
+STAGE_BUCKETS_S: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class StageHistograms(StatsCollector):
+    """Label-keyed histograms; rows hold per-bucket counts (last = +Inf), then sum and count."""
+
+    LABELS = ("stage", "page_type", "cache_tier")
+
+    __slots__ = ("buckets",)
+
+    def __init__(self, buckets: tuple[float, ...] = STAGE_BUCKETS_S) -> None:
+        self.buckets = buckets
+        super().__init__()
+
+    def _new_row(self) -> list[Any]:
+        return [0] * (len(self.buckets) + 1) + [0.0, 0]
+
+    def observe(self, stage: str, page_type: str, cache_tier: str, seconds: float) -> None:
+        idx = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            row = self._row((stage, page_type, cache_tier))
+            row[idx] += 1
+            row[-2] += seconds
+            row[-1] += 1
+
+    def observe_timer(self, timer: PipelineTimer, *, page_type: str, cache_tier: str) -> None:
+        """Record every completed stage and span of *timer*."""
+        for stage, ms in timer.elapsed_per_stage().items():
+            self.observe(stage, page_type, cache_tier, ms / 1000)
+        for stage, ms in timer.span_timings().items():
+            self.observe(stage, page_type, cache_tier, ms / 1000)
+
+    def snapshot(self) -> dict[tuple[str, ...], dict[str, Any]]:
+        """Return ``{(stage, page_type, tier): {buckets, sum, count}}`` with cumulative buckets."""
+        out: dict[tuple[str, ...], dict[str, Any]] = {}
+        for key, row in self.rows().items():
+            *counts, total, count = row
+            cumulative: list[tuple[str, int]] = []
+            running = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts, strict=True):
+                running += n
+                cumulative.append(("+Inf" if bound == float("inf") else repr(bound), running))
+            out[key] = {"buckets": cumulative, "sum": total, "count": count}
+        return out
+
+    def _extra_metrics(self, rows: dict) -> Iterator[Any]:
+        from prometheus_client.core import HistogramMetricFamily
+
+        family = HistogramMetricFamily(METRIC_NAME, "Page-map build stage duration", labels=list(self.LABELS))
+        for labels, data in sorted(self.snapshot().items()):
+            family.add_metric(list(labels), data["buckets"], data["sum"])
+        yield family
+
+
+stage_histograms = StageHistograms()
+register_collector("stage_histograms", lambda: stage_histograms)
@@ -0,0 +1,203 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Reader/writer scheduling for tool calls on one session.
+
+Every tool used to run under one exclusive ``asyncio.Lock`` per session, so
+a 5 ms ``get_page_state`` queued behind a 20 s page-map build and could time
+out with "Server busy".  :class:`ToolLock` keeps that exclusive mode for
+tools that touch the page or the cache (``async with lock`` /
+``acquire()`` / ``release()`` behave exactly like the lock it replaces) and
+adds a shared mode for read-only tools:
+
+- readers run concurrently with each other, never with a writer, so they
+  see a consistent page and cache snapshot;
+- waiters are served FIFO and a queued writer blocks newly arriving
+  readers, so a stream of reads cannot starve an action.
+
+:func:`hold_tool_lock` is what the tool wrappers use; it also records the
+wait time per tool and mode in :data:`tool_lock_stats`.  A plain
+``asyncio.Lock`` is accepted too (always exclusive).
+``PAGEMAP_SHARED_READ_TOOLS=0`` makes shared acquisitions exclusive again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from pagemap.core.env import env_flag
+from pagemap.core.stats import Counter, StatsCollector, register_collector
+
+SHARED_READ_TOOLS_ENABLED = env_flag("PAGEMAP_SHARED_READ_TOOLS", default=True)
+
+METRIC_WAIT = "pagemap_tool_lock_wait_seconds_total"
+METRIC_ACQUIRED = "pagemap_tool_lock_acquisitions_total"
+METRIC_ABANDONED = "pagemap_tool_lock_abandoned_total"
+
+
+class ToolLock:
+    """FIFO reader/writer lock; the default (``async with``) mode is exclusive."""
+
+    __slots__ = ("_readers", "_waiters", "_writer")
+
+    def __init__(self) -> None:
+        self._readers = 0
+        self._writer = False
+        self._waiters: deque[tuple[asyncio.Future[None], bool]] = deque()  # (future, exclusive)
+
+    # -- asyncio.Lock-compatible exclusive mode --
+
+    async def acquire(self) -> bool:
+        if not self._writer and self._readers == 0 and not self._waiters:
+            self._writer = True
+            return True
+        await self._wait(exclusive=True)
+        return True
+
+    def release(self) -> None:
+        if not self._writer:
+            raise RuntimeError("ToolLock is not held exclusively")
+        self._writer = False
+        self._wake()
+
+    def locked(self) -> bool:
+        return self._writer or self._readers > 0
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.release()
+
+    # -- shared mode --
+
+    async def acquire_shared(self) -> None:
+        if not self._writer and not self._waiters:
+            self._readers += 1
+            return
+        await self._wait(exclusive=False)
+
+    def release_shared(self) -> None:
+        if self._readers == 0:
+            raise RuntimeError("ToolLock is not held shared")
+        self._readers -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def shared(self) -> AsyncIterator[None]:
+        await self.acquire_shared()
+        try:
+            yield
+        finally:
+            self.release_shared()
+
+    @property
+    def readers(self) -> int:
+        return self._readers
+
+    # -- internals --
+
+    async def _wait(self, *, exclusive: bool) -> None:
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append((fut, exclusive))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Granted and cancelled in the same tick: hand it back
+                if exclusive:
+                    self.release()
+                else:
+                    self.release_shared()
+            else:
+                if (fut, exclusive) in self._waiters:
+                    self._waiters.remove((fut, exclusive))
+                self._wake()  # a cancelled writer may have been holding readers back
+            raise
+
+    def _wake(self) -> None:
+        """Grant the head of the queue: one writer, or every reader up to the next writer."""
+        if self._writer:
+            return
+        while self._waiters:
+            fut, exclusive = self._waiters[0]
+            if fut.done():  # cancelled; its task has not resumed yet
+                self._waiters.popleft()
+                continue
+            if exclusive:
+                if self._readers:
+                    return
+                self._waiters.popleft()
+                self._writer = True
+                fut.set_result(None)
+                return
+            self._waiters.popleft()
+            self._readers += 1
+            fut.set_result(None)
+
+
+class ToolLockStats(StatsCollector):
+    """Per-tool lock wait counters."""
+
+    LABELS = ("tool", "mode")
+    FIELDS = ("acquired", "abandoned", "wait_s", "max_s")
+    COUNTERS = (
+        Counter(METRIC_WAIT, "Time tool calls spent waiting for the session tool lock", "wait_s"),
+        Counter(METRIC_ACQUIRED, "Tool lock acquisitions", "acquired"),
+        Counter(METRIC_ABANDONED, "Tool calls that gave up waiting for the tool lock (Server busy)", "abandoned"),
+    )
+
+    __slots__ = ()
+
+    def record(self, tool: str, mode: str, wait_s: float, *, acquired: bool = True) -> None:
+        with self._lock:
+            row = self._row((tool, mode))
+            row[0 if acquired else 1] += 1
+            row[2] += wait_s
+            row[3] = max(row[3], wait_s)
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float]]]:
+        """``{tool: {mode: {acquired, abandoned, wait_ms, avg_wait_ms, max_wait_ms}}}``."""
+        snap: dict[str, dict[str, dict[str, float]]] = {}
+        for (tool, mode), (acquired, abandoned, wait_s, max_s) in sorted(self.rows().items()):
+            total = acquired + abandoned
+            snap.setdefault(tool, {})[mode] = {
+                "acquired": acquired,
+                "abandoned": abandoned,
+                "wait_ms": round(wait_s * 1000, 1),
+                "avg_wait_ms": round(wait_s * 1000 / total, 1) if total else 0.0,
+                "max_wait_ms": round(max_s * 1000, 1),
+            }
+        return snap
+
+
+tool_lock_stats = ToolLockStats()
+register_collector("tool_lock", lambda: tool_lock_stats)
+
+
+@asynccontextmanager
+async def hold_tool_lock(lock: ToolLock | asyncio.Lock, tool: str, *, shared: bool = False) -> AsyncIterator[None]:
+    """Hold *lock* for *tool* — shared for read-only tools — and record the wait."""
+    shared = shared and SHARED_READ_TOOLS_ENABLED and isinstance(lock, ToolLock)
+    mode = "shared" if shared else "exclusive"
+    t0 = time.perf_counter()
+    try:
+        if shared:
+            await lock.acquire_shared()  # type: ignore[union-attr]
+        else:
+            await lock.acquire()
+    except asyncio.CancelledError:
+        tool_lock_stats.record(tool, mode, time.perf_counter() - t0, acquired=False)
+        raise
+    tool_lock_stats.record(tool, mode, time.perf_counter() - t0)
+    try:
+        yield
+    finally:
+        if shared:
+            lock.release_shared()  # type: ignore[union-attr]
+        else:
+            lock.release()
@@ -6,6 +6,10 @@ from pagemap.server.session_manager import (  # noqa: F401
     MAX_SESSION_AGE,
     MAX_SESSIONS_PER_TENANT,
     MAX_TABS_PER_SESSION,
+    MEMORY_SAMPLE_INTERVAL,
+    RECYCLE_MAX_DOM_NODES,
+    RECYCLE_MAX_JS_HEAP_MB,
+    RECYCLE_MAX_RENDERER_RSS_MB,
     STDIO_SESSION_ID,
     HttpSessionManager,
     SessionEntry,
@@ -20,6 +24,10 @@ __all__ = [
     "MAX_SESSION_AGE",
     "MAX_SESSIONS_PER_TENANT",
     "MAX_TABS_PER_SESSION",
+    "MEMORY_SAMPLE_INTERVAL",
+    "RECYCLE_MAX_DOM_NODES",
+    "RECYCLE_MAX_JS_HEAP_MB",
+    "RECYCLE_MAX_RENDERER_RSS_MB",
     "STDIO_SESSION_ID",
     "HttpSessionManager",
     "SessionEntry",
@@ -13,6 +13,7 @@ import structlog
 
 import pagemap.server as srv
 from pagemap.context import RequestContext
+from pagemap.server.tool_lock import ToolLock
 
 
 @pytest.fixture(autouse=True)
@@ -34,7 +35,7 @@ class TestStdioMode:
     async def test_returns_request_context_and_lock(self):
         ctx, lock = await srv._acquire_context(mcp_ctx=None)
         assert isinstance(ctx, RequestContext)
-        assert isinstance(lock, asyncio.Lock)
+        assert isinstance(lock, ToolLock)
 
     async def test_uses_state_tool_lock(self):
         ctx, lock = await srv._acquire_context(mcp_ctx=None)
@@ -0,0 +1,148 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for quiescence-based post-action settling (core/action_settle.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from pagemap.core.action_settle import ActionSettler, SettleResult
+from pagemap.server import _format_fill_form_result
+from pagemap.server.action_helpers import _build_action_result
+
+
+class _FakePage:
+    """Minimal event-emitting page: DOM settles per ``dom_results`` (or quiet)."""
+
+    def __init__(self, dom_results: list | None = None) -> None:
+        self.handlers: dict[str, list] = {}
+        self.main_frame = object()
+        self._dom_results = list(dom_results or [])
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.handlers[event].remove(handler)
+
+    def emit(self, event, request):
+        for handler in list(self.handlers.get(event, [])):
+            handler(request)
+
+    async def evaluate(self, _js, args):
+        if self._dom_results:
+            result = self._dom_results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        await asyncio.sleep(args[0] / 1000)
+        return {"waited_ms": args[0], "mutations": 0, "reason": "quiet"}
+
+    async def wait_for_load_state(self, _state):
+        return None
+
+
+def _request(resource_type: str = "fetch", *, navigation: bool = False, frame=None) -> MagicMock:
+    req = MagicMock()
+    req.resource_type = resource_type
+    req.is_navigation_request = MagicMock(return_value=navigation)
+    req.frame = frame
+    return req
+
+
+class TestActionSettler:
+    async def test_quiet_page_returns_after_quiet_window(self):
+        page = _FakePage()
+        with ActionSettler(page) as settler:
+            result = await settler.settle(quiet_ms=20, max_ms=1000)
+        assert result.reason == "quiet"
+        assert result.requests == 0
+        assert result.waited_ms < 500
+
+    async def test_waits_for_action_triggered_fetch(self):
+        page = _FakePage()
+        req = _request("xhr")
+        with ActionSettler(page) as settler:
+            page.emit("request", req)
+            assert settler.pending == 1
+            asyncio.get_running_loop().call_later(0.1, page.emit, "requestfinished", req)
+            result = await settler.settle(quiet_ms=10, max_ms=2000)
+        assert result.reason == "quiet"
+        assert result.requests == 1
+        assert result.waited_ms >= 90
+
+    async def test_hung_request_hits_hard_cap(self):
+        page = _FakePage()
+        with ActionSettler(page) as settler:
+            page.emit("request", _request("fetch"))
+            result = await settler.settle(quiet_ms=10, max_ms=100)
+        assert result.reason == "timeout"
+        assert 90 <= result.waited_ms < 1000
+
+    async def test_failed_request_counts_as_done(self):
+        page = _FakePage()
+        req = _request("fetch")
+        with ActionSettler(page) as settler:
+            page.emit("request", req)
+            page.emit("requestfailed", req)
+            result = await settler.settle(quiet_ms=10, max_ms=1000)
+        assert result.reason == "quiet"
+
+    async def test_untracked_resources_ignored(self):
+        page = _FakePage()
+        with ActionSettler(page) as settler:
+            page.emit("request", _request("image"))
+            page.emit("request", _request("document", navigation=True, frame=object()))  # iframe
+            assert settler.pending == 0
+
+    async def test_main_frame_navigation_tracked(self):
+        page = _FakePage()
+        with ActionSettler(page) as settler:
+            page.emit("request", _request("document", navigation=True, frame=page.main_frame))
+            assert settler.pending == 1
+
+    async def test_dom_timeout_reported(self):
+        page = _FakePage([{"waited_ms": 50, "mutations": 7, "reason": "timeout"}])
+        with ActionSettler(page) as settler:
+            result = await settler.settle(quiet_ms=10, max_ms=50)
+        assert result.reason == "timeout"
+        assert result.mutations == 7
+
+    async def test_navigation_commit_retried_then_quiet(self):
+        page = _FakePage([RuntimeError("Execution context was destroyed")])
+        with ActionSettler(page) as settler:
+            result = await settler.settle(quiet_ms=10, max_ms=1000)
+        assert result.reason == "quiet"
+
+    async def test_dead_page_never_raises(self):
+        page = _FakePage([RuntimeError("Target closed"), RuntimeError("Target closed")])
+        with ActionSettler(page) as settler:
+            result = await settler.settle(quiet_ms=10, max_ms=1000)
+        assert result.reason == "error"
+
+    async def test_listeners_detached_after_settle(self):
+        page = _FakePage()
+        with ActionSettler(page) as settler:
+            await settler.settle(quiet_ms=5, max_ms=100)
+            assert all(not handlers for handlers in page.handlers.values())
+
+
+class TestSettleReporting:
+    def test_action_result_includes_settle_ms(self):
+        data = json.loads(_build_action_result("Clicked", "https://x.test", "none", False, settle_ms=240))
+        assert data["settle_ms"] == 240
+
+    def test_action_result_omits_zero_settle(self):
+        data = json.loads(_build_action_result("Typed", "https://x.test", "none", False, settle_ms=0))
+        assert "settle_ms" not in data
+
+    def test_fill_form_header_reports_total_settle(self):
+        text = _format_fill_form_result(["[1] textbox: typed"], 1, 1, settle_ms=320)
+        assert text.splitlines()[0] == "fill_form: 1/1 fields completed. Settle: 320ms."
+
+    def test_settle_result_defaults(self):
+        result = SettleResult(waited_ms=0, reason="quiet")
+        assert (result.mutations, result.requests) == (0, 0)
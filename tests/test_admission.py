@@ -0,0 +1,165 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for HTTP admission control and load shedding (server/admission.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from pagemap.errors import OverloadedError
+from pagemap.server.admission import (
+    NEW,
+    SESSION,
+    AdmissionController,
+    AdmissionMiddleware,
+    LoadMonitor,
+    LoadSample,
+)
+
+
+def _controller(sample: LoadSample | None = None, **kwargs) -> AdmissionController:
+    monitor = LoadMonitor()
+    monitor.sample = sample or LoadSample()
+    kwargs.setdefault("max_inflight", 1)
+    kwargs.setdefault("queue_size", 4)
+    kwargs.setdefault("queue_timeout_s", 1.0)
+    return AdmissionController(monitor, **kwargs)
+
+
+class TestLoadSample:
+    def test_pool_only_counts_for_new_sessions(self):
+        sample = LoadSample(pool_utilization=1.0)
+        assert sample.pressure() == 0.0
+        assert sample.pressure(new_session=True) == 1.0
+
+    def test_highest_signal_wins(self):
+        sample = LoadSample(loop_lag_ms=125.0, cpu=0.45)
+        assert sample.pressure() == pytest.approx(0.5)
+
+
+class TestLoadMonitor:
+    async def test_worker_thread_cpu_not_counted(self):
+        def burn(seconds: float) -> None:
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                pass
+
+        monitor = LoadMonitor(interval_s=0.05)
+        monitor.start()
+        try:
+            await asyncio.gather(*(asyncio.to_thread(burn, 0.4) for _ in range(2)))
+        finally:
+            await monitor.stop()
+        assert monitor.sample.cpu < 0.5
+        assert monitor.sample.pressure() < 1.0
+
+
+class TestAdmissionController:
+    async def test_admit_and_release(self):
+        controller = _controller()
+        await controller.admit(SESSION)
+        assert controller.inflight == 1
+        controller.release(0.2)
+        assert controller.inflight == 0
+        assert controller.stats.snapshot()[SESSION]["admitted"] == 1
+
+    async def test_new_sessions_shed_first(self):
+        controller = _controller(LoadSample(cpu=0.81), max_inflight=4)
+        with pytest.raises(OverloadedError) as exc:
+            await controller.admit(NEW)
+        assert exc.value.reason == "pressure"
+        assert exc.value.retry_after >= 1
+        await controller.admit(SESSION)  # known sessions still served at 90% of the CPU limit
+        assert controller.inflight == 1
+
+    async def test_capacity_shrinks_with_pressure(self):
+        controller = _controller(max_inflight=10)
+        assert controller.capacity(0.3) == 10
+        assert controller.capacity(0.75) == 5
+        assert controller.capacity(0.99) == 1
+
+    async def test_queued_session_requests_go_first(self):
+        controller = _controller()
+        await controller.admit(SESSION)
+        order: list[str] = []
+
+        async def wait(priority: str) -> None:
+            await controller.admit(priority)
+            order.append(priority)
+            controller.release(0.0)
+
+        tasks = [asyncio.create_task(wait(NEW))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(wait(SESSION)))
+        await asyncio.sleep(0)
+        assert controller.queued == 2
+        controller.release(0.0)
+        await asyncio.gather(*tasks)
+        assert order == [SESSION, NEW]
+        assert controller.stats.snapshot()[NEW]["queued"] == 1
+
+    async def test_full_queue_sheds_immediately(self):
+        controller = _controller(queue_size=2)
+        await controller.admit(SESSION)
+        waiter = asyncio.create_task(controller.admit(NEW))
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError) as exc:
+            await controller.admit(NEW)  # new sessions get half of the queue
+        assert exc.value.reason == "queue_full"
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert controller.queued == 0
+
+    async def test_queue_deadline(self):
+        controller = _controller(queue_timeout_s=0.01)
+        await controller.admit(SESSION)
+        with pytest.raises(OverloadedError) as exc:
+            await controller.admit(SESSION)
+        assert exc.value.reason == "deadline"
+        assert controller.queued == 0
+        assert controller.inflight == 1
+
+
+class TestAdmissionMiddleware:
+    async def _call(self, middleware: AdmissionMiddleware, *, method: str = "POST", path: str = "/mcp", sid=None):
+        sent: list[dict] = []
+        headers = [(b"mcp-session-id", sid.encode())] if sid else []
+        scope = {"type": "http", "method": method, "path": path, "headers": headers}
+
+        async def send(message: dict) -> None:
+            sent.append(message)
+
+        await middleware(scope, None, send)
+        return sent
+
+    @staticmethod
+    async def _app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def test_overloaded_response(self):
+        middleware = AdmissionMiddleware(self._app, _controller(LoadSample(loop_lag_ms=1000.0)))
+        sent = await self._call(middleware)
+        assert sent[0]["status"] == 503
+        headers = dict(sent[0]["headers"])
+        assert int(headers[b"retry-after"]) >= 1
+        body = json.loads(sent[1]["body"])
+        assert body["error"] == "overloaded"
+        assert body["retryable"] is True
+
+    async def test_known_session_prioritized(self):
+        controller = _controller(LoadSample(pool_utilization=1.0))
+        middleware = AdmissionMiddleware(self._app, controller, is_known_session=lambda sid: sid == "abc")
+        assert (await self._call(middleware, sid="abc"))[0]["status"] == 200
+        assert (await self._call(middleware, sid="zzz"))[0]["status"] == 503
+        assert controller.inflight == 0
+
+    async def test_probes_and_streams_not_gated(self):
+        middleware = AdmissionMiddleware(self._app, _controller(LoadSample(loop_lag_ms=1000.0)))
+        assert (await self._call(middleware, method="GET", path="/readyz"))[0]["status"] == 200
+        assert (await self._call(middleware, method="GET"))[0]["status"] == 200
@@ -9,6 +9,7 @@ cookie policy, and safety guards.
 
 from __future__ import annotations
 
+import sys
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -17,7 +18,9 @@ from pagemap import Interactable  # noqa: F401
 from pagemap.core.ecommerce import BarrierResult, BarrierType
 from pagemap.server.barrier_dismisser import (
     _AUTO_DISMISS_TYPES,
+    DISMISS_QUIET_MS,
     AutoDismissResult,
+    _wait_for_dom_stability,
     try_auto_dismiss,
 )
 
@@ -205,6 +208,53 @@ class TestButtonClickDismiss:
         assert result.error == "click dismiss failed"
 
 
+class TestDomStability:
+    @pytest.mark.asyncio
+    async def test_single_session_settle(self, mock_session):
+        mock_session.wait_for_dom_settle = AsyncMock(return_value={"waited_ms": 160, "mutations": 4, "reason": "quiet"})
+        result = await _wait_for_dom_stability(mock_session, max_wait=2.0)
+        mock_session.wait_for_dom_settle.assert_awaited_once_with(quiet_ms=DISMISS_QUIET_MS, max_ms=2000)
+        assert result["reason"] == "quiet"
+        assert result["mutations"] == 4
+
+    @pytest.mark.asyncio
+    async def test_custom_quiet_window(self, mock_session):
+        mock_session.wait_for_dom_settle = AsyncMock(return_value={"waited_ms": 50, "mutations": 0, "reason": "quiet"})
+        await _wait_for_dom_stability(mock_session, max_wait=1.0, quiet_ms=50)
+        mock_session.wait_for_dom_settle.assert_awaited_once_with(quiet_ms=50, max_ms=1000)
+
+    @pytest.mark.asyncio
+    async def test_settle_failure_does_not_sleep(self, mock_session):
+        mock_session.wait_for_dom_settle = AsyncMock(return_value=None)  # evaluate failed inside the session
+        result = await _wait_for_dom_stability(mock_session, max_wait=3.0)
+        assert result["reason"] == "error"
+        assert result["waited_ms"] < 100
+
+    @pytest.mark.asyncio
+    async def test_stability_reported_in_result_and_telemetry(self, mock_session, popup_barrier, make_interactable):
+        interactables = [make_interactable(ref=2, role="button", name="Close")]
+        page_map = _make_page_map(popup_barrier, interactables)
+        settled = {"waited_ms": 180, "mutations": 3, "reason": "quiet"}
+        telemetry = MagicMock()  # telemetry is an optional add-on package
+
+        with (
+            patch("pagemap.server.barrier_dismisser._execute_click_dismiss", new_callable=AsyncMock, return_value=True),
+            patch(
+                "pagemap.server.barrier_dismisser._wait_for_dom_stability", new_callable=AsyncMock, return_value=settled
+            ),
+            patch.dict(sys.modules, {"pagemap.telemetry": telemetry}),
+        ):
+            result = await try_auto_dismiss(mock_session, page_map, interactables, "reject")
+
+        assert result.stability_ms == 180
+        assert result.elapsed_ms >= 0
+        event, payload = telemetry.emit.call_args[0]
+        assert event == "barrier_auto_dismissed"
+        assert payload["stability_ms"] == 180
+        assert payload["stability_reason"] == "quiet"
+        assert "elapsed_ms" in payload
+
+
 class TestSafetyGuards:
     @pytest.mark.asyncio
     async def test_login_barrier_skipped(self, mock_session, login_barrier):
@@ -142,6 +142,8 @@ class TestCacheStoreInLruOnly:
 class TestBrowserSessionBatch:
     async def test_create_and_close_batch_page(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._host = None
+        session._delegates = {}
         session._batch_pages = set()
 
         mock_page = MagicMock()
@@ -162,6 +164,8 @@ class TestBrowserSessionBatch:
 
     async def test_on_new_page_skips_batch_pages(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._host = None
+        session._delegates = {}
         session._pending_new_page = None
         session._batch_pages = set()
 
@@ -0,0 +1,156 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the cross-page boilerplate index (core/pruning/boilerplate.py)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import lxml.html
+
+from pagemap.core.pruning.boilerplate import MIN_PAGES, BoilerplateIndex
+from pagemap.core.pruning.pipeline import prune_page
+
+_SITE = "example.com"
+_HEADER = (
+    '<header class="site-header"><nav><a href="/">Home</a> <a href="/shop">Shop all products</a>'
+    ' <a href="/help">Help center</a> <span class="cart">Cart (2)</span></nav></header>'
+)
+_FOOTER = '<div class="footer-links"><a href="/terms">Terms of service</a> <a href="/privacy">Privacy</a></div>'
+
+
+def _page(n: int, *, header: str = _HEADER, cart: int = 2) -> str:
+    body = (
+        f"<main><h1>Product number {n}</h1><p>{'Handmade ceramic mug with a glazed finish. ' * 6}</p>"
+        f"<p>Price: ${n}9.00</p></main>"
+    )
+    return f"<html><body>{header.replace('(2)', f'({cart})')}{body}{_FOOTER}</body></html>"
+
+
+def _url(n: int, site: str = _SITE) -> str:
+    return f"https://www.{site}/products/{n}"
+
+
+def _apply(index: BoilerplateIndex, html: str, url: str = _url(99)):
+    doc = lxml.html.fromstring(html)
+    return index.apply(url, doc), doc
+
+
+def _learn(index: BoilerplateIndex, site: str = _SITE) -> None:
+    for n in range(MIN_PAGES):
+        assert _apply(index, _page(n), _url(n, site))[0] is None
+
+
+class TestBoilerplateIndex:
+    def test_drops_chrome_after_min_pages(self):
+        index = BoilerplateIndex()
+        _learn(index)
+        assert index.known_blocks(_SITE) == 2
+        report, doc = _apply(index, _page(99, cart=5))  # digits are folded
+        assert report.blocks == 2 and report.nodes > 5 and report.tokens_saved > 0
+        assert doc.find(".//header") is None
+        assert "Terms of service" not in doc.text_content()
+        assert "Product number 99" in doc.text_content()
+
+    def test_same_page_counts_once(self):
+        index = BoilerplateIndex()
+        for _ in range(MIN_PAGES + 1):
+            assert _apply(index, _page(1), _url(1))[0] is None
+        assert index.known_blocks(_SITE) == 0
+
+    def test_rebuilds_of_one_url_count_once(self):
+        index = BoilerplateIndex()
+        for n in range(MIN_PAGES + 2):  # nonce, cart count and content differ per build
+            html = _page(n, cart=n).replace("</body>", f'<input type="hidden" value="csrf-{n}a"></body>')
+            assert _apply(index, html, _url(1) + f"#tab{n}")[0] is None
+        assert index.known_blocks(_SITE) == 0
+
+    def test_changed_chrome_text_is_kept(self):
+        index = BoilerplateIndex()
+        _learn(index)
+        report, doc = _apply(index, _page(5, header=_HEADER.replace("Help center", "Order status")))
+        assert report.blocks == 1  # footer only
+        assert doc.find(".//header") is not None
+
+    def test_main_content_never_a_candidate(self):
+        index = BoilerplateIndex()
+        wrapper = (
+            '<div class="page-header"><main><h1>Same</h1><p>Shared text on every page of the site</p></main></div>'
+        )
+        for n in range(MIN_PAGES + 1):
+            doc = lxml.html.fromstring(f"<html><body>{wrapper}<p>{n}</p></body></html>")
+            assert index.apply(_url(n), doc) is None
+        assert index.known_blocks(_SITE) == 0
+
+    def test_mostly_chrome_page_left_whole(self):
+        index = BoilerplateIndex()
+        _learn(index)
+        html = f"<html><body>{_HEADER}<p>Not found</p>{_FOOTER}</body></html>"
+        report, doc = _apply(index, html)
+        assert report is None
+        assert doc.find(".//header") is not None
+
+    def test_sites_are_separate_and_hostless_skipped(self):
+        index = BoilerplateIndex()
+        _learn(index)
+        assert index.known_blocks("other.com") == 0
+        for n in range(MIN_PAGES + 1):
+            assert _apply(index, _page(n), f"about:blank#{n}")[0] is None
+        assert len(index) == 1
+
+    def test_keyed_by_registrable_domain(self):
+        index = BoilerplateIndex()
+        _learn(index, "shop-a.co.kr")
+        assert index.known_blocks("shop-a.co.kr") == 2
+        assert index.known_blocks("shop-b.co.kr") == 0
+        assert index.known_blocks("co.kr") == 0
+        report, _doc = _apply(index, _page(9), "https://m.shop-a.co.kr/item/9")  # subdomains share chrome
+        assert report is not None and report.blocks == 2
+        assert _apply(index, _page(9), _url(9, "shop-b.co.kr"))[0] is None
+
+    def test_persisted_round_trip(self, tmp_path):
+        path = tmp_path / "boilerplate.json"
+        index = BoilerplateIndex(path)
+        _learn(index)
+        index.save()
+        assert BoilerplateIndex(path).known_blocks(_SITE) == 2
+
+    def test_corrupt_file_ignored(self, tmp_path):
+        path = tmp_path / "boilerplate.json"
+        path.write_text("{not json")
+        assert len(BoilerplateIndex(path)) == 0
+
+
+class TestPrunePage:
+    def test_report_and_stats(self):
+        index = BoilerplateIndex()
+        with (
+            patch("pagemap.core.pruning.pipeline.BOILERPLATE_INDEX_ENABLED", True),
+            patch("pagemap.core.pruning.pipeline.boilerplate_index", index),
+        ):
+            for n in range(MIN_PAGES):
+                assert prune_page(_page(n), "example", f"p{n}", "Product", page_url=_url(n)).boilerplate is None
+            result = prune_page(_page(7), "example", "p7", "Product", page_url=_url(7))
+        assert result.boilerplate.blocks == 2
+        assert result.boilerplate.cpu_saved_ms >= 0
+        assert "Product number 7" in result.pruned_html
+        snap = index.stats.snapshot()
+        assert (snap["pages"], snap["pages_dropped"], snap["blocks"]) == (MIN_PAGES + 1, 1, 2)
+        assert snap["tokens_saved"] == result.boilerplate.tokens_saved
+
+    def test_record_deferred_to_caller(self):
+        index = BoilerplateIndex()
+        with (
+            patch("pagemap.core.pruning.pipeline.BOILERPLATE_INDEX_ENABLED", True),
+            patch("pagemap.core.pruning.pipeline.boilerplate_index", index),
+        ):
+            result = prune_page(_page(1), "example", "p1", "Product", page_url=_url(1), record_boilerplate=False)
+        assert index.stats.snapshot()["pages"] == 0
+        index.record(_url(1), result.boilerplate)
+        index.record("about:blank", None)  # hostless pages are not counted
+        assert index.stats.snapshot()["pages"] == 1
+
+    def test_disabled_by_default(self):
+        for n in range(MIN_PAGES + 1):
+            assert prune_page(_page(n), _SITE, f"p{n}", "Product").boilerplate is None
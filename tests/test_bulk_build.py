@@ -0,0 +1,216 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the parallel, resumable bulk offline build (core/bulk_build.py)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import pytest
+
+from pagemap.core import bulk_build
+from pagemap.core.bulk_build import (
+    MANIFEST_NAME,
+    REPORT_NAME,
+    _percentile,
+    discover_inputs,
+    load_manifest,
+    run_bulk_build,
+)
+
+_PAGE = "<html><head><title>{title}</title></head><body><main><h1>{title}</h1><p>{body}</p></main></body></html>"
+
+
+def _write_corpus(root: Path) -> None:
+    for site in ("shop", "news"):
+        for i in range(2):
+            page_dir = root / site / f"page_{i:03d}"
+            page_dir.mkdir(parents=True)
+            (page_dir / "raw.html").write_text(
+                _PAGE.format(title=f"{site} {i}", body="Body text long enough to be kept by the pruner. " * 3),
+                encoding="utf-8",
+            )
+            (page_dir / "snapshot.json").write_text(
+                json.dumps({"url": f"https://{site}.example.com/{i}", "site_id": site, "page_id": f"p{i}"}),
+                encoding="utf-8",
+            )
+    loose = root / "loose"
+    loose.mkdir()
+    (loose / "article.html").write_text(_PAGE.format(title="Loose", body="Loose page body " * 5), encoding="utf-8")
+
+
+def _fake_build(item):
+    if "bad" in item.key:
+        return {"key": item.key, "ok": False, "elapsed_ms": 1.0, "error": "ValueError: boom"}
+    return {"key": item.key, "ok": True, "elapsed_ms": 2.0, "page_map": {"url": item.url}}
+
+
+def _read_shards(out: Path) -> list[dict]:
+    records = []
+    for shard in sorted(out.glob("pagemaps-*.ndjson")):
+        records.extend(json.loads(line) for line in shard.read_text(encoding="utf-8").splitlines())
+    return records
+
+
+class TestDiscoverInputs:
+    def test_snapshot_and_loose_pages(self, tmp_path):
+        _write_corpus(tmp_path)
+        inputs = discover_inputs(tmp_path)
+        keys = [i.key for i in inputs]
+        assert keys == sorted(keys)
+        assert "shop/page_000" in keys
+        assert "loose/article.html" in keys
+        assert len(inputs) == 5
+
+    def test_snapshot_metadata_used(self, tmp_path):
+        _write_corpus(tmp_path)
+        item = next(i for i in discover_inputs(tmp_path) if i.key == "news/page_001")
+        assert item.url == "https://news.example.com/1"
+        assert item.site_id == "news"
+        assert item.page_id == "p1"
+
+    def test_loose_file_defaults(self, tmp_path):
+        (tmp_path / "top.html").write_text("<p>x</p>", encoding="utf-8")
+        (item,) = discover_inputs(tmp_path)
+        assert item.site_id == "offline"
+        assert item.page_id == "top"
+        assert item.url.startswith("file://")
+
+
+class TestRunBulkBuild:
+    @pytest.fixture(autouse=True)
+    def _fake(self, monkeypatch):
+        monkeypatch.setattr(bulk_build, "build_one", _fake_build)
+
+    def test_streams_sharded_ndjson(self, tmp_path):
+        _write_corpus(tmp_path / "in")
+        out = tmp_path / "out"
+        report = run_bulk_build(tmp_path / "in", out, shard_size=2)
+        assert report.built == 5
+        assert report.shards == ["pagemaps-00000.ndjson", "pagemaps-00001.ndjson", "pagemaps-00002.ndjson"]
+        records = _read_shards(out)
+        assert len(records) == 5
+        assert {r["key"] for r in records} == {i.key for i in discover_inputs(tmp_path / "in")}
+
+    def test_manifest_and_report_written(self, tmp_path):
+        _write_corpus(tmp_path / "in")
+        out = tmp_path / "out"
+        run_bulk_build(tmp_path / "in", out)
+        manifest = load_manifest(out)
+        assert len(manifest) == 5
+        assert all(e["status"] == "ok" for e in manifest.values())
+        report = json.loads((out / REPORT_NAME).read_text(encoding="utf-8"))
+        assert report["built"] == 5
+        assert report["p50_ms"] == 2.0
+
+    def test_resume_skips_completed(self, tmp_path):
+        _write_corpus(tmp_path / "in")
+        out = tmp_path / "out"
+        items = discover_inputs(tmp_path / "in")
+        run_bulk_build(tmp_path / "in", out, inputs=items[:2])
+        report = run_bulk_build(tmp_path / "in", out)
+        assert report.skipped == 2
+        assert report.built == 3
+        # Resumed run opens a fresh shard instead of appending
+        assert report.shards == ["pagemaps-00001.ndjson"]
+        assert len(_read_shards(out)) == 5
+
+    def test_no_resume_starts_over(self, tmp_path):
+        _write_corpus(tmp_path / "in")
+        out = tmp_path / "out"
+        run_bulk_build(tmp_path / "in", out)
+        report = run_bulk_build(tmp_path / "in", out, resume=False)
+        assert report.skipped == 0
+        assert report.built == 5
+        assert len(_read_shards(out)) == 5
+
+    def test_failures_recorded_and_retried(self, tmp_path):
+        (tmp_path / "in").mkdir()
+        (tmp_path / "in" / "bad.html").write_text("<p>x</p>", encoding="utf-8")
+        (tmp_path / "in" / "good.html").write_text("<p>x</p>", encoding="utf-8")
+        out = tmp_path / "out"
+        report = run_bulk_build(tmp_path / "in", out)
+        assert report.failed == 1
+        assert report.failures == [{"key": "bad.html", "error": "ValueError: boom"}]
+        # Failed pages are not checkpointed as done → retried on resume
+        again = run_bulk_build(tmp_path / "in", out)
+        assert again.skipped == 1
+        assert again.failed == 1
+
+    def test_torn_manifest_line_ignored(self, tmp_path):
+        out = tmp_path / "out"
+        out.mkdir()
+        (out / MANIFEST_NAME).write_text('{"key": "a", "status": "ok"}\n{"key": "b", "sta', encoding="utf-8")
+        assert list(load_manifest(out)) == ["a"]
+
+
+class TestPercentile:
+    def test_empty(self):
+        assert _percentile([], 50) == 0.0
+
+    def test_nearest_rank(self):
+        values = [float(v) for v in range(1, 101)]
+        assert _percentile(values, 50) == 50.0
+        assert _percentile(values, 99) == 99.0
+        assert _percentile(values, 100) == 100.0
+
+
+class TestBuildOne:
+    def test_real_offline_build(self, tmp_path):
+        _write_corpus(tmp_path)
+        item = next(i for i in discover_inputs(tmp_path) if i.key == "shop/page_000")
+        record = bulk_build.build_one(item)
+        assert record["ok"], record.get("error")
+        assert record["page_map"]["url"] == "https://shop.example.com/0"
+
+    def test_missing_file_returns_error(self, tmp_path):
+        item = bulk_build.BulkInput(key="x", html_path=str(tmp_path / "nope.html"), site_id="s", page_id="p", url="u")
+        record = bulk_build.build_one(item)
+        assert record["ok"] is False
+        assert "FileNotFoundError" in record["error"]
+
+
+class TestCliBulk:
+    def test_bulk_rejects_format(self, tmp_path, capsys):
+        from pagemap.cli import cmd_build
+
+        args = argparse.Namespace(
+            url=None,
+            snapshots=False,
+            snapshot_dir=None,
+            output=None,
+            format="json",
+            bulk=str(tmp_path),
+            workers=1,
+            shard_size=10,
+            no_resume=False,
+        )
+        with pytest.raises(SystemExit) as exc_info:
+            cmd_build(args)
+        assert exc_info.value.code == 1
+        assert "--bulk" in capsys.readouterr().err
+
+    def test_bulk_prints_report(self, tmp_path, capsys, monkeypatch):
+        from pagemap.cli import cmd_build
+
+        monkeypatch.setattr(bulk_build, "build_one", _fake_build)
+        _write_corpus(tmp_path / "in")
+        args = argparse.Namespace(
+            url=None,
+            snapshots=False,
+            snapshot_dir=None,
+            output=str(tmp_path / "out"),
+            format=None,
+            bulk=str(tmp_path / "in"),
+            workers=1,
+            shard_size=10,
+            no_resume=False,
+        )
+        cmd_build(args)
+        out = capsys.readouterr().out
+        assert "5 built" in out
+        assert "pages/s" in out
+        assert (tmp_path / "out" / MANIFEST_NAME).exists()
@@ -0,0 +1,149 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Integer document-order / ancestry indices on HtmlChunk.
+
+Covers:
+  - node_id / parent_id / branch_id assignment during decomposition
+  - remerge_chunks() ordering by node_id (xpath fallback for unindexed chunks)
+  - boost_adjacent_chunks() / sibling grouping by parent_id
+  - Coupang price-container check by branch_id
+  - micro-benchmark: 10K+ chunk pages
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+
+import pytest
+
+from pagemap.pruning import ChunkType, HtmlChunk, PruneReason
+from pagemap.pruning.compressor import _xpath_sort_key, remerge_chunks
+from pagemap.pruning.pruner import PruneDecision, boost_adjacent_chunks, prune_chunks
+from tests._pruning_helpers import decompose_body, html, make_chunk
+
+
+class TestIndexAssignment:
+    def test_node_ids_follow_document_order(self):
+        chunks = decompose_body(html("<h1>Title</h1><p>First paragraph</p><div><p>Nested paragraph here</p></div>"))
+        ids = [c.node_id for c in chunks]
+        assert all(i >= 0 for i in ids)
+        assert ids == sorted(ids)
+
+    def test_depth_matches_xpath(self):
+        chunks = decompose_body(html("<div><section><p>Deep text</p></section></div>"))
+        (chunk,) = chunks
+        assert chunk.depth == chunk.xpath.count("/") - 1
+
+    def test_siblings_share_parent_id(self):
+        chunks = decompose_body(
+            html("<div><h2>A heading</h2><ul><li>one</li></ul></div><div><h2>Other heading</h2></div>"),
+        )
+        first, second, third = chunks
+        assert first.parent_id == second.parent_id
+        assert third.parent_id != first.parent_id
+        assert first.parent_id < first.node_id
+
+    def test_branch_id_is_top_level_body_child(self):
+        chunks = decompose_body(
+            html("<div><div><p>Price 10,000</p></div><p>Another price 20,000</p></div><div><p>Far away</p></div>"),
+        )
+        a, b, c = chunks
+        assert a.branch_id == b.branch_id
+        assert c.branch_id != a.branch_id
+
+    def test_meta_chunks_unindexed(self):
+        chunk = HtmlChunk(xpath="/og-meta", html="", text="og:title=x", tag="meta", chunk_type=ChunkType.META)
+        assert chunk.node_id == -1
+        assert chunk.parent_key == ""
+
+
+class TestRemergeOrder:
+    def test_document_order_not_tag_order(self):
+        """<p> before <div> in the DOM stays first (xpath parsing sorted 'div' < 'p')."""
+        chunks = decompose_body(html("<p>Intro paragraph</p><div>Trailing block</div>"))
+        merged = remerge_chunks(list(reversed(chunks)))
+        assert merged.index("Intro paragraph") < merged.index("Trailing block")
+
+    def test_unindexed_chunks_use_xpath_order(self):
+        a = make_chunk("second", xpath="/html/body/div[10]")
+        b = make_chunk("first", xpath="/html/body/div[2]")
+        merged = remerge_chunks([a, b], enable_block_tree=False)
+        assert merged.index("first") < merged.index("second")
+
+    def test_groups_by_parent_id(self):
+        chunks = decompose_body(html("<main><p>Alpha text</p><p>Beta text</p></main>"))
+        assert len({c.parent_id for c in chunks}) == 1
+        merged = remerge_chunks(chunks)
+        assert 'data-section="body/main"' in merged
+
+
+class TestPrunerIndices:
+    def test_boost_requires_same_parent_id(self):
+        near = make_chunk("neighbour text here", in_main=False)
+        src = replace(make_chunk("Price 10,000원", in_main=False), node_id=5, parent_id=4)
+        same = replace(near, node_id=6, parent_id=4)
+        other = replace(near, node_id=9, parent_id=8)
+        results = [
+            (src, PruneDecision(keep=True, reason=PruneReason.SCHEMA_MATCH, score=0.9)),
+            (same, PruneDecision(keep=False, reason=PruneReason.NO_MATCH, score=0.35)),
+            (other, PruneDecision(keep=False, reason=PruneReason.NO_MATCH, score=0.35)),
+        ]
+        # other is at distance 2 but parents differ
+        assert boost_adjacent_chunks(results) == 1
+        assert results[1][1].keep is True
+        assert results[2][1].keep is False
+
+    def test_price_container_uses_branch_id(self):
+        body = "<div>" + "".join(f"<h3>Option {i} price {i},000원</h3>" for i in range(1, 12)) + "</div>"
+        body += "<div><h3>Recommended price 9,000원</h3></div>"
+        chunks = decompose_body(html(body))
+        results = prune_chunks(chunks, "Product", has_main=False)
+        reasons = [d.reason for _c, d in results]
+        assert reasons[-1] == PruneReason.COUPANG_REC_FILTER
+        assert PruneReason.COUPANG_REC_FILTER not in reasons[:-1]
+
+
+@pytest.mark.slow
+class TestLargePageBenchmark:
+    """Micro-benchmark: integer indices keep 10K+ chunk pages fast."""
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def big_chunks(cls) -> list[HtmlChunk]:
+        sections = "".join(
+            f"<div><h2>Section {i}</h2>"
+            + "".join(f"<p>Row {i}-{j} price {j},000원 in stock</p>" for j in range(20))
+            + "</div>"
+            for i in range(600)
+        )
+        from pagemap.pruning.preprocessor import _decompose_element
+        from tests._pruning_helpers import parse_doc
+
+        doc, tree = parse_doc(html(sections))
+        return _decompose_element(doc.body, tree, enable_sibling_grouping=False)
+
+    def test_chunk_count(self, big_chunks):
+        assert len(big_chunks) >= 10_000
+
+    def test_prune_and_remerge_speed(self, big_chunks):
+        start = time.perf_counter()
+        results = prune_chunks(big_chunks, "Product", has_main=False)
+        boost_adjacent_chunks(results)
+        remerge_chunks([c for c, d in results if d.keep])
+        elapsed = time.perf_counter() - start
+        print(f"\nprune+boost+remerge: {len(big_chunks)} chunks in {elapsed * 1000:.0f}ms")
+        assert elapsed < 10.0
+
+    def test_integer_order_faster_than_xpath_parse(self, big_chunks):
+        shuffled = list(reversed(big_chunks))
+        t0 = time.perf_counter()
+        sorted(shuffled, key=lambda c: _xpath_sort_key(c.xpath))
+        xpath_s = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        by_id = sorted(shuffled, key=lambda c: c.node_id)
+        int_s = time.perf_counter() - t0
+        print(f"\nsort {len(shuffled)} chunks: xpath={xpath_s * 1000:.1f}ms int={int_s * 1000:.1f}ms")
+        assert by_id == big_chunks
+        assert int_s < xpath_s
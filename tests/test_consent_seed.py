@@ -0,0 +1,165 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for pre-emptive CMP consent seeding (server/consent_seed.py)."""
+
+from __future__ import annotations
+
+import base64
+import json
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from pagemap.browser_session import BrowserConfig, BrowserSession
+from pagemap.core.ecommerce import BarrierResult, BarrierType
+from pagemap.server.consent_seed import (
+    SEEDED_PROVIDERS,
+    ConsentSeedStats,
+    DetectedCmps,
+    consent_cookies,
+    consent_init_script,
+    detected_cmps,
+)
+
+_NOW = datetime(2026, 3, 1, 12, 30, 0, tzinfo=UTC)
+
+
+def _barrier(provider: str, accept_ref: int | None, barrier_type=BarrierType.COOKIE_CONSENT) -> BarrierResult:
+    return BarrierResult(
+        barrier_type=barrier_type,
+        provider=provider,
+        auto_dismissible=True,
+        accept_ref=accept_ref,
+        confidence=0.95,
+    )
+
+
+class TestConsentCookies:
+    def test_host_only_cookies_of_one_provider(self):
+        cookies = consent_cookies("https://shop.example.de/cart?x=1", "onetrust", _NOW)
+        assert all(c["url"] == "https://shop.example.de" for c in cookies)
+        assert {c["name"] for c in cookies} == {"OptanonAlertBoxClosed", "OptanonConsent"}
+        assert consent_cookies("https://shop.example.de/", "usercentrics", _NOW) == []  # localStorage only
+
+    def test_reject_non_essential_values(self):
+        by_name = {
+            c["name"]: c["value"]
+            for provider in ("cookiebot", "onetrust", "didomi")
+            for c in consent_cookies("https://example.com", provider, _NOW)
+        }
+        assert "marketing:false" in by_name["CookieConsent"]
+        assert "necessary:true" in by_name["CookieConsent"]
+        assert "C0001%3A1%2CC0002%3A0" in by_name["OptanonConsent"]
+        assert by_name["OptanonAlertBoxClosed"] == "2026-03-01T12:30:00.000Z"
+        token = json.loads(base64.b64decode(by_name["didomi_token"]))
+        assert token["version"] == 2
+
+    def test_non_http_url_skipped(self):
+        assert consent_cookies("about:blank", "onetrust") == []
+        assert consent_cookies("data:text/html,hi", "onetrust") == []
+
+    def test_init_script_sets_absent_keys_only(self):
+        script = consent_init_script(_NOW)
+        assert "uc_user_interaction" in script
+        assert "didomi_token" in script
+        assert "getItem(k) === null" in script
+
+    def test_quantcast_not_seeded(self):
+        assert "quantcast" not in SEEDED_PROVIDERS
+
+
+class TestConsentSeedStats:
+    def test_hit_when_no_banner_button(self):
+        stats = ConsentSeedStats()
+        assert stats.record(_barrier("onetrust", accept_ref=None)) is True
+        assert stats.record(_barrier("onetrust", accept_ref=4)) is False
+        assert stats.snapshot() == {"onetrust": {"hits": 1, "misses": 1, "hit_rate": 0.5}}
+
+    def test_unseeded_providers_ignored(self):
+        stats = ConsentSeedStats()
+        assert stats.record(_barrier("generic", accept_ref=None)) is False
+        assert stats.record(_barrier("quantcast", accept_ref=None)) is False
+        assert stats.record(_barrier("", accept_ref=None, barrier_type=BarrierType.POPUP_OVERLAY)) is False
+        assert stats.record(None) is False
+        assert stats.snapshot() == {}
+
+
+class TestDetectedCmps:
+    def test_remembers_seedable_cookie_cmp_per_host(self):
+        cmps = DetectedCmps()
+        cmps.remember("https://Shop.example.de/p/1", _barrier("onetrust", accept_ref=3))
+        cmps.remember("https://other.example/", _barrier("quantcast", accept_ref=3))
+        cmps.remember("https://popup.example/", _barrier("onetrust", None, BarrierType.POPUP_OVERLAY))
+        assert cmps.get("https://shop.example.de/cart") == "onetrust"
+        assert cmps.get("https://other.example/") is None
+        assert cmps.get("https://popup.example/") is None
+
+    def test_bounded(self):
+        cmps = DetectedCmps()
+        with patch("pagemap.server.consent_seed.MAX_HOSTS", 2):
+            for host in ("a.com", "b.com", "c.com"):
+                cmps.remember(f"https://{host}/", _barrier("didomi", accept_ref=None))
+        assert cmps.get("https://a.com/") is None
+        assert cmps.get("https://c.com/") == "didomi"
+
+
+class TestNavigateSeeds:
+    @pytest.fixture(autouse=True)
+    def _detected(self):
+        detected_cmps.remember("https://www.example.fr/", _barrier("onetrust", accept_ref=2))
+        yield
+        detected_cmps.clear()
+
+    def _make_session(self) -> BrowserSession:
+        session = BrowserSession(BrowserConfig(wait_strategy="load"))
+        session._page = MagicMock()
+        session._page.url = "https://other.example"
+        session._page.goto = AsyncMock()
+        session._page.evaluate = AsyncMock(return_value={"waited_ms": 5, "mutations": 0, "reason": "quiet"})
+        session._context = MagicMock()
+        session._context.clear_cookies = AsyncMock()
+        session._context.add_cookies = AsyncMock()
+        session._context.cookies = AsyncMock(return_value=[])
+        session._context.set_extra_http_headers = AsyncMock()
+        return session
+
+    async def test_cookies_added_after_domain_clear(self):
+        session = self._make_session()
+        order: list[str] = []
+        session._context.clear_cookies.side_effect = lambda: order.append("clear")
+        session._context.add_cookies.side_effect = lambda cookies: order.append("seed")
+        with patch("pagemap.server.browser_session.CONSENT_SEED_ENABLED", True):
+            await session.navigate("https://www.example.fr/")
+        assert order == ["clear", "seed"]
+        cookies = session._context.add_cookies.call_args[0][0]
+        assert all(c["url"] == "https://www.example.fr" for c in cookies)
+        assert {c["name"] for c in cookies} == {"OptanonAlertBoxClosed", "OptanonConsent"}
+
+    async def test_only_missing_cookies_added(self):
+        session = self._make_session()
+        session._context.cookies.return_value = [{"name": "OptanonConsent", "value": "groups=C0002%3A1"}]
+        with patch("pagemap.server.browser_session.CONSENT_SEED_ENABLED", True):
+            await session.navigate("https://www.example.fr/")
+        session._context.cookies.assert_awaited_once_with("https://www.example.fr/")
+        (cookies,) = session._context.add_cookies.call_args[0]
+        assert [c["name"] for c in cookies] == ["OptanonAlertBoxClosed"]
+
+    async def test_undetected_host_not_seeded(self):
+        session = self._make_session()
+        with patch("pagemap.server.browser_session.CONSENT_SEED_ENABLED", True):
+            await session.navigate("https://www.example.de/")
+        session._context.add_cookies.assert_not_called()
+
+    async def test_disabled_by_default(self):
+        session = self._make_session()
+        await session.navigate("https://www.example.fr/")
+        session._context.add_cookies.assert_not_called()
+
+    async def test_rejected_cookies_do_not_fail_navigation(self):
+        session = self._make_session()
+        session._context.add_cookies.side_effect = RuntimeError("Invalid cookie fields")
+        with patch("pagemap.server.browser_session.CONSENT_SEED_ENABLED", True):
+            result = await session.navigate("https://www.example.fr/")
+        assert result.strategy == "load"
@@ -109,8 +109,8 @@ class TestHTMLRegex:
     def test_cookie_class_not_popup(self, make_interactable):
         """Cookie-related classes should NOT match popup regex."""
         html = '<div class="cookie-popup"><p>We use cookies</p></div>'
-        # The negative filter in _POPUP_HTML_RE should not match cookie classes
-        # because cookie classes don't match _POPUP_HTML_RE patterns
+        # The negative filter in the popup_html rule should not match cookie classes
+        # because cookie classes don't match the popup_html rule
         result = detect_popup_overlay(html.lower(), [])
         # cookie-popup doesn't match our popup patterns (newsletter, app, promo, etc.)
         assert result is None
@@ -0,0 +1,101 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for one-pass embedded script payload extraction (core/embedded_data.py)."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+from pagemap.core.embedded_data import (
+    EmbeddedData,
+    EmbeddedDataStats,
+    embedded_data,
+    embedded_stats,
+    parse_json_ld_text,
+)
+from pagemap.core.perf_bench import HUGE_STATE_NAME, load_corpus
+from pagemap.core.pruning.preprocessor import _extract_json_ld, _extract_rsc_data
+
+_PRODUCT = {"@type": "Product", "name": "Desk lamp"}
+
+
+def _page(*scripts: str) -> str:
+    return f"<html><head>{''.join(scripts)}</head><body><p>x</p></body></html>"
+
+
+class TestTokenizer:
+    def test_classifies_payloads(self):
+        html = _page(
+            f'<script type="application/ld+json">{json.dumps(_PRODUCT)}</script>',
+            '<script id="__NEXT_DATA__" type="application/json">{"props":{}}</script>',
+            '<script>self.__next_f.push([1,"a"])</script>',
+            "<script>var x = 1;</script>",
+            '<script src="/app.js"></script>',
+        )
+        data = EmbeddedData(html)
+        assert [len(data.json_ld), len(data.state), len(data.rsc)] == [1, 1, 1]
+        assert data.json_ld_data() == [_PRODUCT]
+        assert data.next_data.data == {"props": {}}
+
+    def test_attribute_variants(self):
+        html = _page(
+            "<SCRIPT TYPE='Application/LD+JSON'>{\"a\":1}</SCRIPT >",
+            '<script data-x="1" type = "application/ld+json">{"b":2}</script>',
+            "<script type=application/ld+json>[]</script>",
+        )
+        assert EmbeddedData(html).json_ld_data() == [{"a": 1}, {"b": 2}, []]
+
+    def test_invalid_json_left_out(self):
+        html = _page('<script type="application/ld+json">{not json</script>')
+        data = EmbeddedData(html)
+        assert len(data.json_ld) == 1
+        assert data.json_ld_data() == []
+
+    def test_unterminated_script_stops_scan(self):
+        assert EmbeddedData('<script type="application/ld+json">{"a":1}').json_ld == ()
+
+
+class TestBudgets:
+    def test_blob_over_budget_not_parsed(self):
+        html = _page(
+            f'<script type="application/ld+json">{json.dumps(_PRODUCT)}</script>',
+            f'<script type="application/ld+json">{json.dumps({"pad": "x" * 200})}</script>',
+        )
+        stats = EmbeddedDataStats()
+        with (
+            patch("pagemap.core.embedded_data.EMBEDDED_BLOB_BUDGET", 100),
+            patch("pagemap.core.embedded_data.embedded_stats", stats),
+        ):
+            assert EmbeddedData(html).json_ld_data() == [_PRODUCT]
+        assert (stats.snapshot()["parsed"], stats.snapshot()["skipped"]) == (1, 1)
+
+    def test_total_budget_per_document(self):
+        blob = f'<script type="application/ld+json">{json.dumps(_PRODUCT)}</script>'
+        with patch("pagemap.core.embedded_data.EMBEDDED_TOTAL_BUDGET", 2 * len(json.dumps(_PRODUCT))):
+            assert len(EmbeddedData(_page(blob, blob, blob)).json_ld_data()) == 2
+
+
+class TestSharedView:
+    def test_memoized_per_document(self):
+        html = _page(f'<script type="application/ld+json">{json.dumps(_PRODUCT)}</script>')
+        first = embedded_data(html)
+        assert embedded_data(html) is first
+        assert first.json_ld_data()[0] is embedded_data(html).json_ld_data()[0]  # parsed once
+        assert embedded_data(html + " ") is not first
+
+    def test_chunk_text_reuses_parsed_view(self):
+        html = _page(f'<script type="application/ld+json">  {json.dumps(_PRODUCT)}\n</script>')
+        (chunk,) = _extract_json_ld(html)
+        assert parse_json_ld_text(chunk.text) is embedded_data(html).json_ld[0].data
+        assert parse_json_ld_text('{"other": true}') == {"other": True}
+
+    def test_huge_state_page(self):
+        (page,) = load_corpus([HUGE_STATE_NAME])
+        embedded_stats.reset()
+        data = embedded_data(page.html)
+        assert len(page.html) > 2_000_000
+        assert data.json_ld_data()[0]["@type"] == "Product"
+        assert len(_extract_rsc_data(page.html)) == len(data.rsc) > 0
+        assert embedded_stats.snapshot()["parsed"] == 1  # the multi-MB __NEXT_DATA__ stays unparsed
@@ -21,6 +21,7 @@ from playwright.async_api import Error as PlaywrightError
 from pagemap import Interactable, PageMap
 from pagemap.dom_change_detector import DomFingerprint
 from pagemap.server import (
+    _FILL_FORM_CLICK_SETTLE_MS,
     _FILL_FORM_SETTLE_MS,
     FILL_FORM_TIMEOUT_SECONDS,
     FILL_FORM_VALID_ACTIONS,
@@ -154,6 +155,7 @@ class TestFillFormConstants:
 
     def test_settle_ms(self):
         assert _FILL_FORM_SETTLE_MS == 300
+        assert _FILL_FORM_CLICK_SETTLE_MS == 800
 
 
 # ── TestFormFieldModel ──────────────────────────────────────────
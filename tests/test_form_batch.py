@@ -0,0 +1,270 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for single-round-trip batch execution in fill_form (server/form_batch.py)."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import replace
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+
+import pytest
+
+from pagemap import Interactable, PageMap
+from pagemap.server import FormField, _execute_locator_action_with_retry, _fill_form_impl
+from pagemap.server.form_batch import _BATCH_FILL_JS, BatchFillOutcome, batchable_run, run_fill_batch
+
+
+def _ia(ref: int, role: str, affordance: str, selector: str = "") -> Interactable:
+    return Interactable(
+        ref=ref,
+        role=role,
+        name=f"Field {ref}",
+        affordance=affordance,
+        region="main",
+        tier=1,
+        selector=selector,
+    )
+
+
+_REF_MAP = {
+    1: _ia(1, "textbox", "type", "#email"),
+    2: _ia(2, "textbox", "type", "#name"),
+    3: _ia(3, "combobox", "select", "#country"),
+    4: _ia(4, "button", "click", "#submit"),
+    5: _ia(5, "textbox", "type"),  # no selector → not batchable
+}
+
+
+def _page_map() -> PageMap:
+    return PageMap(
+        url="https://example.com/form",
+        title="Form",
+        page_type="form",
+        interactables=list(_REF_MAP.values()),
+        pruned_context="",
+        pruned_tokens=0,
+        generation_ms=0.0,
+    )
+
+
+def _mock_session(batch_result) -> MagicMock:
+    """Session whose page answers the batch JS with *batch_result* (other evaluates fail)."""
+
+    async def evaluate(js, *args):
+        if js == _BATCH_FILL_JS:
+            return batch_result
+        raise RuntimeError("no DOM in unit tests")
+
+    locator = AsyncMock()
+    locator.first = AsyncMock()
+    locator.count = AsyncMock(return_value=1)
+    page = MagicMock()
+    page.evaluate = AsyncMock(side_effect=evaluate)
+    page.get_by_role = MagicMock(return_value=locator)
+    page.locator = MagicMock(return_value=locator)
+    type(page).url = PropertyMock(return_value="https://example.com/form")
+
+    session = MagicMock()
+    session.page = page
+    session.get_page_url = AsyncMock(return_value="https://example.com/form")
+    session.consume_new_page = MagicMock(return_value=None)
+    session.drain_dialogs = MagicMock(return_value=[])
+    return session
+
+
+class TestBatchableRun:
+    def test_consecutive_type_select(self):
+        fields = [FormField(ref=1, action="type", value="a"), FormField(ref=3, action="select", value="KR")]
+        assert batchable_run(fields, _REF_MAP, 0) == fields
+
+    def test_click_ends_run(self):
+        fields = [
+            FormField(ref=1, action="type", value="a"),
+            FormField(ref=4, action="click"),
+            FormField(ref=2, action="type", value="b"),
+        ]
+        assert batchable_run(fields, _REF_MAP, 0) == fields[:1]
+        assert batchable_run(fields, _REF_MAP, 2) == fields[2:]
+
+    def test_target_without_selector_ends_run(self):
+        fields = [FormField(ref=1, action="type", value="a"), FormField(ref=5, action="type", value="b")]
+        assert batchable_run(fields, _REF_MAP, 0) == fields[:1]
+
+
+class TestRunFillBatch:
+    async def test_ops_sent_in_one_evaluate(self):
+        page = MagicMock()
+        page.evaluate = AsyncMock(return_value={"done": 2, "stop": None, "mutations": 3})
+        fields = [FormField(ref=1, action="type", value="a@b.c"), FormField(ref=3, action="select", value="KR")]
+        outcome = await run_fill_batch(page, fields, _REF_MAP)
+        assert outcome == BatchFillOutcome(done=2, stop_reason=None, mutations=3)
+        page.evaluate.assert_awaited_once_with(
+            _BATCH_FILL_JS,
+            [["#email", "type", "a@b.c", "textbox", "Field 1"], ["#country", "select", "KR", "combobox", "Field 3"]],
+        )
+
+    async def test_evaluate_failure_is_done_zero(self):
+        page = MagicMock()
+        page.evaluate = AsyncMock(side_effect=RuntimeError("context destroyed"))
+        outcome = await run_fill_batch(page, [FormField(ref=1, action="type", value="a")], _REF_MAP)
+        assert outcome.done == 0
+
+    async def test_done_clamped(self):
+        page = MagicMock()
+        page.evaluate = AsyncMock(return_value={"done": 9})
+        outcome = await run_fill_batch(page, [FormField(ref=1, action="type", value="a")], _REF_MAP)
+        assert outcome.done == 1
+
+
+class TestFillFormBatchPath:
+    @pytest.fixture(autouse=True)
+    def _page_map(self):
+        import pagemap.server as srv
+
+        srv._state.cache.store(_page_map(), None)
+        yield
+        srv._state.cache.invalidate_all()
+
+    async def test_full_batch_skips_playwright_actions(self):
+        session = _mock_session({"done": 3, "stop": None, "mutations": 0})
+        fields = [
+            FormField(ref=1, action="type", value="a@b.c"),
+            FormField(ref=2, action="type", value="Kim"),
+            FormField(ref=3, action="select", value="KR"),
+        ]
+        with patch("pagemap.server._get_session", return_value=session):
+            result = await _fill_form_impl(fields)
+        assert result.startswith("fill_form: 3/3 fields completed.")
+        assert '[3] combobox "Field 3": selected' in result
+        session.page.get_by_role.assert_not_called()
+        session.page.locator.return_value.first.fill.assert_not_called()
+
+    async def test_partial_batch_falls_back_per_field(self):
+        session = _mock_session({"done": 1, "stop": "not visible", "mutations": 0})
+        fields = [
+            FormField(ref=1, action="type", value="a@b.c"),
+            FormField(ref=2, action="type", value="Kim"),
+            FormField(ref=4, action="click"),
+        ]
+        with patch("pagemap.server._get_session", return_value=session):
+            result = await _fill_form_impl(fields)
+        assert result.startswith("fill_form: 3/3 fields completed.")
+        first = session.page.get_by_role.return_value.first
+        first.fill.assert_awaited_once_with("Kim", timeout=5000)
+        first.click.assert_awaited_once()
+
+    async def test_batch_disabled_uses_per_field(self):
+        session = _mock_session({"done": 2, "stop": None, "mutations": 0})
+        fields = [FormField(ref=1, action="type", value="a"), FormField(ref=2, action="type", value="b")]
+        with (
+            patch("pagemap.server._get_session", return_value=session),
+            patch("pagemap.server._FILL_FORM_BATCH_ENABLED", False),
+        ):
+            result = await _fill_form_impl(fields)
+        assert result.startswith("fill_form: 2/2 fields completed.")
+        assert session.page.get_by_role.return_value.first.fill.await_count == 2
+
+
+# ── Latency benchmark (real Chromium, local fixture page) ─────────────
+
+_FORM_FIELDS = 10
+_FIXTURE_HTML = (
+    "<html><body><form>"
+    + "".join(
+        f'<label for="f{i}">Field {i}</label><input id="f{i}" name="f{i}" oninput="window.events++" '
+        f'onchange="window.events++"><br>'
+        for i in range(_FORM_FIELDS)
+    )
+    + '<label for="country">Country</label><select id="country" onchange="window.events++">'
+    + '<option value="">-</option><option value="KR">Korea</option><option value="US">United States</option>'
+    + "</select></form><script>window.events = 0</script></body></html>"
+)
+
+
+@pytest.mark.network
+@pytest.mark.slow
+class TestFillFormLatencyBenchmark:
+    """Batch vs per-field fill of an 11-field form in headless Chromium."""
+
+    @pytest.fixture
+    async def page(self):
+        from playwright.async_api import async_playwright
+
+        async with async_playwright() as pw:
+            try:
+                browser = await pw.chromium.launch(headless=True)
+            except Exception as exc:
+                pytest.skip(f"Chromium not available: {str(exc).splitlines()[0]}")
+            page = await browser.new_page()
+            yield page
+            await browser.close()
+
+    @staticmethod
+    def _fields_and_refs():
+        ref_map = {
+            i + 1: Interactable(
+                ref=i + 1,
+                role="textbox",
+                name=f"Field {i}",
+                affordance="type",
+                region="main",
+                tier=1,
+                selector=f"#f{i}",
+            )
+            for i in range(_FORM_FIELDS)
+        }
+        ref_map[_FORM_FIELDS + 1] = Interactable(
+            ref=_FORM_FIELDS + 1,
+            role="combobox",
+            name="Country",
+            affordance="select",
+            region="main",
+            tier=1,
+            selector="#country",
+        )
+        fields = [FormField(ref=i + 1, action="type", value=f"value {i}") for i in range(_FORM_FIELDS)]
+        fields.append(FormField(ref=_FORM_FIELDS + 1, action="select", value="Korea"))
+        return fields, ref_map
+
+    async def test_batch_faster_and_equivalent(self, page):
+        fields, ref_map = self._fields_and_refs()
+
+        await page.set_content(_FIXTURE_HTML)
+        start = time.perf_counter()
+        for f in fields:
+            await _execute_locator_action_with_retry(page, ref_map[f.ref], f.action, f.value, "bench", page.url)
+        per_field_ms = (time.perf_counter() - start) * 1000
+        per_field_values = await page.evaluate(
+            "() => [...document.querySelectorAll('input, select')].map(e => e.value)"
+        )
+
+        await page.set_content(_FIXTURE_HTML)
+        start = time.perf_counter()
+        outcome = await run_fill_batch(page, fields, ref_map)
+        batch_ms = (time.perf_counter() - start) * 1000
+        batch_values = await page.evaluate("() => [...document.querySelectorAll('input, select')].map(e => e.value)")
+        events = await page.evaluate("() => window.events")
+
+        print(f"\nfill_form {len(fields)} fields: per-field {per_field_ms:.1f}ms, batch {batch_ms:.1f}ms")
+        assert outcome.done == len(fields)
+        assert batch_values == per_field_values
+        assert batch_values[-1] == "KR"
+        assert events == 2 * _FORM_FIELDS + 1  # input + change per text field, change on select
+        assert batch_ms < per_field_ms
+
+    async def test_stops_at_retargeted_or_changed_form(self, page):
+        fields, ref_map = self._fields_and_refs()
+        await page.set_content(_FIXTURE_HTML)
+        ref_map[3] = replace(ref_map[3], name="Coupon code")  # selector now points at another field
+        outcome = await run_fill_batch(page, fields, ref_map)
+        assert (outcome.done, outcome.stop_reason) == (2, "different element")
+
+        await page.set_content(_FIXTURE_HTML)
+        await page.evaluate(
+            "() => document.getElementById('f1').addEventListener('change', "
+            "() => document.querySelector('form').append(document.createElement('p')))"
+        )
+        outcome = await run_fill_batch(page, fields, self._fields_and_refs()[1])
+        assert (outcome.done, outcome.stop_reason) == (2, "form changed")
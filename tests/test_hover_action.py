@@ -196,17 +196,24 @@ class TestHoverBasic:
         data = json.loads(result)
         assert "Hovered over [3] textbox: Search" in data["description"]
 
-    async def test_hover_settle_time_500ms(self):
-        """hover uses 500ms settle time for CSS transitions."""
+    async def test_hover_settles_adaptively(self):
+        """hover waits for quiescence (capped) instead of a fixed sleep."""
         import pagemap.server as srv
+        from pagemap.core.action_settle import SettleResult
 
         srv._state.cache.store(_make_page_map(), None)
         mock_session = _make_mock_session()
+        settle = AsyncMock(return_value=SettleResult(waited_ms=180, reason="quiet"))
 
-        with patch("pagemap.server._get_session", return_value=mock_session):
-            await execute_action(ref=1, action="hover")
+        with (
+            patch("pagemap.server._get_session", return_value=mock_session),
+            patch("pagemap.server.ActionSettler.settle", settle),
+        ):
+            result = await execute_action(ref=1, action="hover")
 
-        mock_session.page.wait_for_timeout.assert_called_with(500)
+        settle.assert_awaited_once_with(max_ms=500)  # never above the former 500 ms sleep
+        mock_session.page.wait_for_timeout.assert_not_called()
+        assert json.loads(result)["settle_ms"] == 180
 
     async def test_hover_no_value_required(self):
         """hover does not require a value parameter."""
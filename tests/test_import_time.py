@@ -0,0 +1,108 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Import-time budget: cold start of ``pagemap`` and ``pagemap.server``.
+
+Each check runs in a fresh interpreter.  Heavy subsystems (Playwright,
+pruning pipeline, ecommerce engines, diagnostics, tokenizer) must load on
+first use, not at import.  Budgets are CPU seconds spent inside the
+import statement (robust against a loaded CI box, unlike wall time); on
+failure the slowest modules from ``python -X importtime`` are reported.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# CPU-time budgets (seconds) for a cold ``import``.  Generous multiples of a
+# typical run (~0.03s / ~0.8s) — they trip on a new eager heavy import.
+PAGEMAP_BUDGET_S = 0.3
+SERVER_BUDGET_S = 3.0
+
+_DEFERRED = (
+    "playwright.async_api",
+    "structlog",
+    "tiktoken",
+    "lxml",
+    "pagemap.core.pruning",
+    "pagemap.core.ecommerce",
+    "pagemap.core.diagnostics",
+    "pagemap.i18n",
+)
+
+
+def _run(code: str, *extra: str) -> subprocess.CompletedProcess[str]:
+    env = {k: v for k, v in os.environ.items() if not k.startswith("PYTHONIMPORT")}
+    return subprocess.run(
+        [sys.executable, *extra, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=60,
+    )
+
+
+def _loaded_after(module: str) -> set[str]:
+    code = f"import json, sys; import {module}; print(json.dumps(sorted(sys.modules)))"
+    proc = _run(code)
+    assert proc.returncode == 0, proc.stderr
+    return set(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+
+def _import_cpu_s(module: str) -> float:
+    """CPU time spent importing *module* in a fresh interpreter (best of 3)."""
+    code = f"import time; t = time.process_time(); import {module}; print(time.process_time() - t)"
+    best = float("inf")
+    for _ in range(3):
+        proc = _run(code)
+        assert proc.returncode == 0, proc.stderr
+        best = min(best, float(proc.stdout.strip().splitlines()[-1]))
+    return best
+
+
+def _slowest_imports(module: str, n: int = 10) -> str:
+    """Top-*n* modules by self time from ``-X importtime`` (failure diagnostics)."""
+    proc = _run(f"import {module}", "-X", "importtime")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            self_us, _cumulative, name = (p.strip() for p in line[len("import time:") :].split("|"))
+            rows.append((int(self_us), name))
+    rows.sort(reverse=True)
+    return "\n".join(f"{us / 1000:8.1f}ms  {name}" for us, name in rows[:n])
+
+
+class TestDeferredImports:
+    def test_pagemap_is_light(self):
+        loaded = _loaded_after("pagemap")
+        assert not [m for m in _DEFERRED if m in loaded]
+        assert "pagemap.server" not in loaded
+
+    def test_server_defers_heavy_subsystems(self):
+        loaded = _loaded_after("pagemap.server")
+        assert not [m for m in _DEFERRED if m in loaded]
+
+    def test_encoder_loads_on_first_use(self):
+        proc = _run(
+            "import sys; from pagemap.core.preprocessing import preprocess as p; "
+            "before = 'tiktoken' in sys.modules; p.count_tokens('hello'); "
+            "print(before, 'tiktoken' in sys.modules)"
+        )
+        assert proc.returncode == 0, proc.stderr
+        assert proc.stdout.split() == ["False", "True"]
+
+
+@pytest.mark.slow
+class TestImportTimeBudget:
+    @pytest.mark.parametrize(
+        ("module", "budget_s"),
+        [("pagemap", PAGEMAP_BUDGET_S), ("pagemap.server", SERVER_BUDGET_S)],
+    )
+    def test_import_budget(self, module, budget_s):
+        elapsed = _import_cpu_s(module)
+        assert elapsed < budget_s, f"import {module}: {elapsed:.3f}s CPU > {budget_s}s\n{_slowest_imports(module)}"
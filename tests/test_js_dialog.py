@@ -87,6 +87,7 @@ class TestDialogHandlerBehavior:
 
     async def test_alert_calls_accept(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._delegates = {}
         session._pending_dialogs = []
         dialog = _make_dialog("alert", "Alert!")
 
@@ -97,6 +98,7 @@ class TestDialogHandlerBehavior:
 
     async def test_confirm_calls_dismiss(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._delegates = {}
         session._pending_dialogs = []
         dialog = _make_dialog("confirm", "Are you sure?")
 
@@ -107,6 +109,7 @@ class TestDialogHandlerBehavior:
 
     async def test_prompt_calls_dismiss(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._delegates = {}
         session._pending_dialogs = []
         dialog = _make_dialog("prompt", "Enter value:")
 
@@ -117,6 +120,7 @@ class TestDialogHandlerBehavior:
 
     async def test_beforeunload_calls_accept(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._delegates = {}
         session._pending_dialogs = []
         dialog = _make_dialog("beforeunload", "")
 
@@ -127,6 +131,7 @@ class TestDialogHandlerBehavior:
 
     async def test_dialog_info_stored_correctly(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._delegates = {}
         session._pending_dialogs = []
         dialog = _make_dialog("alert", "Test message")
 
@@ -140,6 +145,7 @@ class TestDialogHandlerBehavior:
 
     async def test_confirm_info_dismissed_true(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._delegates = {}
         session._pending_dialogs = []
         dialog = _make_dialog("confirm", "OK?")
 
@@ -149,6 +155,7 @@ class TestDialogHandlerBehavior:
 
     async def test_buffer_overflow_keeps_latest(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._delegates = {}
         session._pending_dialogs = []
 
         for i in range(_MAX_DIALOG_BUFFER + 5):
@@ -162,6 +169,7 @@ class TestDialogHandlerBehavior:
 
     async def test_handler_exception_falls_back_to_dismiss(self):
         session = BrowserSession.__new__(BrowserSession)
+        session._delegates = {}
         session._pending_dialogs = []
 
         dialog = AsyncMock()
@@ -308,6 +308,8 @@ class TestDynamicNavigateWait:
     def _make_session(self):
         session = BrowserSession.__new__(BrowserSession)
         session.config = BrowserConfig()
+        session._host = None
+        session._scanner_pending = False
         mock_page = AsyncMock()
         mock_page.url = "https://example.com"
         session._page = mock_page
@@ -261,6 +261,7 @@ class TestOutputSchemaRegistry:
             "switch_tab",
             "list_tabs",
             "close_tab",
+            "map_tabs",
         }
         assert set(TOOL_OUTPUT_SCHEMAS.keys()) == expected_tools
 
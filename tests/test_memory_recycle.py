@@ -0,0 +1,164 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for memory-driven browser context recycling (D2)."""
+
+from __future__ import annotations
+
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from pagemap.server.browser_pool import BrowserPool, _PooledContext
+from pagemap.server.browser_session import BrowserSession, ContextMemory
+from pagemap.server.session_manager import MAX_NAVIGATIONS, HttpSessionManager
+
+_MB = 1024 * 1024
+
+
+def _memory(heap_mb: float = 50, nodes: int = 2000) -> ContextMemory:
+    return ContextMemory(js_heap_bytes=int(heap_mb * _MB), dom_nodes=nodes, sampled_at=time.monotonic())
+
+
+def _pool_with(*session_ids: str) -> BrowserPool:
+    pool = BrowserPool()
+    for sid in session_ids:
+        sess = MagicMock()
+        sess.sample_memory = AsyncMock(return_value=_memory())
+        pool._contexts[sid] = _PooledContext(session_id=sid, session=sess)
+    return pool
+
+
+class TestSampleMemory:
+    async def test_reads_performance_metrics(self):
+        session = BrowserSession.__new__(BrowserSession)
+        session._perf_cdp = None
+        cdp = MagicMock()
+        cdp.send = AsyncMock(
+            side_effect=[
+                {},  # Performance.enable
+                {"metrics": [{"name": "JSHeapUsedSize", "value": 64 * _MB}, {"name": "Nodes", "value": 1234.0}]},
+                {"metrics": []},
+            ]
+        )
+        session.get_cdp_session = AsyncMock(return_value=cdp)
+        memory = await session.sample_memory()
+        assert memory.js_heap_mb == 64
+        assert memory.dom_nodes == 1234
+        await session.sample_memory()
+        assert cdp.send.await_args_list[-1].args == ("Performance.getMetrics",)  # enabled only once
+        assert cdp.send.await_count == 3
+
+    async def test_failure_returns_none(self):
+        session = BrowserSession.__new__(BrowserSession)
+        session.get_cdp_session = AsyncMock(side_effect=RuntimeError("page closed"))
+        assert await session.sample_memory() is None
+
+
+class TestPoolMemory:
+    async def test_sample_cached_and_reported_in_health(self):
+        pool = _pool_with("s1", "s2")
+        await pool.sample_memory("s1", max_age_s=60)
+        await pool.sample_memory("s1", max_age_s=60)
+        assert pool._contexts["s1"].session.sample_memory.await_count == 1
+        assert set(pool.health().memory) == {"s1"}
+        assert await pool.sample_memory("missing") is None
+
+    async def test_heaviest_session(self):
+        pool = _pool_with("light", "heavy")
+        assert pool.heaviest_session() is None
+        pool._contexts["light"].memory = _memory(heap_mb=40)
+        pool._contexts["heavy"].memory = _memory(heap_mb=900)
+        assert pool.heaviest_session() == "heavy"
+
+    async def test_renderer_rss_sums_renderers(self):
+        pool = BrowserPool()
+        cdp = MagicMock()
+        cdp.send = AsyncMock(
+            return_value={
+                "processInfo": [
+                    {"type": "browser", "id": 1, "cpuTime": 0},
+                    {"type": "renderer", "id": 2, "cpuTime": 0},
+                    {"type": "renderer", "id": 3, "cpuTime": 0},
+                ]
+            }
+        )
+        cdp.detach = AsyncMock()
+        pool._browser = MagicMock()
+        pool._browser.new_browser_cdp_session = AsyncMock(return_value=cdp)
+        with (
+            patch("pagemap.server.browser_pool.sys.platform", "linux"),
+            patch("pagemap.server.browser_pool._process_rss_bytes", side_effect=lambda pid: pid * _MB),
+        ):
+            assert await pool.sample_renderer_rss() == 5 * _MB
+        assert pool.health().renderer_rss_bytes == 5 * _MB
+
+    async def test_renderer_rss_unavailable_is_zero(self):
+        pool = BrowserPool()
+        pool._browser = MagicMock()
+        pool._browser.new_browser_cdp_session = AsyncMock(side_effect=RuntimeError("not chromium"))
+        assert await pool.sample_renderer_rss() == 0
+
+
+class TestCheckRecycle:
+    @pytest.fixture
+    def manager(self):
+        return HttpSessionManager(MagicMock())
+
+    async def _entry(self, manager: HttpSessionManager, navigations: int = 0):
+        entry = await manager._get_or_create_entry_with_tenant("s1")
+        entry.navigation_count = navigations
+        return entry
+
+    async def test_heap_high_water_mark(self, manager):
+        entry = await self._entry(manager)
+        with patch("pagemap.server.session_manager.RECYCLE_MAX_JS_HEAP_MB", 512):
+            assert manager._check_recycle(entry, _memory(heap_mb=100)) is None
+            assert manager._check_recycle(entry, _memory(heap_mb=600)).startswith("js_heap=600MB")
+
+    async def test_dom_node_high_water_mark(self, manager):
+        entry = await self._entry(manager)
+        with patch("pagemap.server.session_manager.RECYCLE_MAX_DOM_NODES", 10_000):
+            assert manager._check_recycle(entry, _memory(nodes=20_000)).startswith("dom_nodes=20000")
+
+    async def test_light_session_not_recycled_by_nav_count(self, manager):
+        entry = await self._entry(manager, navigations=MAX_NAVIGATIONS + 5)
+        assert manager._check_recycle(entry, _memory()) is None
+        assert manager._check_recycle(entry).startswith("nav_count=")  # backstop without a sample
+
+    async def test_renderer_rss_recycles_heaviest_only(self, manager):
+        entry = await self._entry(manager)
+        with patch("pagemap.server.session_manager.RECYCLE_MAX_RENDERER_RSS_MB", 1000):
+            manager._pool.heaviest_session = MagicMock(return_value="other")
+            assert manager._check_recycle(entry, _memory(), renderer_rss_bytes=2000 * _MB) is None
+            manager._pool.heaviest_session = MagicMock(return_value="s1")
+            assert "heaviest session" in manager._check_recycle(entry, _memory(), renderer_rss_bytes=2000 * _MB)
+
+    async def test_recycled_at_next_tool_call(self, manager):
+        old, new = MagicMock(), MagicMock()
+        for sess in (old, new):
+            sess.is_alive = AsyncMock(return_value=True)
+            sess.install_ssrf_route_guard = AsyncMock()
+            sess.tab_count = 1
+        pool = manager._pool
+        pool.acquire = AsyncMock(side_effect=[old, new])
+        pool.release = AsyncMock()
+        pool.sample_memory = AsyncMock(return_value=_memory(heap_mb=2048))
+        entry = await self._entry(manager)
+        assert await manager._get_session_for_entry(entry) is old
+        assert await manager._get_session_for_entry(entry) is new
+        pool.release.assert_awaited_once_with("s1")
+        assert entry.navigation_count == 1
+
+    async def test_sampling_failure_falls_back_to_nav_count(self, manager):
+        sess = MagicMock()
+        sess.is_alive = AsyncMock(return_value=True)
+        sess.install_ssrf_route_guard = AsyncMock()
+        sess.tab_count = 1
+        manager._pool.acquire = AsyncMock(return_value=sess)
+        manager._pool.sample_memory = AsyncMock(side_effect=RuntimeError("cdp gone"))
+        entry = await self._entry(manager)
+        assert await manager._get_session_for_entry(entry) is sess
+        assert await manager._get_session_for_entry(entry) is sess
+        assert entry.navigation_count == 2
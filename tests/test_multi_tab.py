@@ -699,8 +699,8 @@ async def test_expired_tabs_pruned_on_switch(multi_tab):
 
 
 @pytest.mark.asyncio
-async def test_resolve_clears_scroll_merge_state():
-    """Resolved multi-tab ctx has scroll_merge_state=None."""
+async def test_resolve_uses_tab_scroll_merge_state():
+    """Resolved multi-tab ctx carries the tab's own scroll merge state, never the session's."""
     import pagemap.server as srv
     from pagemap.server import _create_stdio_context, _resolve_multi_tab_context
 
@@ -719,10 +719,403 @@ async def test_resolve_clears_scroll_merge_state():
     srv._state.multi_tab = multi
 
     ctx = _create_stdio_context()
-    # Original ctx has scroll_merge_state from ServerState
-    assert ctx.scroll_merge_state is not None or ctx.scroll_merge_state is None  # may be None if init fails
-
     resolved = _resolve_multi_tab_context(ctx)
 
-    # Resolved ctx must have scroll_merge_state=None (tab-scoped isolation)
-    assert resolved.scroll_merge_state is None
+    # Tab-scoped isolation: not the session's state, but stable across calls for the tab
+    assert resolved.scroll_merge_state is tab.scroll_merge_state
+    assert resolved.scroll_merge_state is None or resolved.scroll_merge_state is not ctx.scroll_merge_state
+    assert _resolve_multi_tab_context(ctx).scroll_merge_state is resolved.scroll_merge_state
+
+
+def test_tab_contexts_do_not_share_build_state():
+    """map_tabs builds tabs concurrently: each tab context gets its own mutable build state."""
+    import dataclasses
+
+    from pagemap.server import _create_stdio_context, _tab_context
+    from pagemap.server.context import BuildContext
+
+    tabs = [
+        TabInstance(name=f"t{i}", session=_make_mock_session("https://example.com"), cache=PageMapCache())
+        for i in range(2)
+    ]
+    tabs[0].scroll_merge_state, tabs[1].scroll_merge_state = object(), object()
+    ctx = dataclasses.replace(_create_stdio_context(), build_context=BuildContext())
+
+    first, second = (_tab_context(ctx, tab) for tab in tabs)
+    assert first.scroll_merge_state is tabs[0].scroll_merge_state
+    assert second.scroll_merge_state is tabs[1].scroll_merge_state
+    assert isinstance(first.build_context, BuildContext)
+    assert len({id(ctx.build_context), id(first.build_context), id(second.build_context)}) == 3
+
+
+# ---------------------------------------------------------------------------
+# Shared-context tab mode
+# ---------------------------------------------------------------------------
+
+
+def _patch_shared_sessions(created: list, navigate_error: Exception | None = None):
+    """Patch BrowserSession with fakes that also support start_shared; records instances."""
+
+    def _factory(config=None):
+        session = _make_fake_browser_session()
+        session.config = config
+        session.start_shared = AsyncMock()
+        if navigate_error is not None:
+            session.navigate = AsyncMock(side_effect=navigate_error)
+        created.append(session)
+        return session
+
+    return patch("pagemap.server.multi_tab.BrowserSession", side_effect=_factory)
+
+
+@pytest.mark.asyncio
+async def test_shared_context_tabs_share_one_host(mock_browser):
+    """Shared mode: one host context, tabs are pages in it, route guard installed once."""
+    from pagemap.server.multi_tab import MAX_SHARED_TABS
+
+    multi = MultiTabSession(mock_browser, shared_context=True)
+    created: list = []
+    guard = MagicMock(return_value=None)
+    with _patch_shared_sessions(created):
+        for i in range(MAX_TABS + 1):
+            result = await multi.open_tab(f"tab{i}", f"https://shop.com/p/{i}", url_validator=guard)
+            assert result["status"] == TabOpStatus.OK
+
+    host, tabs = created[0], created[1:]
+    host.start_from_pool.assert_awaited_once_with(mock_browser)
+    host.install_ssrf_route_guard.assert_awaited_once_with(guard)
+    assert len(tabs) == MAX_TABS + 1
+    for tab in tabs:
+        tab.start_shared.assert_awaited_once_with(host)
+        tab.start_from_pool.assert_not_called()
+        tab.install_ssrf_route_guard.assert_not_called()
+    assert multi.max_tabs == MAX_SHARED_TABS
+    assert len({id(t.cache) for t in multi._tabs.values()}) == MAX_TABS + 1
+
+
+@pytest.mark.asyncio
+async def test_shared_context_host_stopped_with_last_tab(mock_browser):
+    multi = MultiTabSession(mock_browser, shared_context=True)
+    created: list = []
+    with _patch_shared_sessions(created):
+        await multi.open_tab("a", "https://shop.com/1")
+        await multi.open_tab("b", "https://shop.com/2")
+    host = created[0]
+
+    await multi.close_tab("a")
+    host.stop.assert_not_awaited()
+    await multi.close_tab("b")
+    host.stop.assert_awaited_once()
+    assert multi._host is None
+
+
+@pytest.mark.asyncio
+async def test_shared_context_host_stopped_when_first_open_fails(mock_browser):
+    """A failed first open must not leave the host context alive with zero tabs."""
+    multi = MultiTabSession(mock_browser, shared_context=True)
+    created: list = []
+    with (
+        _patch_shared_sessions(created, navigate_error=RuntimeError("nav failed")),
+        pytest.raises(RuntimeError, match="nav failed"),
+    ):
+        await multi.open_tab("a", "https://shop.com/1")
+    host, tab = created
+    tab.stop.assert_awaited_once()
+    host.stop.assert_awaited_once()
+    assert multi._host is None
+    assert multi.is_multi_tab is False
+
+
+@pytest.mark.asyncio
+async def test_shared_context_rejects_other_user_agent(mock_browser):
+    """A tab cannot change context options of the shared context it joins."""
+    multi = MultiTabSession(mock_browser, shared_context=True)
+    created: list = []
+    with _patch_shared_sessions(created):
+        await multi.open_tab("a", "https://shop.com/1", user_agent="BotUA/1.0")
+        same = await multi.open_tab("b", "https://shop.com/2", user_agent="BotUA/1.0")
+        other = await multi.open_tab("c", "https://shop.com/3")
+
+    assert created[0].config.user_agent == "BotUA/1.0"
+    assert same["status"] == TabOpStatus.OK
+    assert other["status"] == TabOpStatus.ERROR
+    assert "user_agent" in other["error"]
+    assert multi.tab_names == ["a", "b"]
+    assert len(created) == 3  # host + two tabs, nothing allocated for the rejected one
+
+
+@pytest.mark.asyncio
+async def test_close_all_stops_shared_host(mock_browser):
+    multi = MultiTabSession(mock_browser, shared_context=True)
+    created: list = []
+    with _patch_shared_sessions(created):
+        await multi.open_tab("a", "https://shop.com/1")
+        await multi.open_tab("b", "https://shop.com/2")
+    await multi.close_all()
+    created[0].stop.assert_awaited_once()
+    assert multi._host is None
+
+    # host left without tabs (e.g. by an earlier failure) is released too
+    idle_host = _make_fake_browser_session()
+    multi._host = idle_host
+    await multi.close_all()
+    idle_host.stop.assert_awaited_once()
+    assert multi._host is None
+
+
+@pytest.mark.asyncio
+async def test_memory_budget_caps_tabs(mock_browser):
+    from pagemap.server.multi_tab import TAB_MEMORY_BUDGET_MB
+
+    multi = MultiTabSession(mock_browser, shared_context=True)
+    with _patch_shared_sessions([]):
+        await multi.open_tab("a", "https://shop.com/1")
+        await multi.open_tab("b", "https://shop.com/2")
+        for tab in multi._tabs.values():
+            tab.memory_bytes = TAB_MEMORY_BUDGET_MB * 1024 * 1024 // 2
+        result = await multi.open_tab("c", "https://shop.com/3")
+
+    assert result["status"] == TabOpStatus.MAX_TABS_REACHED
+    assert "memory budget" in result["error"]
+
+
+@pytest.mark.asyncio
+async def test_list_tabs_reports_latency_and_memory(multi_tab):
+    with _patch_browser_session():
+        await multi_tab.open_tab("tab1", "https://site1.com")
+
+    tab = multi_tab.get_active_tab()
+    cdp = MagicMock()
+    cdp.send = AsyncMock(return_value={"usedSize": 48 * 1024 * 1024, "totalSize": 64 * 1024 * 1024})
+    tab.session.get_cdp_session = AsyncMock(return_value=cdp)
+    await multi_tab.sample_memory()
+
+    info = multi_tab.list_tabs()
+    assert info["shared_context"] is False
+    assert info["max_tabs"] == MAX_TABS
+    assert info["tabs"][0]["memory_mb"] == 48.0
+    assert info["tabs"][0]["open_ms"] >= 0
+
+
+class TestSharedContextSession:
+    """BrowserSession.start_shared: page in the host's context."""
+
+    @staticmethod
+    def _host():
+        from pagemap.server.browser_session import BrowserSession
+
+        host = BrowserSession()
+        host._context = MagicMock()
+        page = MagicMock()
+        page.url = "about:blank"
+        page.is_closed = MagicMock(return_value=False)
+        page.close = AsyncMock()
+        page.goto = AsyncMock(return_value=None)
+        page.set_extra_http_headers = AsyncMock()
+        page.evaluate = AsyncMock(return_value={"waited_ms": 1, "mutations": 0, "reason": "quiet"})
+        host._context.new_page = AsyncMock(return_value=page)
+        host._context.clear_cookies = AsyncMock()
+        host._context.set_extra_http_headers = AsyncMock()
+        host._context.close = AsyncMock()
+        return host, page
+
+    async def test_navigate_keeps_shared_cookies(self):
+        from pagemap.server.browser_session import BrowserConfig, BrowserSession
+
+        host, page = self._host()
+        tab = BrowserSession(BrowserConfig(wait_strategy="load"))
+        await tab.start_shared(host)
+        assert tab.page is page
+        assert host._delegates == {page: tab}
+
+        page.url = "https://a.example/"
+        with patch.object(tab, "_install_security_scanner", AsyncMock()) as scanner:
+            await tab.navigate("https://b.example/")
+            await tab.navigate("https://c.example/")
+        scanner.assert_awaited_once()  # lazy, first navigation only
+        host._context.clear_cookies.assert_not_called()
+        host._context.set_extra_http_headers.assert_not_called()
+        page.set_extra_http_headers.assert_awaited()
+
+    async def test_stop_closes_only_the_page(self):
+        from pagemap.server.browser_session import BrowserSession
+
+        host, page = self._host()
+        tab = BrowserSession()
+        await tab.start_shared(host)
+        await tab.stop()
+        page.close.assert_awaited_once()
+        host._context.close.assert_not_called()
+        assert host._delegates == {}
+        assert host._batch_pages == set()
+
+    async def test_host_routes_dialogs_to_tab(self):
+        from pagemap.server.browser_session import BrowserSession
+
+        host, page = self._host()
+        tab = BrowserSession()
+        await tab.start_shared(host)
+        dialog = AsyncMock()
+        dialog.type = "alert"
+        dialog.message = "from tab"
+        dialog.page = page
+        await host._on_dialog(dialog)
+        assert [d.message for d in tab.drain_dialogs()] == ["from tab"]
+        assert host.drain_dialogs() == []
+        dialog.accept.assert_awaited_once()
+
+
+# ---------------------------------------------------------------------------
+# map_tabs: concurrent page maps across tabs
+# ---------------------------------------------------------------------------
+
+
+class TestMapTabs:
+    @pytest.fixture
+    def tabs_ctx(self, mock_browser):
+        import pagemap.server as srv
+        from pagemap.server import _create_stdio_context
+
+        multi = MultiTabSession(mock_browser)
+        for name in ("a", "b", "c"):
+            multi._tabs[name] = TabInstance(name=name, session=_make_mock_session(), cache=PageMapCache())
+        multi._active_tab = "a"
+        srv._state.multi_tab = multi
+        yield _create_stdio_context(), multi
+        srv._state.multi_tab = None
+
+    async def test_maps_tabs_concurrently_with_own_caches(self, tabs_ctx):
+        import asyncio
+
+        from pagemap.server import _map_tabs_impl
+
+        ctx, multi = tabs_ctx
+        running = 0
+        peak = 0
+        seen_caches = []
+
+        async def _fake_inner(
+            url, *, task_hint=None, detail_level=None, max_content_tokens=None, ctx, speculation=True
+        ):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            seen_caches.append(ctx.cache)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return f"PageMap for {await ctx.get_session() is not None}"
+
+        with patch("pagemap.server._get_page_map_inner", side_effect=_fake_inner):
+            data = json.loads(await _map_tabs_impl(None, max_concurrency=2, ctx=ctx))
+
+        assert {r["tab"] for r in data["results"]} == {"a", "b", "c"}
+        assert all(r["status"] == "ok" for r in data["results"])
+        assert data["summary"]["success"] == 3
+        assert peak == 2
+        assert seen_caches and {id(c) for c in seen_caches} == {id(t.cache) for t in multi._tabs.values()}
+        assert multi.active_tab_name == "a"
+
+    async def test_partial_results_at_deadline(self, tabs_ctx):
+        import asyncio
+
+        from pagemap.server import _map_tabs_impl
+
+        ctx, multi = tabs_ctx
+        slow_cache = multi.get_tabs(["c"])[0][0].cache
+        slow_cancelled = False
+
+        async def _fake_inner(
+            url, *, task_hint=None, detail_level=None, max_content_tokens=None, ctx, speculation=True
+        ):
+            nonlocal slow_cancelled
+            if ctx.cache is slow_cache:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    slow_cancelled = True
+                    raise
+            return "PageMap"
+
+        with (
+            patch("pagemap.server._get_page_map_inner", side_effect=_fake_inner),
+            patch("pagemap.server.MAP_TABS_OVERALL_TIMEOUT_SECONDS", 0.2),
+        ):
+            data = json.loads(await _map_tabs_impl(None, ctx=ctx))
+
+        by_tab = {r["tab"]: r["status"] for r in data["results"]}
+        assert by_tab == {"a": "ok", "b": "ok", "c": "timeout"}
+        assert data["summary"]["timed_out"] == 1
+        assert slow_cancelled
+
+    async def test_errors_and_unknown_tabs_reported(self, tabs_ctx):
+        from pagemap.server import _map_tabs_impl
+
+        ctx, _multi = tabs_ctx
+
+        async def _fake_inner(
+            url, *, task_hint=None, detail_level=None, max_content_tokens=None, ctx, speculation=True
+        ):
+            return "Error: Page map generation timed out."
+
+        with patch("pagemap.server._get_page_map_inner", side_effect=_fake_inner):
+            data = json.loads(await _map_tabs_impl(["b", "zzz"], ctx=ctx))
+
+        by_tab = {r["tab"]: r for r in data["results"]}
+        assert by_tab["b"]["status"] == "error"
+        assert by_tab["zzz"]["error"] == "Tab not found"
+        assert (data["summary"]["total"], data["summary"]["success"], data["summary"]["failed"]) == (2, 0, 2)
+
+    async def test_tab_builds_skip_speculative_prebuild(self, tabs_ctx):
+        from pagemap.server import _map_tabs_impl
+
+        ctx, _multi = tabs_ctx
+        inner = AsyncMock(return_value="PageMap")
+        with patch("pagemap.server._get_page_map_inner", inner):
+            await _map_tabs_impl(None, ctx=ctx)
+        # Tabs share ctx.session_id: they must not touch the session's prebuild
+        assert inner.await_count == 3
+        assert all(call.kwargs["speculation"] is False for call in inner.await_args_list)
+
+    async def test_oversized_results_trimmed_per_tab(self, tabs_ctx):
+        from pagemap.server import _map_tabs_impl
+
+        ctx, multi = tabs_ctx
+        small_cache = multi.get_tabs(["a"])[0][0].cache
+
+        async def _fake_inner(
+            url, *, task_hint=None, detail_level=None, max_content_tokens=None, ctx, speculation=True
+        ):
+            return "small" if ctx.cache is small_cache else "line\n" * 5000
+
+        with (
+            patch("pagemap.server._get_page_map_inner", side_effect=_fake_inner),
+            patch("pagemap.server.MAX_RESPONSE_SIZE_BYTES", 8000),
+        ):
+            raw = await _map_tabs_impl(None, ctx=ctx)
+
+        assert len(raw.encode("utf-8")) <= 8000
+        data = json.loads(raw)  # still valid JSON, not a byte-cut string
+        by_tab = {r["tab"]: r for r in data["results"]}
+        assert by_tab["a"]["page_map"] == "small" and "truncated" not in by_tab["a"]
+        for name in ("b", "c"):
+            assert by_tab[name]["truncated"] is True
+            assert by_tab[name]["page_map"].endswith("for the full map.]")
+
+    async def test_progress_reports_finished_tabs(self, tabs_ctx):
+        from pagemap.server import _map_tabs_impl
+
+        ctx, _multi = tabs_ctx
+        progress = AsyncMock()
+        with patch("pagemap.server._get_page_map_inner", AsyncMock(return_value="PageMap")):
+            await _map_tabs_impl(None, ctx=ctx, on_progress=progress)
+        done, total, message = progress.await_args_list[-1].args
+        assert (done, total) == (3, 3)
+        assert set(message.split(", ")) == {"a: ok", "b: ok", "c: ok"}
+
+    async def test_no_tabs_open(self):
+        import pagemap.server as srv
+        from pagemap.server import _create_stdio_context, _map_tabs_impl
+
+        srv._state.multi_tab = None
+        data = json.loads(await _map_tabs_impl(None, ctx=_create_stdio_context()))
+        assert "open_tab" in data["error"]
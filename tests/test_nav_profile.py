@@ -0,0 +1,172 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for per-domain adaptive navigation wait budgets (server/nav_profile.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from pagemap.browser_session import BrowserConfig, BrowserSession
+from pagemap.server.nav_profile import (
+    MIN_PROBES,
+    PROBE_EVERY,
+    SETTLE_FLOOR_MS,
+    NavObservation,
+    NavProfileLearner,
+    NavProfileStats,
+)
+
+_HOST = "shop.example.com"
+_QUIET = {"waited_ms": 120, "mutations": 3, "reason": "quiet"}
+
+
+def _probe(learner: NavProfileLearner, observation: NavObservation, host: str = _HOST) -> None:
+    plan = learner.plan(host, 6000, 3000)
+    assert plan.probe
+    learner.record(plan, observation)
+
+
+def _long_polling() -> NavObservation:
+    return NavObservation(6000.0, False, 120.0, False, idle_changed=False, settle_changed=False)
+
+
+class TestNavProfileLearner:
+    def test_first_navigations_probe_with_defaults(self):
+        learner = NavProfileLearner()
+        for _ in range(MIN_PROBES):
+            plan = learner.plan(_HOST, 6000, 3000)
+            assert (plan.mode, plan.networkidle_ms, plan.settle_max_ms) == ("probe", 6000, 3000)
+            learner.record(plan, _long_polling())
+        assert learner.plan(_HOST, 6000, 3000).mode == "learned"
+
+    def test_long_polling_domain_skips_networkidle(self):
+        learner = NavProfileLearner()
+        for _ in range(MIN_PROBES):
+            _probe(learner, _long_polling())
+        plan = learner.plan(_HOST, 6000, 3000)
+        assert plan.networkidle_ms == 0
+        assert plan.settle_max_ms == SETTLE_FLOOR_MS  # 120 ms p90 quiet × headroom, floored
+        learner.record(plan, NavObservation(0.0, False, 120.0, False))
+        assert learner.stats.snapshot()["saved_ms"] == 6000.0
+
+    def test_idle_that_changes_page_is_capped_not_skipped(self):
+        learner = NavProfileLearner()
+        for idle_ms in (400.0, 600.0, 800.0):
+            _probe(learner, NavObservation(idle_ms, True, 120.0, False, idle_changed=True, settle_changed=True))
+        plan = learner.plan(_HOST, 6000, 3000)
+        assert plan.networkidle_ms == 1200
+        assert plan.settle_max_ms == 3000  # settle changed the page: keep the default
+
+    def test_unknown_fingerprint_keeps_defaults(self):
+        learner = NavProfileLearner()
+        for _ in range(MIN_PROBES):
+            _probe(learner, NavObservation(6000.0, False, 3000.0, True))
+        plan = learner.plan(_HOST, 6000, 3000)
+        assert (plan.networkidle_ms, plan.settle_max_ms) == (6000, 3000)
+
+    def test_periodic_reprobe(self):
+        learner = NavProfileLearner()
+        modes = []
+        for _ in range(PROBE_EVERY):
+            plan = learner.plan(_HOST, 6000, 3000)
+            modes.append(plan.mode)
+            learner.record(plan, _long_polling())
+        assert modes[-1] == "probe"
+        assert modes[MIN_PROBES] == "learned"
+
+    def test_no_host_uses_defaults(self):
+        plan = NavProfileLearner().plan("", 6000, 3000)
+        assert plan.mode == "default"
+
+    def test_persisted_across_instances(self, tmp_path):
+        path = tmp_path / "nav_profiles.json"
+        learner = NavProfileLearner(path)
+        for _ in range(MIN_PROBES):
+            _probe(learner, _long_polling())
+        learner.save()
+        restored = NavProfileLearner(path)
+        assert restored.probes(_HOST) == learner.probes(_HOST)
+        assert restored.plan(_HOST, 6000, 3000).networkidle_ms == 0
+
+    async def test_periodic_save_runs_off_the_event_loop(self, tmp_path):
+        learner = NavProfileLearner(tmp_path / "nav_profiles.json")
+        writers: list[int] = []
+        with (
+            patch("pagemap.server.nav_profile.SAVE_EVERY", 1),
+            patch("pagemap.server.nav_profile.write_text_atomic", lambda *_: writers.append(threading.get_ident())),
+        ):
+            _probe(learner, _long_polling())
+            assert writers == []  # record() only schedules the write
+            await learner.flush()
+        assert len(writers) == 2 and threading.get_ident() not in writers
+
+    def test_corrupt_profile_file_ignored(self, tmp_path):
+        path = tmp_path / "nav_profiles.json"
+        path.write_text("{not json")
+        assert len(NavProfileLearner(path)) == 0
+
+
+class TestNavProfileStats:
+    def test_snapshot_and_reset(self):
+        stats = NavProfileStats()
+        stats.record("probe")
+        stats.record("learned", 4000.0)
+        stats.record("learned", 2000.0)
+        snap = stats.snapshot()
+        assert (snap["probe"], snap["learned"], snap["saved_ms"], snap["avg_saved_ms"]) == (1, 2, 6000.0, 3000.0)
+        stats.reset()
+        assert stats.snapshot()["learned"] == 0
+
+
+class TestAdaptiveNavigate:
+    @pytest.fixture
+    def learner(self):
+        learner = NavProfileLearner()
+        with (
+            patch("pagemap.server.browser_session.ADAPTIVE_NAV_WAIT_ENABLED", True),
+            patch("pagemap.server.browser_session.nav_profiles", learner),
+        ):
+            yield learner
+
+    def _session(self, evaluate: AsyncMock) -> BrowserSession:
+        session = BrowserSession(BrowserConfig(networkidle_budget_ms=100))
+        session._page = MagicMock()
+        session._page.url = "about:blank"
+        session._page.goto = AsyncMock()
+        session._page.evaluate = evaluate
+        session._context = MagicMock()
+        session._context.set_extra_http_headers = AsyncMock()
+
+        async def _hang_forever(state):
+            await asyncio.sleep(999)
+
+        session._page.wait_for_load_state = _hang_forever
+        return session
+
+    async def test_probe_records_fingerprint_changes(self, learner):
+        evaluate = AsyncMock(side_effect=[[50, 900, "Shop"], [50, 900, "Shop"], _QUIET, [52, 960, "Shop"]])
+        result = await self._session(evaluate).navigate(f"https://{_HOST}/")
+        assert result.wait_profile == "probe"
+        (obs,) = learner.probes(_HOST)
+        assert (obs.idle_reached, obs.idle_changed, obs.settle_changed) == (False, False, True)
+        assert obs.settle_ms == 120.0
+
+    async def test_learned_skip_avoids_networkidle_wait(self, learner):
+        for _ in range(MIN_PROBES):
+            _probe(learner, _long_polling())
+        session = self._session(AsyncMock(return_value=_QUIET))
+        session._page.wait_for_load_state = AsyncMock()
+        result = await session.navigate(f"https://{_HOST}/")
+        assert (result.wait_profile, result.strategy) == ("learned", "load+settle")
+        session._page.wait_for_load_state.assert_not_called()
+        assert session._page.evaluate.await_args.args[1] == [200, SETTLE_FLOOR_MS]  # settle capped too
+
+    async def test_disabled_by_default(self):
+        session = self._session(AsyncMock(return_value=_QUIET))
+        result = await session.navigate(f"https://{_HOST}/")
+        assert result.wait_profile is None
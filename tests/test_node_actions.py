@@ -0,0 +1,228 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for direct node-handle action dispatch (server/node_actions.py)."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import AsyncMock, MagicMock, PropertyMock, patch
+
+import pytest
+
+from pagemap import Interactable, PageMap
+from pagemap.dom_change_detector import DomFingerprint
+from pagemap.interactive_detector import _walk_ax_tree
+from pagemap.server import execute_action
+from pagemap.server.node_actions import dispatch_via_handle, handles_valid
+
+
+def _fp(*, document_id: float | None = 1700000000000.5, total: int = 5, title: str = "Page") -> DomFingerprint:
+    return DomFingerprint(
+        interactive_counts={"button": total},
+        total_interactives=total,
+        has_dialog=False,
+        body_child_count=3,
+        title=title,
+        document_id=document_id,
+    )
+
+
+class _FakeCDP:
+    """Records CDP calls and answers the methods used by dispatch_via_handle."""
+
+    def __init__(self, prepare: dict | None = None, *, stale: bool = False, fail_on: str | None = None) -> None:
+        self.calls: list[tuple[str, dict]] = []
+        self._prepare = prepare if prepare is not None else {"ok": True, "x": 10.0, "y": 20.0}
+        self._stale = stale
+        self._fail_on = fail_on
+
+    async def send(self, method: str, params: dict | None = None) -> dict:
+        self.calls.append((method, params or {}))
+        if method == "DOM.resolveNode":
+            if self._stale:
+                raise RuntimeError("No node with given id found")
+            return {"object": {"objectId": "obj-1"}}
+        if self._fail_on and self._fail_on == (params or {}).get("type", method):
+            raise RuntimeError("Target closed")
+        if method == "Runtime.callFunctionOn":
+            return {"result": {"value": self._prepare}}
+        return {}
+
+    def methods(self) -> list[str]:
+        return [m for m, _ in self.calls]
+
+
+class TestHandlesValid:
+    def test_same_document_same_structure(self):
+        assert handles_valid(_fp(), _fp())
+
+    def test_different_document(self):
+        assert not handles_valid(_fp(), _fp(document_id=1700000009999.0))
+
+    def test_structure_changed(self):
+        assert not handles_valid(_fp(), _fp(total=9))
+
+    def test_missing_fingerprints(self):
+        assert not handles_valid(None, _fp())
+        assert not handles_valid(_fp(document_id=None), _fp(document_id=None))
+
+
+class TestDispatchViaHandle:
+    async def test_click_dispatches_trusted_mouse_events(self):
+        cdp = _FakeCDP()
+        assert await dispatch_via_handle(cdp, 42, "click", None)
+        assert cdp.methods() == [
+            "DOM.resolveNode",
+            "Runtime.callFunctionOn",
+            "Input.dispatchMouseEvent",
+            "Input.dispatchMouseEvent",
+            "Input.dispatchMouseEvent",
+            "Runtime.releaseObject",
+        ]
+        assert cdp.calls[0][1] == {"backendNodeId": 42}
+        assert [p["type"] for m, p in cdp.calls if m == "Input.dispatchMouseEvent"] == [
+            "mouseMoved",
+            "mousePressed",
+            "mouseReleased",
+        ]
+
+    async def test_hover_moves_only(self):
+        cdp = _FakeCDP()
+        assert await dispatch_via_handle(cdp, 42, "hover", None)
+        assert [p["type"] for m, p in cdp.calls if m == "Input.dispatchMouseEvent"] == ["mouseMoved"]
+
+    async def test_type_inserts_text(self):
+        cdp = _FakeCDP({"ok": True})
+        assert await dispatch_via_handle(cdp, 7, "type", "hello")
+        assert ("Input.insertText", {"text": "hello"}) in cdp.calls
+
+    async def test_select_done_in_page(self):
+        cdp = _FakeCDP({"ok": True})
+        assert await dispatch_via_handle(cdp, 7, "select", "KR")
+        assert "Input.dispatchMouseEvent" not in cdp.methods()
+
+    async def test_stale_handle_falls_back(self):
+        cdp = _FakeCDP(stale=True)
+        assert not await dispatch_via_handle(cdp, 42, "click", None)
+        assert cdp.methods() == ["DOM.resolveNode"]
+
+    async def test_obscured_node_falls_back(self):
+        cdp = _FakeCDP({"ok": False, "reason": "obscured"})
+        assert not await dispatch_via_handle(cdp, 42, "click", None)
+        assert "Input.dispatchMouseEvent" not in cdp.methods()
+        assert cdp.methods()[-1] == "Runtime.releaseObject"
+
+    async def test_empty_type_value_uses_locator(self):
+        cdp = _FakeCDP()
+        assert not await dispatch_via_handle(cdp, 42, "type", "")
+        assert cdp.calls == []
+
+    async def test_failure_before_press_falls_back(self):
+        cdp = _FakeCDP(fail_on="mouseMoved")
+        assert not await dispatch_via_handle(cdp, 42, "click", None)
+
+    async def test_failure_after_press_raises(self):
+        cdp = _FakeCDP(fail_on="mouseReleased")
+        with pytest.raises(RuntimeError):
+            await dispatch_via_handle(cdp, 42, "click", None)
+
+
+class TestHandleTable:
+    def test_ax_walk_keeps_backend_node_id(self):
+        tree = {
+            "role": "WebArea",
+            "name": "",
+            "children": [{"role": "button", "name": "Buy", "backendDOMNodeId": 99, "children": []}],
+        }
+        results: list[Interactable] = []
+        _walk_ax_tree(tree, results, [0])
+        assert results[0].backend_node_id == 99
+
+    def test_page_map_node_handles(self):
+        pm = PageMap(
+            url="https://x.test",
+            title="",
+            page_type="unknown",
+            interactables=[
+                Interactable(
+                    ref=1, role="button", name="A", affordance="click", region="main", tier=1, backend_node_id=5
+                ),
+                Interactable(ref=2, role="button", name="B", affordance="click", region="main", tier=3),
+            ],
+            pruned_context="",
+            pruned_tokens=0,
+            generation_ms=0.0,
+        )
+        assert pm.node_handles == {1: 5}
+
+
+class TestExecuteActionUsesHandle:
+    @pytest.fixture
+    def session(self):
+        locator = AsyncMock()
+        locator.first = AsyncMock()
+        locator.count = AsyncMock(return_value=1)
+        page = MagicMock()
+        page.get_by_role = MagicMock(return_value=locator)
+        page.locator = MagicMock(return_value=locator)
+        type(page).url = PropertyMock(return_value="https://example.com")
+        session = MagicMock()
+        session.page = page
+        session.get_page_url = AsyncMock(return_value="https://example.com")
+        session.consume_new_page = MagicMock(return_value=None)
+        session.drain_dialogs = MagicMock(return_value=[])
+        session.cdp = _FakeCDP()
+        session.get_cdp_session = AsyncMock(return_value=session.cdp)
+        return session
+
+    @staticmethod
+    def _store(build_fp: DomFingerprint) -> None:
+        import pagemap.server as srv
+
+        pm = PageMap(
+            url="https://example.com",
+            title="Page",
+            page_type="unknown",
+            interactables=[
+                Interactable(
+                    ref=1, role="button", name="Buy", affordance="click", region="main", tier=1, backend_node_id=31
+                )
+            ],
+            pruned_context="",
+            pruned_tokens=0,
+            generation_ms=0.0,
+        )
+        srv._state.cache.store(pm, build_fp)
+
+    async def test_valid_handle_skips_locator(self, session):
+        self._store(_fp())
+        with (
+            patch("pagemap.server._get_session", return_value=session),
+            patch("pagemap.server.capture_dom_fingerprint", side_effect=[_fp(), _fp()]),
+        ):
+            result = await execute_action(ref=1, action="click")
+        assert json.loads(result)["description"] == "Clicked [1] button: Buy"
+        session.page.get_by_role.assert_not_called()
+        assert session.cdp.calls[0] == ("DOM.resolveNode", {"backendNodeId": 31})
+
+    async def test_new_document_uses_locator(self, session):
+        self._store(_fp())
+        current = _fp(document_id=1700000055555.0)
+        with (
+            patch("pagemap.server._get_session", return_value=session),
+            patch("pagemap.server.capture_dom_fingerprint", side_effect=[current, current]),
+        ):
+            await execute_action(ref=1, action="click")
+        session.page.get_by_role.assert_called()
+        assert session.cdp.calls == []
+
+    async def test_stale_handle_falls_back_to_locator(self, session):
+        self._store(_fp())
+        session.cdp._stale = True
+        with (
+            patch("pagemap.server._get_session", return_value=session),
+            patch("pagemap.server.capture_dom_fingerprint", side_effect=[_fp(), _fp()]),
+        ):
+            await execute_action(ref=1, action="click")
+        session.page.get_by_role.return_value.first.click.assert_awaited_once()
@@ -0,0 +1,92 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for compiled detector rule families (core/pattern_set.py)."""
+
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from pagemap.core.diagnostics.antibot_detector import _PROVIDER_RULES, detect_antibot
+from pagemap.core.diagnostics.i18n_patterns import BOT_BLOCKED_RE, PAGE_STATE_RULES
+from pagemap.core.ecommerce.cookie_patterns import _COOKIE_RULES
+from pagemap.core.ecommerce.login_detector import _LOGIN_RULES
+from pagemap.core.ecommerce.popup_detector import _POPUP_RULES
+from pagemap.core.pattern_set import PatternSet, PatternSetStats, detector_stats
+from pagemap.core.perf_bench import load_corpus
+
+_FAMILIES = (_COOKIE_RULES, _LOGIN_RULES, _POPUP_RULES, _PROVIDER_RULES, PAGE_STATE_RULES)
+
+_SYNTHETIC = (
+    '<div id="CybotCookiebotDialog" class="Login-Modal"><input type="Password"></div>',
+    "<body>Just a Moment… Checking your browser. Are-You-Over 18? Not available in your region</body>",
+    '<div class="newsletter-popup">Subscribe — 품절 · 검색 결과가 없습니다 · Accès refusé</div>',
+    '<iframe src="https://challenges.cloudflare.com/turnstile/v0"></iframe><form action="/signin">',
+)
+
+
+def _texts() -> list[str]:
+    return [page.html.lower() for page in load_corpus()] + [t.lower() for t in _SYNTHETIC]
+
+
+class TestEquivalence:
+    @pytest.mark.parametrize("rules", _FAMILIES, ids=lambda r: r.family)
+    def test_lowered_matches_ignorecase(self, rules):
+        for text in _texts():
+            for rule_id in rules.rule_ids:
+                expected = rules.pattern(rule_id).search(text)
+                got = rules.search(rule_id, text)
+                assert (got and got.span()) == (expected and expected.span()), (rules.family, rule_id)
+
+    def test_same_as_public_pattern(self):
+        text = "<p>access denied</p>"
+        assert PAGE_STATE_RULES.search("bot_blocked", text).group() == BOT_BLOCKED_RE.search(text).group()
+
+    def test_fold_variant_falls_back_to_ignorecase(self):
+        rules = PatternSet("t", [("cookie", r"cookies")])
+        text = "we use cookieſ"  # long s: lowercase, but folds onto "s"
+        assert re.search("cookies", text, re.IGNORECASE)
+        assert rules.search("cookie", text) is not None
+
+
+class TestPatternSet:
+    def test_priority_first_and_matching(self):
+        rules = PatternSet("t", [("a", r"alpha"), ("b", r"beta"), ("c", r"gamma")])
+        rule_id, match = rules.first("gamma beta")
+        assert (rule_id, match.group()) == ("b", "beta")
+        assert rules.first("gamma beta", ("c", "b"))[0] == "c"
+        assert rules.matching("gamma beta") == ("b", "c")
+        assert rules.first("delta") is None
+
+    def test_uppercase_rule_rejected(self):
+        with pytest.raises(ValueError, match="lowercase"):
+            PatternSet("t", [("a", r"Alpha")])
+        PatternSet("t", [("a", r"\d+\S\W")])  # escapes are not literals
+
+    def test_duplicate_rule_rejected(self):
+        with pytest.raises(ValueError, match="duplicate"):
+            PatternSet("t", [("a", r"x"), ("a", r"y")])
+
+    def test_antibot_verdict(self):
+        detection = detect_antibot(raw_html="", html_lower='<div class="g-recaptcha"></div>')
+        assert (detection.provider.value, detection.confidence) == ("recaptcha", 0.95)
+
+
+class TestPatternSetStats:
+    def test_snapshot_totals(self):
+        stats = PatternSetStats()
+        stats.record("cookie", 0.002)
+        stats.record("antibot", 0.001)
+        stats.record("cookie", 0.001)
+        snap = stats.snapshot()
+        assert snap["cookie"] == {"scans": 2, "total_ms": 3.0}
+        assert snap["total"] == {"scans": 3, "total_ms": 4.0}
+        stats.reset()
+        assert stats.snapshot() == {"total": {"scans": 0, "total_ms": 0}}
+
+    def test_detectors_record_scans(self):
+        detector_stats.reset()
+        detect_antibot(raw_html="", html_lower="<body>hello</body>")
+        assert detector_stats.snapshot()["antibot"]["scans"] == 1
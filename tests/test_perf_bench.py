@@ -0,0 +1,155 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the offline build-pipeline perf benchmark (core/perf_bench.py)."""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+import pytest
+
+from pagemap.core import perf_bench
+from pagemap.core.page_map_builder import MAX_DOM_NODES, MAX_HTML_SIZE_BYTES
+from pagemap.core.perf_bench import (
+    HUGE_SPA_NAME,
+    HUGE_STATE_NAME,
+    _percentiles,
+    compare_to_baseline,
+    default_worker_counts,
+    format_report,
+    load_corpus,
+    run_perf,
+)
+
+
+def _result(stage_p50: float = 10.0, page_p50: float = 20.0, pps: float = 50.0) -> dict:
+    lat = {"p50": stage_p50, "p95": stage_p50 * 2, "p99": stage_p50 * 3}
+    return {
+        "stages": {"pruning": {"wall_ms": dict(lat), "cpu_ms": dict(lat)}},
+        "pages": {"product": {"wall_ms": {"p50": page_p50, "p95": page_p50, "p99": page_p50}, "peak_alloc_mb": 1.0}},
+        "throughput_pages_per_s": {"1": pps},
+        "peak_rss_mb": 100.0,
+    }
+
+
+class TestCorpus:
+    def test_all_categories_present(self):
+        names = [p.name for p in load_corpus()]
+        assert names == ["product", "listing", "news", "wiki", "cjk_product", HUGE_SPA_NAME, HUGE_STATE_NAME]
+
+    def test_filter_by_name(self):
+        assert [p.name for p in load_corpus(["news"])] == ["news"]
+
+    def test_huge_spa_deterministic_and_within_limits(self):
+        from lxml import html as lxml_html
+
+        (a,) = load_corpus([HUGE_SPA_NAME])
+        (b,) = load_corpus([HUGE_SPA_NAME])
+        assert a.html == b.html
+        assert len(a.html.encode()) < MAX_HTML_SIZE_BYTES
+        assert sum(1 for _ in lxml_html.fromstring(a.html).iter()) < MAX_DOM_NODES
+
+
+class TestStats:
+    def test_percentiles(self):
+        stats = _percentiles([float(v) for v in range(1, 101)])
+        assert stats == {"p50": 50.0, "p95": 95.0, "p99": 99.0}
+
+    def test_percentiles_empty(self):
+        assert _percentiles([]) == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+    @pytest.mark.parametrize(
+        ("max_workers", "expected"),
+        [(1, [1]), (2, [1, 2]), (4, [1, 2, 4]), (6, [1, 2, 4, 6]), (8, [1, 2, 4, 8])],
+    )
+    def test_default_worker_counts(self, max_workers, expected):
+        assert default_worker_counts(max_workers) == expected
+
+
+class TestCompareToBaseline:
+    def test_no_regression(self):
+        assert compare_to_baseline(_result(), _result()) == []
+
+    def test_within_tolerance(self):
+        assert compare_to_baseline(_result(stage_p50=11.0), _result(stage_p50=10.0), tolerance=0.2) == []
+
+    def test_stage_slowdown_flagged(self):
+        regressions = compare_to_baseline(_result(stage_p50=15.0), _result(stage_p50=10.0))
+        assert any(r.startswith("stage pruning wall p50") for r in regressions)
+
+    def test_page_slowdown_flagged(self):
+        regressions = compare_to_baseline(_result(page_p50=40.0), _result(page_p50=20.0))
+        assert any(r.startswith("page product wall p50") for r in regressions)
+
+    def test_throughput_drop_flagged(self):
+        regressions = compare_to_baseline(_result(pps=30.0), _result(pps=50.0))
+        assert regressions == ["throughput @1 workers: 30.00 pages/s vs baseline 50.00 (-40%)"]
+
+    def test_sub_ms_noise_ignored(self):
+        assert compare_to_baseline(_result(stage_p50=0.9), _result(stage_p50=0.3)) == []
+
+
+class TestRunPerf:
+    def test_small_run(self):
+        result = run_perf(iterations=2, max_workers=1, rounds=1, names=["news", "cjk_product"])
+        json.dumps(result)
+        stages = result["stages"]
+        assert {"page_info", "pruning", "detection", "assembly", "total"} <= set(stages)
+        assert "pruning.prune_page.decompose" in stages
+        for stage in stages.values():
+            assert set(stage["wall_ms"]) == {"p50", "p95", "p99"}
+        assert stages["pruning"]["cpu_ms"]["p50"] >= 0
+        assert "cpu_ms" not in stages["pruning.prune_page.decompose"]
+        assert set(result["pages"]) == {"news", "cjk_product"}
+        assert result["pages"]["news"]["peak_alloc_mb"] > 0
+        assert result["throughput_pages_per_s"]["1"] > 0
+        assert "throughput:" in format_report(result)
+
+    @pytest.mark.parametrize(
+        ("platform", "maxrss", "expected"), [("linux", 204800, 200.0), ("darwin", 209715200, 200.0)]
+    )
+    def test_peak_rss_units(self, monkeypatch, platform, maxrss, expected):
+        resource = pytest.importorskip("resource")
+        monkeypatch.setattr(perf_bench.sys, "platform", platform)
+        monkeypatch.setattr(resource, "getrusage", lambda _who: argparse.Namespace(ru_maxrss=maxrss))
+        assert perf_bench._peak_rss_mb() == expected
+
+    def test_report_without_peak_rss(self):
+        assert "peak RSS" not in format_report({**_result(), "peak_rss_mb": None})
+
+
+class TestCliPerf:
+    def _args(self, tmp_path, **overrides) -> argparse.Namespace:
+        args = {
+            "iterations": 1,
+            "workers": 1,
+            "rounds": 1,
+            "pages": "news",
+            "output": str(tmp_path / "result.json"),
+            "baseline": str(tmp_path / "baseline.json"),
+            "update_baseline": False,
+            "tolerance": 0.2,
+        }
+        args.update(overrides)
+        return argparse.Namespace(**args)
+
+    def test_creates_missing_baseline(self, tmp_path, monkeypatch, capsys):
+        from pagemap.cli import cmd_perf
+
+        monkeypatch.setattr(perf_bench, "run_perf", lambda **_: _result())
+        cmd_perf(self._args(tmp_path))
+        assert json.loads((tmp_path / "baseline.json").read_text())["throughput_pages_per_s"] == {"1": 50.0}
+        assert (tmp_path / "result.json").exists()
+        assert "pruning" in capsys.readouterr().out
+
+    def test_regression_exits_nonzero(self, tmp_path, monkeypatch, capsys):
+        from pagemap.cli import cmd_perf
+
+        (tmp_path / "baseline.json").write_text(json.dumps(_result(pps=100.0)))
+        monkeypatch.setattr(perf_bench, "run_perf", lambda **_: _result(pps=50.0))
+        with pytest.raises(SystemExit) as exc_info:
+            cmd_perf(self._args(tmp_path))
+        assert exc_info.value.code == 1
+        assert "1 regression(s)" in capsys.readouterr().out
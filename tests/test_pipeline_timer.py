@@ -85,3 +85,71 @@ class TestPipelineTimer:
         timer.finalize()  # second call should be no-op
         stages = timer.elapsed_per_stage()
         assert len(stages) == 1
+
+    def test_cpu_per_stage(self):
+        timer = PipelineTimer()
+        timer.stage("pruning")
+        sum(i * i for i in range(200_000))
+        timer.stage("assembly")
+        timer.finalize()
+
+        cpu = timer.cpu_per_stage()
+        assert list(cpu.keys()) == ["pruning", "assembly"]
+        assert cpu["pruning"] > 0
+        assert all(v >= 0 for v in cpu.values())
+
+
+class TestSpans:
+    def test_span_noop_without_active_timer(self):
+        from pagemap.core.pipeline_timer import _NULL_SPAN, span
+
+        assert span("decompose") is _NULL_SPAN
+
+    def test_nested_spans_keyed_under_stage(self):
+        from pagemap.core.pipeline_timer import span
+
+        timer = PipelineTimer()
+        timer.stage("pruning")
+        with timer.activate():
+            with span("prune_page"):
+                with span("decompose"):
+                    pass
+                with span("decompose"):
+                    pass
+            with span("metadata"):
+                pass
+        timer.finalize()
+
+        assert list(timer.span_timings()) == ["pruning.prune_page.decompose", "pruning.prune_page", "pruning.metadata"]
+        assert span("x") is not None  # deactivated again → no-op
+        assert timer.span_timings().keys() == {
+            "pruning.prune_page.decompose",
+            "pruning.prune_page",
+            "pruning.metadata",
+        }
+
+    def test_span_path_restored_on_error(self):
+        from pagemap.core.pipeline_timer import span
+
+        timer = PipelineTimer()
+        timer.stage("assembly")
+        with timer.activate():
+            try:
+                with span("ecommerce"):
+                    raise ValueError("boom")
+            except ValueError:
+                pass
+            with span("images"):
+                pass
+        assert set(timer.span_timings()) == {"assembly.ecommerce", "assembly.images"}
+
+    def test_build_records_pruning_spans(self):
+        from pagemap.core.page_map_builder import build_page_map_offline
+
+        timer = PipelineTimer()
+        html = "<html><body><main><h1>Title</h1><p>" + "Body text for pruning. " * 20 + "</p></main></body></html>"
+        with timer.activate():
+            page_map = build_page_map_offline(raw_html=html, url="https://example.com/a", timer=timer)
+        spans = page_map.metadata["span_timing"]
+        assert "pruning.prune_page.decompose" in spans
+        assert "pruning.compressor" in spans
@@ -73,12 +73,20 @@ def _make_mock_new_page(url: str = "https://newsite.com", closed: bool = False)
     return new_page
 
 
+def _make_bare_session() -> BrowserSession:
+    """BrowserSession without a browser (``__init__`` skipped), not a shared-context tab."""
+    session = BrowserSession.__new__(BrowserSession)
+    session._host = None
+    session._delegates = {}
+    return session
+
+
 # ── TestBrowserSessionPopupTracking ──────────────────────────────────
 
 
 class TestBrowserSessionPopupTracking:
     async def test_on_new_page_stores_page(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         session._pending_new_page = None
         new_page = _make_mock_new_page("https://popup.com")
 
@@ -87,7 +95,7 @@ class TestBrowserSessionPopupTracking:
         assert session._pending_new_page is new_page
 
     def test_consume_returns_and_clears(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         page = _make_mock_new_page()
         session._pending_new_page = page
 
@@ -97,13 +105,13 @@ class TestBrowserSessionPopupTracking:
         assert session._pending_new_page is None
 
     def test_consume_none_when_empty(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         session._pending_new_page = None
 
         assert session.consume_new_page() is None
 
     async def test_multiple_popups_latest_wins(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         session._pending_new_page = None
 
         page1 = _make_mock_new_page("https://a.com")
@@ -115,7 +123,7 @@ class TestBrowserSessionPopupTracking:
         assert session._pending_new_page is page2
 
     async def test_multiple_popups_closes_unclaimed(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         session._pending_new_page = None
 
         page1 = _make_mock_new_page("https://a.com")
@@ -127,7 +135,7 @@ class TestBrowserSessionPopupTracking:
         page1.close.assert_awaited_once()
 
     async def test_unclaimed_already_closed_not_reclosed(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         session._pending_new_page = None
 
         page1 = _make_mock_new_page("https://a.com", closed=True)
@@ -139,7 +147,7 @@ class TestBrowserSessionPopupTracking:
         page1.close.assert_not_awaited()
 
     async def test_switch_page_updates_reference(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         old_page = _make_mock_new_page("https://old.com")
         new_page = _make_mock_new_page("https://new.com")
         session._page = old_page
@@ -150,7 +158,7 @@ class TestBrowserSessionPopupTracking:
         assert session._page is new_page
 
     async def test_switch_page_detaches_cdp(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         old_page = _make_mock_new_page("https://old.com")
         cdp = AsyncMock()
         session._page = old_page
@@ -163,7 +171,7 @@ class TestBrowserSessionPopupTracking:
         assert session._cdp_session is None
 
     async def test_switch_page_closes_old(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         old_page = _make_mock_new_page("https://old.com")
         session._page = old_page
         session._cdp_session = None
@@ -174,7 +182,7 @@ class TestBrowserSessionPopupTracking:
         old_page.close.assert_awaited_once()
 
     async def test_switch_page_old_already_closed(self):
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         old_page = _make_mock_new_page("https://old.com", closed=True)
         session._page = old_page
         session._cdp_session = None
@@ -186,7 +194,7 @@ class TestBrowserSessionPopupTracking:
 
     async def test_switch_page_none_old(self):
         """switch_page with no previous page should not error."""
-        session = BrowserSession.__new__(BrowserSession)
+        session = _make_bare_session()
         session._page = None
         session._cdp_session = None
 
@@ -0,0 +1,151 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the per-PageMap render/scan memo (core/render_cache.py)."""
+
+from __future__ import annotations
+
+import dataclasses
+from unittest.mock import patch
+
+import pytest
+
+from pagemap import Interactable, PageMap
+from pagemap.core.render_cache import MAX_MEMO_ENTRIES, RenderCacheStats, render_cache_stats, section_hashes
+from pagemap.serializer import (
+    estimate_prompt_tokens,
+    to_agent_prompt,
+    to_agent_prompt_diff,
+    to_agent_prompt_secure,
+)
+
+
+def _page_map(**overrides) -> PageMap:
+    defaults = {
+        "url": "https://shop.example.com/p/1",
+        "title": "Jacket",
+        "page_type": "product_detail",
+        "interactables": [
+            Interactable(ref=1, role="button", name="Add to cart", affordance="click", region="main", tier=1),
+            Interactable(ref=2, role="link", name="Reviews", affordance="click", region="main", tier=1),
+        ],
+        "pruned_context": "<h1>Jacket</h1><p>189,000 KRW</p>" * 20,
+        "pruned_tokens": 300,
+        "generation_ms": 42.0,
+        "images": ["https://img.example.com/1.jpg"],
+        "metadata": {"ecommerce": {"product": {"name": "Jacket"}}},
+    }
+    defaults.update(overrides)
+    return PageMap(**defaults)
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    render_cache_stats.reset()
+    yield
+    render_cache_stats.reset()
+
+
+class TestSectionHashes:
+    def test_equal_content_equal_hashes(self):
+        assert section_hashes(_page_map()) == section_hashes(_page_map())
+
+    def test_each_section_tracked_separately(self):
+        base = section_hashes(_page_map())
+        changed = section_hashes(_page_map(pruned_context="<p>other</p>"))
+        assert changed.info != base.info
+        assert (changed.actions, changed.images, changed.navigation) == (base.actions, base.images, base.navigation)
+
+    def test_refs_excluded_from_semantic_actions(self):
+        pm = _page_map()
+        renumbered = dataclasses.replace(
+            pm, interactables=[dataclasses.replace(i, ref=i.ref + 10) for i in pm.interactables]
+        )
+        assert section_hashes(renumbered).actions == section_hashes(pm).actions
+        assert section_hashes(renumbered).action_lines != section_hashes(pm).action_lines
+
+
+class TestMemo:
+    def test_repeat_render_hits(self):
+        pm = _page_map()
+        first = to_agent_prompt(pm, include_meta=True, cache_meta="miss")
+        second = to_agent_prompt(pm, include_meta=True, cache_meta="hit | age=3s")
+        assert second == first.replace("Cache: miss", "Cache: hit | age=3s")
+        snap = render_cache_stats.snapshot()
+        assert (snap["hits"], snap["misses"]) == (1, 1)
+        assert snap["hit_rate"] == 0.5
+
+    def test_secure_and_plain_share_body(self):
+        pm = _page_map()
+        plain = to_agent_prompt(pm, include_meta=True)
+        assert to_agent_prompt_secure(pm, include_meta=True) == plain
+        assert to_agent_prompt_secure(pm, include_meta=True) == plain
+        # plain miss; secure miss (its body lookup hits); secure hit
+        assert render_cache_stats.snapshot()["hits"] == 2
+
+    def test_in_place_mutation_invalidates(self):
+        pm = _page_map()
+        to_agent_prompt(pm)
+        pm.metadata["barrier_auto_dismissed"] = {"type": "cookie_consent", "method": "click"}
+        pm.warnings.append("Degraded: tier 3 skipped")
+        assert "Degraded: tier 3 skipped" in to_agent_prompt(pm)
+        assert render_cache_stats.snapshot()["hits"] == 0
+
+    def test_replace_starts_empty_memo(self):
+        pm = _page_map()
+        to_agent_prompt(pm)
+        assert pm._render_memo
+        assert dataclasses.replace(pm, title="Other")._render_memo == {}
+
+    def test_memo_bounded(self):
+        pm = _page_map()
+        for n in range(MAX_MEMO_ENTRIES * 2):
+            pm.pruned_context = f"<p>version {n}</p>"
+            to_agent_prompt(pm)
+        assert len(pm._render_memo) <= MAX_MEMO_ENTRIES
+
+    def test_token_estimate_reuses_body(self):
+        pm = _page_map()
+        tokens = estimate_prompt_tokens(pm)
+        assert f"Tokens: ~{tokens}" in to_agent_prompt(pm, include_meta=True)
+
+    def test_disabled(self):
+        pm = _page_map()
+        with patch("pagemap.core.serializer.RENDER_CACHE_ENABLED", False):
+            to_agent_prompt_secure(pm, include_meta=True)
+            to_agent_prompt_secure(pm, include_meta=True)
+        assert pm._render_memo == {}
+        assert render_cache_stats.snapshot()["hits"] == 0
+
+
+class TestDiffUsesHashes:
+    def test_unchanged_reuses_full_token_count(self):
+        pm = _page_map()
+        full = to_agent_prompt(pm, include_meta=True)
+        diff = to_agent_prompt_diff(pm, pm, cache_age_s=5, include_meta=True)
+        assert diff is not None
+        assert "Status: unchanged" in diff
+        tokens = full.split("Tokens: ~")[1].split("\n")[0]
+        assert f"(full: ~{tokens})" in diff
+        assert render_cache_stats.snapshot()["hits"] == 1
+
+    def test_changed_section_detected(self):
+        old = _page_map()
+        new = _page_map(images=["https://img.example.com/2.jpg"])
+        diff = to_agent_prompt_diff(old, new, include_meta=True)
+        assert diff is not None
+        assert "## Images (updated)" in diff
+        assert "## Info — unchanged" in diff
+        assert "## Actions — unchanged" in diff
+
+
+class TestRenderCacheStats:
+    def test_snapshot_and_reset(self):
+        stats = RenderCacheStats()
+        assert stats.snapshot() == {"hits": 0, "misses": 0, "hit_rate": 0.0, "saved_ms": 0.0}
+        stats.record_miss()
+        stats.record_hit(12.34)
+        stats.record_saved(1.0)
+        assert stats.snapshot() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "saved_ms": 13.3}
+        stats.reset()
+        assert stats.snapshot()["hits"] == 0
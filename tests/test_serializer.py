@@ -156,6 +156,12 @@ class TestAgentPromptFormat:
         assert "Interactables: 1" in prompt
         assert "Generation: 55ms" in prompt
 
+    def test_timing_meta_line(self):
+        pm = _make_page_map()
+        prompt = to_agent_prompt(pm, include_meta=True, timing_meta="pruning=12ms")
+        assert "Timing: pruning=12ms" in prompt
+        assert "Timing:" not in to_agent_prompt(pm, include_meta=True)
+
     def test_no_meta_section_by_default(self):
         pm = _make_page_map()
         prompt = to_agent_prompt(pm, include_meta=False)
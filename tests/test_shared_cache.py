@@ -0,0 +1,258 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the shared L2 page-map cache (server/shared_cache.py)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from pagemap import Interactable, PageMap
+from pagemap.core.ecommerce import BarrierResult, BarrierType
+from pagemap.dom_change_detector import DomFingerprint
+from pagemap.server.shared_cache import (
+    FileBackend,
+    SharedPageMapCache,
+    create_shared_cache,
+    decode_page_map,
+    document_digest,
+    encode_page_map,
+    is_shareable,
+    page_map_key,
+    shareable_document_digest,
+)
+from pagemap.template_cache import InMemoryTemplateCache, PageTemplate, TemplateData, TemplateKey
+
+_URL = "https://news.example.com/story?id=7&b=2"
+
+
+def _page_map(**overrides) -> PageMap:
+    defaults = {
+        "url": _URL,
+        "title": "Story",
+        "page_type": "article",
+        "interactables": [
+            Interactable(
+                ref=1,
+                role="link",
+                name="Home",
+                affordance="click",
+                region="header",
+                tier=1,
+                selector="#home",
+                backend_node_id=42,
+            ),
+            Interactable(
+                ref=2,
+                role="combobox",
+                name="Sort",
+                affordance="select",
+                region="main",
+                tier=1,
+                options=["New", "Top"],
+            ),
+        ],
+        "pruned_context": "<h1>Story</h1><p>Body</p>",
+        "pruned_tokens": 12,
+        "generation_ms": 850.0,
+        "images": ["https://img.example.com/a.jpg"],
+        "metadata": {"author": "Kim"},
+        "navigation_hints": {"pagination": {"next_ref": 3}},
+        "pruned_regions": {"footer"},
+    }
+    defaults.update(overrides)
+    return PageMap(**defaults)
+
+
+_HTML = "<html><body><h1>Story</h1><p>Body</p></body></html>"
+_DIGEST = document_digest(_HTML)
+_FP = DomFingerprint(
+    interactive_counts={"a": 1, "select": 1},
+    total_interactives=2,
+    has_dialog=False,
+    body_child_count=4,
+    title="Story",
+    content_hash=1234,
+)
+
+
+def _live_page(html: str = _HTML, cookies: list | None = None, storage: list | None = None) -> MagicMock:
+    page = MagicMock()
+    page.context.cookies = AsyncMock(return_value=cookies or [])
+    page.evaluate = AsyncMock(return_value={"html": html, "storage": storage or []})
+    return page
+
+
+@pytest.fixture
+def shared(tmp_path) -> SharedPageMapCache:
+    return SharedPageMapCache(FileBackend(tmp_path / "l2"))
+
+
+class TestEncoding:
+    def test_round_trip_strips_node_ids(self):
+        decoded, created = decode_page_map(encode_page_map(_page_map()))
+        original = _page_map()
+        assert decoded.interactables[0].backend_node_id is None
+        assert decoded.interactables[0].selector == "#home"
+        assert decoded.interactables[1].options == ["New", "Top"]
+        assert decoded.pruned_regions == {"footer"}
+        assert (decoded.url, decoded.pruned_context, decoded.metadata, decoded.navigation_hints) == (
+            original.url,
+            original.pruned_context,
+            original.metadata,
+            original.navigation_hints,
+        )
+        assert created > 0
+
+    def test_key_normalizes_url(self):
+        assert page_map_key(_URL + "#top", _DIGEST) == page_map_key("https://NEWS.example.com/story?b=2&id=7", _DIGEST)
+
+    def test_key_tracks_content_and_tenant(self):
+        assert page_map_key(_URL, document_digest("a")) != page_map_key(_URL, document_digest("b"))
+        assert page_map_key(_URL, _DIGEST, "tenant-a") != page_map_key(_URL, _DIGEST, "tenant-b")
+
+    async def test_digest_covers_whole_document(self):
+        head = "x" * 2000
+        first = await shareable_document_digest(_live_page(head + "<p>Alice's order #1</p>"), _URL)
+        second = await shareable_document_digest(_live_page(head + "<p>Bob's order #2</p>"), _URL)
+        assert first is not None and second is not None
+        assert first != second
+
+    async def test_authenticated_state_not_shared(self):
+        assert await shareable_document_digest(_live_page(), _URL) == _DIGEST
+        session_cookie = [{"name": "sessionid", "value": "s3cr3t"}]
+        assert await shareable_document_digest(_live_page(cookies=session_cookie), _URL) is None
+        assert await shareable_document_digest(_live_page(storage=["auth_token"]), _URL) is None
+        seeded = [{"name": "OptanonConsent", "value": "groups=C0001%3A1"}]
+        assert await shareable_document_digest(_live_page(cookies=seeded, storage=["didomi_token"]), _URL) == _DIGEST
+
+    def test_only_clean_builds_shared(self):
+        assert is_shareable(_page_map())
+        assert not is_shareable(_page_map(warnings=["Degraded"]))
+        barrier = BarrierResult(
+            barrier_type=BarrierType.LOGIN_REQUIRED,
+            provider="generic",
+            auto_dismissible=False,
+            accept_ref=None,
+            confidence=0.9,
+        )
+        assert not is_shareable(_page_map(barrier=barrier))
+        assert not is_shareable(_page_map(metadata={"_force_cache_evict": True}))
+
+
+class TestSharedPageMapCache:
+    async def test_put_then_get(self, shared):
+        entry = shared.prepare(_page_map(), _DIGEST)
+        assert entry is not None
+        await shared.put(*entry)
+        hit = await shared.get_page_map(_URL, _DIGEST)
+        assert hit is not None
+        page_map, age_s = hit
+        assert page_map.title == "Story"
+        assert age_s < 60
+        assert await shared.get_page_map(_URL, document_digest(_HTML + " ")) is None
+        snap = shared.stats.snapshot()
+        assert (snap["hits"], snap["misses"], snap["writes"]) == (1, 1, 1)
+        assert snap["hit_rate"] == 0.5
+
+    async def test_same_prefix_different_tail_misses(self, shared):
+        head = "<html><body>" + "Welcome back! " * 200
+        first = await shareable_document_digest(_live_page(head + "<p>Cart: 3 items</p></body></html>"), _URL)
+        second = await shareable_document_digest(_live_page(head + "<p>Cart: 0 items</p></body></html>"), _URL)
+        await shared.put(*shared.prepare(_page_map(), first))
+        assert await shared.get_page_map(_URL, second) is None
+        assert await shared.get_page_map(_URL, first) is not None
+
+    async def test_tenant_scoped(self, shared):
+        await shared.put(*shared.prepare(_page_map(), _DIGEST, "tenant-a"))
+        assert await shared.get_page_map(_URL, _DIGEST, "tenant-b") is None
+        assert await shared.get_page_map(_URL, _DIGEST, "tenant-a") is not None
+
+    async def test_expired_entry_misses(self, tmp_path):
+        shared = SharedPageMapCache(FileBackend(tmp_path), ttl_s=-1)
+        await shared.put(*shared.prepare(_page_map(), _DIGEST))
+        assert await shared.get_page_map(_URL, _DIGEST) is None
+
+    def test_size_cap(self, tmp_path):
+        shared = SharedPageMapCache(FileBackend(tmp_path), max_bytes=16)
+        assert shared.prepare(_page_map(), _DIGEST) is None
+        assert shared.stats.snapshot()["skipped"] == 1
+
+    async def test_backend_errors_never_raise(self):
+        backend = MagicMock()
+        backend.get = AsyncMock(side_effect=ConnectionError("refused"))
+        backend.set = AsyncMock(side_effect=ConnectionError("refused"))
+        shared = SharedPageMapCache(backend)
+        assert await shared.get_page_map(_URL, _DIGEST) is None
+        await shared.put("k", b"v")
+        assert shared.stats.snapshot()["errors"] == 2
+
+    async def test_templates_shared_per_domain(self, shared):
+        template = PageTemplate(
+            data=TemplateData(has_main=True, metadata_source="json_ld", metadata_fields_found=frozenset({"name"})),
+            key=TemplateKey("news.example.com", "article"),
+            source_url=_URL,
+        )
+        await shared.push_template(template)
+        local = InMemoryTemplateCache()
+        assert await shared.pull_templates("news.example.com", local) == 1
+        pulled = local.peek(TemplateKey("news.example.com", "article"))
+        assert pulled is not None
+        assert pulled.data == template.data
+        assert await shared.pull_templates("news.example.com", local) == 0  # local wins
+
+    async def test_create_from_url(self, tmp_path):
+        shared = await create_shared_cache(f"file://{tmp_path}/l2")
+        assert isinstance(shared, SharedPageMapCache)
+        assert await create_shared_cache("memcached://localhost") is None
+
+
+class TestTierL2:
+    @pytest.fixture(autouse=True)
+    def _clean_cache(self):
+        import pagemap.server as srv
+
+        srv._state.cache.invalidate_all()
+        yield
+        srv._state.cache.invalidate_all()
+
+    def _session(self) -> MagicMock:
+        session = MagicMock()
+        session.get_page_url = AsyncMock(return_value=_URL)
+        session.get_page_title = AsyncMock(return_value="Story")
+        session.read_mutation_severity = AsyncMock(return_value=0)
+        session.consume_new_page = MagicMock(return_value=None)
+        session.drain_dialogs = MagicMock(return_value=[])
+        session.page = MagicMock()
+        return session
+
+    async def _get_page_map(self, shared, build):
+        import pagemap.server as srv
+
+        with (
+            patch("pagemap.server._shared_cache", shared),
+            patch("pagemap.server._get_session", return_value=self._session()),
+            patch("pagemap.server.capture_dom_fingerprint", AsyncMock(return_value=_FP)),
+            patch("pagemap.server.shareable_document_digest", AsyncMock(return_value=_DIGEST)),
+            patch("pagemap.server._validate_url_with_dns", AsyncMock(return_value=None)),
+            patch("pagemap.page_map_builder.build_page_map_live", build),
+        ):
+            result = await srv.get_page_map()
+            await asyncio.gather(*srv._state._background_tasks)
+        return result
+
+    async def test_full_build_published_then_served(self, shared):
+        import pagemap.server as srv
+
+        await self._get_page_map(shared, AsyncMock(return_value=_page_map()))
+        assert shared.stats.snapshot()["writes"] == 1
+
+        srv._state.cache.invalidate_all()
+        build = AsyncMock(side_effect=AssertionError("full build not expected"))
+        result = await self._get_page_map(shared, build)
+        assert "Cache: shared | age=" in result
+        assert "[2] combobox: Sort" in result
+        assert srv._state.cache.stats.shared_hits == 1
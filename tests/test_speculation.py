@@ -0,0 +1,235 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for speculative page-map prebuild (server/speculation.py)."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from pagemap import Interactable, PageMap
+from pagemap.dom_change_detector import DomFingerprint
+from pagemap.server.speculation import SpeculationResult, SpeculationStats, SpeculativePrebuilder
+
+_URL = "https://shop.example.com/list?page=2"
+
+
+def _page_map(page_type: str = "listing", metadata: dict | None = None) -> PageMap:
+    return PageMap(
+        url=_URL,
+        title="Listing",
+        page_type=page_type,
+        interactables=[
+            Interactable(ref=1, role="link", name="Next page", affordance="click", region="main", tier=1),
+        ],
+        pruned_context="<h1>Listing</h1>",
+        pruned_tokens=8,
+        generation_ms=900.0,
+        images=[],
+        metadata=metadata or {},
+    )
+
+
+def _fp(content_hash: int = 7) -> DomFingerprint:
+    return DomFingerprint(
+        interactive_counts={"a": 1},
+        total_interactives=1,
+        has_dialog=False,
+        body_child_count=3,
+        title="Listing",
+        content_hash=content_hash,
+    )
+
+
+async def _result(result: SpeculationResult) -> SpeculationResult:
+    return result
+
+
+class TestSpeculativePrebuilder:
+    async def test_served_prebuild_is_a_hit(self):
+        prebuilder = SpeculativePrebuilder()
+        prebuilder.schedule("s", lambda: _result(SpeculationResult("ready", "gen1", 120.0)))
+        await asyncio.sleep(0)
+        assert prebuilder.consume("s", "gen1")
+        assert not prebuilder.pending("s")
+        snap = prebuilder.stats.snapshot()
+        assert (snap["hit"], snap["hit_rate"], snap["saved_ms"]) == (1, 1.0, 120.0)
+
+    async def test_other_generation_served_is_unused(self):
+        prebuilder = SpeculativePrebuilder()
+        prebuilder.schedule("s", lambda: _result(SpeculationResult("ready", "gen1", 50.0)))
+        await asyncio.sleep(0)
+        assert not prebuilder.consume("s", None)
+        snap = prebuilder.stats.snapshot()
+        assert (snap["unused"], snap["wasted_ms"]) == (1, 50.0)
+
+    async def test_next_tool_call_cancels_in_flight_build(self):
+        prebuilder = SpeculativePrebuilder()
+        started = asyncio.Event()
+
+        async def slow() -> SpeculationResult:
+            started.set()
+            await asyncio.sleep(10)
+            return SpeculationResult("ready", "gen1")
+
+        prebuilder.schedule("s", slow)
+        await started.wait()
+        task = prebuilder._by_key["s"].task
+        prebuilder.cancel("s")
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert prebuilder.stats.snapshot()["cancelled"] == 1
+
+    async def test_in_flight_build_survives_consume(self):
+        prebuilder = SpeculativePrebuilder()
+        gate = asyncio.Event()
+
+        async def gated() -> SpeculationResult:
+            await gate.wait()
+            return SpeculationResult("ready", "gen1")
+
+        prebuilder.schedule("s", gated)
+        assert not prebuilder.consume("s", None)
+        assert prebuilder.pending("s")
+        gate.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert prebuilder.consume("s", "gen1")
+
+    async def test_stale_and_failed_recorded(self):
+        prebuilder = SpeculativePrebuilder()
+
+        async def boom() -> SpeculationResult:
+            raise RuntimeError("page closed")
+
+        with patch("pagemap.server.speculation.time.perf_counter", return_value=100.0):  # failed → 0ms elapsed
+            prebuilder.schedule("a", lambda: _result(SpeculationResult("stale", build_ms=30.0)))
+            prebuilder.schedule("b", boom)
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+        snap = prebuilder.stats.snapshot()
+        assert (snap["stale"], snap["failed"], snap["wasted_ms"]) == (1, 1, 30.0)
+        assert not prebuilder.pending("a") and not prebuilder.pending("b")
+
+    def test_remembered_options_bounded(self):
+        prebuilder = SpeculativePrebuilder()
+        with patch("pagemap.server.speculation.MAX_TRACKED_SESSIONS", 2):
+            for key in ("a", "b", "c"):
+                prebuilder.remember(key, 1500, None)
+        assert prebuilder.options("a") is None
+        assert prebuilder.options("c") == (1500, None)
+
+
+class TestSpeculationStats:
+    def test_snapshot_and_reset(self):
+        stats = SpeculationStats()
+        stats.record("hit", 100.0)
+        stats.record("unused", 40.0)
+        stats.record("cancelled", 10.0)
+        snap = stats.snapshot()
+        assert (snap["hit_rate"], snap["saved_ms"], snap["wasted_ms"]) == (0.5, 100.0, 50.0)
+        stats.reset()
+        assert stats.snapshot()["hit"] == 0
+
+
+class TestServerFlow:
+    @pytest.fixture(autouse=True)
+    def _clean(self):
+        import pagemap.server as srv
+
+        srv._state.cache.invalidate_all()
+        srv._prebuilder._by_key.clear()
+        srv._prebuilder.stats.reset()
+        yield
+        srv._state.cache.invalidate_all()
+        srv._prebuilder.stats.reset()
+
+    def _session(self) -> MagicMock:
+        session = MagicMock()
+        session.get_page_url = AsyncMock(return_value=_URL)
+        session.get_page_title = AsyncMock(return_value="Listing")
+        session.read_mutation_severity = AsyncMock(return_value=0)
+        session.consume_new_page = MagicMock(return_value=None)
+        session.drain_dialogs = MagicMock(return_value=[])
+        session.page = MagicMock()
+        return session
+
+    async def _scroll_then_get(self, fingerprint: AsyncMock, build: AsyncMock) -> str:
+        import pagemap.server as srv
+
+        with (
+            patch("pagemap.server.SPECULATIVE_PREBUILD_ENABLED", True),
+            patch("pagemap.server._scroll_page_impl", AsyncMock(return_value="Scrolled down by 720px.")),
+            patch("pagemap.server._get_session", return_value=self._session()),
+            patch("pagemap.server.capture_dom_fingerprint", fingerprint),
+            patch("pagemap.server._validate_url_with_dns", AsyncMock(return_value=None)),
+            patch("pagemap.page_map_builder.build_page_map_live", build),
+        ):
+            await srv.scroll_page()
+            (spec,) = srv._prebuilder._by_key.values()
+            await asyncio.gather(spec.task, return_exceptions=True)
+            return await srv.get_page_map()
+
+    async def test_prebuild_turns_next_get_page_map_into_hit(self):
+        import pagemap.server as srv
+
+        hits = srv._state.cache.stats.hits
+        build = AsyncMock(return_value=_page_map())
+        result = await self._scroll_then_get(AsyncMock(return_value=_fp()), build)
+        assert build.await_count == 1  # only the speculative build
+        assert "[1] link: Next page" in result  # full prompt, not a diff against an unseen map
+        assert "Cache: prebuilt | age=" in result
+        assert srv._state.cache.stats.hits == hits + 1
+        assert srv._prebuilder.stats.snapshot()["hit"] == 1
+
+    async def test_fingerprint_moved_during_build_discards_prebuild(self):
+        import pagemap.server as srv
+
+        fingerprint = AsyncMock(side_effect=[_fp(1), _fp(2), _fp(2), _fp(2)])
+        build = AsyncMock(return_value=_page_map())
+        await self._scroll_then_get(fingerprint, build)
+        assert build.await_count == 2  # speculative (stale) + interactive
+        assert srv._prebuilder.stats.snapshot()["stale"] == 1
+
+    async def test_bot_blocked_build_not_kept(self):
+        import pagemap.server as srv
+
+        build = AsyncMock(return_value=_page_map("blocked", {"blocked_info": {"detected": True}}))
+        result = await self._scroll_then_get(AsyncMock(return_value=_fp()), build)
+        assert srv._prebuilder.stats.snapshot()["skipped"] == 1
+        assert "Cache: prebuilt" not in result
+
+    async def test_failed_action_not_speculated(self):
+        import pagemap.server as srv
+
+        with (
+            patch("pagemap.server.SPECULATIVE_PREBUILD_ENABLED", True),
+            patch(
+                "pagemap.server._scroll_page_impl", AsyncMock(return_value="Error: scroll_page timed out after 10s.")
+            ),
+            patch("pagemap.server._get_session", return_value=self._session()),
+        ):
+            await srv.scroll_page()
+        assert not srv._prebuilder._by_key
+
+
+class TestActionFailed:
+    @pytest.mark.parametrize(
+        ("result", "failed"),
+        [
+            ("Scrolled down by 720px.", False),
+            ("Error: Browser connection lost. Call get_page_map to recover.", True),
+            ('{"description": "Clicked", "change": "none", "refs_expired": false}', False),
+            ('{"error": "Element not found", "refs_expired": true}', True),
+            ("fill_form: 3/3 fields completed.", False),
+            ("fill_form: 1/3 fields completed (stopped: navigation).", False),
+            ("fill_form: 1/3 fields completed (stopped: action error).\n  [2] textbox", True),
+        ],
+    )
+    def test_classifies_tool_responses(self, result, failed):
+        from pagemap.server import _action_failed
+
+        assert _action_failed(result) is failed
@@ -0,0 +1,66 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for page-map stage histograms exported on /metrics (server/stage_metrics.py)."""
+
+from __future__ import annotations
+
+import pytest
+
+from pagemap.core.pipeline_timer import PipelineTimer, span
+from pagemap.server.stage_metrics import METRIC_NAME, StageHistograms
+
+
+class TestStageHistograms:
+    def test_observe_buckets_cumulative(self):
+        hist = StageHistograms(buckets=(0.01, 0.1, 1.0))
+        hist.observe("pruning", "article", "C", 0.005)
+        hist.observe("pruning", "article", "C", 0.05)
+        hist.observe("pruning", "article", "C", 5.0)
+        data = hist.snapshot()[("pruning", "article", "C")]
+        assert data["buckets"] == [("0.01", 1), ("0.1", 2), ("1.0", 2), ("+Inf", 3)]
+        assert data["count"] == 3
+        assert data["sum"] == pytest.approx(5.055)
+
+    def test_labels_kept_separate(self):
+        hist = StageHistograms()
+        hist.observe("pruning", "article", "C", 0.1)
+        hist.observe("pruning", "listing", "B", 0.1)
+        assert set(hist.snapshot()) == {("pruning", "article", "C"), ("pruning", "listing", "B")}
+
+    def test_observe_timer_includes_spans(self):
+        hist = StageHistograms()
+        timer = PipelineTimer()
+        timer.stage("pruning")
+        with timer.activate(), span("decompose"):
+            pass
+        timer.finalize()
+        hist.observe_timer(timer, page_type="product_detail", cache_tier="C")
+        stages = {k[0] for k in hist.snapshot()}
+        assert stages == {"pruning", "pruning.decompose"}
+
+    def test_reset(self):
+        hist = StageHistograms()
+        hist.observe("pruning", "article", "C", 0.1)
+        hist.reset()
+        assert hist.snapshot() == {}
+
+
+class TestPrometheusExport:
+    def test_exposition_format(self):
+        prometheus_client = pytest.importorskip("prometheus_client")
+
+        hist = StageHistograms(buckets=(0.1, 1.0))
+        hist.observe("pruning.prune_page.decompose", "article", "C", 0.05)
+        registry = prometheus_client.CollectorRegistry()
+        registry.register(hist)
+        text = prometheus_client.generate_latest(registry).decode()
+        assert f"# TYPE {METRIC_NAME} histogram" in text
+        assert (
+            f'{METRIC_NAME}_bucket{{cache_tier="C",le="0.1",page_type="article",stage="pruning.prune_page.decompose"}} 1.0'
+            in text
+        )
+        assert (
+            f'{METRIC_NAME}_count{{cache_tier="C",page_type="article",stage="pruning.prune_page.decompose"}} 1.0'
+            in text
+        )
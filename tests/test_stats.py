@@ -0,0 +1,70 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the shared stats collector base, its registry and env flags (core/stats.py, core/env.py)."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from pagemap.core.env import env_flag
+from pagemap.core.stats import Counter, StatsCollector, enabled_collectors, register_collector
+
+
+class _Stats(StatsCollector):
+    LABELS = ("outcome",)
+    FIELDS = ("count", "seconds")
+    SEED = (("hit",), ("miss",))
+    COUNTERS = (
+        Counter("t_total", "Lookups", "count", only=("hit", "miss")),
+        Counter("t_seconds_total", "Lookup time", "seconds", labelled=False, scale=0.5),
+    )
+
+    __slots__ = ()
+
+
+class TestStatsCollector:
+    def test_add_seed_and_reset(self):
+        stats = _Stats()
+        stats.add(("hit",), 1, 0.2)
+        stats.add(("hit",), 1)
+        stats.add(("other",), 1, 0.4)
+        assert stats.rows() == {("hit",): [2, 0.2], ("miss",): [0, 0], ("other",): [1, 0.4]}
+        stats.reset()
+        assert stats.rows() == {("hit",): [0, 0], ("miss",): [0, 0]}
+
+    def test_collect_exports_declared_counters(self):
+        pytest.importorskip("prometheus_client")
+
+        stats = _Stats()
+        stats.add(("hit",), 3, 1.0)
+        stats.add(("other",), 5, 1.0)
+        lookups, seconds = stats.collect()
+        assert [(s.labels, s.value) for s in lookups.samples] == [({"outcome": "hit"}, 3), ({"outcome": "miss"}, 0)]
+        assert [s.value for s in seconds.samples] == [1.0]  # both rows, scaled
+
+    def test_registry_skips_disabled_features(self):
+        on, off = _Stats(), _Stats()
+        with patch.dict("pagemap.core.stats._collectors", clear=True):
+            register_collector("on", lambda: on)
+            register_collector("off", lambda: None)
+            register_collector("on", lambda: off)  # same name replaces
+            assert enabled_collectors() == [off]
+
+
+class TestEnvFlag:
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [("1", True), ("TRUE", True), (" yes ", True), ("0", False), ("", False), ("no", False)],
+    )
+    def test_values(self, monkeypatch, value, expected):
+        monkeypatch.setenv("PAGEMAP_TEST_FLAG", value)
+        assert env_flag("PAGEMAP_TEST_FLAG") is expected
+        assert env_flag("PAGEMAP_TEST_FLAG", default=True) is expected
+
+    def test_unset_uses_default(self, monkeypatch):
+        monkeypatch.delenv("PAGEMAP_TEST_FLAG", raising=False)
+        assert env_flag("PAGEMAP_TEST_FLAG") is False
+        assert env_flag("PAGEMAP_TEST_FLAG", default=True) is True
@@ -7,11 +7,14 @@ Verifies:
 4. Browser death handling
 5. Timeout handling
 6. Dialog warnings included in response
+7. CDP capture options (format, quality, scale, ref clip) and byte-budget ladder
+8. page.screenshot fallback without CDP
 """
 
 from __future__ import annotations
 
 import asyncio
+import base64
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from mcp.server.fastmcp import Image as McpImage
@@ -233,3 +236,157 @@ class TestScreenshotDialogWarnings:
 
         assert "JS dialog" in result[1]
         assert "Delete?" in result[1]
+
+
+# ── TestScreenshotCDP ─────────────────────────────────────────────
+
+
+class _FakeScreenshotCDP:
+    """Answers getLayoutMetrics and captureScreenshot; size shrinks with quality/scale."""
+
+    def __init__(self, png_size: int = 4000) -> None:
+        self.png_size = png_size
+        self.captures: list[dict] = []
+
+    async def send(self, method: str, params: dict | None = None) -> dict:
+        if method == "Page.getLayoutMetrics":
+            return {
+                "cssVisualViewport": {"pageX": 0, "pageY": 500, "clientWidth": 1280, "clientHeight": 800},
+                "cssContentSize": {"width": 1280, "height": 6000},
+            }
+        assert method == "Page.captureScreenshot"
+        self.captures.append(params)
+        scale = params["clip"]["scale"]
+        size = self.png_size if params["format"] == "png" else self.png_size * params["quality"] // 200
+        return {"data": base64.b64encode(b"\xff" * int(size * scale * scale)).decode()}
+
+
+def _make_cdp_session(cdp: _FakeScreenshotCDP) -> MagicMock:
+    session = _make_mock_session()
+    session.get_cdp_session = AsyncMock(return_value=cdp)
+    return session
+
+
+class TestScreenshotCDP:
+    """Capture through CDP Page.captureScreenshot."""
+
+    async def test_viewport_capture_params(self):
+        cdp = _FakeScreenshotCDP()
+        session = _make_cdp_session(cdp)
+
+        with patch("pagemap.server._get_session", return_value=session):
+            result = await take_screenshot()
+
+        params = cdp.captures[0]
+        assert params["format"] == "png"
+        assert params["optimizeForSpeed"] is True
+        assert params["clip"] == {"x": 0, "y": 500, "width": 1280, "height": 800, "scale": 1.0}
+        assert params["captureBeyondViewport"] is False
+        assert "quality" not in params
+        session.page.screenshot.assert_not_called()
+        assert result[0]._format == "png"
+        assert "capture " in result[1]
+
+    async def test_webp_quality_and_scale(self):
+        cdp = _FakeScreenshotCDP()
+        session = _make_cdp_session(cdp)
+
+        with patch("pagemap.server._get_session", return_value=session):
+            result = await take_screenshot(format="webp", quality=55, scale=0.5)
+
+        params = cdp.captures[0]
+        assert (params["format"], params["quality"], params["clip"]["scale"]) == ("webp", 55, 0.5)
+        assert result[0]._format == "webp"
+        assert "webp q55, scale 0.5" in result[1]
+
+    async def test_full_page_captures_beyond_viewport(self):
+        cdp = _FakeScreenshotCDP()
+        session = _make_cdp_session(cdp)
+
+        with patch("pagemap.server._get_session", return_value=session):
+            await take_screenshot(full_page=True)
+
+        params = cdp.captures[0]
+        assert params["clip"]["height"] == 6000
+        assert params["captureBeyondViewport"] is True
+
+    async def test_budget_steps_down_until_fit(self):
+        cdp = _FakeScreenshotCDP(png_size=10_000)
+        session = _make_cdp_session(cdp)
+
+        with patch("pagemap.server._get_session", return_value=session):
+            result = await take_screenshot(max_bytes=1_000)
+
+        steps = [(p["format"], p.get("quality"), p["clip"]["scale"]) for p in cdp.captures]
+        assert steps[0] == ("png", None, 1.0)
+        assert steps[1] == ("jpeg", 80, 1.0)
+        assert steps[-1][2] < 1.0  # quality ladder exhausted, then downscaled
+        assert len(result[0].data) <= 1_000
+        assert "re-encode" in result[1]
+        assert f"over {len(steps) - 1} step(s)" in result[1]
+
+    async def test_budget_unreachable_returns_error(self):
+        cdp = _FakeScreenshotCDP(png_size=10_000_000)
+        session = _make_cdp_session(cdp)
+
+        with patch("pagemap.server._get_session", return_value=session):
+            result = await take_screenshot(full_page=True, max_bytes=10)
+
+        assert isinstance(result, str)
+        assert "Screenshot too large" in result
+
+    async def test_ref_clip_uses_element_rect(self):
+        import pagemap.server as srv
+        from pagemap import Interactable
+
+        pm = _make_page_map()
+        pm.interactables = [Interactable(ref=3, role="button", name="Buy", affordance="click", region="main", tier=1)]
+        srv._state.cache.store(pm, None)
+        cdp = _FakeScreenshotCDP()
+        session = _make_cdp_session(cdp)
+        locator = MagicMock()
+        locator.evaluate = AsyncMock(return_value={"x": 100, "y": 1500, "width": 200, "height": 40})
+
+        with (
+            patch("pagemap.server._get_session", return_value=session),
+            patch("pagemap.server._resolve_locator", AsyncMock(return_value=(locator, "role"))),
+        ):
+            await take_screenshot(ref=3)
+
+        params = cdp.captures[0]
+        assert params["clip"] == {"x": 100, "y": 1500, "width": 200, "height": 40, "scale": 1.0}
+        assert params["captureBeyondViewport"] is True  # below the 500-1300 viewport
+
+    async def test_ref_without_page_map(self):
+        import pagemap.server as srv
+
+        srv._state.cache.invalidate_all()
+        with patch("pagemap.server._get_session", return_value=_make_mock_session()):
+            result = await take_screenshot(ref=1)
+
+        assert "No active Page Map" in result
+
+    async def test_invalid_options(self):
+        with patch("pagemap.server._get_session", return_value=_make_mock_session()):
+            assert "Invalid format" in await take_screenshot(format="gif")
+            assert "quality must be" in await take_screenshot(format="jpeg", quality=0)
+            assert "scale must be" in await take_screenshot(scale=2.0)
+            assert "max_bytes must be" in await take_screenshot(max_bytes=0)
+
+
+class TestScreenshotFallback:
+    """page.screenshot fallback when no CDP session is available."""
+
+    async def test_quality_ladder_without_cdp(self):
+        session = _make_mock_session()
+        session.get_cdp_session = AsyncMock(side_effect=RuntimeError("CDP unavailable"))
+        session.page.screenshot = AsyncMock(side_effect=[b"x" * 5000, b"x" * 3000, b"x" * 900])
+
+        with patch("pagemap.server._get_session", return_value=session):
+            result = await take_screenshot(max_bytes=1000)
+
+        calls = [c.kwargs for c in session.page.screenshot.call_args_list]
+        assert calls[0] == {"full_page": False, "type": "png"}
+        assert calls[1] == {"full_page": False, "type": "jpeg", "quality": 80}
+        assert calls[2]["quality"] == 60
+        assert result[0]._format == "jpeg"
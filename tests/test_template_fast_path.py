@@ -0,0 +1,205 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for the template-confident fast path (pruning/regions.py, template_cache.py)."""
+
+from __future__ import annotations
+
+from dataclasses import replace
+from unittest.mock import patch
+
+import lxml.html
+
+from pagemap.core.pruned_context_builder import build_pruned_context
+from pagemap.core.pruning.boilerplate import BoilerplateIndex
+from pagemap.core.pruning.pipeline import prune_page
+from pagemap.core.pruning.regions import chrome_holders, isolate_content_regions, learn_content_regions
+from pagemap.core.template_cache import (
+    FAST_PATH_MIN_PASSES,
+    FastPathStats,
+    InMemoryTemplateCache,
+    TemplateKey,
+    fast_path_ready,
+    learn_template,
+    validate_template,
+)
+from pagemap.server.shared_cache import _template_from_dict, _template_to_dict
+
+_KEY = TemplateKey("shop.example.com", "product_detail")
+_MENU = (
+    "<header><nav>"
+    + "".join(f'<a href="/c/{i}">Category {i}</a>' for i in range(30))
+    + '</nav></header><div id="promo-123">Free shipping</div>'
+)
+_FOOTER = "<footer>" + "".join(f'<a href="/f/{i}">Footer {i}</a>' for i in range(20)) + "</footer>"
+
+
+def _page(n: int, *, main: str | None = None) -> str:
+    main = main or (
+        f'<main><nav class="crumbs"><a href="/">Home</a></nav><h1>Wool sweater {n}</h1>'
+        f"<p>{'Soft merino knit with ribbed cuffs and a relaxed fit. ' * 5}</p>"
+        f"<p>Price ${n}9.00 · In stock</p></main>"
+    )
+    return f"<html><head><title>Sweater</title></head><body>{_MENU}{main}{_FOOTER}</body></html>"
+
+
+def _learned():
+    result = prune_page(_page(1), "example", "live", "Product", learn_regions=True)
+    return learn_template(_KEY, "Product", result, metadata={}, source_url="https://shop.example.com/p/1")
+
+
+def _confident(template):
+    template.validation_passes = FAST_PATH_MIN_PASSES
+    return template
+
+
+class TestRegions:
+    def test_learns_main_despite_breadcrumb_nav(self):
+        result = prune_page(_page(1), "example", "live", "Product", learn_regions=True)
+        assert result.content_regions == ("//main",)
+
+    def test_chrome_holders_and_page_specific_ids(self):
+        html = (
+            '<html><body><div id="app"><header>Top</header><div id="content">'
+            f"<p>{'Long product description text. ' * 10}</p></div></div>"
+            '<div id="item-48213"><p>Sold</p></div></body></html>'
+        )
+        result = prune_page(html, "s", "p", "Generic")
+        doc = lxml.html.fromstring(html)
+        assert chrome_holders(doc) == frozenset({"//*[@id='app']"})
+        assert learn_content_regions(doc, result.selected_chunks, chrome_holders(doc)) == ("//*[@id='content']",)
+
+    def test_isolate_keeps_main_wrapper(self):
+        doc = lxml.html.fromstring(
+            '<html><body><header>x</header><main><div id="c"><p>y</p></div></main></body></html>'
+        )
+        assert isolate_content_regions(doc, ("//*[@id='c']",)) is not None
+        assert [el.tag for el in doc.body] == ["main"]
+        assert doc.find(".//header") is None
+
+    def test_missing_region_leaves_dom_untouched(self):
+        doc = lxml.html.fromstring("<html><body><header>x</header><div><p>y</p></div></body></html>")
+        assert isolate_content_regions(doc, ("//main",)) is None
+        assert doc.find(".//header") is not None
+
+
+class TestPrunePage:
+    def test_fast_path_matches_generic_content(self):
+        html = _page(2)
+        generic = prune_page(html, "example", "live", "Product")
+        fast = prune_page(html, "example", "live", "Product", content_regions=("//main",))
+        assert fast.fast_path == "hit"
+        assert [c.text for c in fast.selected_chunks] == [c.text for c in generic.selected_chunks]
+        assert fast.aom_filter_stats.total_nodes < generic.aom_filter_stats.total_nodes
+
+    def test_unmatched_region_falls_back_in_place(self):
+        result = prune_page(_page(2), "example", "live", "Product", content_regions=("//*[@id='gone']",))
+        assert result.fast_path == "fallback"
+        assert "Wool sweater 2" in result.pruned_html
+
+
+class TestTemplate:
+    def test_learned_template_carries_regions(self):
+        template = _learned()
+        assert template.data.content_regions == ("//main",)
+        assert template.data.content_tokens > 0
+
+    def test_ready_only_when_enabled_and_validated(self):
+        template = _learned()
+        with patch("pagemap.core.template_cache.TEMPLATE_FAST_PATH_ENABLED", True):
+            assert not fast_path_ready(template)
+            cache = InMemoryTemplateCache()
+            cache.store(template)
+            for _ in range(FAST_PATH_MIN_PASSES):
+                cache.record_validation_pass(_KEY)
+            assert fast_path_ready(template)
+            cache.record_validation_failure(_KEY)
+            assert not fast_path_ready(template)
+        assert not fast_path_ready(_confident(_learned()))  # flag off
+
+    def test_failure_restarts_pass_count(self):
+        template = _learned()
+        cache = InMemoryTemplateCache()
+        cache.store(template)
+        with patch("pagemap.core.template_cache.TEMPLATE_FAST_PATH_ENABLED", True):
+            for _ in range(FAST_PATH_MIN_PASSES):
+                cache.record_validation_pass(_KEY)
+            cache.record_validation_failure(_KEY)
+            cache.record_validation_pass(_KEY)
+            assert template.consecutive_failures == 0
+            assert not fast_path_ready(template)
+            for _ in range(FAST_PATH_MIN_PASSES - 1):
+                cache.record_validation_pass(_KEY)
+            assert fast_path_ready(template)
+
+    def test_fast_path_validation_skips_ratios(self):
+        template = _learned()
+        args = dict(actual_has_main=True, actual_metadata_source="", actual_aom_removal_ratio=0.0)
+        assert validate_template(template, **args, actual_chunk_selection_ratio=0.0, fast_path=True).passed
+        assert not validate_template(template, **args, actual_chunk_selection_ratio=1.0).passed
+
+    def test_shared_cache_round_trip(self):
+        template = _learned()
+        pulled = _template_from_dict(_KEY.domain, _KEY.page_type, _template_to_dict(template))
+        assert pulled.data == template.data
+
+
+class TestBuildPrunedContext:
+    def _build(self, html, template, stats, page_url=""):
+        with (
+            patch("pagemap.core.template_cache.TEMPLATE_FAST_PATH_ENABLED", True),
+            patch("pagemap.core.pruned_context_builder.TEMPLATE_FAST_PATH_ENABLED", True),
+            patch("pagemap.core.pruned_context_builder.fast_path_stats", stats),
+        ):
+            _, _, metadata = build_pruned_context(
+                html, page_type="product_detail", template=template, page_url=page_url
+            )
+        return metadata["_pruning_result"]
+
+    def test_hit_and_stats(self):
+        stats = FastPathStats()
+        result = self._build(_page(3), _confident(_learned()), stats)
+        assert result.fast_path == "hit"
+        self._build(_page(4), _learned(), stats)  # not yet confident
+        row = stats.snapshot()[_KEY.domain]
+        assert (row["hit"], row["generic"], row["fallback"], row["hit_rate"]) == (1, 1, 0, 0.5)
+
+    def test_thin_region_falls_back_to_whole_page(self):
+        template = _confident(_learned())
+        template.data = replace(template.data, content_tokens=10_000)
+        stats = FastPathStats()
+        result = self._build(_page(5), template, stats)
+        assert result.fast_path == "fallback"
+        assert result.aom_filter_stats.total_nodes > 50  # whole document was pruned
+        assert stats.snapshot()[_KEY.domain]["fallback"] == 1
+
+    def test_fallback_counts_boilerplate_once(self):
+        template = _confident(_learned())
+        template.data = replace(template.data, content_tokens=10_000)
+        index = BoilerplateIndex()
+        with (
+            patch("pagemap.core.pruning.pipeline.BOILERPLATE_INDEX_ENABLED", True),
+            patch("pagemap.core.pruning.pipeline.boilerplate_index", index),
+            patch("pagemap.core.pruned_context_builder.BOILERPLATE_INDEX_ENABLED", True),
+            patch("pagemap.core.pruned_context_builder.boilerplate_index", index),
+        ):
+            result = self._build(_page(5), template, FastPathStats(), page_url="https://shop.example.com/p/5")
+        assert result.fast_path == "fallback"
+        assert index.stats.snapshot()["pages"] == 1
+
+
+class TestFastPathStats:
+    def test_snapshot_and_bound(self):
+        stats = FastPathStats()
+        stats.record("a.com", "hit", 0.004)
+        stats.record("a.com", "hit", 0.002)
+        stats.record("a.com", "fallback", 0.030)
+        row = stats.snapshot()["a.com"]
+        assert (row["hit"], row["hit_ms_avg"], row["fallback_ms_avg"]) == (2, 3.0, 30.0)
+        assert row["hit_rate"] == 0.667
+        with patch("pagemap.core.template_cache.MAX_FAST_PATH_DOMAINS", 2):
+            stats.record("b.com", "generic", 0.01)
+            stats.record("c.com", "generic", 0.01)
+        assert set(stats.snapshot()) == {"b.com", "c.com"}
+        stats.reset()
+        assert stats.snapshot() == {}
@@ -0,0 +1,252 @@
+# Copyright (C) 2025-2026 Retio AI
+# SPDX-License-Identifier: AGPL-3.0-only
+
+"""Tests for reader/writer tool scheduling (server/tool_lock.py)."""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from pagemap import Interactable, PageMap
+from pagemap.dom_change_detector import DomFingerprint
+from pagemap.server.tool_lock import ToolLock, ToolLockStats, hold_tool_lock, tool_lock_stats
+
+_URL = "https://example.com/account"
+
+
+async def _settle() -> None:
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+class TestToolLock:
+    async def test_readers_share(self):
+        lock = ToolLock()
+        await lock.acquire_shared()
+        await asyncio.wait_for(lock.acquire_shared(), timeout=0.1)
+        assert lock.readers == 2
+        assert lock.locked()
+
+    async def test_writer_excludes_readers(self):
+        lock = ToolLock()
+        await lock.acquire()
+        reader = asyncio.create_task(lock.acquire_shared())
+        await _settle()
+        assert not reader.done()
+        lock.release()
+        await reader
+        assert lock.readers == 1
+
+    async def test_queued_writer_blocks_new_readers(self):
+        lock = ToolLock()
+        order: list[str] = []
+        await lock.acquire_shared()
+
+        async def writer():
+            async with lock:
+                order.append("writer")
+
+        async def late_reader():
+            async with lock.shared():
+                order.append("reader")
+
+        tasks = [asyncio.create_task(writer())]
+        await _settle()
+        tasks.append(asyncio.create_task(late_reader()))
+        await _settle()
+        assert order == []
+        lock.release_shared()
+        await asyncio.gather(*tasks)
+        assert order == ["writer", "reader"]
+        assert not lock.locked()
+
+    async def test_cancelled_writer_unblocks_readers(self):
+        lock = ToolLock()
+        await lock.acquire_shared()
+        writer = asyncio.create_task(lock.acquire())
+        await _settle()
+        reader = asyncio.create_task(lock.acquire_shared())
+        await _settle()
+        writer.cancel()
+        await asyncio.wait_for(reader, timeout=0.1)
+        assert lock.readers == 2
+        assert not lock._waiters
+
+    async def test_release_unheld_raises(self):
+        lock = ToolLock()
+        with pytest.raises(RuntimeError):
+            lock.release()
+        with pytest.raises(RuntimeError):
+            lock.release_shared()
+
+
+class TestHoldToolLock:
+    @pytest.fixture(autouse=True)
+    def _reset(self):
+        tool_lock_stats.reset()
+        yield
+        tool_lock_stats.reset()
+
+    async def test_records_wait_per_tool_and_mode(self):
+        lock = ToolLock()
+        async with (
+            hold_tool_lock(lock, "get_page_state", shared=True),
+            hold_tool_lock(lock, "take_screenshot", shared=True),
+        ):
+            assert lock.readers == 2
+        async with hold_tool_lock(lock, "execute_action"):
+            assert lock.locked()
+        snap = tool_lock_stats.snapshot()
+        assert snap["get_page_state"]["shared"]["acquired"] == 1
+        assert snap["execute_action"]["exclusive"]["acquired"] == 1
+        assert not lock.locked()
+
+    async def test_timeout_recorded_as_abandoned(self):
+        lock = ToolLock()
+        await lock.acquire()
+        with pytest.raises(TimeoutError):
+            async with asyncio.timeout(0.01):
+                async with hold_tool_lock(lock, "get_page_state", shared=True):
+                    pass
+        assert tool_lock_stats.snapshot()["get_page_state"]["shared"]["abandoned"] == 1
+        lock.release()
+        assert not lock.locked()
+
+    async def test_plain_lock_is_exclusive(self):
+        lock = asyncio.Lock()
+        async with hold_tool_lock(lock, "list_tabs", shared=True):
+            assert lock.locked()
+        assert "exclusive" in tool_lock_stats.snapshot()["list_tabs"]
+
+    async def test_disabled_falls_back_to_exclusive(self):
+        lock = ToolLock()
+        with patch("pagemap.server.tool_lock.SHARED_READ_TOOLS_ENABLED", False):
+            async with hold_tool_lock(lock, "get_page_state", shared=True):
+                assert lock.readers == 0 and lock.locked()
+
+    def test_stats_snapshot(self):
+        stats = ToolLockStats()
+        stats.record("get_page_map", "exclusive", 0.5)
+        stats.record("get_page_map", "exclusive", 1.5, acquired=False)
+        assert stats.snapshot()["get_page_map"]["exclusive"] == {
+            "acquired": 1,
+            "abandoned": 1,
+            "wait_ms": 2000.0,
+            "avg_wait_ms": 1000.0,
+            "max_wait_ms": 1500.0,
+        }
+
+
+class TestServerReaders:
+    """Read-only tools proceed while another reader holds the session lock."""
+
+    @pytest.fixture(autouse=True)
+    async def _reader_in_progress(self):
+        import pagemap.server as srv
+
+        srv._state.cache.invalidate_all()
+        original_lock, original_timeout = srv._state.tool_lock, srv._TOOL_LOCK_TIMEOUT
+        srv._state.tool_lock = ToolLock()
+        srv._TOOL_LOCK_TIMEOUT = 0.05
+        await srv._state.tool_lock.acquire_shared()
+        yield
+        srv._state.tool_lock = original_lock
+        srv._TOOL_LOCK_TIMEOUT = original_timeout
+        srv._state.cache.invalidate_all()
+
+    def _session(self) -> MagicMock:
+        session = MagicMock()
+        session.get_page_url = AsyncMock(return_value=_URL)
+        session.get_page_title = AsyncMock(return_value="Account")
+        session.peek_mutation_severity = AsyncMock(return_value=0)
+        session.drain_dialogs = MagicMock(return_value=[])
+        session.page = MagicMock()
+        return session
+
+    def _fp(self, content_hash: int = 1) -> DomFingerprint:
+        return DomFingerprint(
+            interactive_counts={"button": 1},
+            total_interactives=1,
+            has_dialog=False,
+            body_child_count=2,
+            title="Account",
+            content_hash=content_hash,
+        )
+
+    def _store(self) -> None:
+        import pagemap.server as srv
+
+        page_map = PageMap(
+            url=_URL,
+            title="Account",
+            page_type="unknown",
+            interactables=[Interactable(ref=1, role="button", name="Save", affordance="click", region="main", tier=1)],
+            pruned_context="<h1>Account</h1>",
+            pruned_tokens=5,
+            generation_ms=10.0,
+            images=[],
+            metadata={},
+        )
+        srv._state.cache.store(page_map, self._fp())
+
+    async def test_get_page_state_not_blocked_by_reader(self):
+        import pagemap.server as srv
+
+        get_session = AsyncMock()
+        with (
+            patch("pagemap.server._get_session", get_session),
+            patch("pagemap.server._peek_session", return_value=self._session()),
+        ):
+            result = await srv.get_page_state()
+        assert '"url": "https://example.com/account"' in result
+        get_session.assert_not_awaited()  # no recovery/recycle under the shared lock
+
+    async def test_reader_without_session_needs_exclusive_path(self):
+        import pagemap.server as srv
+
+        get_session = AsyncMock(return_value=self._session())
+        with (
+            patch("pagemap.server._get_session", get_session),
+            patch("pagemap.server._peek_session", return_value=None),
+        ):
+            result = await srv.get_page_state()
+        assert "another tool call is in progress" in result
+        get_session.assert_not_awaited()
+
+    async def test_mutating_tool_still_waits(self):
+        import pagemap.server as srv
+
+        self._store()
+        result = await srv.execute_action(ref=1, action="click")
+        assert "another tool call is in progress" in result
+
+    async def test_unchanged_page_map_served_shared(self):
+        import pagemap.server as srv
+
+        self._store()
+        hits = srv._state.cache.stats.hits
+        with (
+            patch("pagemap.server._peek_session", return_value=self._session()),
+            patch("pagemap.server.capture_dom_fingerprint", AsyncMock(return_value=self._fp())),
+            patch("pagemap.server._validate_url_with_dns", AsyncMock(return_value=None)),
+        ):
+            result = await srv.get_page_map()
+        assert "Status: unchanged" in result
+        assert srv._state.cache.stats.hits == hits + 1
+
+    async def test_changed_page_needs_exclusive_path(self):
+        import pagemap.server as srv
+
+        self._store()
+        moved = dataclasses.replace(self._fp(), content_hash=2)
+        with (
+            patch("pagemap.server._peek_session", return_value=self._session()),
+            patch("pagemap.server.capture_dom_fingerprint", AsyncMock(return_value=moved)),
+            patch("pagemap.server._validate_url_with_dns", AsyncMock(return_value=None)),
+        ):
+            result = await srv.get_page_map()
+        assert "another tool call is in progress" in result